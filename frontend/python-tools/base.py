@@ -4,15 +4,125 @@
 import os
 import sys
 import json
+import asyncio
+import logging
+import threading
 import requests
+import requests.adapters
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
 from dns_resolver import get_dns_resolver_session
+from shopify_throttle import (ShopifyThrottledError, charge_query_cost, estimate_query_cost, get_throttle,
+                              is_throttled)
+from mcp_logging import Payload
+from mcp_deadline import check_deadline, http_timeout
+from product_index import get_product_index
 
+logger = logging.getLogger('shopify-client')
+
+
+# ---------------------------------------------------------------------------
+# Process-wide HTTP transport
+#
+# Every client in a process shares one keep-alive connection pool.  The async
+# client drives it from a small dedicated I/O executor so concurrent tool calls
+# overlap their network waits without blocking the event loop (and without
+# competing with other users of the loop's default executor).
+# ---------------------------------------------------------------------------
+
+_POOL_SIZE = int(os.environ.get('SHOPIFY_HTTP_POOL_SIZE', '10'))
+# Read timeout for one GraphQL request; a tool call's deadline can shorten it
+SHOPIFY_HTTP_TIMEOUT = float(os.environ.get('SHOPIFY_HTTP_TIMEOUT', '60'))
+
+# Attempts made when Shopify still answers THROTTLED despite local pacing
+# (a value below 1 still sends the request once).
+THROTTLE_RETRIES = int(os.environ.get('SHOPIFY_THROTTLE_RETRIES', '5'))
+
+# Requested cost each chunk of a batched lookup is sized to (Shopify rejects
+# single queries over 1000); ``nodes(ids:)`` takes at most 250 IDs.
+BATCH_QUERY_COST = int(os.environ.get('SHOPIFY_BATCH_QUERY_COST', '500'))
+MAX_NODES_PER_QUERY = 250
+# Variants a SKU search may return; the exact match among them is used
+SKU_SEARCH_CANDIDATES = 3
+
+_transport_lock = threading.Lock()
+_shared_session: Optional[requests.Session] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide pooled session used for Shopify requests."""
+    global _shared_session
+    if _shared_session is None:
+        with _transport_lock:
+            if _shared_session is None:
+                custom_dns = os.environ.get('CUSTOM_DNS_SERVERS')
+                if custom_dns:
+                    session = get_dns_resolver_session(
+                        dns_servers=custom_dns.split(','),
+                        pool_maxsize=_POOL_SIZE,
+                    )
+                else:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=_POOL_SIZE,
+                    )
+                    session.mount('https://', adapter)
+                session.headers.update({'Content-Type': 'application/json'})
+                _shared_session = session
+    return _shared_session
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Return the executor that runs blocking HTTP calls for async clients."""
+    global _io_executor
+    if _io_executor is None:
+        with _transport_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=_POOL_SIZE,
+                    thread_name_prefix='shopify-io',
+                )
+    return _io_executor
+
+
+class ShopifyServerError(Exception):
+    """Shopify answered with a 5xx status; the request may be retried."""
+
+
+class _ShopifyClientBase:
+    """Configuration and response handling shared by the sync and async clients."""
+
+    PRODUCT_BY_HANDLE_QUERY = '''
+        query getProductByHandle($handle: String!) {
+            productByHandle(handle: $handle) {
+                id
+            }
+        }
+        '''
+
+    PRODUCT_SEARCH_QUERY = '''
+        query searchProduct($query: String!) {
+            products(first: 1, query: $query) {
+                edges {
+                    node {
+                        id
+                        title
+                        variants(first: 10) {
+                            edges {
+                                node {
+                                    sku
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        '''
 
-class ShopifyClient:
-    """Base client for Shopify Admin API GraphQL operations."""
-    
     def __init__(self):
         self.shop_url = os.environ.get('SHOPIFY_SHOP_URL')
         self.access_token = os.environ.get('SHOPIFY_ACCESS_TOKEN')
@@ -29,41 +139,49 @@ class ShopifyClient:
             self.shop_url = f'https://{self.shop_url}'
         
         self.graphql_url = f"{self.shop_url}/admin/api/2025-07/graphql.json"
-        
-        # Use custom DNS resolver if specified
-        custom_dns = os.environ.get('CUSTOM_DNS_SERVERS')
-        if custom_dns:
-            dns_servers = custom_dns.split(',')
-            self.session = get_dns_resolver_session(dns_servers=dns_servers)
-        else:
-            self.session = requests.Session()
-        
-        self.session.headers.update({
-            'X-Shopify-Access-Token': self.access_token,
-            'Content-Type': 'application/json'
-        })
+        self.session = get_shared_session()
+        self.headers = {'X-Shopify-Access-Token': self.access_token}
+        self.throttle = get_throttle()
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+            logging.basicConfig()  # No-op when a server already configured logging
     
-    def execute_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute a GraphQL query or mutation."""
+    def _build_payload(self, query: str, variables: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         payload = {'query': query}
         if variables:
             payload['variables'] = variables
         
         if self.debug:
-            print(f"GraphQL Request: {json.dumps(payload, indent=2)}", file=sys.stderr)
+            logger.debug("GraphQL Request: %s", Payload(payload))
+        return payload
+    
+    def _post(self, payload: Dict[str, Any], reserved: float = 0.0,
+              timeout: Any = None) -> Dict[str, Any]:
+        """Send a GraphQL payload over the shared pool (blocking).
         
+        ``reserved`` is the throttle reservation made for this request; it is
+        released and the bucket re-synced from ``extensions.cost`` afterwards.
+        ``timeout`` is passed to ``requests`` (see ``mcp_deadline.http_timeout``).
+        """
+        cost_info = None
         try:
-            response = self.session.post(self.graphql_url, json=payload)
+            response = self.session.post(self.graphql_url, json=payload, headers=self.headers,
+                                         timeout=timeout or SHOPIFY_HTTP_TIMEOUT)
             response.raise_for_status()
             result = response.json()
+            cost_info = (result.get('extensions') or {}).get('cost')
             
             if self.debug:
-                print(f"GraphQL Response: {json.dumps(result, indent=2)}", file=sys.stderr)
+                logger.debug("GraphQL Response: %s", Payload(result))
+            
+            if is_throttled(result):
+                self.throttle.note_throttled()
+                raise ShopifyThrottledError(f"GraphQL Errors: {json.dumps(result['errors'])}")
             
             # Check for GraphQL errors
             if 'errors' in result:
                 error_msg = f"GraphQL Errors: {json.dumps(result['errors'], indent=2)}"
-                print(error_msg, file=sys.stderr)
+                logger.error(error_msg)
                 # Don't exit - raise exception so MCP server can handle it
                 raise Exception(error_msg)
             
@@ -71,12 +189,15 @@ class ShopifyClient:
             
         except requests.exceptions.RequestException as e:
             error_msg = f"API Request Error: {e}"
-            print(error_msg, file=sys.stderr)
             if hasattr(e.response, 'text'):
-                print(f"Response: {e.response.text}", file=sys.stderr)
                 error_msg += f"\nResponse: {e.response.text}"
+            logger.error(error_msg)
+            if getattr(e.response, 'status_code', 0) >= 500:
+                raise ShopifyServerError(error_msg)
             # Don't exit - raise exception so MCP server can handle it
             raise Exception(error_msg)
+        finally:
+            self.throttle.record(payload['query'], payload.get('variables'), cost_info, reserved)
     
     def check_user_errors(self, data: Dict[str, Any], operation: str) -> bool:
         """Check for userErrors in mutation response."""
@@ -98,59 +219,266 @@ class ShopifyClient:
             return f"gid://shopify/Product/{identifier}"
         return identifier
     
-    def resolve_product_id(self, identifier: str) -> Optional[str]:
+    # Fields ``resolve_variants`` returns unless a caller asks for others
+    VARIANT_SELECTION = '''
+        price
+        compareAtPrice
+        product { id }
+        '''
+    
+    @staticmethod
+    def _batch_size(per_item_query: str, limit: int) -> int:
+        """Items per chunk so a batched query stays within ``BATCH_QUERY_COST``."""
+        per_item = max(estimate_query_cost(per_item_query), 1)
+        return max(1, min(limit, BATCH_QUERY_COST // per_item))
+    
+    @staticmethod
+    def _nodes_query(selection: str, type_name: str) -> str:
+        return f'''
+        query batchNodes($ids: [ID!]!) {{
+            nodes(ids: $ids) {{
+                ... on {type_name} {{
+                    id
+                    {selection}
+                }}
+            }}
+        }}
+        '''
+    
+    @staticmethod
+    def _sku_search_query(count: int, selection: str) -> str:
+        """One aliased ``productVariants`` search per SKU, ``v0``..``v<count-1>``."""
+        params = ', '.join(f'$q{i}: String!' for i in range(count))
+        searches = '\n'.join(
+            f'v{i}: productVariants(first: {SKU_SEARCH_CANDIDATES}, query: $q{i}) '
+            f'{{ edges {{ node {{ id sku {selection} }} }} }}'
+            for i in range(count)
+        )
+        return f'query batchSkus({params}) {{\n{searches}\n}}'
+    
+    @staticmethod
+    def _sku_search(sku: str, search: str) -> str:
+        return f'sku:{json.dumps(sku)} {search}'.strip()
+    
+    @staticmethod
+    def _pick_sku_match(result: Dict[str, Any], alias: str, sku: str) -> Optional[Dict[str, Any]]:
+        edges = (result.get('data', {}).get(alias) or {}).get('edges', [])
+        for edge in edges:
+            if (edge['node'].get('sku') or '').upper() == sku.upper():
+                return edge['node']
+        return None
+    
+    def _variant_gid(self, identifier: str) -> Optional[str]:
+        """Variant GID for a GID or numeric ID; None for a SKU."""
+        if identifier.startswith('gid://'):
+            return identifier
+        if identifier.isdigit():
+            return f"gid://shopify/ProductVariant/{identifier}"
+        return None
+    
+    @staticmethod
+    def _pick_search_match(result: Dict[str, Any], identifier: str) -> Optional[str]:
+        """Pick the product ID from a ``PRODUCT_SEARCH_QUERY`` result."""
+        edges = result.get('data', {}).get('products', {}).get('edges', [])
+        if not edges:
+            return None
+        
+        product = edges[0]['node']
+        # Prefer an exact SKU match, otherwise return first match
+        for variant in product.get('variants', {}).get('edges', []):
+            if (variant['node'].get('sku') or '').upper() == identifier.upper():
+                return product['id']
+        return product['id']
+
+
+class AsyncShopifyClient(_ShopifyClientBase):
+    """Async client for Shopify Admin API GraphQL operations.
+    
+    Requests run on the shared connection pool via the I/O executor, so the
+    calling event loop stays free while a request is in flight.  Every request
+    is paced by the process-wide cost throttle.
+    """
+    
+    async def execute_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a GraphQL query or mutation."""
+        payload = self._build_payload(query, variables)
+        cost = self.throttle.estimate_cost(query, variables)
+        loop = asyncio.get_running_loop()
+        attempts = max(1, THROTTLE_RETRIES)
+        for attempt in range(attempts):
+            reserved = await self.throttle.acquire_async(cost)
+            try:
+                # Computed here: the executor thread doesn't see the caller's deadline
+                timeout = http_timeout(SHOPIFY_HTTP_TIMEOUT)
+                result = await loop.run_in_executor(get_io_executor(), self._post, payload, reserved, timeout)
+                charge_query_cost(result)
+                return result
+            except ShopifyThrottledError:
+                if attempt == attempts - 1:
+                    raise
+            except Exception:
+                # Report a request cut short by the call's deadline as a timeout
+                check_deadline("Shopify request finished")
+                raise
+    
+    async def resolve_product_id(self, identifier: str) -> Optional[str]:
         """Resolve product by ID, handle, SKU, or title."""
         # Try as direct ID first
         if identifier.startswith('gid://') or identifier.isdigit():
             return self.normalize_id(identifier)
         
+        # Local identifier index (see product_index.py), once warmed
+        index = get_product_index(self.shop_url)
+        if index is not None:
+            if index.sync_due():
+                try:
+                    await index.sync(self)
+                except Exception as e:
+                    logger.warning("Product index delta failed: %s", e)
+            match = index.lookup(identifier)
+            if match:
+                return match['product_id']
+            query, variables = index.resolve_request(identifier)
+            return index.store_resolved(identifier, await self.execute_graphql(query, variables))
+        
         # Try by handle
-        query = '''
-        query getProductByHandle($handle: String!) {
-            productByHandle(handle: $handle) {
-                id
-            }
-        }
-        '''
-        result = self.execute_graphql(query, {'handle': identifier})
+        result = await self.execute_graphql(self.PRODUCT_BY_HANDLE_QUERY, {'handle': identifier})
         if result.get('data', {}).get('productByHandle'):
             return result['data']['productByHandle']['id']
         
         # Try by SKU or title
         search_query = f'sku:"{identifier}" OR title:"{identifier}"'
-        query = '''
-        query searchProduct($query: String!) {
-            products(first: 1, query: $query) {
-                edges {
-                    node {
-                        id
-                        title
-                        variants(first: 10) {
-                            edges {
-                                node {
-                                    sku
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        '''
-        result = self.execute_graphql(query, {'query': search_query})
-        edges = result.get('data', {}).get('products', {}).get('edges', [])
+        result = await self.execute_graphql(self.PRODUCT_SEARCH_QUERY, {'query': search_query})
+        return self._pick_search_match(result, identifier)
+    
+    async def fetch_nodes(self, ids: List[str], selection: str,
+                          type_name: str = 'ProductVariant') -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch many nodes by GID with ``nodes(ids:)``, one query per cost-sized chunk."""
+        ids = list(dict.fromkeys(ids))
+        query = self._nodes_query(selection, type_name)
+        size = self._batch_size(f'{{ node(id: "") {{ ... on {type_name} {{ id {selection} }} }} }}',
+                                MAX_NODES_PER_QUERY)
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        results = await asyncio.gather(*(self.execute_graphql(query, {'ids': chunk}) for chunk in chunks))
+        found: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(ids)
+        for result in results:
+            for node in result.get('data', {}).get('nodes') or []:
+                if node and node.get('id') in found:
+                    found[node['id']] = node
+        return found
+    
+    async def find_variants_by_sku(self, skus: List[str], selection: Optional[str] = None,
+                                   search: str = '') -> Dict[str, Optional[Dict[str, Any]]]:
+        """Variants by exact SKU, with aliased searches batched per cost-sized chunk.
         
-        if edges:
-            product = edges[0]['node']
-            # Verify SKU match if searching by SKU
-            if identifier.upper() in search_query.upper():
-                for variant in product.get('variants', {}).get('edges', []):
-                    if variant['node'].get('sku', '').upper() == identifier.upper():
-                        return product['id']
-            # Otherwise return first match
-            return product['id']
+        ``search`` narrows every search, e.g. ``product_status:active``.
+        """
+        skus = list(dict.fromkeys(skus))
+        selection = selection or self.VARIANT_SELECTION
+        size = self._batch_size(self._sku_search_query(1, selection), MAX_NODES_PER_QUERY)
+        chunks = [skus[i:i + size] for i in range(0, len(skus), size)]
         
-        return None
+        async def search_chunk(chunk: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+            variables = {f'q{i}': self._sku_search(sku, search) for i, sku in enumerate(chunk)}
+            result = await self.execute_graphql(self._sku_search_query(len(chunk), selection), variables)
+            return {sku: self._pick_sku_match(result, f'v{i}', sku) for i, sku in enumerate(chunk)}
+        
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        for chunk_found in await asyncio.gather(*(search_chunk(chunk) for chunk in chunks)):
+            found.update(chunk_found)
+        return found
+    
+    async def resolve_variants(self, identifiers: List[str], selection: Optional[str] = None,
+                               search: str = '', skus_only: bool = False) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve variant GIDs, numeric variant IDs and SKUs to variant nodes in batches.
+        
+        IDs are fetched with ``nodes(ids:)``. SKUs the product index knows go
+        the same way; the rest are searched (``find_variants_by_sku``). The
+        result maps each identifier to its node (``id``, ``sku`` and
+        ``selection``), or None when it didn't resolve. ``search`` narrows
+        only the SKU searches. With ``skus_only`` every identifier is a SKU,
+        so an all-digit SKU isn't mistaken for a variant ID.
+        """
+        selection = selection or self.VARIANT_SELECTION
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+        by_gid: Dict[str, str] = {}
+        skus: List[str] = []
+        index = get_product_index(self.shop_url)
+        for identifier in identifiers:
+            gid = None if skus_only else self._variant_gid(identifier)
+            if gid is None and index is not None:
+                match = index.lookup(identifier)
+                if match and match['matched'] == 'sku':
+                    gid = match['variant_id']
+            if gid is None:
+                skus.append(identifier)
+            else:
+                by_gid[identifier] = gid
+        
+        if by_gid:
+            nodes = await self.fetch_nodes(list(by_gid.values()), f'sku {selection}')
+            for identifier, gid in by_gid.items():
+                node = nodes.get(gid)
+                from_index = skus_only or self._variant_gid(identifier) is None
+                if from_index and (node is None or (node.get('sku') or '').upper() != identifier.upper()):
+                    skus.append(identifier)  # The SKU moved since the index saw it
+                else:
+                    resolved[identifier] = node
+        if skus:
+            resolved.update(await self.find_variants_by_sku(skus, selection, search))
+        return {identifier: resolved.get(identifier) for identifier in identifiers}
+
+
+class ShopifyClient(_ShopifyClientBase):
+    """Synchronous client for Shopify Admin API GraphQL operations.
+    
+    Blocking facade for CLI scripts; shares the connection pool with
+    ``AsyncShopifyClient``.
+    """
+    
+    def execute_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a GraphQL query or mutation."""
+        payload = self._build_payload(query, variables)
+        cost = self.throttle.estimate_cost(query, variables)
+        attempts = max(1, THROTTLE_RETRIES)
+        for attempt in range(attempts):
+            reserved = self.throttle.acquire(cost)
+            try:
+                result = self._post(payload, reserved, http_timeout(SHOPIFY_HTTP_TIMEOUT))
+                charge_query_cost(result)
+                return result
+            except ShopifyThrottledError:
+                if attempt == attempts - 1:
+                    raise
+            except Exception:
+                # Report a request cut short by the call's deadline as a timeout
+                check_deadline("Shopify request finished")
+                raise
+    
+    def resolve_product_id(self, identifier: str) -> Optional[str]:
+        """Resolve product by ID, handle, SKU, or title."""
+        # Try as direct ID first
+        if identifier.startswith('gid://') or identifier.isdigit():
+            return self.normalize_id(identifier)
+        
+        # Local identifier index; deltas are left to the async client
+        index = get_product_index(self.shop_url)
+        if index is not None:
+            match = index.lookup(identifier)
+            if match:
+                return match['product_id']
+            query, variables = index.resolve_request(identifier)
+            return index.store_resolved(identifier, self.execute_graphql(query, variables))
+        
+        # Try by handle
+        result = self.execute_graphql(self.PRODUCT_BY_HANDLE_QUERY, {'handle': identifier})
+        if result.get('data', {}).get('productByHandle'):
+            return result['data']['productByHandle']['id']
+        
+        # Try by SKU or title
+        search_query = f'sku:"{identifier}" OR title:"{identifier}"'
+        result = self.execute_graphql(self.PRODUCT_SEARCH_QUERY, {'query': search_query})
+        return self._pick_search_match(result, identifier)
 
 
 def parse_tags(tags_input: str) -> List[str]:
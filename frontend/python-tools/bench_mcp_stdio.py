@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-message overhead of the MCP stdio transport
+
+Runs a server with one trivial echo tool in a subprocess and pipes
+``tools/call`` requests through it, once with the old setup (reader thread
+via ``run_in_executor`` + stdlib json) and once with the asyncio stream
+transport + the default codec. Also times the codecs alone on a typical
+tool result.
+
+Usage: python bench_mcp_stdio.py [--messages 5000] [--payload-items 50]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_transport import CODECS
+
+SERVER = """
+import asyncio, logging
+from mcp_base_server import EnhancedMCPServer
+logging.disable(logging.CRITICAL)
+
+class EchoTool:
+    name = "echo"
+    description = "Return the arguments"
+    input_schema = {}
+    async def execute(self, **kwargs):
+        return kwargs
+
+server = EnhancedMCPServer("bench")
+server.add_tool(EchoTool())
+asyncio.run(server.run())
+"""
+
+SETUPS = {
+    'before (thread readline + json)': {'MCP_STDIO_MODE': 'thread', 'MCP_JSON_CODEC': 'json'},
+    'after (asyncio streams + default codec)': {'MCP_STDIO_MODE': 'stream'},
+}
+
+
+def sample_payload(items: int):
+    return {
+        "success": True,
+        "products": [
+            {
+                "id": f"gid://shopify/Product/{i}",
+                "title": f"Espresso Machine {i}",
+                "handle": f"espresso-machine-{i}",
+                "vendor": "Breville",
+                "variants": [{"sku": f"SKU-{i}-{v}", "price": "1299.99", "inventoryQuantity": v} for v in range(3)],
+                "tags": ["espresso", "machine", "sale"],
+            }
+            for i in range(items)
+        ],
+    }
+
+
+def round_trip(env_overrides, messages: int, payload) -> float:
+    """Seconds per message for pipelined tools/call requests"""
+    env = dict(os.environ, **env_overrides)
+    proc = subprocess.Popen(
+        [sys.executable, '-c', SERVER], cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+    )
+    proc.stdout.readline()  # ready
+
+    request = json.dumps({"jsonrpc": "2.0", "method": "tools/call",
+                          "params": {"name": "echo", "arguments": payload}})
+
+    def send():
+        for i in range(messages):
+            proc.stdin.write(request.replace('"method"', f'"id": {i}, "method"', 1).encode() + b'\n')
+        proc.stdin.close()
+
+    start = time.perf_counter()
+    writer = threading.Thread(target=send)
+    writer.start()
+    for _ in range(messages):
+        proc.stdout.readline()
+    elapsed = time.perf_counter() - start
+    writer.join()
+    proc.wait()
+    return elapsed / messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--payload-items', type=int, default=50)
+    args = parser.parse_args()
+
+    payload = sample_payload(args.payload_items)
+    size = len(json.dumps(payload))
+    print(f"Payload: {args.payload_items} products, {size:,} bytes as JSON\n")
+
+    print("Codec (encode + decode one payload):")
+    for name, codec_cls in CODECS.items():
+        codec = codec_cls()
+        encoded = codec.dumps_bytes(payload)
+        runs = 2000
+        seconds = timeit.timeit(lambda: codec.loads(codec.dumps_bytes(payload)), number=runs) / runs
+        print(f"  {name:8s} {seconds * 1e6:8.1f} us  ({len(encoded):,} bytes)")
+
+    print(f"\nRound trip, {args.messages} pipelined tools/call messages:")
+    for label, env in SETUPS.items():
+        small = round_trip(env, args.messages, {"q": "x"})
+        large = round_trip(env, max(1, args.messages // 10), payload)
+        print(f"  {label:42s} small {small * 1e6:7.1f} us/msg   payload {large * 1e6:8.1f} us/msg")
+
+
+if __name__ == '__main__':
+    main()
@@ -57,10 +57,13 @@ class DNSResolverAdapter(requests.adapters.HTTPAdapter):
         super().close()
 
 
-def get_dns_resolver_session(dns_servers=None):
-    """Get a requests session with custom DNS resolution."""
+def get_dns_resolver_session(dns_servers=None, **adapter_kwargs):
+    """Get a requests session with custom DNS resolution.
+
+    Extra keyword arguments (e.g. ``pool_maxsize``) are passed to the adapter.
+    """
     session = requests.Session()
-    adapter = DNSResolverAdapter(dns_servers=dns_servers)
+    adapter = DNSResolverAdapter(dns_servers=dns_servers, **adapter_kwargs)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
     return session
\ No newline at end of file
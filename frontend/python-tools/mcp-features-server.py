@@ -16,11 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the features-related tools
-from mcp_tools.features.manage_metaobjects import ManageFeaturesMetaobjectsTool
-from mcp_tools.products.update_metafields import UpdateMetafieldsTool
-from mcp_tools.products.manage_variant_links import ManageVariantLinksTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -36,9 +31,9 @@ class FeaturesMCPServer(EnhancedMCPServer):
         
     def _load_tools(self):
         """Load only features-related tools"""
-        self.add_tool(ManageFeaturesMetaobjectsTool())
-        self.add_tool(UpdateMetafieldsTool())
-        self.add_tool(ManageVariantLinksTool())
+        self.add_lazy_tool("mcp_tools.features.manage_metaobjects", "ManageFeaturesMetaobjectsTool")
+        self.add_lazy_tool("mcp_tools.products.update_metafields", "UpdateMetafieldsTool")
+        self.add_lazy_tool("mcp_tools.products.manage_variant_links", "ManageVariantLinksTool")
         
         
         # Add scratchpad tools
@@ -16,10 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import GraphQL tools
-from mcp_tools.graphql.query import GraphQLQueryTool
-from mcp_tools.graphql.mutation import GraphQLMutationTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -36,8 +32,8 @@ class GraphQLMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load GraphQL tools only"""
         # Add the 2 GraphQL tools
-        self.add_tool(GraphQLQueryTool())
-        self.add_tool(GraphQLMutationTool())
+        self.add_lazy_tool("mcp_tools.graphql.query", "GraphQLQueryTool")
+        self.add_lazy_tool("mcp_tools.graphql.mutation", "GraphQLMutationTool")
         
         # Add scratchpad tools
         for tool_def in SCRATCHPAD_TOOLS:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Connect stdin/stdout to one namespace of the multiplexed MCP host
+
+Drop-in stdio command for clients that spawn a server per namespace:
+``python3 mcp-host-connect.py products`` instead of
+``python3 mcp-products-server.py``. Starts ``mcp_host.py`` in the background
+when it isn't running yet. Only the standard library is imported, so each
+connection costs an interpreter start and nothing else.
+"""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+def default_socket_dir() -> str:
+    """Same per-user default as ``mcp_host.default_socket_dir``"""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return os.path.join(runtime, 'espressobot-mcp')
+    return os.path.join(tempfile.gettempdir(), f'espressobot-mcp-{os.getuid()}')
+
+
+SOCKET_DIR = os.environ.get('MCP_HOST_SOCKET_DIR') or default_socket_dir()
+CONNECT_TIMEOUT = float(os.environ.get('MCP_HOST_CONNECT_TIMEOUT', '30'))
+HOST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp_host.py')
+
+
+def start_host():
+    """Launch the host detached from this process"""
+    subprocess.Popen(
+        [sys.executable, HOST_SCRIPT, '--socket-dir', SOCKET_DIR],
+        cwd=os.path.dirname(HOST_SCRIPT),
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def check_socket_dir():
+    """Refuse a socket directory another user owns or can open (the host creates it if missing)"""
+    try:
+        info = os.lstat(SOCKET_DIR)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        sys.exit(f"{SOCKET_DIR} must be a directory owned by this user with mode 700")
+
+
+def connect(namespace: str) -> socket.socket:
+    path = os.path.join(SOCKET_DIR, f'{namespace}.sock')
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    started = False
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+            return sock
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            if not started:
+                start_host()
+                started = True
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def pump_stdin(sock: socket.socket):
+    """Forward stdin to the host, then half-close so it finishes in-flight requests"""
+    try:
+        while True:
+            data = os.read(sys.stdin.fileno(), 65536)
+            if not data:
+                break
+            sock.sendall(data)
+    except OSError:
+        pass
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit(f"Usage: {sys.argv[0]} NAMESPACE")
+    check_socket_dir()
+    sock = connect(sys.argv[1])
+    threading.Thread(target=pump_stdin, args=(sock,), daemon=True).start()
+    out = sys.stdout.buffer
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            break
+        out.write(data)
+        out.flush()
+
+
+if __name__ == '__main__':
+    main()
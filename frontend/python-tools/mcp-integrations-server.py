@@ -16,12 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the integration-related tools
-from mcp_tools.skuvault.upload_products import UploadToSkuVaultTool
-from mcp_tools.skuvault.manage_kits import ManageSkuVaultKitsTool
-from mcp_tools.marketing.send_review_request import SendReviewRequestTool
-from mcp_tools.research.perplexity import PerplexityResearchTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -38,10 +32,10 @@ class IntegrationsMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load only integration-related tools"""
         # Add the integration tools
-        self.add_tool(UploadToSkuVaultTool())
-        self.add_tool(ManageSkuVaultKitsTool())
-        self.add_tool(SendReviewRequestTool())
-        self.add_tool(PerplexityResearchTool())
+        self.add_lazy_tool("mcp_tools.skuvault.upload_products", "UploadToSkuVaultTool")
+        self.add_lazy_tool("mcp_tools.skuvault.manage_kits", "ManageSkuVaultKitsTool")
+        self.add_lazy_tool("mcp_tools.marketing.send_review_request", "SendReviewRequestTool")
+        self.add_lazy_tool("mcp_tools.research.perplexity", "PerplexityResearchTool")
         
         
         # Add scratchpad tools
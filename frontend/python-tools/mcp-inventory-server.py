@@ -16,11 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the inventory-related tools
-from mcp_tools.inventory.manage_policy import ManageInventoryPolicyTool
-from mcp_tools.products.manage_tags import ManageTagsTool
-from mcp_tools.store.manage_redirects import ManageRedirectsTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -36,9 +31,9 @@ class InventoryMCPServer(EnhancedMCPServer):
         
     def _load_tools(self):
         """Load only inventory-related tools"""
-        self.add_tool(ManageInventoryPolicyTool())
-        self.add_tool(ManageTagsTool())
-        self.add_tool(ManageRedirectsTool())
+        self.add_lazy_tool("mcp_tools.inventory.manage_policy", "ManageInventoryPolicyTool")
+        self.add_lazy_tool("mcp_tools.products.manage_tags", "ManageTagsTool")
+        self.add_lazy_tool("mcp_tools.store.manage_redirects", "ManageRedirectsTool")
         
         
         # Add scratchpad tools
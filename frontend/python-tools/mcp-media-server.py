@@ -16,9 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the media-related tools
-from mcp_tools.media.add_images import AddProductImagesTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -35,7 +32,7 @@ class MediaMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load only media-related tools"""
         # Add the media tool
-        self.add_tool(AddProductImagesTool())
+        self.add_lazy_tool("mcp_tools.media.add_images", "AddProductImagesTool")
         
         
         # Add scratchpad tools
@@ -23,12 +23,6 @@ from mcp_base_server import EnhancedMCPServer as MCPServerBase
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
-from mcp_tools.analytics import (
-    OrderAnalyticsTool,
-    DailySalesTool,
-    RevenueReportsTool
-)
-
 class OrdersServer(MCPServerBase):
     """MCP server for Shopify order analytics"""
     
@@ -39,9 +33,9 @@ class OrdersServer(MCPServerBase):
         )
         
         # Register analytics tools
-        self.add_tool(OrderAnalyticsTool())
-        self.add_tool(DailySalesTool())
-        self.add_tool(RevenueReportsTool())
+        self.add_lazy_tool("mcp_tools.analytics.order_analytics", "OrderAnalyticsTool")
+        self.add_lazy_tool("mcp_tools.analytics.daily_sales", "DailySalesTool")
+        self.add_lazy_tool("mcp_tools.analytics.revenue_reports", "RevenueReportsTool")
         
         # Add scratchpad tools
         for tool_def in SCRATCHPAD_TOOLS:
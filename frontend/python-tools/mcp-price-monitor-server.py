@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
+from mcp_deadline import http_timeout
 from mcp_tools.base import BaseMCPTool
 from typing import Dict, Any, Optional, List
 
@@ -24,6 +25,7 @@ class PriceMonitorAlertsDataTool(BaseMCPTool):
     
     name = "price_monitor_alerts_data"
     description = "Access price monitor alerts data with filtering and sorting options"
+    read_only = True
     context = """
     Access price monitor alerts with comprehensive filtering options:
     - Filter by status (active, resolved, dismissed)
@@ -83,7 +85,7 @@ class PriceMonitorAlertsDataTool(BaseMCPTool):
             response = requests.get(
                 "http://localhost:5173/api/price-monitor/alerts/data",
                 params=params,
-                timeout=30
+                timeout=http_timeout(30)
             )
             
             if response.status_code == 200:
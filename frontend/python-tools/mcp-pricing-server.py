@@ -16,11 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the pricing-related tools
-from mcp_tools.pricing.update import UpdatePricingTool
-from mcp_tools.pricing.bulk_update import BulkPriceUpdateTool
-from mcp_tools.pricing.update_costs import UpdateCostsTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -36,9 +31,9 @@ class PricingMCPServer(EnhancedMCPServer):
         
     def _load_tools(self):
         """Load only pricing-related tools"""
-        self.add_tool(UpdatePricingTool())
-        self.add_tool(BulkPriceUpdateTool())
-        self.add_tool(UpdateCostsTool())
+        self.add_lazy_tool("mcp_tools.pricing.update", "UpdatePricingTool")
+        self.add_lazy_tool("mcp_tools.pricing.bulk_update", "BulkPriceUpdateTool")
+        self.add_lazy_tool("mcp_tools.pricing.update_costs", "UpdateCostsTool")
         
         
         # Add scratchpad tools
@@ -16,14 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the product management tools
-from mcp_tools.products.create_full import CreateFullProductTool
-from mcp_tools.products.update_full import UpdateFullProductTool
-from mcp_tools.products.add_variants import AddVariantsTool
-from mcp_tools.products.create_combo import CreateComboTool
-from mcp_tools.products.create_open_box import CreateOpenBoxTool
-from mcp_tools.products.duplicate_listing import DuplicateListingTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -40,12 +32,12 @@ class ProductManagementMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load only product management tools"""
         # Add the product management tools
-        self.add_tool(CreateFullProductTool())
-        self.add_tool(UpdateFullProductTool())
-        self.add_tool(AddVariantsTool())
-        self.add_tool(CreateComboTool())
-        self.add_tool(CreateOpenBoxTool())
-        self.add_tool(DuplicateListingTool())
+        self.add_lazy_tool("mcp_tools.products.create_full", "CreateFullProductTool")
+        self.add_lazy_tool("mcp_tools.products.update_full", "UpdateFullProductTool")
+        self.add_lazy_tool("mcp_tools.products.add_variants", "AddVariantsTool")
+        self.add_lazy_tool("mcp_tools.products.create_combo", "CreateComboTool")
+        self.add_lazy_tool("mcp_tools.products.create_open_box", "CreateOpenBoxTool")
+        self.add_lazy_tool("mcp_tools.products.duplicate_listing", "DuplicateListingTool")
         
         
         # Add scratchpad tools
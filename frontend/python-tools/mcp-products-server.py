@@ -16,13 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the product-related tools
-from mcp_tools.products.get import GetProductTool
-from mcp_tools.products.search import SearchProductsTool
-from mcp_tools.products.create import CreateProductTool
-from mcp_tools.products.update_status import UpdateStatusTool
-from mcp_tools.products.update_variant_weight import UpdateVariantWeightTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -43,11 +36,11 @@ class ProductsMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load only product-related tools"""
         # Add the 5 product tools
-        self.add_tool(GetProductTool())
-        self.add_tool(SearchProductsTool())
-        self.add_tool(CreateProductTool())
-        self.add_tool(UpdateStatusTool())
-        self.add_tool(UpdateVariantWeightTool())
+        self.add_lazy_tool("mcp_tools.products.get", "GetProductTool")
+        self.add_lazy_tool("mcp_tools.products.search", "SearchProductsTool")
+        self.add_lazy_tool("mcp_tools.products.create", "CreateProductTool")
+        self.add_lazy_tool("mcp_tools.products.update_status", "UpdateStatusTool")
+        self.add_lazy_tool("mcp_tools.products.update_variant_weight", "UpdateVariantWeightTool")
         
         # GraphQL tools moved to dedicated GraphQL agent for safety
         # self.add_tool(GraphQLQueryTool())
@@ -16,10 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the sales-related tools
-from mcp_tools.sales.manage_miele_sales import ManageMieleSalesTool
-from mcp_tools.sales.manage_map_sales import ManageMapSalesTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -35,8 +31,8 @@ class SalesMCPServer(EnhancedMCPServer):
         
     def _load_tools(self):
         """Load only sales-related tools"""
-        self.add_tool(ManageMieleSalesTool())
-        self.add_tool(ManageMapSalesTool())
+        self.add_lazy_tool("mcp_tools.sales.manage_miele_sales", "ManageMieleSalesTool")
+        self.add_lazy_tool("mcp_tools.sales.manage_map_sales", "ManageMapSalesTool")
         
         
         # Add scratchpad tools
@@ -1,76 +1,477 @@
 #\!/usr/bin/env python3
 """
-MCP Server with file watching and auto-restart
-Ensures server stays running and restarts on file changes
+MCP Server with a pool of warm workers and instant failover
+
+The supervisor owns stdin/stdout and relays JSON-RPC lines to one active
+``mcp-server.py`` worker, while ``MCP_WORKER_POOL_SIZE - 1`` standbys sit
+ready with every tool already imported (``MCP_PRELOAD_TOOLS=1``). When the
+active worker dies, the next request goes to a standby straight away;
+requests that were in flight on the dead worker get an error response and a
+replacement standby is started in the background.
+
+Workers are also recycled before they get into trouble: after
+``MCP_WORKER_MAX_REQUESTS`` requests or once their RSS passes
+``MCP_WORKER_MAX_RSS_MB``, a standby takes over new requests and the old
+worker exits after finishing what it has in flight.
+
+Paged tool results (``result://`` streams) live in the worker that produced
+them, so ``resources/read`` of a stream goes to that worker rather than the
+active one, and a retiring worker stays up until its streams are read to the
+end or expire.
+
+Crash counts, failover latency and worker warm-up times are returned by the
+``supervisor/metrics`` method and logged to stderr on every change.
 """
 
-import subprocess
-import sys
+import asyncio
+import json
+import logging
 import os
-import time
 import signal
-from pathlib import Path
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_logging import configure_logging
+from mcp_streaming import RESULT_SCHEME, STREAM_TTL_SECONDS
+from mcp_transport import StdioTransport, get_codec
+
+configure_logging(log_file=None)
+logger = logging.getLogger('mcp-server-watch')
+
+WORKER_COMMAND = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp-server.py')]
+
+# Active worker plus standbys
+POOL_SIZE = int(os.environ.get('MCP_WORKER_POOL_SIZE', '2'))
+
+# Recycle a worker after this many requests or this much RSS (0 disables)
+MAX_REQUESTS = int(os.environ.get('MCP_WORKER_MAX_REQUESTS', '1000'))
+MAX_RSS_MB = float(os.environ.get('MCP_WORKER_MAX_RSS_MB', '1024'))
+
+RSS_CHECK_INTERVAL = 5.0
+
+# A worker that dies sooner than this after starting delays the next spawn
+CRASH_LOOP_SECONDS = 5.0
+MAX_SPAWN_BACKOFF = 30.0
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB, where /proc is available"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _message_ids(message: Any) -> List[Any]:
+    """Request ids in a JSON-RPC message or batch"""
+    members = message if isinstance(message, list) else [message]
+    return [m['id'] for m in members if isinstance(m, dict) and m.get('id') is not None]
+
+
+def _stream_id(uri: Any) -> Optional[str]:
+    """Stream id of a ``result://`` URI"""
+    if isinstance(uri, str) and uri.startswith(f"{RESULT_SCHEME}://"):
+        return urlparse(uri).netloc or None
+    return None
+
+
+def _next_cursor(result: Any) -> Optional[str]:
+    """Continuation link of a paged ``tools/call`` or ``resources/read`` result"""
+    if not isinstance(result, dict):
+        return None
+    return result.get('nextCursor') or (result.get('_meta') or {}).get('nextCursor')
+
+
+class Timing:
+    """Count, last, max and mean of a duration in milliseconds"""
 
-class MCPServerManager:
     def __init__(self):
-        self.process = None
-        
-    def start_server(self):
-        """Start the MCP server process"""
-        if self.process:
-            self.stop_server()
-            
-        print("🚀 Starting MCP server...")
-        self.process = subprocess.Popen(
-            [sys.executable, "mcp-server.py"],
-            stdin=sys.stdin,
-            stdout=sys.stdout,
-            stderr=sys.stderr
-        )
-        
-    def stop_server(self):
-        """Stop the MCP server process"""
-        if self.process:
-            print("🛑 Stopping MCP server...")
-            self.process.terminate()
+        self.count = 0
+        self.total = 0.0
+        self.last: Optional[float] = None
+        self.max = 0.0
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        self.max = max(self.max, ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'last_ms': round(self.last, 1) if self.last is not None else None,
+            'max_ms': round(self.max, 1),
+            'mean_ms': round(self.total / self.count, 1) if self.count else None,
+        }
+
+
+class Worker:
+    """One mcp-server.py process and the requests it owes responses to"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.pid = process.pid
+        self.started_at = time.monotonic()
+        self.ready = asyncio.Event()
+        self.pending: Dict[Any, float] = {}
+        self.requests = 0
+        self.retiring = False
+        self.streams: Dict[str, float] = {}  # Open result stream id -> expiry
+        self.reads: Dict[Any, str] = {}  # resources/read request id -> stream id
+
+    async def send(self, line: bytes):
+        self.process.stdin.write(line)
+        await self.process.stdin.drain()
+
+
+class MCPServerManager:
+    def __init__(self, command: Optional[List[str]] = None, pool_size: int = POOL_SIZE,
+                 max_requests: int = MAX_REQUESTS, max_rss_mb: float = MAX_RSS_MB, transport=None,
+                 stream_ttl: float = STREAM_TTL_SECONDS):
+        self.command = command or WORKER_COMMAND
+        self.pool_size = max(1, pool_size)
+        self.max_requests = max_requests
+        self.max_rss_mb = max_rss_mb
+        self.transport = transport
+        self.workers: List[Worker] = []
+        self.active: Optional[Worker] = None
+        self.owners: Dict[Any, Worker] = {}
+        self.stream_owners: Dict[str, Worker] = {}
+        self.stream_ttl = stream_ttl
+        self.codec = get_codec()
+        self._write_lock = asyncio.Lock()
+        self._active_changed = asyncio.Condition()
+        self._spawn_backoff = 0.0
+        self._starting = 0
+        self._stopping = False
+        self._tasks = set()
+        self.metrics = {
+            'crashes': 0,
+            'recycles': 0,
+            'spawned': 0,
+            'requests': 0,
+            'failed_in_flight': 0,
+        }
+        self.failover = Timing()
+        self.warmup = Timing()
+        self._lost_active_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _spawn_soon(self, delay: float = 0.0):
+        self._starting += 1
+        task = asyncio.create_task(self._spawn(delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self, delay: float = 0.0):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            if self._stopping:
+                return
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=None,
+                env=dict(os.environ, MCP_PRELOAD_TOOLS='1', PYTHONUNBUFFERED='1'),
+                limit=64 * 1024 * 1024,
+            )
+            worker = Worker(process)
+            self.workers.append(worker)
+        except OSError as e:
+            logger.error(f"Could not start worker: {e}")
+            return
+        finally:
+            self._starting -= 1
+        self.metrics['spawned'] += 1
+        logger.info(f"Started worker {worker.pid}")
+        if self._stopping:
+            # Shutdown began while it was starting; let it exit with the rest
+            worker.retiring = True
+            self._close_stdin(worker)
+        task = asyncio.create_task(self._read_worker(worker))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read_worker(self, worker: Worker):
+        """Relay a worker's responses to the client until it exits"""
+        stdout = worker.process.stdout
+        while True:
+            try:
+                line = await stdout.readline()
+            except ValueError:
+                continue  # Oversized line, already discarded
+            if not line:
+                break
             try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-            self.process = None
-            
-    def restart_server(self):
-        """Restart the MCP server"""
-        self.stop_server()
-        time.sleep(0.5)  # Brief pause
-        self.start_server()
-        
-    def run(self):
-        """Run the server with auto-restart on crash"""
-        # Start the server
-        self.start_server()
-        
-        # Handle shutdown gracefully
-        def signal_handler(sig, frame):
-            print("\n👋 Shutting down...")
-            self.stop_server()
-            sys.exit(0)
-            
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
+                message = self.codec.loads(line)
+            except ValueError:
+                continue  # Stray output, not a protocol message
+            if isinstance(message, dict) and message.get('method') == 'ready' and 'id' not in message:
+                await self._on_ready(worker)
+                continue
+            for request_id in _message_ids(message):
+                worker.pending.pop(request_id, None)
+                self.owners.pop(request_id, None)
+            self._track_streams(worker, message)
+            await self._write(line if line.endswith(b'\n') else line + b'\n')
+            if worker.retiring and self._idle(worker):
+                self._close_stdin(worker)
+        await worker.process.wait()
+        await self._on_exit(worker)
+
+    def _track_streams(self, worker: Worker, message: Any):
+        """Note result streams a worker opened, and drop the ones read to the end"""
+        for member in message if isinstance(message, list) else [message]:
+            if not isinstance(member, dict):
+                continue
+            read = worker.reads.pop(member.get('id'), None)
+            stream_id = _stream_id(_next_cursor(member.get('result')))
+            if stream_id:
+                worker.streams[stream_id] = time.monotonic() + self.stream_ttl
+                self.stream_owners[stream_id] = worker
+            elif read and 'result' in member:
+                worker.streams.pop(read, None)
+                self.stream_owners.pop(read, None)
+
+    def _idle(self, worker: Worker) -> bool:
+        """No pending requests and no unexpired result streams"""
+        now = time.monotonic()
+        for stream_id, expires in list(worker.streams.items()):
+            if expires <= now:
+                del worker.streams[stream_id]
+                self.stream_owners.pop(stream_id, None)
+        return not worker.pending and not worker.streams
+
+    async def _on_ready(self, worker: Worker):
+        self.warmup.add((time.monotonic() - worker.started_at) * 1000)
+        worker.ready.set()
+        logger.info(f"Worker {worker.pid} warm in {self.warmup.last:.0f}ms")
+        if self.active is None:
+            await self._promote()
+
+    async def _promote(self) -> bool:
+        """Make the first ready standby active"""
+        standby = next((w for w in self.workers if w.ready.is_set() and not w.retiring and w is not self.active), None)
+        if standby is None:
+            return False
+        async with self._active_changed:
+            self.active = standby
+            self._active_changed.notify_all()
+        if self._lost_active_at is not None:
+            self.failover.add((time.monotonic() - self._lost_active_at) * 1000)
+            self._lost_active_at = None
+            logger.info(f"Failed over to worker {standby.pid} in {self.failover.last:.1f}ms")
+        return True
+
+    async def _on_exit(self, worker: Worker):
+        self.workers.remove(worker)
+        code = worker.process.returncode
+        if not worker.retiring and not self._stopping:
+            self.metrics['crashes'] += 1
+            logger.error(f"Worker {worker.pid} exited with code {code}")
+            lifetime = time.monotonic() - worker.started_at
+            if lifetime < CRASH_LOOP_SECONDS:
+                self._spawn_backoff = min(MAX_SPAWN_BACKOFF, max(0.5, self._spawn_backoff * 2))
+            else:
+                self._spawn_backoff = 0.0
+
+        for stream_id in worker.streams:
+            self.stream_owners.pop(stream_id, None)
+
+        # Requests the worker never answered
+        for request_id in list(worker.pending):
+            self.owners.pop(request_id, None)
+            self.metrics['failed_in_flight'] += 1
+            await self._write_message({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": -32603, "message": f"MCP worker exited with code {code} before responding"},
+            })
+
+        if self.active is worker:
+            self.active = None
+            self._lost_active_at = time.monotonic()
+            await self._promote()
+        if not self._stopping:
+            self._top_up(self._spawn_backoff if not worker.retiring else 0.0)
+        self._log_metrics()
+
+    def _top_up(self, delay: float = 0.0):
+        """Start workers until the pool is full again"""
+        live = sum(1 for w in self.workers if not w.retiring) + self._starting
+        for _ in range(self.pool_size - live):
+            self._spawn_soon(delay)
+
+    def _close_stdin(self, worker: Worker):
+        if not worker.process.stdin.is_closing():
+            worker.process.stdin.close()
+
+    async def _retire(self, worker: Worker, reason: str):
+        """Route new requests elsewhere; the worker exits once it has answered what it holds
+
+        and its result streams are drained or expired.
+        """
+        if worker.retiring:
+            return
+        worker.retiring = True
+        self.metrics['recycles'] += 1
+        logger.info(f"Recycling worker {worker.pid}: {reason}")
+        if self.active is worker:
+            self.active = None
+            self._lost_active_at = time.monotonic()
+            await self._promote()
+        if self._idle(worker):
+            self._close_stdin(worker)
+        self._top_up()
+
+    async def _watch_workers(self):
+        while not self._stopping:
+            await asyncio.sleep(RSS_CHECK_INTERVAL)
+            for worker in list(self.workers):
+                if worker.retiring and self._idle(worker):
+                    self._close_stdin(worker)  # Its last result streams expired
+            if not self.max_rss_mb:
+                continue
+            for worker in list(self.workers):
+                rss = read_rss_mb(worker.pid)
+                if rss is not None and rss > self.max_rss_mb and not worker.retiring:
+                    await self._retire(worker, f"RSS {rss:.0f}MB > {self.max_rss_mb:.0f}MB")
+
+    # ------------------------------------------------------------------
+    # Client side
+    # ------------------------------------------------------------------
+
+    async def _write(self, line: bytes):
+        async with self._write_lock:
+            await self.transport.write_line(line)
+
+    async def _write_message(self, message: Dict[str, Any]):
+        await self._write(self.codec.dumps_bytes(message) + b'\n')
+
+    async def _active_worker(self) -> Worker:
+        async with self._active_changed:
+            await self._active_changed.wait_for(lambda: self.active is not None)
+            return self.active
+
+    async def route(self, line: bytes):
+        """Send one client message to the worker that should handle it"""
         try:
-            # Keep running and monitor the process
-            while True:
-                if self.process and self.process.poll() is not None:
-                    print(f"\n⚠️  MCP server exited with code {self.process.returncode}")
-                    print("🔄 Restarting in 2 seconds...")
-                    time.sleep(2)
-                    self.start_server()
-                time.sleep(1)
-        except KeyboardInterrupt:
-            signal_handler(None, None)
+            message = self.codec.loads(line)
+        except ValueError as e:
+            logger.error(f"Invalid JSON: {e}")
+            return
+        method = message.get('method') if isinstance(message, dict) else None
+        request_id = message.get('id') if isinstance(message, dict) else None
 
-if __name__ == "__main__":
+        if method == 'supervisor/metrics':
+            await self._write_message({"jsonrpc": "2.0", "id": request_id, "result": self.snapshot()})
+            return
+        if method == 'notifications/cancelled':
+            owner = self.owners.get(message.get('params', {}).get('requestId'))
+            if owner is not None:
+                await owner.send(line)
+            return
+
+        worker = self._stream_owner(message) or await self._active_worker()
+        for request_id in _message_ids(message):
+            worker.pending[request_id] = time.monotonic()
+            self.owners[request_id] = worker
+            worker.requests += 1
+            self.metrics['requests'] += 1
+        try:
+            await worker.send(line)
+        except (ConnectionError, RuntimeError):
+            pass  # Worker is dying; _on_exit answers its pending requests
+        if self.max_requests and worker.requests >= self.max_requests:
+            await self._retire(worker, f"{worker.requests} requests")
+
+    def _stream_owner(self, message: Any) -> Optional[Worker]:
+        """The worker holding the result stream a ``resources/read`` asks for"""
+        if not isinstance(message, dict) or message.get('method') != 'resources/read':
+            return None
+        stream_id = _stream_id((message.get('params') or {}).get('uri'))
+        worker = self.stream_owners.get(stream_id)
+        if worker is None or worker not in self.workers or worker.process.stdin.is_closing():
+            return None
+        if message.get('id') is not None:
+            worker.reads[message['id']] = stream_id
+        return worker
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            'pool_size': self.pool_size,
+            'active_pid': self.active.pid if self.active else None,
+            'active_requests': self.active.requests if self.active else 0,
+            'open_streams': len(self.stream_owners),
+            'standby': sum(1 for w in self.workers if w.ready.is_set() and not w.retiring and w is not self.active),
+            'failover': self.failover.snapshot(),
+            'warmup': self.warmup.snapshot(),
+        }
+
+    def _log_metrics(self):
+        logger.info(f"Supervisor metrics: {json.dumps(self.snapshot())}")
+
+    async def run(self):
+        """Serve stdin/stdout through the pool until the client closes stdin"""
+        if self.transport is None:
+            self.transport = await StdioTransport().open()
+        self._top_up()
+        rss_task = asyncio.create_task(self._watch_workers())
+
+        await self._active_worker()
+        await self._write_message({"jsonrpc": "2.0", "method": "ready"})
+
+        while True:
+            line = await self.transport.read_message()
+            if line is None:
+                break
+            if line.strip():
+                await self.route(line)
+
+        await self.shutdown()
+        rss_task.cancel()
+
+    async def shutdown(self):
+        """Let workers answer what they hold, then stop them"""
+        self._stopping = True
+        for worker in list(self.workers):
+            worker.retiring = True
+            if not worker.pending:
+                self._close_stdin(worker)
+        for worker in list(self.workers):
+            try:
+                await asyncio.wait_for(worker.process.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                worker.process.kill()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._log_metrics()
+
+
+async def main():
     manager = MCPServerManager()
-    manager.run()
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, main_task.cancel)
+    try:
+        await manager.run()
+    except asyncio.CancelledError:
+        await manager.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
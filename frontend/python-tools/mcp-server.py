@@ -8,10 +8,9 @@ import asyncio
 import json
 import sys
 import os
-import importlib
-import inspect
+import argparse
 import traceback
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 import logging
 from datetime import datetime
@@ -19,14 +18,19 @@ from datetime import datetime
 # Add python-tools to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('/tmp/mcp-server.log'), logging.StreamHandler()]
-)
+from mcp_base_server import MAX_CONCURRENT_REQUESTS, handle_batch, serve_stdio, shareable_in_batch
+from mcp_metrics import MetricsRegistry, ensure_metrics_endpoint
+from mcp_logging import Payload, configure_logging
+from mcp_streaming import ResultStore, build_tool_result, call_tool
+from mcp_deadline import DeadlineExceeded, run_with_deadline, tool_timeout
+from mcp_tool_manifest import LazyTool, format_profile, get_tool_manifest, profile_startup
+
+configure_logging()
 logger = logging.getLogger('mcp-server')
 
+# Import every tool at startup instead of on first call (set by the worker pool)
+PRELOAD_TOOLS = os.environ.get('MCP_PRELOAD_TOOLS') == '1'
+
 class MCPServer:
     """Stdio-based MCP server for Python tools"""
     
@@ -37,51 +41,44 @@ class MCPServer:
             "name": "espressobot-tools",
             "version": "1.0.0"
         }
+        self.metrics = MetricsRegistry(self.server_info["name"])
+        self.results = ResultStore()
         
     async def initialize(self):
         """Initialize server and discover tools"""
         logger.info("Initializing MCP server...")
         await self.discover_tools()
+        if PRELOAD_TOOLS:
+            self.preload_tools()
         # Skip automatic testing for performance during bulk operations
         # await self.test_all_tools()  # Uncomment for manual testing
         logger.info(f"MCP server ready with {len(self.tools)} tools")
         
     async def discover_tools(self):
-        """Discover and load all MCP tools"""
+        """Register all MCP tools from the cached manifest; modules are imported on first call"""
         tools_dir = Path(__file__).parent / "mcp_tools"
         if not tools_dir.exists():
             logger.warning(f"Tools directory not found: {tools_dir}")
             return
             
-        # Import all tool modules
-        for category_dir in tools_dir.iterdir():
-            if category_dir.is_dir() and not category_dir.name.startswith('_'):
-                for tool_file in category_dir.glob("*.py"):
-                    if tool_file.name.startswith('_'):
-                        continue
-                        
-                    module_name = f"mcp_tools.{category_dir.name}.{tool_file.stem}"
-                    try:
-                        module = importlib.import_module(module_name)
-                        
-                        # Find tool classes in module
-                        for name, obj in inspect.getmembers(module):
-                            if (inspect.isclass(obj) and 
-                                hasattr(obj, 'name') and 
-                                hasattr(obj, 'execute') and
-                                obj.__module__ == module.__name__):  # Avoid importing base class
-                                tool_instance = obj()
-                                self.tools[tool_instance.name] = tool_instance
-                                
-                                # Store tool context if available
-                                if hasattr(tool_instance, 'context'):
-                                    self.tool_contexts[tool_instance.name] = tool_instance.context
-                                    
-                                logger.info(f"Loaded tool: {tool_instance.name}")
-                                
-                    except Exception as e:
-                        logger.error(f"Failed to load {module_name}: {e}")
+        for entry in get_tool_manifest().all_tools():
+            tool = LazyTool(entry)
+            self.tools[tool.name] = tool
+            
+            # Store tool context if available
+            if 'context' in entry:
+                self.tool_contexts[tool.name] = entry['context']
+                
+        logger.info(f"Registered {len(self.tools)} tools from manifest")
                         
+    def preload_tools(self):
+        """Import every tool up front, for warm standby workers"""
+        for tool_name, tool in self.tools.items():
+            try:
+                tool.load()
+            except (Exception, SystemExit) as e:  # Some tools exit when env vars are missing
+                logger.error(f"Failed to preload {tool_name}: {e}")
+                
     async def test_all_tools(self):
         """Test all loaded tools"""
         logger.info("Testing all tools...")
@@ -106,8 +103,11 @@ class MCPServer:
         
         logger.info(f"Test summary: {passed} passed, {failed} failed, {skipped} skipped")
         
-    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle JSON-RPC request"""
+    async def handle_request(self, request: Union[Dict[str, Any], List[Any]]) -> Optional[Any]:
+        """Handle JSON-RPC request or batch"""
+        if isinstance(request, list):
+            return await handle_batch(self.handle_request, request,
+                                      lambda r: shareable_in_batch(self.tools, r), MAX_CONCURRENT_REQUESTS)
         method = request.get("method")
         params = request.get("params", {})
         request_id = request.get("id")
@@ -136,6 +136,8 @@ class MCPServer:
                         "description": getattr(tool, 'description', ''),
                         "inputSchema": getattr(tool, 'input_schema', {})
                     }
+                    if getattr(tool, 'read_only', False):
+                        tool_info["annotations"] = {"readOnlyHint": True}
                     # Include context in description if available
                     if name in self.tool_contexts:
                         tool_info["description"] += f"\n\nContext:\n{self.tool_contexts[name]}"
@@ -147,9 +149,17 @@ class MCPServer:
                     "result": {"tools": tools_list}
                 }
                 
-            elif method == "tools/call":
-                logger.info(f"tools/call params: {params}")
+            elif method == "resources/read":
+                uri = params.get("uri")
+                if not self.results.handles(uri):
+                    raise ValueError(f"Unknown resource: {uri}")
+                return {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": await self.results.read(uri)
+                }
                 
+            elif method == "tools/call":
                 # Handle nested structure from some MCP clients
                 if isinstance(params.get("name"), dict):
                     tool_name = params["name"]["name"]
@@ -162,29 +172,28 @@ class MCPServer:
                     raise ValueError(f"Unknown tool: {tool_name}")
                     
                 tool = self.tools[tool_name]
+                logger.debug("tools/call %s %s", tool_name, Payload(tool_args))
                 
                 try:
-                    result = await tool.execute(**tool_args)
-                    logger.info(f"Tool {tool_name} returned {len(result) if isinstance(result, list) else 'non-list'} results")
-                    
-                    # Format result according to MCP protocol specification
-                    # MCP expects result.content array with type/text items
-                    formatted_result = {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result)
-                            }
-                        ]
-                    }
+                    with self.metrics.track(tool_name) as call:
+                        formatted_result = await run_with_deadline(
+                            self._run_tool(tool_name, tool, tool_args, params, call),
+                            tool_timeout(tool, params), tool_name)
+                    logger.info("Tool %s returned %d bytes", tool_name, call.response_bytes)
                     
                     response = {
                         "jsonrpc": "2.0",
                         "id": request_id,
                         "result": formatted_result
                     }
-                    logger.info(f"Sending MCP-formatted response: {json.dumps(response)[:200]}...")
                     return response
+                except DeadlineExceeded as timeout_error:
+                    logger.warning(f"{timeout_error}")
+                    return {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "error": timeout_error.error()
+                    }
                 except Exception as tool_error:
                     # Log the error but don't crash the server
                     logger.error(f"Tool {tool_name} execution failed: {str(tool_error)}")
@@ -208,6 +217,13 @@ class MCPServer:
             else:
                 raise ValueError(f"Unknown method: {method}")
                 
+        except DeadlineExceeded as e:
+            logger.warning(f"{e}")
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": e.error()
+            }
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
@@ -220,42 +236,40 @@ class MCPServer:
                 }
             }
             
+    async def _run_tool(self, tool_name: str, tool, tool_args: Dict[str, Any],
+                        params: Dict[str, Any], call) -> Dict[str, Any]:
+        """Run a tool and format its result, noting size and outcome on ``call``"""
+        result = await call_tool(tool, tool_args)
+        # MCP expects result.content array with type/text items;
+        # results over the inline limit end with a resource_link to the rest
+        formatted_result, call.response_bytes = await build_tool_result(
+            tool_name, result, self.results,
+            progress_token=(params.get("_meta") or {}).get("progressToken"))
+        call.failed = isinstance(result, dict) and result.get("success") is False
+        return formatted_result
+        
     async def run(self):
         """Run the stdio server"""
         logger.info("Starting stdio server...")
         
         # Initialize server
         await self.initialize()
+        await ensure_metrics_endpoint()
         
-        # Send ready signal
-        ready_msg = {"jsonrpc": "2.0", "method": "ready"}
-        sys.stdout.write(json.dumps(ready_msg) + "\n")
-        sys.stdout.flush()
+        await serve_stdio(self.handle_request, MAX_CONCURRENT_REQUESTS)
         
-        # Read requests from stdin
-        while True:
-            try:
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
-                if not line:
-                    break
-                    
-                request = json.loads(line.strip())
-                response = await self.handle_request(request)
-                
-                # Only send response if it's not None (notifications don't need responses)
-                if response is not None:
-                    sys.stdout.write(json.dumps(response) + "\n")
-                    sys.stdout.flush()
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON: {e}")
-            except Exception as e:
-                logger.error(f"Server error: {e}")
-                
         logger.info("Server shutting down")
         
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EspressoBot Python tools MCP server")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report per-module import times against the startup budget and exit")
+    args = parser.parse_args()
+    
+    if args.profile_startup:
+        report = profile_startup()
+        print(format_profile(report))
+        sys.exit(0 if report["within_budget"] else 1)
+        
     server = MCPServer()
     asyncio.run(server.run())
\ No newline at end of file
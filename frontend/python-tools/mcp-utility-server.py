@@ -16,9 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from mcp_base_server import EnhancedMCPServer, MCPResource, MCPPrompt
 
-# Import only the utility tools
-from mcp_tools.memory.operations import MemoryOperationsTool
-
 # Scratchpad functionality
 from mcp_scratchpad_tool import SCRATCHPAD_TOOLS
 
@@ -35,7 +32,7 @@ class UtilityMCPServer(EnhancedMCPServer):
     def _load_tools(self):
         """Load only utility tools"""
         # Add the utility tool
-        self.add_tool(MemoryOperationsTool())
+        self.add_lazy_tool("mcp_tools.memory.operations", "MemoryOperationsTool")
         
         
         # Add scratchpad tools
@@ -10,18 +10,237 @@ import sys
 import os
 import logging
 import traceback
-from typing import Dict, List, Any, Optional, Callable
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Callable, Union
 from pathlib import Path
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('/tmp/mcp-server.log'), logging.StreamHandler()]
-)
+from shopify_throttle import get_throttle
+from mcp_transport import StdioTransport, get_codec
+from mcp_tool_manifest import LazyTool, get_tool_manifest
+from mcp_metrics import MetricsRegistry, ensure_metrics_endpoint
+from mcp_logging import Payload, configure_logging
+from mcp_streaming import ResultStore, build_tool_result, call_tool, current_notifier
+from mcp_deadline import DeadlineExceeded, run_with_deadline, tool_timeout
+
+configure_logging()
 logger = logging.getLogger('mcp-base-server')
 
+# Requests handled at once per server; the rest wait their turn
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('MCP_MAX_CONCURRENT_REQUESTS', '8'))
+
+# Set while a dispatcher runs a request, so batches can run their members under it
+current_dispatcher: ContextVar[Optional['RequestDispatcher']] = ContextVar('mcp_dispatcher', default=None)
+
+
+class RequestDispatcher:
+    """Runs each JSON-RPC request as its own task and writes replies as they finish
+    
+    The reader never blocks on a slow tool, so later requests (and
+    ``notifications/cancelled`` for the slow one) are seen immediately.
+    At most ``max_concurrency`` handlers run at once; responses go out in
+    completion order, one whole line at a time under the writer lock.
+    """
+    
+    def __init__(self, handler: Callable, max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+                 send: Optional[Callable] = None):
+        self.handler = handler
+        self.send = send
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._write_lock = asyncio.Lock()
+        self.in_flight: Dict[Any, asyncio.Task] = {}
+        self._tasks = set()
+        
+    async def write(self, message: Dict[str, Any]):
+        """Write one message line to stdout"""
+        async with self._write_lock:
+            if self.send is not None:
+                await self.send(message)
+            else:
+                sys.stdout.write(get_codec().dumps(message) + "\n")
+                sys.stdout.flush()
+            
+    def dispatch(self, request: Union[Dict[str, Any], List[Any]]):
+        """Start handling a decoded request or batch
+        
+        A batch is answered with one line, but each of its requests runs as
+        its own task under the shared concurrency limit (see
+        ``handle_batch``), so cancelling one leaves the others running.
+        """
+        if isinstance(request, dict) and request.get("method") == "notifications/cancelled":
+            self.cancel(request.get("params", {}).get("requestId"))
+            return
+        task = asyncio.create_task(self._handle(request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if isinstance(request, dict) and request.get("id") is not None:
+            self.track(request["id"], task)
+            
+    def track(self, request_id: Any, task: asyncio.Task):
+        """Make ``task`` the one ``notifications/cancelled`` for ``request_id`` cancels"""
+        self.in_flight[request_id] = task
+        
+        def forget(_):
+            if self.in_flight.get(request_id) is task:
+                del self.in_flight[request_id]
+        task.add_done_callback(forget)
+            
+    def cancel(self, request_id: Any) -> bool:
+        """Cancel an in-flight request; its response is never sent"""
+        task = self.in_flight.get(request_id)
+        if task is None or task.done():
+            return False
+        logger.info(f"Cancelling request {request_id}")
+        task.cancel()
+        return True
+        
+    async def _handle(self, request: Union[Dict[str, Any], List[Any]]):
+        current_notifier.set(self.write)
+        current_dispatcher.set(self)
+        try:
+            if isinstance(request, list):
+                # Members take their own slots
+                response = await self.handler(request)
+            else:
+                async with self._slots:
+                    response = await self.handler(request)
+            if response is not None:
+                await self.write(response)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Server error: {e}")
+            
+    async def drain(self):
+        """Wait for every in-flight request to finish"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def serve_transport(handler: Callable, transport, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+    """Read JSON-RPC lines from a transport and dispatch them concurrently until EOF"""
+    dispatcher = RequestDispatcher(handler, max_concurrency, transport.write_message)
+    codec = get_codec()
+    
+    # Send ready signal
+    await dispatcher.write({"jsonrpc": "2.0", "method": "ready"})
+    
+    # Read requests
+    while True:
+        try:
+            line = await transport.read_message()
+            if line is None:
+                break
+            if not line.strip():
+                continue
+                
+            dispatcher.dispatch(codec.loads(line))
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON: {e}")
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.error(f"Connection lost: {e}")
+            break
+        except Exception as e:
+            logger.error(f"Server error: {e}")
+            
+    # Finish what was already accepted before exiting
+    await dispatcher.drain()
+    transport.close()
+
+
+async def serve_stdio(handler: Callable, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+    """Serve JSON-RPC over stdin/stdout"""
+    transport = await StdioTransport().open()
+    await serve_transport(handler, transport, max_concurrency)
+
+
+# Methods whose identical calls in one batch can share a single answer
+SHAREABLE_METHODS = {"tools/list", "resources/list", "prompts/list"}
+
+
+def shareable_in_batch(tools: Dict[str, Any], request: Dict[str, Any]) -> bool:
+    """Whether identical copies of ``request`` in a batch may share one answer"""
+    method = request.get("method")
+    if method in SHAREABLE_METHODS:
+        return True
+    if method != "tools/call":
+        return False
+    name = (request.get("params") or {}).get("name")
+    if isinstance(name, dict):
+        name = name.get("name")
+    return isinstance(name, str) and bool(getattr(tools.get(name), "read_only", False))
+
+
+def _invalid_request(message: str, request_id: Any = None) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32600, "message": f"Invalid Request: {message}"}}
+
+
+async def handle_batch(handler: Callable, batch: List[Any], shareable: Callable[[Dict[str, Any]], bool],
+                       max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> Optional[Any]:
+    """Answer a JSON-RPC batch: run its requests concurrently, return one array
+    
+    Requests for which ``shareable(request)`` is true and whose method and
+    params (minus ``_meta``) match an earlier one in the batch are run once;
+    each gets the shared answer under its own id. Notifications get no entry,
+    so a batch of only notifications returns None.
+    
+    Under a ``RequestDispatcher`` every member is its own cancellable task
+    and takes a slot of the dispatcher's limit; a cancelled member gets no
+    entry. Otherwise the batch is limited to ``max_concurrency`` on its own.
+    """
+    if not batch:
+        return _invalid_request("empty batch")
+    dispatcher = current_dispatcher.get()
+    slots = dispatcher._slots if dispatcher is not None else asyncio.Semaphore(max(1, max_concurrency))
+    shared: Dict[str, asyncio.Task] = {}
+    reused = 0
+    
+    async def run(request: Dict[str, Any]):
+        async with slots:
+            return await handler(request)
+    
+    async def answer(request: Any):
+        nonlocal reused
+        if not isinstance(request, dict):
+            return _invalid_request("batch entries must be objects")
+        if not shareable(request):
+            return await run(request)
+        params = {k: v for k, v in (request.get("params") or {}).items() if k != "_meta"}
+        key = f"{request.get('method')}:{json.dumps(params, sort_keys=True, default=str)}"
+        if key in shared:
+            reused += 1
+        else:
+            shared[key] = asyncio.create_task(run(request))
+        # Cancelling one member must not cancel the run the others share
+        response = await asyncio.shield(shared[key])
+        if response is None or request.get("id") is None:
+            return None
+        return {**response, "id": request["id"]}
+    
+    def start(request: Any) -> asyncio.Task:
+        task = asyncio.create_task(answer(request))
+        if dispatcher is not None and isinstance(request, dict) and request.get("id") is not None:
+            dispatcher.track(request["id"], task)
+        return task
+    
+    outcomes = await asyncio.gather(*(start(request) for request in batch), return_exceptions=True)
+    responses = []
+    for request, outcome in zip(batch, outcomes):
+        if isinstance(outcome, asyncio.CancelledError) or outcome is None:
+            continue
+        if isinstance(outcome, BaseException):
+            logger.error(f"Batch member failed: {outcome}")
+            if request.get("id") is None:
+                continue
+            outcome = {"jsonrpc": "2.0", "id": request.get("id"),
+                       "error": {"code": -32603, "message": str(outcome)}}
+        responses.append(outcome)
+    if reused:
+        logger.info(f"Batch of {len(batch)}: {reused} identical calls answered from another")
+    return responses or None
+
 
 class MCPResource:
     """Resource definition for MCP server"""
@@ -44,7 +263,7 @@ class MCPResource:
             return {
                 "uri": self.uri,
                 "mimeType": self.mime_type,
-                "text": content if isinstance(content, str) else json.dumps(content)
+                "text": content if isinstance(content, str) else get_codec().dumps(content)
             }
         return None
 
@@ -75,20 +294,56 @@ class MCPPrompt:
 class EnhancedMCPServer:
     """Enhanced MCP server with resources and prompts support"""
     
-    def __init__(self, name: str, version: str = "1.0.0"):
+    def __init__(self, name: str, version: str = "1.0.0", max_concurrency: int = MAX_CONCURRENT_REQUESTS):
         self.tools = {}
+        self.max_concurrency = max_concurrency
         self.resources = {}
         self.prompts = {}
         self.server_info = {
             "name": name,
             "version": version
         }
+        self.metrics = MetricsRegistry(name)
+        self.results = ResultStore()
+        self._setup_builtin_resources()
+        
+    def _setup_builtin_resources(self):
+        """Register resources every server exposes"""
+        throttle_resource = MCPResource(
+            name="shopify_throttle",
+            uri="shopify://throttle",
+            description="Shopify GraphQL cost bucket level and throttle counters for this process",
+            mime_type="application/json"
+        )
+        
+        @throttle_resource.getter
+        def get_throttle_status():
+            return get_throttle().snapshot()
+        
+        self.add_resource(throttle_resource)
+        
+        metrics_resource = MCPResource(
+            name="tool_metrics",
+            uri="metrics://tools",
+            description="Per-tool call counts, latency percentiles, errors, response sizes and Shopify cost",
+            mime_type="application/json"
+        )
+        
+        @metrics_resource.getter
+        def get_tool_metrics():
+            return self.metrics.snapshot()
+        
+        self.add_resource(metrics_resource)
         
     def add_tool(self, tool):
         """Add a tool to the server"""
         self.tools[tool.name] = tool
         logger.info(f"Added tool: {tool.name}")
         
+    def add_lazy_tool(self, module: str, class_name: str):
+        """Add a tool from the manifest; its module is imported on the first call"""
+        self.add_tool(LazyTool(get_tool_manifest().entry(module, class_name)))
+        
     def add_resource(self, resource: MCPResource):
         """Add a resource to the server"""
         self.resources[resource.uri] = resource
@@ -99,8 +354,11 @@ class EnhancedMCPServer:
         self.prompts[prompt.name] = prompt
         logger.info(f"Added prompt: {prompt.name}")
         
-    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle JSON-RPC request with resources and prompts support"""
+    async def handle_request(self, request: Union[Dict[str, Any], List[Any]]) -> Optional[Any]:
+        """Handle JSON-RPC request (or batch) with resources and prompts support"""
+        if isinstance(request, list):
+            return await handle_batch(self.handle_request, request,
+                                      lambda r: shareable_in_batch(self.tools, r), self.max_concurrency)
         method = request.get("method")
         params = request.get("params", {})
         request_id = request.get("id")
@@ -124,11 +382,14 @@ class EnhancedMCPServer:
             elif method == "tools/list":
                 tools_list = []
                 for name, tool in self.tools.items():
-                    tools_list.append({
+                    tool_info = {
                         "name": name,
                         "description": getattr(tool, 'description', ''),
                         "inputSchema": getattr(tool, 'input_schema', {})
-                    })
+                    }
+                    if getattr(tool, 'read_only', False):
+                        tool_info["annotations"] = {"readOnlyHint": True}
+                    tools_list.append(tool_info)
                     
                 return {
                     "jsonrpc": "2.0",
@@ -154,6 +415,12 @@ class EnhancedMCPServer:
                 
             elif method == "resources/read":
                 uri = params.get("uri")
+                if self.results.handles(uri):
+                    return {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "result": await self.results.read(uri)
+                    }
                 if uri not in self.resources:
                     raise ValueError(f"Unknown resource: {uri}")
                     
@@ -210,17 +477,11 @@ class EnhancedMCPServer:
                     raise ValueError(f"Unknown tool: {tool_name}")
                     
                 tool = self.tools[tool_name]
-                result = await tool.execute(**tool_args)
-                
-                # Format result according to MCP protocol
-                formatted_result = {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(result)
-                        }
-                    ]
-                }
+                logger.debug("tools/call %s %s", tool_name, Payload(tool_args))
+                with self.metrics.track(tool_name) as call:
+                    formatted_result = await run_with_deadline(
+                        self._run_tool(tool_name, tool, tool_args, params, call),
+                        tool_timeout(tool, params), tool_name)
                 
                 return {
                     "jsonrpc": "2.0",
@@ -234,12 +495,19 @@ class EnhancedMCPServer:
                 return None  # Notifications don't need responses
                 
             elif method == "notifications/cancelled":
-                # Client cancelled a request, just acknowledge silently
+                # Cancellation is handled by the dispatcher, which owns the tasks
                 return None  # Notifications don't need responses
                 
             else:
                 raise ValueError(f"Unknown method: {method}")
                 
+        except DeadlineExceeded as e:
+            logger.warning(f"{e}")
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": e.error()
+            }
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
@@ -252,38 +520,24 @@ class EnhancedMCPServer:
                 }
             }
             
+    async def _run_tool(self, tool_name: str, tool, tool_args: Dict[str, Any],
+                        params: Dict[str, Any], call) -> Dict[str, Any]:
+        """Run a tool and format its result, noting size and outcome on ``call``"""
+        result = await call_tool(tool, tool_args)
+        # Format result according to MCP protocol; large results are paged
+        formatted_result, call.response_bytes = await build_tool_result(
+            tool_name, result, self.results,
+            progress_token=(params.get("_meta") or {}).get("progressToken"))
+        call.failed = isinstance(result, dict) and result.get("success") is False
+        return formatted_result
+        
     async def run(self):
         """Run the stdio server"""
         logger.info(f"Starting {self.server_info['name']} MCP server...")
-        
-        # Send ready signal
-        ready_msg = {"jsonrpc": "2.0", "method": "ready"}
-        sys.stdout.write(json.dumps(ready_msg) + "\n")
-        sys.stdout.flush()
-        
-        # Read requests from stdin
-        while True:
-            try:
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
-                if not line:
-                    break
-                    
-                request = json.loads(line.strip())
-                response = await self.handle_request(request)
-                
-                # Only send response if it's not None (notifications don't need responses)
-                if response is not None:
-                    sys.stdout.write(json.dumps(response) + "\n")
-                    sys.stdout.flush()
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON: {e}")
-            except Exception as e:
-                logger.error(f"Server error: {e}")
-                
+        await ensure_metrics_endpoint()
+        await serve_stdio(self.handle_request, self.max_concurrency)
         logger.info("Server shutting down")
+        
     def add_tool_from_def(self, tool_def):
         """Add a tool from a tool definition dictionary"""
         class DynamicTool:
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Deadlines and cooperative cancellation for tool calls
+
+Every ``tools/call`` runs under a deadline: the tool's ``timeout`` (declared
+on ``BaseMCPTool``, ``MCP_TOOL_TIMEOUT_SECONDS`` unless a tool overrides it),
+shortened by the client's ``_meta.timeoutMs`` when the request carries one.
+The deadline sits in a context variable, so code anywhere below the tool can
+ask how long it has left:
+
+- ``http_timeout(default)`` caps a ``requests`` timeout at the time left, so
+  a hung upstream can't hold a worker thread past the call;
+- ``check_deadline()`` lets a multi-step tool stop cleanly between steps;
+- ``record_progress(**fields)`` keeps what a multi-step tool has done so far.
+  When the call times out, the error's ``data.partial`` carries it, so the
+  client knows which products were already changed.
+
+Context variables don't follow work into a thread pool: read
+``http_timeout`` on the calling side and pass the value in.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from mcp_logging import Payload
+
+logger = logging.getLogger('mcp-deadline')
+
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get('MCP_TOOL_TIMEOUT_SECONDS', '120'))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('MCP_HTTP_CONNECT_TIMEOUT', '10'))
+
+# JSON-RPC error code for a request that ran out of time
+TIMEOUT_ERROR_CODE = -32001
+
+_deadline: ContextVar[Optional[float]] = ContextVar('mcp_deadline', default=None)
+_progress: ContextVar[Optional[Dict[str, Any]]] = ContextVar('mcp_progress', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A tool call, or a step of it, ran past its deadline"""
+
+    def __init__(self, message: str, partial: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.partial = partial or {}
+
+    def error(self) -> Dict[str, Any]:
+        """JSON-RPC error object"""
+        error = {"code": TIMEOUT_ERROR_CODE, "message": str(self)}
+        if self.partial:
+            error["data"] = {"partial": self.partial}
+        return error
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(step: str = ""):
+    """Raise ``DeadlineExceeded`` if the current deadline has passed"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded{' before ' + step if step else ''}", progress())
+
+
+def http_timeout(default: float) -> Tuple[float, float]:
+    """``(connect, read)`` timeout for ``requests``: ``default``, capped by the deadline"""
+    left = remaining()
+    if left is not None:
+        if left <= 0:
+            raise DeadlineExceeded("Deadline exceeded before HTTP request", progress())
+        default = min(default, left)
+    return min(HTTP_CONNECT_TIMEOUT, default), default
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run the block under a deadline ``seconds`` from now (never extends an outer one)"""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def cleanup_scope(seconds: float):
+    """Run the block under a fresh ``seconds`` deadline, replacing an expired one
+
+    For undoing work after a call timed out or was cancelled, when the
+    call's own deadline would refuse the request that does the undoing.
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def record_progress(**fields):
+    """Note what the current call has done so far; reported if it times out"""
+    progress = _progress.get()
+    if progress is not None:
+        progress.update(fields)
+
+
+def progress() -> Dict[str, Any]:
+    """Progress recorded by the current call"""
+    return dict(_progress.get() or {})
+
+
+def tool_timeout(tool, params: Dict[str, Any]) -> float:
+    """The tool's declared timeout, shortened by the request's ``_meta.timeoutMs``"""
+    seconds = getattr(tool, 'timeout', None) or DEFAULT_TIMEOUT_SECONDS
+    client_ms = (params.get('_meta') or {}).get('timeoutMs')
+    if isinstance(client_ms, (int, float)) and client_ms > 0:
+        seconds = min(seconds, client_ms / 1000)
+    return seconds
+
+
+async def run_with_deadline(awaitable: Awaitable, seconds: float, name: str) -> Any:
+    """Await ``awaitable`` under a deadline, collecting its progress
+
+    Timing out cancels it and raises ``DeadlineExceeded`` with the progress it
+    recorded; a cancellation from the client is logged with it and re-raised.
+    """
+    recorded: Dict[str, Any] = {}
+    token = _progress.set(recorded)
+    try:
+        with deadline_scope(seconds):
+            return await asyncio.wait_for(awaitable, seconds)
+    except DeadlineExceeded as e:
+        raise DeadlineExceeded(f"{name} timed out after {seconds:g}s: {e}", e.partial or dict(recorded))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"{name} timed out after {seconds:g}s", dict(recorded))
+    except asyncio.CancelledError:
+        if recorded:
+            logger.warning("%s cancelled; progress so far: %s", name, Payload(recorded))
+        raise
+    finally:
+        _progress.reset(token)
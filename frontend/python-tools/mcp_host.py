@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Multiplexed host for the specialized MCP servers
+
+One process loads every ``mcp-*-server.py`` server and serves each on its
+own channel: a Unix socket per namespace (``products.sock``,
+``pricing.sock``...) in ``MCP_HOST_SOCKET_DIR``, plus optionally one
+namespace on this process's stdin/stdout. The socket directory defaults to
+``$XDG_RUNTIME_DIR/espressobot-mcp`` (or a per-user directory under the
+temp dir), is created mode 0700, and the host refuses to start in one that
+another user owns or can open. Every connection gets its own
+request dispatcher, but all of them share one interpreter, so the Shopify
+HTTP session, the GraphQL cost throttle, the tool manifest and any loaded
+tool (with its caches) exist once instead of once per server.
+
+Each namespace keeps its server's own tool list, resources and prompts.
+
+Clients that can only spawn a stdio command use ``mcp-host-connect.py
+<namespace>``, which starts the host when it isn't running yet. The host
+exits after ``MCP_HOST_IDLE_SECONDS`` with no connections (0 to never).
+
+Usage: python mcp_host.py [--stdio NAMESPACE] [--only products,pricing]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import logging
+import os
+import signal
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_base_server import EnhancedMCPServer, serve_stdio, serve_transport
+from mcp_metrics import ensure_metrics_endpoint
+from mcp_transport import MAX_MESSAGE_BYTES, StreamTransport
+
+logger = logging.getLogger('mcp-host')
+
+SERVERS_DIR = Path(__file__).parent
+
+
+def default_socket_dir() -> Path:
+    """Per-user socket directory: under $XDG_RUNTIME_DIR, else the temp dir plus our uid"""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return Path(runtime) / 'espressobot-mcp'
+    return Path(tempfile.gettempdir()) / f'espressobot-mcp-{os.getuid()}'
+
+
+SOCKET_DIR = Path(os.environ.get('MCP_HOST_SOCKET_DIR') or default_socket_dir())
+IDLE_SECONDS = float(os.environ.get('MCP_HOST_IDLE_SECONDS', '600'))
+
+
+def server_files(directory: Path = SERVERS_DIR) -> Dict[str, Path]:
+    """Namespace -> server script, e.g. 'product-management' -> mcp-product-management-server.py"""
+    return {
+        path.name[len('mcp-'):-len('-server.py')]: path
+        for path in sorted(directory.glob('mcp-*-server.py'))
+    }
+
+
+def load_server(path: Path) -> EnhancedMCPServer:
+    """Import a server script and instantiate the server class it defines"""
+    module_name = path.stem.replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for _, obj in inspect.getmembers(module, inspect.isclass):
+        if issubclass(obj, EnhancedMCPServer) and obj.__module__ == module_name:
+            return obj()
+    raise ValueError(f"{path.name} defines no EnhancedMCPServer subclass")
+
+
+def load_servers(namespaces: Optional[Iterable[str]] = None,
+                 directory: Path = SERVERS_DIR) -> Dict[str, EnhancedMCPServer]:
+    """Instantiate the requested servers (all by default); failures are logged and skipped"""
+    files = server_files(directory)
+    servers = {}
+    for namespace in namespaces or files:
+        if namespace not in files:
+            logger.error(f"No server for namespace {namespace!r}")
+            continue
+        try:
+            servers[namespace] = load_server(files[namespace])
+        except Exception as e:
+            logger.error(f"Failed to load {namespace} server: {e}")
+    return servers
+
+
+class MCPHost:
+    """Serves several MCP servers from one process, one socket per namespace"""
+
+    def __init__(self, servers: Dict[str, EnhancedMCPServer], socket_dir: Path = SOCKET_DIR,
+                 idle_seconds: float = IDLE_SECONDS):
+        self.servers = servers
+        self.socket_dir = Path(socket_dir)
+        self.idle_seconds = idle_seconds
+        self.connections: Dict[str, int] = {namespace: 0 for namespace in servers}
+        self._listeners = []
+        self._lock_file = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._last_active = time.monotonic()
+
+    def socket_path(self, namespace: str) -> Path:
+        return self.socket_dir / f"{namespace}.sock"
+
+    def _prepare_socket_dir(self):
+        """Create the socket directory private to us, or refuse one that isn't"""
+        self.socket_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = self.socket_dir.lstat()
+        if not stat.S_ISDIR(info.st_mode):
+            raise RuntimeError(f"{self.socket_dir} is not a directory")
+        if info.st_uid != os.getuid():
+            raise RuntimeError(f"{self.socket_dir} is owned by uid {info.st_uid}, not {os.getuid()}")
+        if info.st_mode & 0o077:
+            raise RuntimeError(f"{self.socket_dir} has mode {stat.S_IMODE(info.st_mode):o}; "
+                               f"it must be 700 so other users can't reach the sockets")
+
+    def _acquire_lock(self):
+        self._prepare_socket_dir()
+        self._lock_file = open(self.socket_dir / 'host.lock', 'w')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                self._lock_file = None
+                raise RuntimeError(f"Another MCP host is serving {self.socket_dir}")
+
+    async def start(self):
+        """Listen on a socket per namespace"""
+        self._stopped = asyncio.Event()
+        self._acquire_lock()
+        for namespace in self.servers:
+            path = self.socket_path(namespace)
+            if path.exists():
+                path.unlink()  # Left over from a host that died; we hold the lock now
+            listener = await asyncio.start_unix_server(
+                lambda reader, writer, namespace=namespace: self._serve_connection(namespace, reader, writer),
+                path=str(path), limit=MAX_MESSAGE_BYTES,
+            )
+            self._listeners.append(listener)
+        logger.info(f"MCP host serving {', '.join(self.servers)} in {self.socket_dir}")
+
+    async def _serve_connection(self, namespace: str, reader, writer):
+        server = self.servers[namespace]
+        self.connections[namespace] += 1
+        try:
+            await serve_transport(server.handle_request, StreamTransport(reader, writer), server.max_concurrency)
+        finally:
+            self.connections[namespace] -= 1
+            self._last_active = time.monotonic()
+
+    async def serve_stdio(self, namespace: str):
+        """Serve one namespace on stdin/stdout; the host stops when stdin closes"""
+        server = self.servers[namespace]
+        self.connections[namespace] += 1
+        try:
+            await serve_stdio(server.handle_request, server.max_concurrency)
+        finally:
+            self.connections[namespace] -= 1
+            self.stop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'socket_dir': str(self.socket_dir),
+            'connections': dict(self.connections),
+            'tools': {namespace: len(server.tools) for namespace, server in self.servers.items()},
+        }
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve_forever(self):
+        """Run until stopped, or idle for ``idle_seconds``"""
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=max(1.0, min(self.idle_seconds or 60, 60)))
+            except asyncio.TimeoutError:
+                pass
+            if (self.idle_seconds and not any(self.connections.values()) and
+                    time.monotonic() - self._last_active > self.idle_seconds):
+                logger.info("MCP host idle, shutting down")
+                break
+        await self.close()
+
+    async def close(self):
+        for listener in self._listeners:
+            listener.close()
+            await listener.wait_closed()
+        self._listeners = []
+        for namespace in self.servers:
+            try:
+                self.socket_path(namespace).unlink()
+            except FileNotFoundError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Serve every specialized MCP server from one process")
+    parser.add_argument('--stdio', metavar='NAMESPACE', help="also serve this namespace on stdin/stdout")
+    parser.add_argument('--only', help="comma-separated namespaces to load (default: all)")
+    parser.add_argument('--socket-dir', default=str(SOCKET_DIR))
+    args = parser.parse_args()
+
+    namespaces = args.only.split(',') if args.only else None
+    if args.stdio and namespaces and args.stdio not in namespaces:
+        namespaces.append(args.stdio)
+    host = MCPHost(load_servers(namespaces), Path(args.socket_dir))
+    await host.start()
+    await ensure_metrics_endpoint()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, host.stop)
+    if args.stdio:
+        asyncio.create_task(host.serve_stdio(args.stdio))
+    await host.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the MCP servers
+
+``configure_logging()`` replaces the per-server ``basicConfig`` calls. The
+root logger gets a single ``QueueHandler``; the file and stderr handlers run
+on a ``QueueListener`` thread, so a log call on the event loop only enqueues
+the record. Interpolating the message and formatting it (text, or one JSON
+object per line with ``MCP_LOG_FORMAT=json``) happen on that thread.
+
+Arguments are frozen before they're queued so the listener never touches
+objects the loop may still be mutating. Containers are rendered through
+``Payload``, which walks them only until ``MCP_LOG_MAX_CHARS`` characters
+are produced and then notes what was left out - a 5 MB GraphQL result costs
+the same to log as a 5 KB one. Log payloads with
+``logger.debug("result: %s", Payload(result))`` rather than ``json.dumps``.
+
+``MCP_LOG_SAMPLE`` keeps a fraction of the DEBUG/INFO records of chatty
+loggers, e.g. ``mcp-server=0.1,mcp_tools.products=0.25``. Warnings and
+errors are always kept.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+LOG_FILE = os.environ.get('MCP_LOG_FILE', '/tmp/mcp-server.log')
+LOG_LEVEL = os.environ.get('MCP_LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('MCP_LOG_FORMAT', 'text')
+# Characters a single logged payload may render to
+MAX_PAYLOAD_CHARS = int(os.environ.get('MCP_LOG_MAX_CHARS', '2000'))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+# ---------------------------------------------------------------------------
+# Bounded payload rendering
+# ---------------------------------------------------------------------------
+
+class _Full(Exception):
+    pass
+
+
+def _describe(obj: Any) -> str:
+    """Type and size of ``obj`` without rendering it"""
+    if isinstance(obj, dict):
+        return f"dict, {len(obj)} keys"
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return f"{type(obj).__name__}, {len(obj)} items"
+    if isinstance(obj, (str, bytes, bytearray)):
+        return f"{type(obj).__name__}, {len(obj)} chars" if isinstance(obj, str) else f"{len(obj)} bytes"
+    return type(obj).__name__
+
+
+def truncate(obj: Any, limit: int = MAX_PAYLOAD_CHARS) -> str:
+    """JSON-like rendering of ``obj`` cut off after ``limit`` characters
+
+    Work is proportional to ``limit``, not to the size of ``obj``: strings are
+    sliced before they're copied, bytes are only measured, and containers are
+    walked item by item until the budget runs out.
+    """
+    parts = []
+    budget = [limit]
+
+    def emit(text: str):
+        if len(text) >= budget[0]:
+            parts.append(text[:budget[0]])
+            budget[0] = 0
+            raise _Full
+        parts.append(text)
+        budget[0] -= len(text)
+
+    def walk(value: Any, depth: int):
+        if isinstance(value, str):
+            emit(json.dumps(value[:budget[0] + 1]))
+        elif isinstance(value, (bytes, bytearray)):
+            emit(f"<{len(value)} bytes>")
+        elif value is None or isinstance(value, (bool, int, float)):
+            emit(json.dumps(value))
+        elif isinstance(value, dict):
+            if depth > 8:
+                return emit(f"<{_describe(value)}>")
+            emit('{')
+            for i, (key, item) in enumerate(value.items()):
+                emit(', ' if i else '')
+                emit(json.dumps(str(key)[:budget[0] + 1]) + ': ')
+                walk(item, depth + 1)
+            emit('}')
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            if depth > 8:
+                return emit(f"<{_describe(value)}>")
+            emit('[')
+            for i, item in enumerate(value):
+                emit(', ' if i else '')
+                walk(item, depth + 1)
+            emit(']')
+        else:
+            text = repr(value)
+            emit(text[:budget[0] + 1])
+
+    try:
+        walk(obj, 0)
+    except _Full:
+        return ''.join(parts) + f"... [truncated: {_describe(obj)}]"
+    except RuntimeError:
+        # Changed size while we walked it
+        return ''.join(parts) + f"... [changed while logging: {_describe(obj)}]"
+    return ''.join(parts)
+
+
+class Payload:
+    """Log argument rendered with ``truncate`` only if the record is emitted"""
+
+    __slots__ = ('obj', 'limit')
+
+    def __init__(self, obj: Any, limit: int = MAX_PAYLOAD_CHARS):
+        self.obj = obj
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return truncate(self.obj, self.limit)
+
+    __repr__ = __str__
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'mcp-server=0.1,mcp_tools=0.5' -> {'mcp-server': 0.1, 'mcp_tools': 0.5}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rate = item.partition('=')
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the sub-WARNING records of the configured loggers
+
+    The most specific configured name wins: with ``mcp_tools=0.5`` and
+    ``mcp_tools.products.search=0`` the search tool is silent below WARNING
+    while other tools keep half their records.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, rng: Optional[random.Random] = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.rng = rng or random.Random()
+        self._resolved: Dict[str, float] = {}
+
+    def set_rate(self, name: str, rate: float):
+        self.rates[name] = rate
+        self._resolved.clear()
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition('.')[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or self.rng.random() < rate
+
+
+# ---------------------------------------------------------------------------
+# Handlers and formatters
+# ---------------------------------------------------------------------------
+
+def _freeze(arg: Any) -> Any:
+    if arg is None or isinstance(arg, (str, int, float, bool)):
+        return arg
+    if isinstance(arg, Payload):
+        return str(arg)
+    if isinstance(arg, (dict, list, tuple, set, frozenset, bytes, bytearray)):
+        return truncate(arg)
+    text = str(arg)
+    return text if len(text) <= MAX_PAYLOAD_CHARS else text[:MAX_PAYLOAD_CHARS] + '... [truncated]'
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock handler formats every record before queueing it. This one only
+    freezes the arguments (bounded, see ``truncate``) and captures exception
+    text, so message interpolation and the formatter run off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        if isinstance(record.args, dict):
+            record.args = {key: _freeze(value) for key, value in record.args.items()}
+        elif record.args:
+            record.args = tuple(_freeze(arg) for arg in record.args)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields become top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = _freeze(value)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
+
+
+def configure_logging(level: str = LOG_LEVEL, log_file: Optional[str] = LOG_FILE,
+                      log_format: str = LOG_FORMAT, stream=None,
+                      sample: Optional[str] = None) -> DeferredQueueHandler:
+    """Route the root logger through a queue to file/stderr handlers; idempotent"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    formatter = JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(stream or sys.stderr)]
+    if log_file:
+        try:
+            handlers.append(logging.FileHandler(log_file))
+        except OSError:
+            pass
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    rates = parse_sample_rates(os.environ.get('MCP_LOG_SAMPLE', '') if sample is None else sample)
+    _queue_handler.addFilter(SamplingFilter(rates))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    return _queue_handler
+
+
+def get_sampler() -> Optional[SamplingFilter]:
+    """The installed sampling filter, to adjust rates at runtime"""
+    if _queue_handler is None:
+        return None
+    return next((f for f in _queue_handler.filters if isinstance(f, SamplingFilter)), None)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Per-tool metrics for the MCP servers
+
+Each server owns a ``MetricsRegistry`` that records, per tool: calls,
+errors (raised), failures (``success: false`` results), cancellations, an
+HDR-style latency histogram, response bytes and the Shopify query cost the
+call consumed (attributed through ``shopify_throttle.track_query_cost``).
+
+``snapshot()`` backs the ``metrics://tools`` resource, sorted by total wall
+time so the tools that dominate it come first. ``prometheus()`` renders the
+same data in the Prometheus text format; set ``MCP_METRICS_PORT`` to serve
+every registry in the process at ``/metrics`` on localhost.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from shopify_throttle import get_throttle, track_query_cost
+
+logger = logging.getLogger('mcp-metrics')
+
+# Serve /metrics on this port when set
+METRICS_PORT = int(os.environ.get('MCP_METRICS_PORT', '0'))
+METRICS_HOST = os.environ.get('MCP_METRICS_HOST', '127.0.0.1')
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of integer microseconds, HDR style
+
+    Values below ``2 ** (SUB_BUCKET_BITS + 1)`` are counted exactly; above
+    that each power of two is split into ``2 ** SUB_BUCKET_BITS`` buckets, so
+    any recorded value is off by less than 1% at every magnitude while memory
+    stays a few hundred counters.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - (self.SUB_BUCKET_BITS + 1), 0)
+        return (shift << (self.SUB_BUCKET_BITS + 1)) | (value >> shift)
+
+    def _value(self, index: int) -> int:
+        shift = index >> (self.SUB_BUCKET_BITS + 1)
+        mantissa = index & ((1 << (self.SUB_BUCKET_BITS + 1)) - 1)
+        # Middle of the bucket
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def record(self, value: float) -> None:
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, quantile: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, quantile * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+
+class ToolMetrics:
+    """Counters and histogram for one tool"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.latency_us = LatencyHistogram()
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self.shopify_queries = 0
+        self.shopify_requested_cost = 0.0
+        self.shopify_actual_cost = 0.0
+
+    def snapshot(self, total_us: int) -> Dict[str, Any]:
+        latency = self.latency_us
+        ms = lambda us: round(us / 1000, 2)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'failures': self.failures,
+            'cancelled': self.cancelled,
+            'latency_ms': {
+                **{f"p{int(q * 100)}": ms(latency.percentile(q)) for q in QUANTILES},
+                'max': ms(latency.max),
+                'mean': ms(latency.total / latency.count) if latency.count else 0,
+                'total': ms(latency.total),
+            },
+            'wall_time_share': round(latency.total / total_us, 4) if total_us else 0,
+            'response_bytes': {
+                'total': self.response_bytes,
+                'max': self.max_response_bytes,
+                'mean': round(self.response_bytes / self.calls) if self.calls else 0,
+            },
+            'shopify': {
+                'queries': self.shopify_queries,
+                'requested_cost': self.shopify_requested_cost,
+                'actual_cost': self.shopify_actual_cost,
+            },
+        }
+
+
+class ToolCall:
+    """Handle yielded by ``MetricsRegistry.track``; set what the caller learns"""
+
+    def __init__(self):
+        self.response_bytes = 0
+        self.failed = False
+
+
+_registries: List['MetricsRegistry'] = []
+
+
+class MetricsRegistry:
+    """Metrics for every tool of one server"""
+
+    def __init__(self, server: str):
+        self.server = server
+        self.tools: Dict[str, ToolMetrics] = {}
+        self.started_at = time.time()
+        _registries.append(self)
+
+    def tool(self, name: str) -> ToolMetrics:
+        metrics = self.tools.get(name)
+        if metrics is None:
+            metrics = self.tools[name] = ToolMetrics()
+        return metrics
+
+    @contextmanager
+    def track(self, name: str):
+        """Time a tool call and attribute its Shopify cost"""
+        metrics = self.tool(name)
+        call = ToolCall()
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            with track_query_cost() as cost:
+                yield call
+        except asyncio.CancelledError:
+            outcome = 'cancelled'
+            raise
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            metrics.calls += 1
+            metrics.latency_us.record((time.perf_counter() - start) * 1e6)
+            if outcome == 'error':
+                metrics.errors += 1
+            elif outcome == 'cancelled':
+                metrics.cancelled += 1
+            elif call.failed:
+                metrics.failures += 1
+            metrics.response_bytes += call.response_bytes
+            metrics.max_response_bytes = max(metrics.max_response_bytes, call.response_bytes)
+            metrics.shopify_queries += cost['queries']
+            metrics.shopify_requested_cost += cost['requested']
+            metrics.shopify_actual_cost += cost['actual']
+
+    def snapshot(self) -> Dict[str, Any]:
+        total_us = sum(m.latency_us.total for m in self.tools.values())
+        tools = sorted(self.tools.items(), key=lambda item: item[1].latency_us.total, reverse=True)
+        return {
+            'server': self.server,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'tools': {name: metrics.snapshot(total_us) for name, metrics in tools},
+            'shopify_throttle': get_throttle().snapshot(),
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        for tool, m in self.tools.items():
+            labels = f'server="{_escape(self.server)}",tool="{_escape(tool)}"'
+            lines.extend([
+                f'mcp_tool_calls_total{{{labels}}} {m.calls}',
+                f'mcp_tool_errors_total{{{labels}}} {m.errors}',
+                f'mcp_tool_failures_total{{{labels}}} {m.failures}',
+                f'mcp_tool_cancelled_total{{{labels}}} {m.cancelled}',
+                *(f'mcp_tool_latency_seconds{{{labels},quantile="{q}"}} {m.latency_us.percentile(q) / 1e6}'
+                  for q in QUANTILES),
+                f'mcp_tool_latency_seconds_sum{{{labels}}} {m.latency_us.total / 1e6}',
+                f'mcp_tool_latency_seconds_count{{{labels}}} {m.latency_us.count}',
+                f'mcp_tool_response_bytes_total{{{labels}}} {m.response_bytes}',
+                f'mcp_tool_shopify_queries_total{{{labels}}} {m.shopify_queries}',
+                f'mcp_tool_shopify_cost_total{{{labels}}} {m.shopify_actual_cost}',
+            ])
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+METRIC_HELP = [
+    ('mcp_tool_calls_total', 'counter', 'Tool calls'),
+    ('mcp_tool_errors_total', 'counter', 'Tool calls that raised'),
+    ('mcp_tool_failures_total', 'counter', 'Tool calls that returned success: false'),
+    ('mcp_tool_cancelled_total', 'counter', 'Tool calls cancelled by the client'),
+    ('mcp_tool_latency_seconds', 'summary', 'Tool call latency'),
+    ('mcp_tool_response_bytes_total', 'counter', 'Encoded tool result bytes'),
+    ('mcp_tool_shopify_queries_total', 'counter', 'Shopify GraphQL queries made by the tool'),
+    ('mcp_tool_shopify_cost_total', 'counter', 'Shopify actualQueryCost consumed by the tool'),
+]
+
+
+def prometheus(registries: Optional[List['MetricsRegistry']] = None) -> str:
+    """Prometheus text exposition of the given registries (all in the process by default)"""
+    registries = _registries if registries is None else registries
+    samples = [line for registry in registries for line in registry.prometheus_lines()]
+    lines = []
+    for name, kind, help_text in METRIC_HELP:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(line for line in samples if line.startswith((name + '{', name + '_sum{', name + '_count{')))
+    throttle = get_throttle().snapshot()
+    lines.append('# TYPE shopify_throttle_available gauge')
+    lines.append(f"shopify_throttle_available {throttle['currentlyAvailable']}")
+    lines.append('# TYPE shopify_throttle_throttled_total counter')
+    lines.append(f"shopify_throttle_throttled_total {throttle['throttled']}")
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# /metrics endpoint
+# ---------------------------------------------------------------------------
+
+_endpoint: Optional[asyncio.AbstractServer] = None
+
+
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()).strip():
+            pass  # Headers
+        parts = request_line.decode('latin-1').split()
+        if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == '/metrics':
+            status, body = '200 OK', prometheus().encode()
+        else:
+            status, body = '404 Not Found', b'Not found\n'
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def ensure_metrics_endpoint(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[asyncio.AbstractServer]:
+    """Start the process's /metrics endpoint once, if a port is configured"""
+    global _endpoint
+    if _endpoint is None and port:
+        try:
+            _endpoint = await asyncio.start_server(_handle_http, host, port)
+            logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+        except OSError as e:
+            logger.error(f"Could not serve metrics on port {port}: {e}")
+    return _endpoint
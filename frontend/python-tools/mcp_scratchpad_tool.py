@@ -2,42 +2,238 @@
 """
 Standalone scratchpad tool for MCP servers
 Can be imported and used by any MCP server to provide scratchpad functionality
+
+Several server processes share the scratchpad, so writes are appended as
+one JSON line each to ``scratchpad.log`` under a file lock instead of
+rewriting ``scratchpad.json``.  The log is folded into the JSON snapshot
+once it grows past COMPACT_BYTES (and on clear); readers apply the log on
+top of the snapshot.  ``log_seq`` in the snapshot records the last folded
+op so the Node server, which replays the same log, never applies one twice.
 """
 
+import asyncio
+import atexit
+import functools
 import json
 import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
-# Path to the scratchpad file
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# Path to the scratchpad snapshot (also read by the Node server)
 SCRATCHPAD_FILE = Path(__file__).parent.parent / 'server' / 'data' / 'scratchpad.json'
 
+# Writes are appended here and folded into the snapshot on compaction
+SCRATCHPAD_LOG = SCRATCHPAD_FILE.with_suffix('.log')
+SCRATCHPAD_LOCK = SCRATCHPAD_FILE.with_suffix('.lock')
+
+# Compact once the log grows past this many bytes
+COMPACT_BYTES = int(os.environ.get('SCRATCHPAD_COMPACT_BYTES', str(64 * 1024)))
+
+# fsync the log at most this often (seconds); 0 syncs every write
+FSYNC_INTERVAL = float(os.environ.get('SCRATCHPAD_FSYNC_INTERVAL', '1.0'))
+
+# Entries kept in the scratchpad
+MAX_ENTRIES = 50
+
 def ensure_data_directory():
     """Ensure the data directory exists"""
     SCRATCHPAD_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-def load_scratchpad() -> Dict[str, Any]:
-    """Load scratchpad data from file"""
-    try:
+def _empty_scratchpad() -> Dict[str, Any]:
+    return {
+        'content': '',
+        'entries': [],
+        'last_updated': None,
+        'created_at': datetime.now().isoformat(),
+        'log_seq': 0
+    }
+
+# ---------------------------------------------------------------------------
+# Append-only log
+# ---------------------------------------------------------------------------
+
+_log_state = {'fh': None, 'last_fsync': 0.0, 'dirty': False}
+_process_lock = threading.Lock()
+
+@contextmanager
+def _locked(exclusive: bool = True):
+    """Cross-process lock around the snapshot and log"""
+    ensure_data_directory()
+    with _process_lock, open(SCRATCHPAD_LOCK, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _log_handle():
+    """This process's O_APPEND handle on the log"""
+    if _log_state['fh'] is None:
         ensure_data_directory()
+        _log_state['fh'] = open(SCRATCHPAD_LOG, 'a', encoding='utf-8')
+    return _log_state['fh']
+
+def _sync_log(force: bool = False):
+    """fsync pending log writes, batched to one per FSYNC_INTERVAL"""
+    fh = _log_state['fh']
+    if fh is None or not _log_state['dirty']:
+        return
+    now = time.monotonic()
+    if force or now - _log_state['last_fsync'] >= FSYNC_INTERVAL:
+        os.fsync(fh.fileno())
+        _log_state['last_fsync'] = now
+        _log_state['dirty'] = False
+
+atexit.register(lambda: _sync_log(force=True))
+
+def _read_snapshot() -> Dict[str, Any]:
+    try:
         with open(SCRATCHPAD_FILE, 'r') as f:
-            return json.load(f)
+            data = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
-        # Return empty scratchpad if file doesn't exist or is invalid
-        return {
-            'content': '',
-            'entries': [],
-            'last_updated': None,
-            'created_at': datetime.now().isoformat()
-        }
+        # Empty scratchpad if file doesn't exist or is invalid
+        return _empty_scratchpad()
+    data.setdefault('entries', [])
+    data.setdefault('log_seq', 0)
+    return data
 
-def save_scratchpad(data: Dict[str, Any]):
-    """Save scratchpad data to file"""
-    ensure_data_directory()
-    data['last_updated'] = datetime.now().isoformat()
-    with open(SCRATCHPAD_FILE, 'w') as f:
+def _read_log() -> List[Dict[str, Any]]:
+    ops = []
+    try:
+        with open(SCRATCHPAD_LOG, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn line from a crash mid-write
+    except FileNotFoundError:
+        pass
+    return ops
+
+def _log_tail() -> tuple:
+    """(seq of the newest op or None, whether the log ends mid-line)"""
+    try:
+        with open(SCRATCHPAD_LOG, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 64 * 1024))
+            tail = f.read()
+    except FileNotFoundError:
+        return None, False
+    torn = bool(tail) and not tail.endswith(b'\n')
+    for line in reversed(tail.splitlines()):
+        try:
+            return json.loads(line)['seq'], torn
+        except (ValueError, KeyError):
+            continue
+    return None, torn
+
+def _last_seq() -> int:
+    """Sequence number of the newest op, from the log tail or the snapshot"""
+    seq, _ = _log_tail()
+    return seq if seq is not None else _read_snapshot().get('log_seq', 0)
+
+def _apply(scratchpad: Dict[str, Any], op: Dict[str, Any]):
+    """Apply one log op to a scratchpad dict"""
+    if op['seq'] <= scratchpad.get('log_seq', 0):
+        return
+    kind = op['op']
+    if kind == 'write':
+        scratchpad['content'] = op['content']
+    elif kind == 'append':
+        scratchpad['content'] = (scratchpad.get('content', '') + '\n' + op['content']).strip()
+    elif kind == 'add_entry':
+        entries = scratchpad.setdefault('entries', [])
+        entries.append(op['entry'])
+        # Keep only last 50 entries to prevent unlimited growth
+        del entries[:-MAX_ENTRIES]
+    elif kind == 'clear':
+        scratchpad['content'] = ''
+        scratchpad['entries'] = []
+    scratchpad['log_seq'] = op['seq']
+    scratchpad['last_updated'] = op['timestamp']
+
+def _record(kind: str, **fields) -> Dict[str, Any]:
+    """Append one op to the log and return it"""
+    with _locked():
+        seq, torn = _log_tail()
+        if seq is None:
+            seq = _read_snapshot().get('log_seq', 0)
+        op = {'seq': seq + 1, 'op': kind, 'timestamp': datetime.now().isoformat(), **fields}
+        if kind == 'add_entry':
+            op['entry']['id'] = op['seq']
+            op['entry']['timestamp'] = op['timestamp']
+        fh = _log_handle()
+        fh.write(('\n' if torn else '') + json.dumps(op) + '\n')
+        fh.flush()
+        _log_state['dirty'] = True
+        _sync_log(force=FSYNC_INTERVAL <= 0)
+        if kind == 'clear' or os.fstat(fh.fileno()).st_size > COMPACT_BYTES:
+            _compact_locked()
+    return op
+
+def _compact_locked():
+    """Fold the log into the snapshot and truncate it (caller holds the lock)"""
+    scratchpad = _read_snapshot()
+    for op in _read_log():
+        _apply(scratchpad, op)
+    _write_snapshot(scratchpad)
+    with open(SCRATCHPAD_LOG, 'a') as f:
+        # Truncate in place so other processes' append handles stay valid
+        f.truncate(0)
+        os.fsync(f.fileno())
+
+def _write_snapshot(data: Dict[str, Any]):
+    tmp = SCRATCHPAD_FILE.with_suffix('.json.tmp')
+    with open(tmp, 'w') as f:
         json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, SCRATCHPAD_FILE)
+
+def compact_scratchpad():
+    """Fold pending log writes into the snapshot now"""
+    with _locked():
+        _compact_locked()
+
+async def _in_thread(fn, *args, **kwargs):
+    """Run a locking/fsyncing step off the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+# ---------------------------------------------------------------------------
+# Public helpers
+# ---------------------------------------------------------------------------
+
+def load_scratchpad(limit: Optional[int] = None) -> Dict[str, Any]:
+    """Load scratchpad data: snapshot plus any writes still in the log"""
+    with _locked(exclusive=False):
+        scratchpad = _read_snapshot()
+        for op in _read_log():
+            _apply(scratchpad, op)
+    if limit is not None:
+        scratchpad['entries'] = scratchpad['entries'][-limit:] if limit > 0 else []
+    return scratchpad
+
+def save_scratchpad(data: Dict[str, Any]):
+    """Replace the whole scratchpad, discarding the log"""
+    with _locked():
+        data['last_updated'] = datetime.now().isoformat()
+        data['log_seq'] = _last_seq()
+        _write_snapshot(data)
+        with open(SCRATCHPAD_LOG, 'a') as f:
+            f.truncate(0)
 
 def format_scratchpad_content(scratchpad: Dict[str, Any]) -> str:
     """Format scratchpad content for display"""
@@ -56,9 +252,9 @@ def format_scratchpad_content(scratchpad: Dict[str, Any]) -> str:
     
     return formatted
 
-async def scratchpad_read() -> Dict[str, Any]:
+async def scratchpad_read(limit: Optional[int] = None) -> Dict[str, Any]:
     """Read scratchpad content"""
-    scratchpad = load_scratchpad()
+    scratchpad = await _in_thread(load_scratchpad, limit)
     
     if not scratchpad.get('content') and not scratchpad.get('entries'):
         return {
@@ -82,14 +278,12 @@ async def scratchpad_write(content: str) -> Dict[str, Any]:
             'message': 'Content is required for write action'
         }
     
-    scratchpad = load_scratchpad()
-    scratchpad['content'] = content
-    save_scratchpad(scratchpad)
+    await _in_thread(_record, 'write', content=content)
     
     return {
         'success': True,
         'message': 'Scratchpad content updated',
-        'data': scratchpad
+        'data': await _in_thread(load_scratchpad)
     }
 
 async def scratchpad_append(content: str) -> Dict[str, Any]:
@@ -100,14 +294,12 @@ async def scratchpad_append(content: str) -> Dict[str, Any]:
             'message': 'Content is required for append action'
         }
     
-    scratchpad = load_scratchpad()
-    scratchpad['content'] = (scratchpad.get('content', '') + '\n' + content).strip()
-    save_scratchpad(scratchpad)
+    await _in_thread(_record, 'append', content=content)
     
     return {
         'success': True,
         'message': 'Content appended to scratchpad',
-        'data': scratchpad
+        'data': await _in_thread(load_scratchpad)
     }
 
 async def scratchpad_add_entry(content: str, author: str = 'unknown') -> Dict[str, Any]:
@@ -118,49 +310,23 @@ async def scratchpad_add_entry(content: str, author: str = 'unknown') -> Dict[st
             'message': 'Content is required for add_entry action'
         }
     
-    scratchpad = load_scratchpad()
-    if 'entries' not in scratchpad:
-        scratchpad['entries'] = []
-    
-    entry = {
-        'content': content,
-        'author': author,
-        'timestamp': datetime.now().isoformat(),
-        'id': len(scratchpad['entries']) + 1
-    }
-    
-    scratchpad['entries'].append(entry)
-    
-    # Keep only last 50 entries to prevent unlimited growth
-    if len(scratchpad['entries']) > 50:
-        scratchpad['entries'] = scratchpad['entries'][-50:]
-    
-    save_scratchpad(scratchpad)
+    op = await _in_thread(_record, 'add_entry', entry={'content': content, 'author': author})
     
     return {
         'success': True,
         'message': 'Entry added to scratchpad',
-        'data': scratchpad,
-        'entry': entry
+        'data': await _in_thread(load_scratchpad),
+        'entry': op['entry']
     }
 
 async def scratchpad_clear() -> Dict[str, Any]:
     """Clear scratchpad content"""
-    scratchpad = load_scratchpad()
-    
-    cleared_scratchpad = {
-        'content': '',
-        'entries': [],
-        'last_updated': datetime.now().isoformat(),
-        'created_at': scratchpad.get('created_at', datetime.now().isoformat())
-    }
-    
-    save_scratchpad(cleared_scratchpad)
+    await _in_thread(_record, 'clear')
     
     return {
         'success': True,
         'message': 'Scratchpad cleared',
-        'data': cleared_scratchpad
+        'data': await _in_thread(load_scratchpad)
     }
 
 # MCP tool definitions that can be imported by servers
@@ -170,7 +336,12 @@ SCRATCHPAD_TOOLS = [
         'description': 'Read the current scratchpad content',
         'inputSchema': {
             'type': 'object',
-            'properties': {}
+            'properties': {
+                'limit': {
+                    'type': 'integer',
+                    'description': 'Only return the most recent N entries'
+                }
+            }
         },
         'handler': scratchpad_read
     },
@@ -233,4 +404,18 @@ SCRATCHPAD_TOOLS = [
         },
         'handler': scratchpad_clear
     }
-]
\ No newline at end of file
+]
+
+def main(argv: Optional[List[str]] = None):
+    """Run one action (``read``, ``write``, ``append``, ``add_entry``, ``clear``) and print the result"""
+    argv = sys.argv[1:] if argv is None else argv
+    handlers = {tool['name'][len('scratchpad_'):]: tool['handler'] for tool in SCRATCHPAD_TOOLS}
+    if len(argv) != 1 or argv[0] not in handlers:
+        sys.exit(f"Usage: {sys.argv[0]} {{{','.join(handlers)}}} < ARGS_JSON")
+    raw = sys.stdin.read().strip()
+    result = asyncio.run(handlers[argv[0]](**(json.loads(raw) if raw else {})))
+    _sync_log(force=True)
+    print(json.dumps(result))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Paged delivery of large tool results
+
+A tool may implement ``execute`` as an async generator that yields pages of
+items (typically one GraphQL connection page each). ``tools/call`` inlines
+items until the response would pass ``MCP_MAX_INLINE_BYTES``; the rest stays
+in the suspended generator and the response ends with a ``resource_link``
+whose URI carries a cursor, ``result://<id>?cursor=1``. Each
+``resources/read`` of that URI returns the next page (a JSON array) plus a
+``nextCursor`` link, so a 5,000-order export is never held in memory as one
+string, and pages nobody reads are never fetched.
+
+List results are paged the same way, one encoded item at a time. Anything
+else is encoded once and, if it is over the limit, handed out as
+consecutive slices of its JSON text.
+
+When a request carries ``_meta.progressToken`` the server also sends a
+``notifications/progress`` for every page of items a generator produces.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from mcp_transport import get_codec
+from mcp_deadline import DEFAULT_TIMEOUT_SECONDS, run_with_deadline
+
+logger = logging.getLogger('mcp-streaming')
+
+RESULT_SCHEME = 'result'
+# Encoded bytes of tool result returned inline (and per page after that)
+MAX_INLINE_BYTES = int(os.environ.get('MCP_MAX_INLINE_BYTES', str(256 * 1024)))
+# Unread streams are closed after this long, or when too many are open
+STREAM_TTL_SECONDS = float(os.environ.get('MCP_RESULT_STREAM_TTL', '600'))
+MAX_OPEN_STREAMS = int(os.environ.get('MCP_MAX_RESULT_STREAMS', '32'))
+
+# Set by the request dispatcher: coroutine function that writes one message
+current_notifier: ContextVar[Optional[Callable]] = ContextVar('mcp_notifier', default=None)
+
+
+async def notify(message: Dict[str, Any]):
+    """Send a notification on the connection serving the current request, if any"""
+    send = current_notifier.get()
+    if send is not None:
+        await send(message)
+
+
+async def call_tool(tool, arguments: Dict[str, Any]) -> Any:
+    """Run a tool; async-generator tools come back as the un-iterated generator"""
+    result = tool.execute(**arguments)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _single(batch):
+    yield batch
+
+
+class ResultStream:
+    """Items from a tool, cut into JSON array pages of at most ``max_bytes``
+
+    Items are encoded one at a time as they are taken; a single item larger
+    than ``max_bytes`` still goes out whole, as a page of its own.
+    """
+
+    def __init__(self, tool: str, batches: AsyncIterator, max_bytes: int = MAX_INLINE_BYTES,
+                 progress_token: Any = None):
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.max_bytes = max_bytes
+        self.progress_token = progress_token
+        self.page = 0
+        self.items = 0  # Sent so far
+        self.produced = 0  # Taken from the tool so far
+        self.done = False
+        self.touched = time.monotonic()
+        self.last_page: Optional[bytes] = None
+        self.lock = asyncio.Lock()
+        self._batches = batches
+        self._pending = deque()
+        self._head: Optional[bytes] = None  # Encoding of _pending[0], if taken but not sent
+
+    async def _fill(self) -> bool:
+        """Queue the next batch; False once the source is exhausted"""
+        try:
+            batch = await self._batches.__anext__()
+        except StopAsyncIteration:
+            return False
+        batch = batch if isinstance(batch, list) else [batch]
+        self._pending.extend(batch)
+        self.produced += len(batch)
+        if self.progress_token is not None:
+            await notify({
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {
+                    "progressToken": self.progress_token,
+                    "progress": self.produced,
+                    "message": f"{self.tool}: {self.produced} items",
+                },
+            })
+        return True
+
+    async def next_page(self) -> bytes:
+        """Encoded JSON array of the next page; sets ``done`` when nothing is left"""
+        codec = get_codec()
+        parts = []
+        size = 2
+        while True:
+            if not self._pending:
+                if not await self._fill():
+                    self.done = True
+                    break
+                continue
+            encoded = self._head if self._head is not None else codec.dumps_bytes(self._pending[0])
+            if parts and size + len(encoded) + 1 > self.max_bytes:
+                self._head = encoded
+                break
+            self._head = None
+            self._pending.popleft()
+            parts.append(encoded)
+            size += len(encoded) + 1
+        self.page += 1
+        self.items += len(parts)
+        self.touched = time.monotonic()
+        self.last_page = b'[' + b','.join(parts) + b']'
+        return self.last_page
+
+    async def aclose(self):
+        self.done = True
+        self._pending.clear()
+        close = getattr(self._batches, 'aclose', None)
+        if close is not None:
+            try:
+                await close()
+            except Exception as e:
+                logger.warning("Closing %s result stream failed: %s", self.tool, e)
+
+
+class TextStream(ResultStream):
+    """Slices of one already-encoded result that is too big to inline"""
+
+    def __init__(self, tool: str, data: bytes, max_bytes: int = MAX_INLINE_BYTES):
+        super().__init__(tool, _single(None), max_bytes)
+        self._data = data
+        self._offset = 0
+
+    async def next_page(self) -> bytes:
+        end = self._offset + self.max_bytes
+        # Never split a UTF-8 sequence: back up to the start of one
+        while end < len(self._data) and (self._data[end] & 0xC0) == 0x80:
+            end -= 1
+        self.last_page = self._data[self._offset:end]
+        self._offset = end
+        self.page += 1
+        self.done = self._offset >= len(self._data)
+        self.touched = time.monotonic()
+        if self.done:
+            self._data = b''
+        return self.last_page
+
+
+class ResultStore:
+    """Open result streams of one server, read through ``result://`` URIs"""
+
+    def __init__(self, max_inline_bytes: int = MAX_INLINE_BYTES, max_streams: int = MAX_OPEN_STREAMS,
+                 ttl: float = STREAM_TTL_SECONDS, page_timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.max_inline_bytes = max_inline_bytes
+        self.page_timeout = page_timeout
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self.streams: 'OrderedDict[str, ResultStream]' = OrderedDict()
+
+    @staticmethod
+    def link(stream: ResultStream) -> str:
+        return f"{RESULT_SCHEME}://{stream.id}?cursor={stream.page}"
+
+    @staticmethod
+    def handles(uri: str) -> bool:
+        return isinstance(uri, str) and uri.startswith(f"{RESULT_SCHEME}://")
+
+    async def _expire(self):
+        now = time.monotonic()
+        for stream_id, stream in list(self.streams.items()):
+            if now - stream.touched > self.ttl or len(self.streams) > self.max_streams:
+                del self.streams[stream_id]
+                await stream.aclose()
+
+    async def add(self, stream: ResultStream):
+        self.streams[stream.id] = stream
+        await self._expire()
+
+    async def read(self, uri: str) -> Dict[str, Any]:
+        """``resources/read`` result for a cursor URI; re-reading the last cursor repeats its page"""
+        parsed = urlparse(uri)
+        stream = self.streams.get(parsed.netloc)
+        if stream is None:
+            raise ValueError(f"Result stream expired or unknown: {uri}")
+        try:
+            cursor = int(parse_qs(parsed.query).get('cursor', ['-1'])[0])
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {uri}")
+
+        async with stream.lock:
+            if cursor == stream.page - 1 and stream.last_page is not None:
+                data = stream.last_page
+            elif cursor == stream.page and not stream.done:
+                try:
+                    data = await run_with_deadline(stream.next_page(), self.page_timeout, f"{stream.tool} page {cursor}")
+                except BaseException:
+                    # The generator can't resume after failing or being cancelled mid-page
+                    self.streams.pop(stream.id, None)
+                    await stream.aclose()
+                    raise
+            else:
+                raise ValueError(f"Cursor {cursor} is not the next page of {stream.tool} results")
+            self.streams.move_to_end(stream.id)
+            done = stream.done
+
+        result = {"contents": [{
+            "uri": uri,
+            "mimeType": "text/plain" if isinstance(stream, TextStream) else "application/json",
+            "text": data.decode('utf-8'),
+        }]}
+        if not done:
+            result["nextCursor"] = self.link(stream)
+        return result
+
+    async def close(self):
+        while self.streams:
+            _, stream = self.streams.popitem()
+            await stream.aclose()
+
+
+async def build_tool_result(tool_name: str, result: Any, store: ResultStore,
+                            progress_token: Any = None) -> Tuple[Dict[str, Any], int]:
+    """MCP ``tools/call`` result for a tool's return value, and the bytes sent inline
+
+    Small results come back as a single text item, as before. Larger ones
+    carry their first page inline followed by a ``resource_link`` to the rest.
+    """
+    max_inline = store.max_inline_bytes
+    if inspect.isasyncgen(result) or isinstance(result, list):
+        batches = result if inspect.isasyncgen(result) else _single(result)
+        stream = ResultStream(tool_name, batches, max_inline, progress_token)
+        data = await stream.next_page()
+    else:
+        data = get_codec().dumps_bytes(result)
+        if len(data) <= max_inline:
+            return {"content": [{"type": "text", "text": data.decode('utf-8')}]}, len(data)
+        stream = TextStream(tool_name, data, max_inline)
+        data = await stream.next_page()
+
+    content = [{"type": "text", "text": data.decode('utf-8')}]
+    if stream.done:
+        return {"content": content}, len(data)
+
+    await store.add(stream)
+    link = store.link(stream)
+    content.append({
+        "type": "resource_link",
+        "uri": link,
+        "name": f"{tool_name} results (continued)",
+        "description": (f"First {stream.items} items shown. Read this URI for the next page; "
+                        f"each page links the one after it." if not isinstance(stream, TextStream) else
+                        "Result truncated. Read this URI for the next slice of its JSON text."),
+        "mimeType": "text/plain" if isinstance(stream, TextStream) else "application/json",
+    })
+    logger.info("%s result paged after %d bytes: %s", tool_name, len(data), link)
+    return {"content": content, "_meta": {"nextCursor": link}}, len(data)
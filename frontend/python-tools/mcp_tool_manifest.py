@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Cached tool manifest and lazy tool loading for the MCP servers
+
+``tools/list`` only needs each tool's name, description, input schema and
+context, all of which are class attributes. They are recorded per module in
+a JSON manifest keyed by the module file's mtime and size, so a server start
+reads one small file instead of importing every tool module (and through
+them requests, numpy, the Shopify clients...). A module is imported again
+only when its file changed, or the first time one of its tools is called.
+
+``LazyTool`` stands in for a tool in ``server.tools``: it carries the
+manifest metadata and imports and instantiates the real tool on first use.
+
+``profile_startup`` times the lazy start against importing every module,
+for ``mcp-server.py --profile-startup``.
+"""
+
+import importlib
+import inspect
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('mcp-tool-manifest')
+
+TOOLS_DIR = Path(__file__).parent / 'mcp_tools'
+DEFAULT_MANIFEST_PATH = Path(__file__).parent.parent / 'server' / 'data' / 'mcp_tool_manifest.json'
+
+# Bumped when the entry format changes, which discards older manifests
+MANIFEST_VERSION = 2
+
+# Cold-start budget for a server to be ready to answer tools/list
+STARTUP_BUDGET_MS = float(os.environ.get('MCP_STARTUP_BUDGET_MS', '250'))
+
+
+def tool_modules(tools_dir: Path = TOOLS_DIR) -> List[Tuple[str, Path]]:
+    """(module name, file) for every tool module, in discovery order"""
+    modules = []
+    if not tools_dir.exists():
+        return modules
+    for category_dir in sorted(tools_dir.iterdir()):
+        if category_dir.is_dir() and not category_dir.name.startswith('_'):
+            for tool_file in sorted(category_dir.glob('*.py')):
+                if tool_file.name.startswith('_'):
+                    continue
+                modules.append((f"{tools_dir.name}.{category_dir.name}.{tool_file.stem}", tool_file))
+    return modules
+
+
+def describe_module(module_name: str) -> List[Dict[str, Any]]:
+    """Import a module and return a manifest entry per tool class it defines"""
+    module = importlib.import_module(module_name)
+    entries = []
+    for class_name, obj in inspect.getmembers(module, inspect.isclass):
+        if (hasattr(obj, 'name') and hasattr(obj, 'execute') and
+                obj.__module__ == module.__name__):  # Avoid importing base class
+            entry = {
+                'module': module_name,
+                'class': class_name,
+                'name': obj.name,
+                'description': getattr(obj, 'description', ''),
+                'input_schema': getattr(obj, 'input_schema', {}),
+            }
+            if hasattr(obj, 'context'):
+                entry['context'] = obj.context
+            if getattr(obj, 'read_only', False):
+                entry['read_only'] = True
+            entries.append(entry)
+    return entries
+
+
+def _file_key(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ToolManifest:
+    """Tool metadata per module, re-read from source only when a file changes"""
+
+    def __init__(self, tools_dir: Path = TOOLS_DIR, path: Optional[Path] = None):
+        self.tools_dir = Path(tools_dir)
+        self.path = Path(path or os.environ.get('MCP_TOOL_MANIFEST_PATH') or DEFAULT_MANIFEST_PATH)
+        self._modules: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._modules is None:
+            try:
+                data = json.loads(self.path.read_text())
+                self._modules = data['modules'] if data.get('version') == MANIFEST_VERSION else {}
+            except (FileNotFoundError, ValueError, KeyError):
+                self._modules = {}
+        return self._modules
+
+    def _module_file(self, module_name: str) -> Path:
+        parts = module_name.split('.')
+        return self.tools_dir.joinpath(*parts[1:]).with_suffix('.py')
+
+    def _refresh(self, module_name: str, tool_file: Path) -> Tuple[Dict[str, Any], bool]:
+        """Cached entry for a module, describing it again if its file changed"""
+        modules = self._load()
+        key = _file_key(tool_file)
+        cached = modules.get(module_name)
+        if cached is not None and cached['file'] == key:
+            return cached, False
+        modules[module_name] = {'file': key, 'tools': describe_module(module_name)}
+        return modules[module_name], True
+
+    def module_tools(self, module_name: str) -> List[Dict[str, Any]]:
+        """Entries for the tools of one module"""
+        entry, changed = self._refresh(module_name, self._module_file(module_name))
+        if changed:
+            self.save()
+        return entry['tools']
+
+    def entry(self, module_name: str, class_name: str) -> Dict[str, Any]:
+        """Entry for one tool class"""
+        for tool in self.module_tools(module_name):
+            if tool['class'] == class_name:
+                return tool
+        raise ValueError(f"{module_name}.{class_name} is not a tool class")
+
+    def all_tools(self) -> List[Dict[str, Any]]:
+        """Entries for every tool under ``tools_dir``; modules that fail to import are skipped"""
+        modules = self._load()
+        found, tools, changed = set(), [], False
+        for module_name, tool_file in tool_modules(self.tools_dir):
+            found.add(module_name)
+            try:
+                entry, refreshed = self._refresh(module_name, tool_file)
+            except Exception as e:
+                logger.error(f"Failed to load {module_name}: {e}")
+                continue
+            changed = changed or refreshed
+            tools.extend(entry['tools'])
+        for module_name in set(modules) - found:
+            del modules[module_name]
+            changed = True
+        if changed:
+            self.save()
+        return tools
+
+    def save(self) -> None:
+        """Write the manifest atomically; a failure only costs the next start its cache"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({'version': MANIFEST_VERSION, 'modules': self._load()}))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write tool manifest {self.path}: {e}")
+
+
+_manifest: Optional[ToolManifest] = None
+
+
+def get_tool_manifest() -> ToolManifest:
+    """Process-wide manifest for the bundled tools"""
+    global _manifest
+    if _manifest is None:
+        _manifest = ToolManifest()
+    return _manifest
+
+
+class LazyTool:
+    """Manifest-backed tool that imports its module on first use"""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.module = entry['module']
+        self.class_name = entry['class']
+        self.name = entry['name']
+        self.description = entry.get('description', '')
+        self.input_schema = entry.get('input_schema', {})
+        self.context = entry.get('context', '')
+        self.read_only = entry.get('read_only', False)
+        self._instance = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def load(self):
+        """The real tool instance, importing its module if needed"""
+        if self._instance is None:
+            start = time.perf_counter()
+            tool_class = getattr(importlib.import_module(self.module), self.class_name)
+            self._instance = tool_class()
+            logger.info(f"Loaded tool {self.name} from {self.module} in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return self._instance
+
+    async def execute(self, **kwargs) -> Any:
+        result = self.load().execute(**kwargs)
+        # Async-generator tools hand back their generator un-iterated
+        return await result if inspect.isawaitable(result) else result
+
+    async def test(self) -> Dict[str, Any]:
+        tool = self.load()
+        if not hasattr(tool, 'test'):
+            return {"status": "not_implemented"}
+        return await tool.test()
+
+    def __getattr__(self, attr):
+        # Only reached for attributes the manifest doesn't carry
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+
+# ---------------------------------------------------------------------------
+# Startup profiling
+# ---------------------------------------------------------------------------
+
+# Times a lazy server start in a process that has imported nothing yet
+LAZY_START_SCRIPT = """
+import json, sys, time
+from pathlib import Path
+start = time.perf_counter()
+sys.path[:0] = {paths!r}
+from mcp_tool_manifest import ToolManifest
+manifest = ToolManifest(Path({tools_dir!r}), {manifest_path!r})
+cached = len(manifest._load())
+manifest.all_tools()
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000, "cached": cached}}))
+"""
+
+
+def _time_lazy_start(tools_dir: Path, manifest_path: Optional[Path]) -> Dict[str, Any]:
+    """Lazy start (import this module, read the manifest, list tools) in a fresh interpreter"""
+    script = LAZY_START_SCRIPT.format(
+        paths=[str(Path(__file__).parent), str(Path(tools_dir).resolve().parent)],
+        tools_dir=str(tools_dir),
+        manifest_path=str(manifest_path) if manifest_path else None,
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def profile_startup(tools_dir: Path = TOOLS_DIR, budget_ms: float = STARTUP_BUDGET_MS,
+                    manifest_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Time a lazy manifest start, then every module import in discovery order
+
+    The lazy start runs in a fresh interpreter, so nothing imported here
+    makes it look cheaper. Without a cached manifest it builds one, which is
+    what a first start pays. Run the whole profile in a fresh process too:
+    modules imported earlier cost nothing here, and each module's time
+    includes the shared dependencies it is the first to pull in, which is
+    what an eager start pays for it.
+    """
+    lazy = _time_lazy_start(tools_dir, manifest_path)
+
+    modules = []
+    for module_name, _ in tool_modules(tools_dir):
+        start = time.perf_counter()
+        error = None
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            error = str(e)
+        modules.append({
+            'module': module_name,
+            'ms': round((time.perf_counter() - start) * 1000, 2),
+            'error': error,
+        })
+
+    eager_ms = sum(m['ms'] for m in modules)
+    lazy_ms = lazy['ms']
+    return {
+        'budget_ms': budget_ms,
+        'manifest_cached': lazy['cached'] > 0,
+        'lazy_ms': round(lazy_ms, 2),
+        'eager_ms': round(eager_ms, 2),
+        'within_budget': lazy_ms <= budget_ms,
+        'modules': sorted(modules, key=lambda m: m['ms'], reverse=True),
+    }
+
+
+def format_profile(report: Dict[str, Any]) -> str:
+    """Human-readable table for ``profile_startup``"""
+    budget = report['budget_ms']
+    lines = [f"{'module':55s} {'import ms':>10s}  {'% budget':>8s}"]
+    for module in report['modules']:
+        note = f"  FAILED: {module['error']}" if module['error'] else ''
+        lines.append(f"{module['module']:55s} {module['ms']:10.1f}  {module['ms'] / budget * 100:7.0f}%{note}")
+    lines.append('')
+    lines.append(f"Eager start (import every module): {report['eager_ms']:.1f}ms")
+    lines.append(f"Lazy start ({'cached manifest' if report['manifest_cached'] else 'building the manifest'}, "
+                 f"fresh process): {report['lazy_ms']:.1f}ms")
+    if not report['manifest_cached']:
+        lines.append("No manifest was cached: the first start builds it, at the eager cost")
+    lines.append(f"Budget: {budget:.0f}ms - {'OK' if report['within_budget'] else 'OVER BUDGET'}")
+    return '\n'.join(lines)
@@ -1,13 +1,22 @@
 """
 Analytics tools for Shopify order and sales data
+
+Tool classes resolve on first access, so importing one tool module does not
+import its siblings.
 """
 
-from .order_analytics import OrderAnalyticsTool
-from .revenue_reports import RevenueReportsTool
-from .daily_sales import DailySalesTool
+import importlib
+
+_TOOL_MODULES = {
+    'OrderAnalyticsTool': '.order_analytics',
+    'RevenueReportsTool': '.revenue_reports',
+    'DailySalesTool': '.daily_sales',
+}
+
+__all__ = list(_TOOL_MODULES)
+
 
-__all__ = [
-    'OrderAnalyticsTool',
-    'RevenueReportsTool', 
-    'DailySalesTool'
-]
\ No newline at end of file
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        return getattr(importlib.import_module(_TOOL_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,19 +5,22 @@ Daily sales summary tool - optimized for quick daily metrics
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime, timedelta
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from .order_warehouse import get_order_warehouse
+from .rollups import _bincount
 
 class DailySalesTool(BaseMCPTool):
     """Get quick daily sales summary with minimal API calls"""
     
     name = "analytics_daily_sales"
     description = "Get today's or recent daily sales summary quickly"
+    read_only = True
     context = """
     Provides quick daily sales metrics optimized for performance.
     
     Features:
     - Fast summary without product details
-    - Today's sales with hourly breakdown
+    - Today's sales with hourly breakdown, overall and per channel
     - Comparison with previous day
     - Order velocity tracking
     
@@ -54,31 +57,44 @@ class DailySalesTool(BaseMCPTool):
                      compare_previous: bool = True) -> Dict[str, Any]:
         """Get daily sales summary"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
-            # Parse date
-            target_date = self._parse_date(date)
-            is_today = target_date == datetime.now().strftime('%Y-%m-%d')
+            # Sync from two days early so the shop-local day is covered even
+            # when the server clock is in a different timezone
+            server_date = self._parse_date(date)
+            warehouse = get_order_warehouse()
+            await warehouse.sync(client, self._shift_date(server_date, -2 if compare_previous else -1))
+            
+            # Days and hours are in the shop's timezone
+            now = datetime.now(warehouse.timezone)
+            target_date = self._parse_date(date, now)
+            is_today = target_date == now.strftime('%Y-%m-%d')
             
             # Only include hourly for today
             if not is_today:
                 include_hourly = False
             
-            # Build main query
+            previous_date = self._shift_date(target_date, -1)
+            
+            # One pass over the day's orders feeds the summary and every histogram
+            day = self._scan_day(warehouse.orders(target_date, target_date), now if is_today else None)
+            
             results = {
                 "date": target_date,
                 "is_today": is_today,
-                "summary": await self._get_day_summary(client, target_date)
+                "summary": day["summary"],
+                "channels": day["channels"]
             }
             
             # Add hourly breakdown if requested
             if include_hourly:
-                results["hourly"] = await self._get_hourly_breakdown(client, target_date)
+                results["hourly"] = day["hourly"]
+                results["half_hourly"] = day["half_hourly"]
+                results["channel_hourly"] = day["channel_hourly"]
             
             # Add comparison if requested
             if compare_previous:
-                previous_date = (datetime.strptime(target_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
-                previous_summary = await self._get_day_summary(client, previous_date)
+                previous_summary = self._scan_day(warehouse.orders(previous_date, previous_date))["summary"]
                 
                 results["comparison"] = {
                     "previous_date": previous_date,
@@ -98,8 +114,9 @@ class DailySalesTool(BaseMCPTool):
             
             # Add current time for "today" queries
             if is_today:
-                results["as_of"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                results["business_hours_remaining"] = self._calculate_remaining_hours()
+                results["as_of"] = now.strftime('%Y-%m-%d %H:%M:%S')
+                results["timezone"] = str(warehouse.timezone)
+                results["business_hours_remaining"] = self._calculate_remaining_hours(now)
             
             return {
                 "success": True,
@@ -112,141 +129,65 @@ class DailySalesTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _get_day_summary(self, client: ShopifyClient, date: str) -> Dict[str, Any]:
-        """Get summary for a specific day"""
-        date_filter = f"created_at:{date} financial_status:paid"
-        
-        query = f"""
-        {{
-            orders(first: 250, query: "{date_filter}") {{
-                edges {{
-                    node {{
-                        totalPriceSet {{
-                            shopMoney {{
-                                amount
-                            }}
-                        }}
-                    }}
-                    cursor
-                }}
-                pageInfo {{
-                    hasNextPage
-                }}
-            }}
-        }}
+    def _scan_day(self, rows, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Summary, hourly, half-hourly and per-channel counts from one pass over a day's orders
+
+        The histograms are bincounts over the hour, the half-hour slot and
+        ``channel * 24 + hour`` of each order.
         """
+        hours, slots, channel_index, prices = [], [], [], []
+        names: Dict[str, int] = {}
+        for row in rows:
+            local = datetime.fromisoformat(row["created_local"])
+            hours.append(local.hour)
+            slots.append(local.hour * 2 + local.minute // 30)
+            channel_index.append(names.setdefault(row["source_identifier"] or "unknown", len(names)))
+            prices.append(row["total_price"])
         
-        # Execute query
-        result = client.execute_graphql(query)
-        data = result.get('data', {}).get('orders', {})
+        ones = [1.0] * len(hours)
+        hourly = [int(n) for n in _bincount(hours, ones, 24)]
+        half_hourly = [int(n) for n in _bincount(slots, ones, 48)]
+        by_channel_hour = _bincount([c * 24 + h for c, h in zip(channel_index, hours)], ones, len(names) * 24)
+        channel_revenue = _bincount(channel_index, prices, len(names))
         
-        edges = data.get('edges', [])
-        order_count = 0
+        order_count = len(hours)
+        total_revenue = sum(prices)
         
-        # Calculate revenue from first page
-        total_revenue = sum(
-            float(edge.get('node', {}).get('totalPriceSet', {}).get('shopMoney', {}).get('amount', 0))
-            for edge in edges
-        )
-        order_count += len(edges)
+        # Business hours (6 AM to 10 PM), stopping at the current hour for today
+        last_hour = 22 if now is None else min(22, now.hour)
+        business_hours = range(6, last_hour + 1)
         
-        # If there are more pages, fetch them
-        if data.get('pageInfo', {}).get('hasNextPage', False) and edges:
-            cursor = edges[-1].get('cursor')
-            additional_data = await self._fetch_remaining_revenue(client, date_filter, cursor)
-            total_revenue += additional_data['revenue']
-            order_count += additional_data['count']
+        channels = {}
+        channel_hourly = {}
+        for name, c in names.items():
+            counts = by_channel_hour[c * 24:(c + 1) * 24]
+            channels[name] = {"orders": int(sum(counts)), "revenue": round(channel_revenue[c], 2)}
+            channel_hourly[name] = {f"{hour:02d}:00": int(counts[hour]) for hour in business_hours}
+        order = sorted(channels, key=lambda name: channels[name]["orders"], reverse=True)
         
         return {
-            "order_count": order_count,
-            "total_revenue": round(total_revenue, 2),
-            "average_order_value": round(total_revenue / order_count, 2) if order_count > 0 else 0
+            "summary": {
+                "order_count": order_count,
+                "total_revenue": round(total_revenue, 2),
+                "average_order_value": round(total_revenue / order_count, 2) if order_count > 0 else 0
+            },
+            "hourly": {f"{hour:02d}:00": hourly[hour] for hour in business_hours},
+            "half_hourly": {
+                f"{slot // 2:02d}:{(slot % 2) * 30:02d}": half_hourly[slot]
+                for slot in range(12, last_hour * 2 + 2)
+                if now is None or slot // 2 < now.hour or (slot % 2) * 30 <= now.minute
+            },
+            "channels": {name: channels[name] for name in order},
+            "channel_hourly": {name: channel_hourly[name] for name in order}
         }
     
-    async def _fetch_remaining_revenue(self, client: ShopifyClient, date_filter: str, cursor: str) -> Dict[str, Any]:
-        """Fetch remaining revenue with pagination"""
-        total = 0.0
-        count = 0
-        has_next = True
-        
-        while has_next:
-            query = f"""
-            {{
-                orders(first: 250, after: "{cursor}", query: "{date_filter}") {{
-                    edges {{
-                        node {{
-                            totalPriceSet {{
-                                shopMoney {{
-                                    amount
-                                }}
-                            }}
-                        }}
-                        cursor
-                    }}
-                    pageInfo {{
-                        hasNextPage
-                    }}
-                }}
-            }}
-            """
-            
-            result = client.execute_graphql(query)
-            data = result.get('data', {}).get('orders', {})
-            edges = data.get('edges', [])
-            
-            # Add revenue and count
-            total += sum(
-                float(edge.get('node', {}).get('totalPriceSet', {}).get('shopMoney', {}).get('amount', 0))
-                for edge in edges
-            )
-            count += len(edges)
-            
-            # Check for next page
-            has_next = data.get('pageInfo', {}).get('hasNextPage', False)
-            if has_next and edges:
-                cursor = edges[-1].get('cursor')
-        
-        return {"revenue": total, "count": count}
-    
-    async def _get_hourly_breakdown(self, client: ShopifyClient, date: str) -> Dict[str, Any]:
-        """Get hourly breakdown for today"""
-        hourly_data = {}
-        
-        # Generate hourly queries for business hours (6 AM to 10 PM)
-        for hour in range(6, 23):  # 6 AM to 10 PM
-            hour_start = f"{date}T{hour:02d}:00:00"
-            hour_end = f"{date}T{hour+1:02d}:00:00"
-            
-            # Skip future hours
-            if datetime.strptime(hour_start, '%Y-%m-%dT%H:%M:%S') > datetime.now():
-                break
-            
-            query = f"""
-            {{
-                orders(first: 250, query: "created_at:>={hour_start} created_at:<{hour_end} financial_status:paid") {{
-                    edges {{
-                        node {{
-                            id
-                        }}
-                    }}
-                }}
-            }}
-            """
-            
-            result = client.execute_graphql(query)
-            edges = result.get('data', {}).get('orders', {}).get('edges', [])
-            count = len(edges)
-            
-            hourly_data[f"{hour:02d}:00"] = count
-        
-        return hourly_data
-    
-    def _parse_date(self, date_str: str) -> str:
+    def _parse_date(self, date_str: str, now: Optional[datetime] = None) -> str:
         """Parse date string to YYYY-MM-DD format"""
+        now = now or datetime.now()
         if date_str.lower() == 'today':
-            return datetime.now().strftime('%Y-%m-%d')
+            return now.strftime('%Y-%m-%d')
         elif date_str.lower() == 'yesterday':
-            return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            return (now - timedelta(days=1)).strftime('%Y-%m-%d')
         else:
             # Validate date format
             try:
@@ -255,15 +196,18 @@ class DailySalesTool(BaseMCPTool):
             except ValueError:
                 raise ValueError(f"Invalid date format: {date_str}. Use YYYY-MM-DD or 'today'/'yesterday'")
     
+    def _shift_date(self, date: str, days: int) -> str:
+        """Move a YYYY-MM-DD date by a number of days"""
+        return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+    
     def _calculate_percentage_change(self, old_value: float, new_value: float) -> float:
         """Calculate percentage change"""
         if old_value == 0:
             return 0.0 if new_value == 0 else 100.0
         return round(((new_value - old_value) / old_value) * 100, 2)
     
-    def _calculate_remaining_hours(self) -> int:
+    def _calculate_remaining_hours(self, now: datetime) -> int:
         """Calculate remaining business hours (until 10 PM)"""
-        now = datetime.now()
         closing_time = now.replace(hour=22, minute=0, second=0)  # 10 PM
         
         if now >= closing_time:
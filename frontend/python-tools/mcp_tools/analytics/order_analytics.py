@@ -4,20 +4,23 @@ Order analytics tool for Shopify - handles high-volume order data
 
 from typing import Dict, Any, Optional, List
 import json
-from datetime import datetime, timedelta
-from ..base import BaseMCPTool, ShopifyClient
+from datetime import datetime, timedelta, tzinfo
+from ..base import BaseMCPTool, AsyncShopifyClient
+from .order_warehouse import get_order_warehouse
 
 class OrderAnalyticsTool(BaseMCPTool):
     """Get detailed order analytics with support for high-volume stores"""
     
     name = "analytics_order_summary"
     description = "Get order analytics including count, revenue, and product performance for a date range"
+    read_only = True
     context = """
     Fetches comprehensive order analytics for iDrinkCoffee.com.
     
     Features:
     - Handles 100-200+ daily orders efficiently
-    - Automatic pagination for large datasets
+    - Answers from a local order warehouse kept current by incremental sync
+    - Large first-time ranges are loaded with a Shopify bulk operation
     - Returns order count, revenue, top products
     - Supports date range queries
     - Includes average order value (AOV)
@@ -59,16 +62,18 @@ class OrderAnalyticsTool(BaseMCPTool):
     
     async def execute(self, start_date: str, end_date: str, 
                      include_products: bool = True, product_limit: int = 10) -> Dict[str, Any]:
-        """Execute order analytics query with pagination support"""
+        """Execute order analytics from the local order warehouse"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
-            # Parse dates
-            start_date = self._parse_date(start_date)
-            end_date = self._parse_date(end_date)
+            # Parse dates in the shop's timezone, which the warehouse buckets days by
+            warehouse = get_order_warehouse()
+            shop_tz = await warehouse.ensure_timezone(client)
+            start_date = self._parse_date(start_date, shop_tz)
+            end_date = self._parse_date(end_date, shop_tz)
             
-            # Build query filter
-            date_filter = f"created_at:>={start_date} created_at:<={end_date} financial_status:paid"
+            # Bring the local order warehouse up to date for this range
+            sync_stats = await warehouse.sync(client, start_date)
             
             # Initialize analytics data
             analytics = {
@@ -84,78 +89,27 @@ class OrderAnalyticsTool(BaseMCPTool):
                 }
             }
             
-            # Fetch all orders with pagination
-            all_orders = []
-            has_next_page = True
-            cursor = None
-            
-            while has_next_page:
-                # Build paginated query
-                orders_query = self._build_orders_query(date_filter, cursor, include_products)
-                
-                result = client.execute_graphql(orders_query)
-                orders_data = result.get('data', {}).get('orders', {})
-                
-                # Add orders to collection
-                edges = orders_data.get('edges', [])
-                all_orders.extend(edges)
-                
-                # Check for next page
-                page_info = orders_data.get('pageInfo', {})
-                has_next_page = page_info.get('hasNextPage', False)
-                
-                if has_next_page and edges:
-                    cursor = edges[-1].get('cursor')
-            
-            # Process analytics
-            total_revenue = 0.0
-            product_sales = {} if include_products else None
-            
-            for edge in all_orders:
-                order = edge.get('node', {})
-                
-                # Add to revenue
-                total_amount = order.get('totalPriceSet', {}).get('shopMoney', {}).get('amount', '0')
-                total_revenue += float(total_amount)
-                
-                # Process line items for product analytics
-                if include_products:
-                    line_items = order.get('lineItems', {}).get('edges', [])
-                    for item_edge in line_items:
-                        item = item_edge.get('node', {})
-                        product_title = item.get('title', 'Unknown Product')
-                        sku = item.get('sku', 'NO-SKU')
-                        quantity = item.get('quantity', 0)
-                        price = float(item.get('originalUnitPriceSet', {}).get('shopMoney', {}).get('amount', '0'))
-                        
-                        # Aggregate by product
-                        key = f"{product_title} ({sku})"
-                        if key not in product_sales:
-                            product_sales[key] = {
-                                "title": product_title,
-                                "sku": sku,
-                                "quantity_sold": 0,
-                                "revenue": 0.0
-                            }
-                        
-                        product_sales[key]['quantity_sold'] += quantity
-                        product_sales[key]['revenue'] += (price * quantity)
+            summary = warehouse.summary(start_date, end_date)
+            order_count = summary["order_count"]
+            total_revenue = summary["gross_revenue"]
             
             # Update analytics
-            analytics['summary']['order_count'] = len(all_orders)
+            analytics['summary']['order_count'] = order_count
             analytics['summary']['total_revenue'] = round(total_revenue, 2)
-            analytics['summary']['average_order_value'] = round(total_revenue / len(all_orders), 2) if all_orders else 0
+            analytics['summary']['average_order_value'] = round(total_revenue / order_count, 2) if order_count else 0
             
             # Add top products if requested
-            if include_products and product_sales:
-                # Sort by revenue and get top N
-                sorted_products = sorted(product_sales.values(), key=lambda x: x['revenue'], reverse=True)
-                analytics['top_products'] = sorted_products[:product_limit]
+            if include_products:
+                top_products = warehouse.top_products(start_date, end_date, product_limit)
+                if top_products:
+                    analytics['top_products'] = top_products
             
             # Add query cost info
             analytics['api_cost'] = {
-                "queries_made": len(all_orders) // 250 + 1,
-                "total_orders_fetched": len(all_orders)
+                "strategy": sync_stats["strategy"] or "incremental",
+                "queries_made": sync_stats["api_calls"],
+                "orders_synced": sync_stats["backfilled_orders"] + sync_stats["delta_orders"],
+                "total_orders_fetched": order_count
             }
             
             return {
@@ -169,12 +123,12 @@ class OrderAnalyticsTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    def _parse_date(self, date_str: str) -> str:
-        """Parse date string to YYYY-MM-DD format"""
+    def _parse_date(self, date_str: str, tz: Optional[tzinfo] = None) -> str:
+        """Parse date string to YYYY-MM-DD format ('today' is the shop's today)"""
         if date_str.lower() == 'today':
-            return datetime.now().strftime('%Y-%m-%d')
+            return datetime.now(tz).strftime('%Y-%m-%d')
         elif date_str.lower() == 'yesterday':
-            return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            return (datetime.now(tz) - timedelta(days=1)).strftime('%Y-%m-%d')
         else:
             # Validate date format
             try:
@@ -183,54 +137,6 @@ class OrderAnalyticsTool(BaseMCPTool):
             except ValueError:
                 raise ValueError(f"Invalid date format: {date_str}. Use YYYY-MM-DD or 'today'/'yesterday'")
     
-    def _build_orders_query(self, date_filter: str, cursor: Optional[str], include_line_items: bool) -> str:
-        """Build GraphQL query with optional cursor for pagination"""
-        after_clause = f', after: "{cursor}"' if cursor else ''
-        
-        line_items_fragment = """
-            lineItems(first: 250) {
-                edges {
-                    node {
-                        title
-                        sku
-                        quantity
-                        originalUnitPriceSet {
-                            shopMoney {
-                                amount
-                                currencyCode
-                            }
-                        }
-                    }
-                }
-            }
-        """ if include_line_items else ""
-        
-        return f"""
-        {{
-            orders(first: 250, query: "{date_filter}"{after_clause}) {{
-                edges {{
-                    cursor
-                    node {{
-                        id
-                        name
-                        createdAt
-                        totalPriceSet {{
-                            shopMoney {{
-                                amount
-                                currencyCode
-                            }}
-                        }}
-                        {line_items_fragment}
-                    }}
-                }}
-                pageInfo {{
-                    hasNextPage
-                    endCursor
-                }}
-            }}
-        }}
-        """
-    
     async def test(self) -> Dict[str, Any]:
         """Test with yesterday's data"""
         try:
@@ -0,0 +1,449 @@
+"""
+Local order warehouse for the analytics tools
+
+Keeps a SQLite copy of the shop's orders so reports are answered locally
+instead of re-downloading every order on every call.
+
+Sync model:
+- Backfill: the first time a date range is requested, every order created in
+  the missing days is fetched once (paginated, or as a bulk operation for
+  large ranges).  ``covered_from`` records the earliest fully loaded day, so
+  closed days are never fetched again.
+- Delta: afterwards only orders with ``updated_at`` past the stored cursor are
+  fetched, which picks up new orders as well as refunds, cancellations and
+  status changes on old ones.
+
+Days are bucketed in the shop's own timezone, matching how Shopify interprets
+``created_at:`` date filters.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from ..base import AsyncShopifyClient, BulkOperationRunner, should_use_bulk
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent.parent / 'server' / 'data' / 'order_warehouse.db'
+
+# Don't hit the API for deltas more often than this (seconds)
+MIN_SYNC_INTERVAL = float(os.environ.get('ORDER_WAREHOUSE_MIN_SYNC_SECONDS', '30'))
+
+# Page sizes keep the requested query cost under Shopify's 1000 point ceiling
+PAGE_SIZE = 15
+LINE_ITEMS_PER_ORDER = 25
+# Follow-up pages for orders with more line items than the first page holds
+LINE_ITEMS_PAGE_SIZE = 250
+
+SCHEMA_VERSION = '1'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    created_day TEXT NOT NULL,
+    created_local TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    financial_status TEXT,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    currency TEXT,
+    total_price REAL NOT NULL DEFAULT 0,
+    total_discounts REAL NOT NULL DEFAULT 0,
+    total_refunded REAL NOT NULL DEFAULT 0,
+    refund_count INTEGER NOT NULL DEFAULT 0,
+    source_identifier TEXT,
+    source_name TEXT,
+    discount_codes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_day ON orders (created_day, financial_status);
+
+CREATE TABLE IF NOT EXISTS line_items (
+    order_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    sku TEXT,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    unit_price REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (order_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+ORDER_FIELDS = """
+    id
+    name
+    createdAt
+    updatedAt
+    displayFinancialStatus
+    cancelledAt
+    currencyCode
+    sourceIdentifier
+    sourceName
+    discountCodes
+    totalPriceSet { shopMoney { amount } }
+    totalDiscountsSet { shopMoney { amount } }
+    refunds { totalRefundedSet { shopMoney { amount } } }
+"""
+
+LINE_ITEM_FIELDS = """
+    title
+    sku
+    quantity
+    originalUnitPriceSet { shopMoney { amount } }
+"""
+
+PAGED_ORDERS_QUERY = f"""
+query warehouseOrders($first: Int!, $after: String, $query: String!) {{
+    orders(first: $first, after: $after, query: $query, sortKey: UPDATED_AT) {{
+        edges {{
+            node {{
+                {ORDER_FIELDS}
+                lineItems(first: {LINE_ITEMS_PER_ORDER}) {{
+                    edges {{ node {{ {LINE_ITEM_FIELDS} }} }}
+                    pageInfo {{
+                        hasNextPage
+                        endCursor
+                    }}
+                }}
+            }}
+        }}
+        pageInfo {{
+            hasNextPage
+            endCursor
+        }}
+    }}
+}}
+"""
+
+ORDER_LINE_ITEMS_QUERY = f"""
+query warehouseOrderLineItems($id: ID!, $after: String) {{
+    order(id: $id) {{
+        lineItems(first: {LINE_ITEMS_PAGE_SIZE}, after: $after) {{
+            edges {{ node {{ {LINE_ITEM_FIELDS} }} }}
+            pageInfo {{
+                hasNextPage
+                endCursor
+            }}
+        }}
+    }}
+}}
+"""
+
+BULK_ORDERS_QUERY = """
+{{
+    orders(query: {query}) {{
+        edges {{
+            node {{
+                {order_fields}
+                lineItems {{
+                    edges {{ node {{ id {line_item_fields} }} }}
+                }}
+            }}
+        }}
+    }}
+}}
+"""
+
+
+def _money(value: Optional[Dict[str, Any]]) -> float:
+    return float(((value or {}).get('shopMoney') or {}).get('amount') or 0)
+
+
+class OrderWarehouse:
+    """SQLite order store kept current by incremental sync"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or os.environ.get('ORDER_WAREHOUSE_PATH') or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        self._sync_lock = asyncio.Lock()
+        self.last_sync_stats: Dict[str, Any] = {}
+
+    def _init_schema(self):
+        if self._get_meta('schema_version') not in (None, SCHEMA_VERSION):
+            # Column set changed - rebuild from scratch on next sync
+            self.conn.executescript("DROP TABLE IF EXISTS orders; DROP TABLE IF EXISTS line_items; DROP TABLE IF EXISTS meta;")
+        self.conn.executescript(SCHEMA)
+        self._set_meta('schema_version', SCHEMA_VERSION)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+    def _get_meta(self, key: str) -> Optional[str]:
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def timezone(self) -> ZoneInfo:
+        return ZoneInfo(self._get_meta('timezone') or 'UTC')
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    async def sync(self, client: AsyncShopifyClient, start_day: str, force: bool = False) -> Dict[str, Any]:
+        """Make sure every order created from ``start_day`` on is stored and current"""
+        async with self._sync_lock:
+            stats = {"backfilled_orders": 0, "delta_orders": 0, "api_calls": 0, "strategy": None}
+            await self.ensure_timezone(client, stats)
+
+            covered_from = self._get_meta('covered_from')
+            if covered_from is None or start_day < covered_from:
+                # Delta cursor starts from before the backfill so nothing is missed
+                backfill_started = datetime.now(timezone.utc) - timedelta(minutes=5)
+                backfill_end = None
+                if covered_from is not None:
+                    backfill_end = (date.fromisoformat(covered_from) - timedelta(days=1)).isoformat()
+                await self._backfill(client, start_day, backfill_end, stats)
+                self._set_meta('covered_from', start_day)
+                if self._get_meta('cursor') is None:
+                    self._set_meta('cursor', backfill_started.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                self.conn.commit()
+
+            last_delta = float(self._get_meta('last_delta_at') or 0)
+            if force or time.time() - last_delta >= MIN_SYNC_INTERVAL:
+                await self._delta(client, stats)
+
+            self.last_sync_stats = stats
+            return stats
+
+    async def ensure_timezone(self, client: AsyncShopifyClient,
+                              stats: Optional[Dict[str, Any]] = None) -> ZoneInfo:
+        """Shop timezone, fetched once and kept in the warehouse"""
+        if self._get_meta('timezone') is None:
+            result = await client.execute_graphql('{ shop { ianaTimezone } }')
+            if stats is not None:
+                stats["api_calls"] += 1
+            self._set_meta('timezone', result['data']['shop']['ianaTimezone'])
+            self.conn.commit()
+        return self.timezone
+
+    async def _backfill(self, client: AsyncShopifyClient, start_day: str, end_day: Optional[str],
+                        stats: Dict[str, Any]):
+        search = f"created_at:>={start_day}"
+        if end_day:
+            search += f" created_at:<={end_day}"
+
+        if await should_use_bulk(client, 'orders', search, page_size=PAGE_SIZE):
+            stats["strategy"] = "bulk_operation"
+            query = BULK_ORDERS_QUERY.format(
+                query=json.dumps(search), order_fields=ORDER_FIELDS, line_item_fields=LINE_ITEM_FIELDS
+            )
+            runner = BulkOperationRunner(client)
+            batch = []
+            async for order in runner.run(query):
+                batch.append(order)
+                if len(batch) >= 500:
+                    self._store_orders(batch)
+                    stats["backfilled_orders"] += len(batch)
+                    batch = []
+            self._store_orders(batch)
+            stats["backfilled_orders"] += len(batch)
+        else:
+            stats["strategy"] = "paginated"
+            stats["backfilled_orders"] += await self._fetch_paged(client, search, stats)
+        stats["api_calls"] += 1  # count query
+
+    async def _delta(self, client: AsyncShopifyClient, stats: Dict[str, Any]):
+        cursor = self._get_meta('cursor')
+        stats["delta_orders"] += await self._fetch_paged(
+            client, f"updated_at:>='{cursor}'", stats, advance_cursor=True
+        )
+        self._set_meta('last_delta_at', str(time.time()))
+        self.conn.commit()
+
+    async def _fetch_paged(self, client: AsyncShopifyClient, search: str, stats: Dict[str, Any],
+                           advance_cursor: bool = False) -> int:
+        fetched = 0
+        after = None
+        while True:
+            result = await client.execute_graphql(
+                PAGED_ORDERS_QUERY, {"first": PAGE_SIZE, "after": after, "query": search}
+            )
+            stats["api_calls"] += 1
+            data = result.get('data', {}).get('orders', {})
+            orders = [edge['node'] for edge in data.get('edges', [])]
+            for order in orders:
+                await self._complete_line_items(client, order, stats)
+            self._store_orders(orders, advance_cursor)
+            fetched += len(orders)
+
+            page_info = data.get('pageInfo', {})
+            if not page_info.get('hasNextPage') or not orders:
+                return fetched
+            after = page_info.get('endCursor')
+
+    async def _complete_line_items(self, client: AsyncShopifyClient, order: Dict[str, Any],
+                                   stats: Dict[str, Any]):
+        """Fetch the rest of an order's line items when the first page was not all of them"""
+        line_items = order.get('lineItems') or {}
+        page_info = line_items.get('pageInfo') or {}
+        edges = list(line_items.get('edges', []))
+        while page_info.get('hasNextPage'):
+            result = await client.execute_graphql(
+                ORDER_LINE_ITEMS_QUERY, {"id": order['id'], "after": page_info.get('endCursor')}
+            )
+            stats["api_calls"] += 1
+            page = ((result.get('data') or {}).get('order') or {}).get('lineItems') or {}
+            edges.extend(page.get('edges', []))
+            page_info = page.get('pageInfo') or {}
+        order['lineItems'] = {'edges': edges}
+
+    def _store_orders(self, orders: Iterable[Dict[str, Any]], advance_cursor: bool = False):
+        """Upsert orders; delta pages also move the ``updated_at`` cursor forward"""
+        tz = self.timezone
+        cursor = self._get_meta('cursor')
+        order_rows = []
+        item_rows = []
+        order_ids = []
+
+        for order in orders:
+            created = datetime.fromisoformat(order['createdAt'].replace('Z', '+00:00'))
+            local = created.astimezone(tz)
+            refunds = order.get('refunds') or []
+            order_ids.append(order['id'])
+            order_rows.append((
+                order['id'],
+                order.get('name'),
+                order['createdAt'],
+                local.strftime('%Y-%m-%d'),
+                local.isoformat(),
+                order['updatedAt'],
+                order.get('displayFinancialStatus'),
+                1 if order.get('cancelledAt') else 0,
+                order.get('currencyCode'),
+                _money(order.get('totalPriceSet')),
+                _money(order.get('totalDiscountsSet')),
+                sum(_money(r.get('totalRefundedSet')) for r in refunds),
+                len(refunds),
+                order.get('sourceIdentifier'),
+                order.get('sourceName'),
+                json.dumps(order.get('discountCodes') or []),
+            ))
+            for position, item in enumerate(self._line_items(order)):
+                item_rows.append((
+                    order['id'],
+                    position,
+                    item.get('title'),
+                    item.get('sku'),
+                    item.get('quantity') or 0,
+                    _money(item.get('originalUnitPriceSet')),
+                ))
+            if advance_cursor and (cursor is None or order['updatedAt'] > cursor):
+                cursor = order['updatedAt']
+
+        if not order_rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM line_items WHERE order_id = ?", [(oid,) for oid in order_ids]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                order_rows,
+            )
+            self.conn.executemany("INSERT INTO line_items VALUES (?, ?, ?, ?, ?, ?)", item_rows)
+            if advance_cursor:
+                self._set_meta('cursor', cursor)
+
+    @staticmethod
+    def _line_items(order: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Line items from either a paginated (edges) or bulk (list) order"""
+        line_items = order.get('lineItems') or []
+        if isinstance(line_items, dict):
+            return [edge.get('node', {}) for edge in line_items.get('edges', [])]
+        return line_items
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def summary(self, start_day: str, end_day: str, financial_status: Optional[str] = 'PAID') -> Dict[str, Any]:
+        """Order count and gross revenue for a day range (inclusive)"""
+        sql = "SELECT COUNT(*), COALESCE(SUM(total_price), 0) FROM orders WHERE created_day BETWEEN ? AND ?"
+        params: List[Any] = [start_day, end_day]
+        if financial_status:
+            sql += " AND financial_status = ?"
+            params.append(financial_status)
+        count, revenue = self.conn.execute(sql, params).fetchone()
+        return {"order_count": count, "gross_revenue": round(revenue, 2)}
+
+    def daily_totals(self, start_day: str, end_day: str, financial_status: Optional[str] = 'PAID') -> Dict[str, Dict[str, Any]]:
+        """Per-day order count and revenue"""
+        sql = """
+            SELECT created_day, COUNT(*), COALESCE(SUM(total_price), 0)
+            FROM orders WHERE created_day BETWEEN ? AND ?
+        """
+        params: List[Any] = [start_day, end_day]
+        if financial_status:
+            sql += " AND financial_status = ?"
+            params.append(financial_status)
+        sql += " GROUP BY created_day"
+        return {
+            day: {"order_count": count, "gross_revenue": round(revenue, 2)}
+            for day, count, revenue in self.conn.execute(sql, params)
+        }
+
+    def top_products(self, start_day: str, end_day: str, limit: int = 10,
+                     financial_status: Optional[str] = 'PAID') -> List[Dict[str, Any]]:
+        """Best-selling line items by revenue"""
+        sql = """
+            SELECT li.title, li.sku, SUM(li.quantity) AS quantity_sold,
+                   SUM(li.quantity * li.unit_price) AS revenue
+            FROM line_items li JOIN orders o ON o.id = li.order_id
+            WHERE o.created_day BETWEEN ? AND ?
+        """
+        params: List[Any] = [start_day, end_day]
+        if financial_status:
+            sql += " AND o.financial_status = ?"
+            params.append(financial_status)
+        sql += " GROUP BY li.title, li.sku ORDER BY revenue DESC LIMIT ?"
+        params.append(limit)
+        return [
+            {
+                "title": row["title"] or 'Unknown Product',
+                "sku": row["sku"] or 'NO-SKU',
+                "quantity_sold": row["quantity_sold"],
+                "revenue": round(row["revenue"], 2),
+            }
+            for row in self.conn.execute(sql, params)
+        ]
+
+    def orders(self, start_day: str, end_day: str, financial_status: Optional[str] = 'PAID') -> List[sqlite3.Row]:
+        """Stored order rows for a day range"""
+        sql = "SELECT * FROM orders WHERE created_day BETWEEN ? AND ?"
+        params: List[Any] = [start_day, end_day]
+        if financial_status:
+            sql += " AND financial_status = ?"
+            params.append(financial_status)
+        return self.conn.execute(sql + " ORDER BY created_at", params).fetchall()
+
+
+_warehouse: Optional[OrderWarehouse] = None
+
+
+def get_order_warehouse() -> OrderWarehouse:
+    """Process-wide warehouse shared by the analytics tools"""
+    global _warehouse
+    if _warehouse is None:
+        _warehouse = OrderWarehouse()
+    return _warehouse
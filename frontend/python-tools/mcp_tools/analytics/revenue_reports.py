@@ -2,16 +2,19 @@
 Revenue and financial reports tool for Shopify
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 import json
 from datetime import datetime, timedelta
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from .order_warehouse import OrderWarehouse, get_order_warehouse
+from .rollups import rollup_orders
 
 class RevenueReportsTool(BaseMCPTool):
     """Generate revenue reports with various breakdowns and comparisons"""
     
     name = "analytics_revenue_report"
     description = "Generate detailed revenue reports with breakdowns by period, channel, and customer type"
+    read_only = True
     context = """
     Comprehensive revenue reporting tool for financial analysis.
     
@@ -74,7 +77,7 @@ class RevenueReportsTool(BaseMCPTool):
                      include_channels: bool = True) -> Dict[str, Any]:
         """Generate revenue report"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Parse dates
             start = datetime.strptime(start_date, '%Y-%m-%d')
@@ -97,38 +100,48 @@ class RevenueReportsTool(BaseMCPTool):
                 }
             }
             
-            # Get period data based on report type
-            if report_type == "daily":
-                report["daily_breakdown"] = await self._get_daily_breakdown(client, start, end)
-            elif report_type == "weekly":
-                report["weekly_breakdown"] = await self._get_weekly_breakdown(client, start, end)
-            elif report_type == "monthly":
-                report["monthly_breakdown"] = await self._get_monthly_breakdown(client, start, end)
+            # One warehouse sync covers the report and the comparison period
+            previous_start = (start - timedelta(days=(end - start).days + 1)).strftime('%Y-%m-%d')
+            previous_end = (start - timedelta(days=1)).strftime('%Y-%m-%d')
+            warehouse = get_order_warehouse()
+            await warehouse.sync(client, previous_start)
             
-            # Get overall metrics
-            base_filter = f"created_at:>={start_date} created_at:<={end_date}"
+            # Every breakdown and section comes from one pass over the stored orders
+            rows = warehouse.orders(start_date, end_date, financial_status=None)
+            rollups = rollup_orders(rows, start_date, end_date)
+            totals = rollups["total"]
+            
+            # Get period data based on report type
+            if report_type in ("daily", "weekly", "monthly"):
+                report[f"{report_type}_breakdown"] = rollups[report_type]
             
             # Fetch main revenue data
-            revenue_data = await self._fetch_revenue_data(client, base_filter)
+            revenue_data = self._fetch_revenue_data(warehouse, start_date, end_date)
             report["summary"].update(revenue_data)
             
             # Add refunds if requested
             if include_refunds:
-                refund_data = await self._fetch_refund_data(client, start_date, end_date)
+                refund_data = {
+                    "total_refunded": totals["refunds"],
+                    "refund_count": totals["refund_count"]
+                }
                 report["refunds"] = refund_data
                 report["summary"]["refunds"] = refund_data["total_refunded"]
-                report["summary"]["net_revenue"] = report["summary"]["gross_revenue"] - refund_data["total_refunded"]
+                report["summary"]["net_revenue"] = round(report["summary"]["gross_revenue"] - refund_data["total_refunded"], 2)
             
             # Add discount analysis if requested
             if include_discounts:
-                discount_data = await self._fetch_discount_data(client, base_filter)
+                discount_data = {
+                    "total_discount_amount": totals["discounts"],
+                    "orders_with_discount": totals["orders_with_discount"],
+                    "top_discount_codes": self._top_discount_codes(rows)
+                }
                 report["discounts"] = discount_data
                 report["summary"]["discounts"] = discount_data["total_discount_amount"]
             
             # Add channel breakdown if requested
             if include_channels:
-                channel_data = await self._fetch_channel_data(client, base_filter)
-                report["channels"] = channel_data
+                report["channels"] = totals["channels"]
             
             # Calculate some additional metrics
             if report["summary"]["order_count"] > 0:
@@ -137,12 +150,7 @@ class RevenueReportsTool(BaseMCPTool):
                 )
             
             # Add comparison with previous period
-            previous_start = (start - timedelta(days=(end - start).days + 1)).strftime('%Y-%m-%d')
-            previous_end = (start - timedelta(days=1)).strftime('%Y-%m-%d')
-            previous_data = await self._fetch_revenue_data(
-                client, 
-                f"created_at:>={previous_start} created_at:<={previous_end}"
-            )
+            previous_data = self._fetch_revenue_data(warehouse, previous_start, previous_end)
             
             report["comparison"] = {
                 "previous_period": {
@@ -172,227 +180,19 @@ class RevenueReportsTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _fetch_revenue_data(self, client: ShopifyClient, filter_query: str) -> Dict[str, Any]:
-        """Fetch basic revenue data with pagination"""
-        # Initialize count
-        order_count = 0
-        
-        # Fetch revenue data with pagination
-        total_revenue = 0.0
-        cursor = None
-        has_next = True
-        
-        while has_next:
-            after_clause = f', after: "{cursor}"' if cursor else ''
-            
-            query = f"""
-            {{
-                orders(first: 250{after_clause}, query: "{filter_query} financial_status:paid") {{
-                    edges {{
-                        node {{
-                            totalPriceSet {{
-                                shopMoney {{
-                                    amount
-                                }}
-                            }}
-                        }}
-                        cursor
-                    }}
-                    pageInfo {{
-                        hasNextPage
-                    }}
-                }}
-            }}
-            """
-            
-            result = client.execute_graphql(query)
-            data = result.get('data', {}).get('orders', {})
-            edges = data.get('edges', [])
-            
-            # Sum revenue and count orders
-            for edge in edges:
-                amount = edge.get('node', {}).get('totalPriceSet', {}).get('shopMoney', {}).get('amount', '0')
-                total_revenue += float(amount)
-                order_count += 1
-            
-            # Check pagination
-            page_info = data.get('pageInfo', {})
-            has_next = page_info.get('hasNextPage', False)
-            if has_next and edges:
-                cursor = edges[-1].get('cursor')
-        
-        return {
-            "gross_revenue": round(total_revenue, 2),
-            "order_count": order_count
-        }
-    
-    async def _fetch_refund_data(self, client: ShopifyClient, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Fetch refund data"""
-        query = f"""
-        {{
-            orders(query: "created_at:>={start_date} created_at:<={end_date} refund_line_items:true") {{
-                edges(first: 250) {{
-                    node {{
-                        refunds {{
-                            totalRefundedSet {{
-                                shopMoney {{
-                                    amount
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }}
-        """
-        
-        result = client.execute_graphql(query)
-        edges = result.get('data', {}).get('orders', {}).get('edges', [])
-        
-        total_refunded = 0.0
-        refund_count = 0
-        
-        for edge in edges:
-            refunds = edge.get('node', {}).get('refunds', [])
-            for refund in refunds:
-                amount = refund.get('totalRefundedSet', {}).get('shopMoney', {}).get('amount', '0')
-                total_refunded += float(amount)
-                refund_count += 1
-        
-        return {
-            "total_refunded": round(total_refunded, 2),
-            "refund_count": refund_count
-        }
+    def _fetch_revenue_data(self, warehouse: OrderWarehouse, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Fetch basic revenue data from the order warehouse"""
+        return warehouse.summary(start_date, end_date)
     
-    async def _fetch_discount_data(self, client: ShopifyClient, filter_query: str) -> Dict[str, Any]:
-        """Fetch discount analysis data"""
-        query = f"""
-        {{
-            orders(first: 250, query: "{filter_query} financial_status:paid") {{
-                edges {{
-                    node {{
-                        totalDiscountsSet {{
-                            shopMoney {{
-                                amount
-                            }}
-                        }}
-                        discountApplications {{
-                            edges {{
-                                node {{
-                                    ... on DiscountCodeApplication {{
-                                        code
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }}
-        """
-        
-        result = client.execute_graphql(query)
-        edges = result.get('data', {}).get('orders', {}).get('edges', [])
-        
-        total_discount = 0.0
-        orders_with_discount = 0
+    def _top_discount_codes(self, rows, limit: int = 5) -> Dict[str, int]:
+        """Most used discount codes on paid, discounted orders"""
         discount_codes = {}
-        
-        for edge in edges:
-            node = edge.get('node', {})
-            discount_amount = float(node.get('totalDiscountsSet', {}).get('shopMoney', {}).get('amount', '0'))
-            
-            if discount_amount > 0:
-                total_discount += discount_amount
-                orders_with_discount += 1
-                
-                # Track discount codes
-                disc_apps = node.get('discountApplications', {}).get('edges', [])
-                for app in disc_apps:
-                    code = app.get('node', {}).get('code', 'Unknown')
-                    if code:
-                        discount_codes[code] = discount_codes.get(code, 0) + 1
-        
-        return {
-            "total_discount_amount": round(total_discount, 2),
-            "orders_with_discount": orders_with_discount,
-            "top_discount_codes": dict(sorted(discount_codes.items(), key=lambda x: x[1], reverse=True)[:5])
-        }
-    
-    async def _fetch_channel_data(self, client: ShopifyClient, filter_query: str) -> Dict[str, Any]:
-        """Fetch sales channel breakdown"""
-        # Note: This is simplified. In production, you'd want pagination here too
-        query = f"""
-        {{
-            orders(first: 250, query: "{filter_query} financial_status:paid") {{
-                edges {{
-                    node {{
-                        sourceIdentifier
-                        totalPriceSet {{
-                            shopMoney {{
-                                amount
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }}
-        """
-        
-        result = client.execute_graphql(query)
-        edges = result.get('data', {}).get('orders', {}).get('edges', [])
-        
-        channels = {}
-        for edge in edges:
-            node = edge.get('node', {})
-            channel = node.get('sourceIdentifier', 'unknown')
-            amount = float(node.get('totalPriceSet', {}).get('shopMoney', {}).get('amount', '0'))
-            
-            if channel not in channels:
-                channels[channel] = {
-                    "revenue": 0.0,
-                    "order_count": 0
-                }
-            
-            channels[channel]["revenue"] += amount
-            channels[channel]["order_count"] += 1
-        
-        # Round revenue values
-        for channel in channels:
-            channels[channel]["revenue"] = round(channels[channel]["revenue"], 2)
-        
-        return channels
-    
-    async def _get_daily_breakdown(self, client: ShopifyClient, start: datetime, end: datetime) -> List[Dict]:
-        """Get daily breakdown"""
-        daily_data = []
-        current = start
-        
-        while current <= end:
-            date_str = current.strftime('%Y-%m-%d')
-            data = await self._fetch_revenue_data(client, f"created_at:{date_str}")
-            
-            daily_data.append({
-                "date": date_str,
-                "revenue": data["gross_revenue"],
-                "orders": data["order_count"]
-            })
-            
-            current += timedelta(days=1)
-        
-        return daily_data
-    
-    async def _get_weekly_breakdown(self, client: ShopifyClient, start: datetime, end: datetime) -> List[Dict]:
-        """Get weekly breakdown"""
-        # Implementation would group by week
-        # Simplified for brevity
-        return []
-    
-    async def _get_monthly_breakdown(self, client: ShopifyClient, start: datetime, end: datetime) -> List[Dict]:
-        """Get monthly breakdown"""
-        # Implementation would group by month
-        # Simplified for brevity
-        return []
+        for row in rows:
+            if row["financial_status"] != "PAID" or row["total_discounts"] <= 0:
+                continue
+            for code in json.loads(row["discount_codes"] or "[]"):
+                discount_codes[code] = discount_codes.get(code, 0) + 1
+        return dict(sorted(discount_codes.items(), key=lambda x: x[1], reverse=True)[:limit])
     
     def _calculate_percentage_change(self, old_value: float, new_value: float) -> float:
         """Calculate percentage change"""
@@ -0,0 +1,146 @@
+"""
+Calendar rollups over stored orders
+
+Orders for a report range are read from the warehouse once and aggregated
+into day buckets with ``numpy.bincount``; ISO-week and month buckets are a
+second bincount over the day totals.  Revenue, refunds, discounts and the
+channel split all share the same bucket indices, so every breakdown of a
+report agrees with every other one.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-order measures summed into every bucket
+MEASURES = ('orders', 'revenue', 'discounts', 'discounted_orders', 'refunds', 'refund_count')
+
+
+def _bincount(indices: Sequence[int], weights: Sequence[float], size: int) -> List[float]:
+    """Sum ``weights`` per index; pure Python when NumPy is unavailable"""
+    if np is not None:
+        return np.bincount(np.asarray(indices, dtype=np.int64),
+                           weights=np.asarray(weights, dtype=np.float64),
+                           minlength=size).tolist()
+    totals = [0.0] * size
+    for index, weight in zip(indices, weights):
+        totals[index] += weight
+    return totals
+
+
+def _calendar(start: date, days: int) -> Dict[str, Any]:
+    """Week and month bucket of every day in the range"""
+    week_of_day, month_of_day = [], []
+    weeks: List[Dict[str, Any]] = []
+    months: List[Dict[str, Any]] = []
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        iso_year, iso_week, _ = day.isocalendar()
+        week_label = f"{iso_year}-W{iso_week:02d}"
+        if not weeks or weeks[-1]["week"] != week_label:
+            weeks.append({"week": week_label, "start": day.isoformat()})
+        weeks[-1]["end"] = day.isoformat()
+        week_of_day.append(len(weeks) - 1)
+
+        month_label = day.strftime('%Y-%m')
+        if not months or months[-1]["month"] != month_label:
+            months.append({"month": month_label, "start": day.isoformat()})
+        months[-1]["end"] = day.isoformat()
+        month_of_day.append(len(months) - 1)
+
+    return {"week_of_day": week_of_day, "month_of_day": month_of_day, "weeks": weeks, "months": months}
+
+
+def rollup_orders(rows: Sequence[Any], start_day: str, end_day: str,
+                  paid_status: str = 'PAID') -> Dict[str, Any]:
+    """Daily, weekly (ISO), monthly and whole-range buckets for warehouse order rows.
+
+    ``rows`` are rows from ``OrderWarehouse.orders(..., financial_status=None)``.
+    Revenue and discounts count paid orders only; refunds count every order,
+    attributed to the day the order was created.  Weeks and months at the
+    edges of the range are partial and carry their clipped start/end.
+    """
+    start = datetime.strptime(start_day, '%Y-%m-%d').date()
+    days = (datetime.strptime(end_day, '%Y-%m-%d').date() - start).days + 1
+    calendar = _calendar(start, days)
+
+    # Column vectors of the order rows
+    day_index, channel_index, channel_names = [], [], {}
+    columns: Dict[str, List[float]] = {measure: [] for measure in MEASURES}
+    for row in rows:
+        index = (date.fromisoformat(row["created_day"]) - start).days
+        if not 0 <= index < days:
+            continue
+        paid = row["financial_status"] == paid_status
+        day_index.append(index)
+        channel_index.append(channel_names.setdefault(row["source_identifier"] or 'unknown', len(channel_names)))
+        columns['orders'].append(1.0 if paid else 0.0)
+        columns['revenue'].append(row["total_price"] if paid else 0.0)
+        columns['discounts'].append(row["total_discounts"] if paid else 0.0)
+        columns['discounted_orders'].append(1.0 if paid and row["total_discounts"] > 0 else 0.0)
+        columns['refunds'].append(row["total_refunded"])
+        columns['refund_count'].append(float(row["refund_count"]))
+
+    # Day buckets, then week and month buckets from the day totals
+    by_day = {measure: _bincount(day_index, columns[measure], days) for measure in MEASURES}
+    channel_count = len(channel_names)
+    pair_index = [d * channel_count + c for d, c in zip(day_index, channel_index)]
+    channel_by_day = {
+        measure: _bincount(pair_index, columns[measure], days * channel_count)
+        for measure in ('orders', 'revenue')
+    }
+
+    def rollup(bucket_of_day: List[int], size: int):
+        totals = {measure: _bincount(bucket_of_day, by_day[measure], size) for measure in MEASURES}
+        pairs = [bucket_of_day[d] * channel_count + c for d in range(days) for c in range(channel_count)]
+        channels = {
+            measure: _bincount(pairs, channel_by_day[measure], size * channel_count)
+            for measure in ('orders', 'revenue')
+        }
+        return totals, channels
+
+    names = list(channel_names)
+
+    def buckets(labels: List[Dict[str, Any]], totals, channels) -> List[Dict[str, Any]]:
+        result = []
+        for i, label in enumerate(labels):
+            orders = int(totals['orders'][i])
+            revenue = totals['revenue'][i]
+            refunds = totals['refunds'][i]
+            result.append({
+                **label,
+                "orders": orders,
+                "revenue": round(revenue, 2),
+                "refunds": round(refunds, 2),
+                "refund_count": int(totals['refund_count'][i]),
+                "net_revenue": round(revenue - refunds, 2),
+                "discounts": round(totals['discounts'][i], 2),
+                "orders_with_discount": int(totals['discounted_orders'][i]),
+                "average_order_value": round(revenue / orders, 2) if orders else 0.0,
+                "channels": {
+                    name: {
+                        "order_count": int(channels['orders'][i * channel_count + c]),
+                        "revenue": round(channels['revenue'][i * channel_count + c], 2),
+                    }
+                    for c, name in enumerate(names)
+                    if channels['orders'][i * channel_count + c]
+                },
+            })
+        return result
+
+    day_labels = [{"date": (start + timedelta(days=d)).isoformat()} for d in range(days)]
+    weekly = rollup(calendar["week_of_day"], len(calendar["weeks"]))
+    monthly = rollup(calendar["month_of_day"], len(calendar["months"]))
+    total = rollup([0] * days, 1)
+
+    return {
+        "daily": buckets(day_labels, by_day, channel_by_day),
+        "weekly": buckets(calendar["weeks"], *weekly),
+        "monthly": buckets(calendar["months"], *monthly),
+        "total": buckets([{"start": start_day, "end": end_day}], *total)[0],
+    }
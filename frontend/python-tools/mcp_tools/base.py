@@ -11,8 +11,10 @@ from abc import ABC, abstractmethod
 # Add parent directory to path to import existing tools
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import ShopifyClient from parent base module
-from base import ShopifyClient
+# Import the Shopify clients from parent base module
+from base import ShopifyClient, AsyncShopifyClient
+from shopify_bulk import BulkOperationRunner, should_use_bulk
+from mcp_deadline import DEFAULT_TIMEOUT_SECONDS
 
 class BaseMCPTool(ABC):
     """Base class for all MCP tools"""
@@ -22,13 +24,21 @@ class BaseMCPTool(ABC):
     description: str = ""
     context: str = ""  # Tool-specific context/instructions
     input_schema: Dict[str, Any] = {}
+    # Seconds a call may run before it is cancelled (clients may ask for less)
+    timeout: float = DEFAULT_TIMEOUT_SECONDS
+    # No side effects: advertised as readOnlyHint, and identical calls in one batch run once
+    read_only: bool = False
     
     def __init__(self):
         if not self.name:
             raise ValueError("Tool must have a name")
             
     async def execute(self, **kwargs) -> Any:
-        """Execute the tool with given arguments"""
+        """Execute the tool with given arguments
+        
+        May also be written as an async generator yielding pages (lists) of
+        results; the server pages them out instead of building one response.
+        """
         raise NotImplementedError("Subclasses must implement execute()")
         
     async def test(self) -> Dict[str, Any]:
@@ -4,7 +4,7 @@ Native MCP implementation for managing product features via metaobjects
 
 import json
 from typing import Dict, Any, List, Optional, Tuple
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class ManageFeaturesMetaobjectsTool(BaseMCPTool):
     """Manage product features using Shopify metaobjects"""
@@ -97,10 +97,10 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
     async def execute(self, action: str, product: str, **kwargs) -> Dict[str, Any]:
         """Execute features management action"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Find product
-            product_id = client.resolve_product_id(product)
+            product_id = await client.resolve_product_id(product)
             if not product_id:
                 return {
                     "success": False,
@@ -135,7 +135,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 "action": action
             }
     
-    async def _get_current_features(self, client: ShopifyClient, product_id: str) -> Tuple[List[Dict], Optional[str]]:
+    async def _get_current_features(self, client: AsyncShopifyClient, product_id: str) -> Tuple[List[Dict], Optional[str]]:
         """Get current features from metafield"""
         query = f'''{{
             product(id: "{product_id}") {{
@@ -162,7 +162,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
             }}
         }}'''
         
-        result = client.execute_graphql(query)
+        result = await client.execute_graphql(query)
         
         if 'errors' in result:
             return [], None
@@ -220,7 +220,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
             "count": len(features)
         }
     
-    async def _add_feature(self, client: ShopifyClient, product_id: str, 
+    async def _add_feature(self, client: AsyncShopifyClient, product_id: str, 
                           current_features: List[Dict], metafield_id: Optional[str], 
                           kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new feature"""
@@ -262,7 +262,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 "error": "Failed to update features metafield"
             }
     
-    async def _update_feature(self, client: ShopifyClient, current_features: List[Dict], 
+    async def _update_feature(self, client: AsyncShopifyClient, current_features: List[Dict], 
                              kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing feature"""
         position = kwargs.get('position')
@@ -302,7 +302,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 "error": "Failed to update feature metaobject"
             }
     
-    async def _remove_feature(self, client: ShopifyClient, product_id: str,
+    async def _remove_feature(self, client: AsyncShopifyClient, product_id: str,
                              current_features: List[Dict], metafield_id: Optional[str],
                              kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Remove a feature"""
@@ -343,7 +343,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 "error": "Failed to update features metafield"
             }
     
-    async def _reorder_features(self, client: ShopifyClient, product_id: str,
+    async def _reorder_features(self, client: AsyncShopifyClient, product_id: str,
                                current_features: List[Dict], metafield_id: Optional[str],
                                kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Reorder features"""
@@ -394,7 +394,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 "error": "Invalid order format. Use comma-separated numbers (e.g., '3,1,2,4')"
             }
     
-    async def _clear_features(self, client: ShopifyClient, product_id: str,
+    async def _clear_features(self, client: AsyncShopifyClient, product_id: str,
                              current_features: List[Dict]) -> Dict[str, Any]:
         """Clear all features"""
         # Delete all metaobjects
@@ -421,7 +421,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         else:
             return f"**{title}**"
     
-    async def _get_metaobject_definition_id(self, client: ShopifyClient) -> Optional[str]:
+    async def _get_metaobject_definition_id(self, client: AsyncShopifyClient) -> Optional[str]:
         """Get metaobject definition ID for product_features_block"""
         query = '''
         {
@@ -436,7 +436,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         }
         '''
         
-        result = client.execute_graphql(query)
+        result = await client.execute_graphql(query)
         
         if 'errors' in result:
             return None
@@ -448,7 +448,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         
         return None
     
-    async def _create_feature_metaobject(self, client: ShopifyClient, text: str, 
+    async def _create_feature_metaobject(self, client: AsyncShopifyClient, text: str, 
                                         image_id: Optional[str] = None, 
                                         status: str = "ACTIVE") -> Optional[str]:
         """Create a new feature metaobject"""
@@ -483,7 +483,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return None
@@ -495,7 +495,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         metaobject = result.get('data', {}).get('metaobjectCreate', {}).get('metaobject')
         return metaobject['id'] if metaobject else None
     
-    async def _update_feature_metaobject(self, client: ShopifyClient, metaobject_id: str, 
+    async def _update_feature_metaobject(self, client: AsyncShopifyClient, metaobject_id: str, 
                                         text: str, image_id: Optional[str] = None,
                                         status: Optional[str] = None) -> bool:
         """Update an existing feature metaobject"""
@@ -533,7 +533,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
                 }
             }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return False
@@ -541,7 +541,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         user_errors = result.get('data', {}).get('metaobjectUpdate', {}).get('userErrors', [])
         return len(user_errors) == 0
     
-    async def _delete_feature_metaobject(self, client: ShopifyClient, metaobject_id: str) -> bool:
+    async def _delete_feature_metaobject(self, client: AsyncShopifyClient, metaobject_id: str) -> bool:
         """Delete a feature metaobject"""
         mutation = """
         mutation deleteMetaobject($id: ID!) {
@@ -557,7 +557,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         
         variables = {"id": metaobject_id}
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return False
@@ -565,7 +565,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
         user_errors = result.get('data', {}).get('metaobjectDelete', {}).get('userErrors', [])
         return len(user_errors) == 0
     
-    async def _update_features_metafield(self, client: ShopifyClient, product_id: str, 
+    async def _update_features_metafield(self, client: AsyncShopifyClient, product_id: str, 
                                         metaobject_ids: List[str]) -> bool:
         """Update features metafield with metaobject references"""
         mutation = """
@@ -592,7 +592,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
             }]
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return False
@@ -603,7 +603,7 @@ class ManageFeaturesMetaobjectsTool(BaseMCPTool):
     async def test(self) -> Dict[str, Any]:
         """Test features metaobjects management"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test getting metaobject definition
             definition_id = await self._get_metaobject_definition_id(client)
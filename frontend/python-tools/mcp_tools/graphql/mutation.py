@@ -4,7 +4,7 @@ Native MCP implementation for GraphQL mutations
 
 import json
 from typing import Dict, Any, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class GraphQLMutationTool(BaseMCPTool):
     """Execute GraphQL mutations on Shopify Admin API"""
@@ -57,10 +57,10 @@ class GraphQLMutationTool(BaseMCPTool):
     async def execute(self, mutation: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute GraphQL mutation"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Execute the mutation
-            result = client.execute_graphql(mutation, variables)
+            result = await client.execute_graphql(mutation, variables)
             
             # Check for user errors in common mutation response patterns
             user_errors = []
@@ -93,8 +93,8 @@ class GraphQLMutationTool(BaseMCPTool):
         try:
             # Use a query for testing, not an actual mutation
             query = "{ shop { name } }"
-            client = ShopifyClient()
-            result = client.execute_graphql(query)
+            client = AsyncShopifyClient()
+            result = await client.execute_graphql(query)
             
             return {
                 "status": "passed",
@@ -4,13 +4,14 @@ Native MCP implementation for GraphQL queries
 
 import json
 from typing import Dict, Any, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class GraphQLQueryTool(BaseMCPTool):
     """Execute GraphQL queries on Shopify Admin API"""
     
     name = "graphql_query"
     description = "Execute GraphQL queries on Shopify Admin API"
+    read_only = True
     context = """
     Executes raw GraphQL queries against the Shopify Admin API.
     
@@ -52,10 +53,10 @@ class GraphQLQueryTool(BaseMCPTool):
     async def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute GraphQL query"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Execute the query
-            result = client.execute_graphql(query, variables)
+            result = await client.execute_graphql(query, variables)
             
             # Return the full result including data and extensions
             return {
@@ -5,7 +5,7 @@ MCP wrapper for manage_inventory_policy tool
 from typing import Dict, Any, Optional, List
 import json
 from ..base import BaseMCPTool
-from base import ShopifyClient
+from base import AsyncShopifyClient
 
 class ManageInventoryPolicyTool(BaseMCPTool):
     """Manage product inventory policy (oversell settings)"""
@@ -67,7 +67,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         
         try:
             # Initialize Shopify client
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # First, find the product/variants based on identifier
             variants = await self._find_variants(client, identifier)
@@ -125,7 +125,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         except Exception as e:
             raise Exception(f"manage_inventory_policy failed: {str(e)}")
     
-    async def _find_variants(self, client: ShopifyClient, identifier: str) -> List[Dict[str, Any]]:
+    async def _find_variants(self, client: AsyncShopifyClient, identifier: str) -> List[Dict[str, Any]]:
         """Find variants based on identifier (variant ID, SKU, or product handle)"""
         
         if not identifier:
@@ -158,7 +158,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
             }
             """
             
-            result = client.execute_graphql(query, {
+            result = await client.execute_graphql(query, {
                 "id": f"gid://shopify/ProductVariant/{identifier}"
             })
             
@@ -186,7 +186,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         }
         """
         
-        result = client.execute_graphql(sku_query, {
+        result = await client.execute_graphql(sku_query, {
             "query": f"sku:{identifier}"
         })
         
@@ -219,7 +219,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         }
         """
         
-        result = client.execute_graphql(handle_query, {
+        result = await client.execute_graphql(handle_query, {
             "handle": identifier
         })
         
@@ -239,7 +239,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         
         return []
     
-    async def _update_variant_inventory_policy(self, client: ShopifyClient, variant_id: str, policy: str, product_id: str) -> Dict[str, Any]:
+    async def _update_variant_inventory_policy(self, client: AsyncShopifyClient, variant_id: str, policy: str, product_id: str) -> Dict[str, Any]:
         """Update inventory policy for a specific variant using bulk update"""
         
         mutation = """
@@ -277,7 +277,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
         if not product_id.startswith("gid://"):
             product_id = f"gid://shopify/Product/{product_id}"
         
-        result = client.execute_graphql(mutation, {
+        result = await client.execute_graphql(mutation, {
             "productId": product_id,
             "variants": [{
                 "id": variant_id,
@@ -313,7 +313,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
             self.validate_env()
             
             # Test by performing a read-only query
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Simple query to test API connectivity
             query = """
@@ -325,7 +325,7 @@ class ManageInventoryPolicyTool(BaseMCPTool):
             }
             """
             
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result.get('data', {}).get('shop'):
                 return {
@@ -13,7 +13,7 @@ import asyncio
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class AddProductImagesTool(BaseMCPTool):
@@ -88,10 +88,10 @@ class AddProductImagesTool(BaseMCPTool):
                      local_files: Optional[bool] = None) -> Dict[str, Any]:
         """Execute product image management"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            resolved_id = client.resolve_product_id(product_id)
+            resolved_id = await client.resolve_product_id(product_id)
             if not resolved_id:
                 return {
                     "success": False,
@@ -123,7 +123,7 @@ class AddProductImagesTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _list_images(self, client: ShopifyClient, product_id: str) -> Dict[str, Any]:
+    async def _list_images(self, client: AsyncShopifyClient, product_id: str) -> Dict[str, Any]:
         """List all product images"""
         query = """
         query getProductImages($id: ID!) {
@@ -149,7 +149,7 @@ class AddProductImagesTool(BaseMCPTool):
         """
         
         variables = {"id": product_id}
-        result = client.execute_graphql(query, variables)
+        result = await client.execute_graphql(query, variables)
         
         product = result.get('data', {}).get('product')
         if not product:
@@ -175,7 +175,7 @@ class AddProductImagesTool(BaseMCPTool):
             "images": images
         }
     
-    async def _add_images(self, client: ShopifyClient, product_id: str, images: List[str],
+    async def _add_images(self, client: AsyncShopifyClient, product_id: str, images: List[str],
                          alt_texts: Optional[List[str]] = None, local_files: Optional[bool] = None) -> Dict[str, Any]:
         """Add images to product"""
         
@@ -208,7 +208,7 @@ class AddProductImagesTool(BaseMCPTool):
         
         return result
     
-    async def _upload_local_file(self, client: ShopifyClient, file_path: str, alt_text: Optional[str] = None) -> str:
+    async def _upload_local_file(self, client: AsyncShopifyClient, file_path: str, alt_text: Optional[str] = None) -> str:
         """Upload local file to Shopify staging"""
         # Get file info
         filename = os.path.basename(file_path)
@@ -252,7 +252,7 @@ class AddProductImagesTool(BaseMCPTool):
             }]
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('stagedUploadsCreate', {}).get('userErrors'):
             errors = result['data']['stagedUploadsCreate']['userErrors']
@@ -276,7 +276,7 @@ class AddProductImagesTool(BaseMCPTool):
         
         return target['resourceUrl']
     
-    async def _create_product_media(self, client: ShopifyClient, product_id: str, 
+    async def _create_product_media(self, client: AsyncShopifyClient, product_id: str, 
                                    sources: List[str], alt_texts: Optional[List[str]] = None) -> Dict[str, Any]:
         """Create product media from URLs or resource URLs"""
         mutation = """
@@ -336,7 +336,7 @@ class AddProductImagesTool(BaseMCPTool):
             "media": media
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         # Check for errors
         if result.get('data', {}).get('productCreateMedia', {}).get('mediaUserErrors'):
@@ -361,7 +361,7 @@ class AddProductImagesTool(BaseMCPTool):
             ]
         }
     
-    async def _delete_images(self, client: ShopifyClient, product_id: str, positions: List[int]) -> Dict[str, Any]:
+    async def _delete_images(self, client: AsyncShopifyClient, product_id: str, positions: List[int]) -> Dict[str, Any]:
         """Delete images by position"""
         # Get current images
         list_result = await self._list_images(client, product_id)
@@ -402,7 +402,7 @@ class AddProductImagesTool(BaseMCPTool):
             "mediaIds": media_ids
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productDeleteMedia', {}).get('mediaUserErrors'):
             errors = result['data']['productDeleteMedia']['mediaUserErrors']
@@ -416,7 +416,7 @@ class AddProductImagesTool(BaseMCPTool):
             "deleted_ids": deleted
         }
     
-    async def _reorder_images(self, client: ShopifyClient, product_id: str, positions: List[int]) -> Dict[str, Any]:
+    async def _reorder_images(self, client: AsyncShopifyClient, product_id: str, positions: List[int]) -> Dict[str, Any]:
         """Reorder images"""
         # Get current images
         list_result = await self._list_images(client, product_id)
@@ -463,7 +463,7 @@ class AddProductImagesTool(BaseMCPTool):
             "moves": moves
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productReorderMedia', {}).get('userErrors'):
             errors = result['data']['productReorderMedia']['userErrors']
@@ -474,7 +474,7 @@ class AddProductImagesTool(BaseMCPTool):
             "message": "Images reordered successfully"
         }
     
-    async def _clear_images(self, client: ShopifyClient, product_id: str) -> Dict[str, Any]:
+    async def _clear_images(self, client: AsyncShopifyClient, product_id: str) -> Dict[str, Any]:
         """Clear all images"""
         # Get current images
         list_result = await self._list_images(client, product_id)
@@ -497,10 +497,10 @@ class AddProductImagesTool(BaseMCPTool):
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
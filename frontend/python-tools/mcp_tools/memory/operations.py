@@ -2,12 +2,19 @@
 Native MCP implementation for memory operations
 """
 
+import asyncio
 import json
+import logging
 import sqlite3
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from datetime import datetime
 from ..base import BaseMCPTool
+from base import get_io_executor
+import memory_search
+import memory_vectors
+
+logger = logging.getLogger(__name__)
 
 class MemoryOperationsTool(BaseMCPTool):
     """Memory operations for EspressoBot's local memory system"""
@@ -18,7 +25,8 @@ class MemoryOperationsTool(BaseMCPTool):
     Provides access to EspressoBot's local memory system with semantic search.
     
     Operations:
-    - search: Search memories with semantic similarity
+    - search: Semantic search over stored embeddings, or full-text search
+      (BM25 ranked, prefix matching) when no embedding function is configured
     - add: Add new memories
     - list: List recent memories
     - delete: Remove specific memories
@@ -48,6 +56,12 @@ class MemoryOperationsTool(BaseMCPTool):
                 "type": "string",
                 "description": "Search query (for search operation)"
             },
+            "mode": {
+                "type": "string",
+                "enum": ["auto", "semantic", "text"],
+                "description": "Search mode: semantic when available (auto), embeddings only, or full-text only",
+                "default": "auto"
+            },
             "content": {
                 "type": "string",
                 "description": "Memory content to add"
@@ -81,7 +95,8 @@ class MemoryOperationsTool(BaseMCPTool):
         
         try:
             if operation == 'search':
-                return await self._search(kwargs.get('query', ''), user_id, kwargs.get('limit', 10))
+                return await self._search(kwargs.get('query', ''), user_id, kwargs.get('limit', 10),
+                                          kwargs.get('mode', 'auto'))
             elif operation == 'add':
                 return await self._add(kwargs.get('content', ''), user_id)
             elif operation == 'list':
@@ -98,7 +113,7 @@ class MemoryOperationsTool(BaseMCPTool):
                 "operation": operation
             }
     
-    async def _search(self, query: str, user_id: str, limit: int) -> Dict[str, Any]:
+    async def _search(self, query: str, user_id: str, limit: int, mode: str = 'auto') -> Dict[str, Any]:
         """Search memories"""
         if not query:
             return {"success": False, "error": "Query required for search"}
@@ -108,38 +123,57 @@ class MemoryOperationsTool(BaseMCPTool):
             return {"success": False, "error": f"Database not found at {self.db_path}"}
             
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            # Used from the I/O executor too, one statement at a time
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
             conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
         except sqlite3.Error as e:
             return {"success": False, "error": f"Database connection error: {str(e)}"}
         
         try:
-            # For now, do simple text search
-            # TODO: Integrate with embedding search when available
-            cursor.execute("""
-                SELECT id, content, metadata, created_at 
-                FROM memories 
-                WHERE user_id = ? AND content LIKE ?
-                ORDER BY created_at DESC 
-                LIMIT ?
-            """, (user_id, f'%{query}%', limit))
+            rows = None
+            fallback_reason = None
+            if mode != 'text' and memory_vectors.semantic_available():
+                try:
+                    # Embedding (maybe an HTTP call), index refresh and the matrix product
+                    # all run off the event loop
+                    rows = await self._run_io(memory_vectors.semantic_search, conn, self.db_path,
+                                              query, user_id, limit)
+                except Exception as e:
+                    if mode == 'semantic':
+                        return {"success": False, "error": f"Semantic search failed: {e}"}
+                    logger.warning(f"Semantic memory search failed, using full-text search: {e}")
+                    fallback_reason = str(e)
+            if rows is None and mode == 'semantic':
+                return {"success": False, "error": "Semantic search needs numpy and an embedding function"}
+            if rows is None:
+                # BM25-ranked FTS5 search, index kept in sync by triggers
+                rows = memory_search.search(conn, str(self.db_path), query, user_id, limit)
+                mode = 'text'
+            else:
+                mode = 'semantic'
             
             memories = []
-            for row in cursor.fetchall():
-                memories.append({
+            for row in rows:
+                memory = {
                     'id': row['id'],
                     'content': row['content'],
                     'metadata': json.loads(row['metadata']) if row['metadata'] else {},
                     'created_at': row['created_at']
-                })
+                }
+                if row['score'] is not None:
+                    memory['score'] = row['score']
+                memories.append(memory)
             
-            return {
+            response = {
                 "success": True,
                 "memories": memories,
                 "count": len(memories),
-                "query": query
+                "query": query,
+                "mode": mode
             }
+            if fallback_reason:
+                response["fallback_reason"] = fallback_reason
+            return response
             
         finally:
             conn.close()
@@ -149,27 +183,27 @@ class MemoryOperationsTool(BaseMCPTool):
         if not content:
             return {"success": False, "error": "Content required"}
             
+        # Embedded off the event loop; a failed embedding stores the memory without one
+        embedding = await self._run_io(memory_vectors.try_embed, content)
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                INSERT INTO memories (user_id, content, created_at)
-                VALUES (?, ?, ?)
-            """, (user_id, content, datetime.now().isoformat()))
-            
-            conn.commit()
-            memory_id = cursor.lastrowid
+            memory = memory_vectors.add_memory(conn, user_id, content, embedding=embedding)
             
             return {
                 "success": True,
                 "message": "Memory added successfully",
-                "memory_id": memory_id
+                "memory_id": memory["id"],
+                "embedded": memory["embedded"]
             }
             
         finally:
             conn.close()
     
+    @staticmethod
+    async def _run_io(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(get_io_executor(), fn, *args)
+    
     async def _list(self, user_id: str, limit: int) -> Dict[str, Any]:
         """List recent memories"""
         conn = sqlite3.connect(self.db_path)
@@ -2,10 +2,12 @@
 MCP wrapper for bulk_price_update tool - now a self-contained native tool.
 """
 
-from typing import Dict, Any, Optional, List
-from collections import defaultdict
+from typing import Dict, Any, List
 from ..base import BaseMCPTool
-from ..base import ShopifyClient
+from ..base import AsyncShopifyClient
+from mcp_deadline import record_progress
+from price_diff import PRICE_SELECTION, plan_price_changes
+from shopify_mutations import MutationExecutor
 
 class BulkPriceUpdateTool(BaseMCPTool):
     """Update prices for multiple products at once using native API calls."""
@@ -25,7 +27,12 @@ class BulkPriceUpdateTool(BaseMCPTool):
 
     Important:
     - Processes updates in batches for efficiency by grouping variants per product.
-    - Reports success/failure for each product.
+    - Skips variants that already have the requested prices.
+    - Updates several products at once, paced by the API cost budget.
+    - Every write finishes before the tool returns. The result is the
+      summary (success, variants_updated, variants_unchanged, errors) with
+      the plan (change counts, estimated duration) under "plan" and
+      success/failure for each product under "products".
     - Use for seasonal sales, bulk repricing, etc.
     """
 
@@ -49,97 +56,95 @@ class BulkPriceUpdateTool(BaseMCPTool):
         "required": ["updates"]
     }
 
+    timeout = 600
+
+    PRICE_MUTATION = '''
+    mutation updateVariantPricing($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+        productVariantsBulkUpdate(productId: $productId, variants: $variants) {
+            productVariants {
+                id
+            }
+            userErrors {
+                field
+                message
+            }
+        }
+    }
+    '''
+
     async def execute(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute bulk price update natively."""
-        self.validate_env()
-        client = ShopifyClient()
+        """Execute bulk price update natively.
 
-        # Group variants by product ID
-        product_updates: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        errors = []
+        Runs every mutation before returning. The summary keys are the ones
+        this tool has always returned; ``plan`` holds the change counts,
+        mutation count, concurrency and estimated duration, and ``products``
+        one outcome per product in completion order.
+        """
+        self.validate_env()
+        client = AsyncShopifyClient()
 
+        # Resolve every variant and read its current prices in a few batched queries
+        variants_found = await client.resolve_variants([str(update['variant_id']) for update in updates],
+                                                       PRICE_SELECTION)
+        current = {v['id']: v for v in variants_found.values() if v}
+        requested = []
         for update in updates:
-            variant_id = str(update['variant_id'])
-            product_id = await self._get_product_id_for_variant(client, variant_id)
-
-            if not product_id:
-                errors.append({"variant_id": variant_id, "error": "Product not found"})
-                continue
-
-            variant_gid = f"gid://shopify/ProductVariant/{variant_id}" if not variant_id.startswith('gid://') else variant_id
-            
-            variant_update = {
-                "id": variant_gid,
-                "price": str(update["price"])
-            }
-            if "compare_at_price" in update and update["compare_at_price"] is not None:
-                variant_update["compareAtPrice"] = str(update["compare_at_price"])
-            else:
-                variant_update["compareAtPrice"] = None
+            variant = variants_found.get(str(update['variant_id']))
+            requested.append({
+                "variant_id": variant['id'] if variant else str(update['variant_id']),
+                "price": update["price"],
+                "compare_at_price": update.get("compare_at_price"),
+            })
+
+        # Only variants whose prices actually change are written, grouped per product
+        price_plan = plan_price_changes(requested, current)
+        errors = [{"variant_id": variant_id, "error": "Product not found"} for variant_id in price_plan.not_found]
+        errors += price_plan.invalid
+        executor = MutationExecutor(client)
+        jobs = [(product_id, {'productId': product_id, 'variants': variants})
+                for product_id, variants in price_plan.changes.items()]
+        plan = {**price_plan.counts(), **executor.plan(self.PRICE_MUTATION, jobs)}
 
-            product_updates[product_id].append(variant_update)
-
-    # Execute bulk updates per product
         updated_count = 0
-        for product_id, variants in product_updates.items():
-            mutation = '''
-            mutation updateVariantPricing($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
-                productVariantsBulkUpdate(productId: $productId, variants: $variants) {
-                    productVariants {
-                        id
-                    }
-                    userErrors {
-                        field
-                        message
-                    }
-                }
-            }
-            '''
-            variables = {
-                'productId': product_id,
-                'variants': variants
-            }
-            result = client.execute_graphql(mutation, variables)
-            data = result.get('data', {}).get('productVariantsBulkUpdate', {})
+        updated_products = []
+        remaining_products = [product_id for product_id, _ in jobs]
+        product_items = []
+        record_progress(not_yet_updated=remaining_products)
+        async for outcome in executor.run(self.PRICE_MUTATION, jobs):
+            product_id = outcome["key"]
+            remaining_products.remove(product_id)
+            item = {"product_id": product_id, "attempts": outcome["attempts"]}
+            data = ((outcome["result"] or {}).get('data') or {}).get('productVariantsBulkUpdate') or {}
             user_errors = data.get('userErrors', [])
 
-            if user_errors:
-                errors.append({"product_id": product_id, "error": user_errors})
+            if outcome["error"] or user_errors:
+                errors.append({"product_id": product_id, "error": outcome["error"] or user_errors})
+                item.update(success=False, error=outcome["error"] or user_errors)
             else:
                 updated_count += len(data.get('productVariants', []))
+                updated_products.append(product_id)
+                item.update(success=True, variants_updated=len(data.get('productVariants', [])))
+            record_progress(variants_updated=updated_count, updated_products=updated_products, errors=errors,
+                            not_yet_updated=remaining_products)
+            product_items.append(item)
 
         return {
             "success": len(errors) == 0,
             "total_variants_processed": len(updates),
             "variants_updated": updated_count,
-            "errors": errors
-        }
-
-    async def _get_product_id_for_variant(self, client: ShopifyClient, variant_id: str) -> Optional[str]:
-        """Get the parent product ID for a given variant ID."""
-        variant_gid = f"gid://shopify/ProductVariant/{variant_id}" if not variant_id.startswith('gid://') else variant_id
-
-        query = '''
-        query getProductFromVariant($id: ID!) {
-            productVariant(id: $id) {
-                product {
-                    id
-                }
-            }
+            "variants_unchanged": len(price_plan.unchanged),
+            "errors": errors,
+            "plan": plan,
+            "products": product_items
         }
-        '''
-        result = client.execute_graphql(query, {"id": variant_gid})
-        if result and result.get("data", {}).get("productVariant"):
-            return result["data"]["productVariant"]["product"]["id"]
-        return None
 
     async def test(self) -> Dict[str, Any]:
         """Test the tool (read-only test)"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             query = "{ shop { name } }"
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             if result.get('data', {}).get('shop'):
                 return {
                     "status": "passed",
@@ -5,7 +5,7 @@ MCP wrapper for update_pricing tool
 from typing import Dict, Any, Optional
 import json
 from ..base import BaseMCPTool
-from base import ShopifyClient
+from base import AsyncShopifyClient
 
 class UpdatePricingTool(BaseMCPTool):
     """Update product variant pricing"""
@@ -68,7 +68,7 @@ class UpdatePricingTool(BaseMCPTool):
         self.validate_env()
         
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Normalize IDs
             if not product_id.startswith('gid://'):
@@ -115,7 +115,7 @@ class UpdatePricingTool(BaseMCPTool):
                 'variants': [variant_input]
             }
             
-            result = client.execute_graphql(mutation, variables)
+            result = await client.execute_graphql(mutation, variables)
             
             # Check for errors
             data = result.get('data', {}).get('productVariantsBulkUpdate', {})
@@ -144,7 +144,7 @@ class UpdatePricingTool(BaseMCPTool):
         except Exception as e:
             raise Exception(f"update_pricing failed: {str(e)}")
     
-    async def _update_variant_cost(self, client: ShopifyClient, variant_id: str, cost: float) -> Dict[str, Any]:
+    async def _update_variant_cost(self, client: AsyncShopifyClient, variant_id: str, cost: float) -> Dict[str, Any]:
         """Update inventory item cost (separate mutation)"""
         try:
             # First get the inventory item ID
@@ -158,7 +158,7 @@ class UpdatePricingTool(BaseMCPTool):
             }
             '''
             
-            inv_result = client.execute_graphql(query, {'id': variant_id})
+            inv_result = await client.execute_graphql(query, {'id': variant_id})
             inventory_item = inv_result.get('data', {}).get('productVariant', {}).get('inventoryItem')
             
             if not inventory_item:
@@ -190,7 +190,7 @@ class UpdatePricingTool(BaseMCPTool):
                 }
             }
             
-            cost_result = client.execute_graphql(mutation, variables)
+            cost_result = await client.execute_graphql(mutation, variables)
             
             # Check for errors
             cost_data = cost_result.get('data', {}).get('inventoryItemUpdate', {})
@@ -216,7 +216,7 @@ class UpdatePricingTool(BaseMCPTool):
             # Test environment and API connectivity
             self.validate_env()
             
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Simple query to test API connectivity
             query = """
@@ -228,7 +228,7 @@ class UpdatePricingTool(BaseMCPTool):
             }
             """
             
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result.get('data', {}).get('shop'):
                 return {
@@ -5,7 +5,7 @@ MCP wrapper for update_costs tool - update costs by SKU
 from typing import Dict, Any, Optional, List
 import json
 from ..base import BaseMCPTool
-from base import ShopifyClient
+from base import AsyncShopifyClient
 
 class UpdateCostsTool(BaseMCPTool):
     """Update product costs by SKU - faster than update_pricing for cost-only changes"""
@@ -18,7 +18,7 @@ class UpdateCostsTool(BaseMCPTool):
     Key Benefits:
     - Faster than update_pricing when only cost needs updating
     - Direct SKU lookup (no need for product/variant IDs)  
-    - Bulk-friendly with detailed success/failure reporting
+    - Bulk-friendly: pass ``updates`` to look up every SKU in a few batched queries
     - Preserves all other variant fields
     
     Use Cases:
@@ -51,19 +51,84 @@ class UpdateCostsTool(BaseMCPTool):
                 "type": "string",
                 "description": "Currency code (default: USD)",
                 "default": "USD"
+            },
+            "updates": {
+                "type": "array",
+                "description": "Several cost updates at once (instead of sku/cost)",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "sku": {"type": "string"},
+                        "cost": {"type": "number"}
+                    },
+                    "required": ["sku", "cost"]
+                }
             }
-        },
-        "required": ["sku", "cost"]
+        }
     }
     
-    async def execute(self, sku: str, cost: float, currency: str = "USD") -> Dict[str, Any]:
-        """Update cost for a variant by SKU"""
+    VARIANT_SELECTION = '''
+        title
+        product {
+            id
+            title
+            handle
+        }
+        inventoryItem {
+            id
+            unitCost {
+                amount
+                currencyCode
+            }
+        }
+        '''
+    
+    async def execute(self, sku: Optional[str] = None, cost: Optional[float] = None, currency: str = "USD",
+                      updates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Update cost for a variant by SKU, or for each of ``updates``"""
         self.validate_env()
         
+        if updates is None:
+            if not sku:
+                return {"success": False, "error": "Either sku and cost, or updates, are required"}
+            updates = [{"sku": sku, "cost": cost}]
+            single = True
+        else:
+            single = False
+        
+        try:
+            client = AsyncShopifyClient()
+            
+            # Look up every SKU's inventory item in batched queries
+            variants = await client.resolve_variants([u["sku"] for u in updates], self.VARIANT_SELECTION,
+                                                     skus_only=True)
+            results = []
+            for update in updates:
+                results.append(await self._update_one(client, update["sku"], update.get("cost"),
+                                                      currency, variants.get(update["sku"])))
+        except Exception as e:
+            raise Exception(f"update_costs failed: {str(e)}")
+        
+        if single:
+            return results[0]
+        return {
+            "success": all(r["success"] for r in results),
+            "summary": {
+                "total": len(results),
+                "updated": sum(1 for r in results if r["success"]),
+                "failed": sum(1 for r in results if not r["success"])
+            },
+            "results": results
+        }
+    
+    async def _update_one(self, client: AsyncShopifyClient, sku: str, cost: Any, currency: str,
+                          variant: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate and apply one cost update to an already resolved variant"""
         # Validate cost parameter
         if cost is None:
             return {
                 "success": False,
+                "sku": sku,
                 "error": "Cost parameter cannot be None. Please provide a valid numeric cost value."
             }
         
@@ -73,99 +138,58 @@ class UpdateCostsTool(BaseMCPTool):
             except (ValueError, TypeError):
                 return {
                     "success": False,
+                    "sku": sku,
                     "error": f"Invalid cost value: {cost}. Must be a number."
                 }
         
         if cost < 0:
             return {
                 "success": False,
+                "sku": sku,
                 "error": "Cost cannot be negative"
             }
         
-        try:
-            client = ShopifyClient()
-            
-            # Get variant info by SKU
-            variant = await self._get_variant_by_sku(client, sku)
-            if not variant:
-                return {
-                    "success": False,
-                    "error": f"SKU not found: {sku}"
-                }
-            
-            # Get current cost for comparison
-            current_cost = 0.0
-            if variant.get('inventoryItem', {}).get('unitCost'):
-                current_cost = float(variant['inventoryItem']['unitCost']['amount'])
-            
-            # Update cost via inventory item
-            success, result = await self._update_inventory_cost(
-                client, 
-                variant['inventoryItem']['id'], 
-                cost
-            )
-            
-            if success:
-                return {
-                    "success": True,
-                    "sku": sku,
-                    "product_title": variant['product']['title'],
-                    "variant_title": variant.get('title', 'Default'),
-                    "cost_update": {
-                        "old_cost": current_cost,
-                        "new_cost": cost,
-                        "currency": currency,
-                        "change": cost - current_cost
-                    },
-                    "inventory_item_id": variant['inventoryItem']['id']
-                }
-            else:
-                return {
-                    "success": False,
-                    "sku": sku,
-                    "error": result
-                }
-                
-        except Exception as e:
-            raise Exception(f"update_costs failed: {str(e)}")
-    
-    async def _get_variant_by_sku(self, client: ShopifyClient, sku: str) -> Optional[Dict[str, Any]]:
-        """Get variant and inventory item info by SKU"""
-        query = '''
-        query getVariantBySku($query: String!) {
-            productVariants(first: 1, query: $query) {
-                edges {
-                    node {
-                        id
-                        sku
-                        title
-                        product {
-                            id
-                            title
-                            handle
-                        }
-                        inventoryItem {
-                            id
-                            unitCost {
-                                amount
-                                currencyCode
-                            }
-                        }
-                    }
-                }
+        if not variant:
+            return {
+                "success": False,
+                "sku": sku,
+                "error": f"SKU not found: {sku}"
             }
-        }
-        '''
         
-        variables = {"query": f"sku:{sku}"}
-        result = client.execute_graphql(query, variables)
+        # Get current cost for comparison
+        current_cost = 0.0
+        if variant.get('inventoryItem', {}).get('unitCost'):
+            current_cost = float(variant['inventoryItem']['unitCost']['amount'])
         
-        edges = result.get('data', {}).get('productVariants', {}).get('edges', [])
-        if edges:
-            return edges[0]['node']
-        return None
+        # Update cost via inventory item
+        success, result = await self._update_inventory_cost(
+            client, 
+            variant['inventoryItem']['id'], 
+            cost
+        )
+        
+        if success:
+            return {
+                "success": True,
+                "sku": sku,
+                "product_title": variant['product']['title'],
+                "variant_title": variant.get('title', 'Default'),
+                "cost_update": {
+                    "old_cost": current_cost,
+                    "new_cost": cost,
+                    "currency": currency,
+                    "change": cost - current_cost
+                },
+                "inventory_item_id": variant['inventoryItem']['id']
+            }
+        else:
+            return {
+                "success": False,
+                "sku": sku,
+                "error": result
+            }
     
-    async def _update_inventory_cost(self, client: ShopifyClient, inventory_item_id: str, cost: float) -> tuple[bool, Any]:
+    async def _update_inventory_cost(self, client: AsyncShopifyClient, inventory_item_id: str, cost: float) -> tuple[bool, Any]:
         """Update cost for inventory item"""
         mutation = '''
         mutation updateCost($id: ID!, $input: InventoryItemInput!) {
@@ -192,7 +216,7 @@ class UpdateCostsTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         # Check for errors
         update_data = result.get('data', {}).get('inventoryItemUpdate', {})
@@ -210,7 +234,7 @@ class UpdateCostsTool(BaseMCPTool):
             # Test environment and API connectivity
             self.validate_env()
             
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Simple query to test API connectivity
             query = """
@@ -222,7 +246,7 @@ class UpdateCostsTool(BaseMCPTool):
             }
             """
             
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result.get('data', {}).get('shop'):
                 return {
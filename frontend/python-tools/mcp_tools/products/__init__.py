@@ -1,18 +1,25 @@
 #!/usr/bin/env python3
 """
 Product management tools for EspressoBot.
+
+Tool classes resolve on first access, so importing one tool module does not
+import its siblings.
 """
 
-from .get import GetProductTool
-from .search import SearchProductsTool
-from .create import CreateProductTool
-from .update_status import UpdateStatusTool
-from .update_variant_weight import UpdateVariantWeightTool
+import importlib
+
+_TOOL_MODULES = {
+    'GetProductTool': '.get',
+    'SearchProductsTool': '.search',
+    'CreateProductTool': '.create',
+    'UpdateStatusTool': '.update_status',
+    'UpdateVariantWeightTool': '.update_variant_weight',
+}
+
+__all__ = list(_TOOL_MODULES)
+
 
-__all__ = [
-    'GetProductTool',
-    'SearchProductsTool', 
-    'CreateProductTool',
-    'UpdateStatusTool',
-    'UpdateVariantWeightTool'
-]
\ No newline at end of file
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        return getattr(importlib.import_module(_TOOL_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
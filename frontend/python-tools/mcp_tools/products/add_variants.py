@@ -10,7 +10,7 @@ from typing import Dict, Any, List, Optional, Union
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class AddVariantsTool(BaseMCPTool):
@@ -129,10 +129,10 @@ class AddVariantsTool(BaseMCPTool):
     async def execute(self, product_id: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute variant addition"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            resolved_id = client.resolve_product_id(product_id)
+            resolved_id = await client.resolve_product_id(product_id)
             if not resolved_id:
                 return {
                     "success": False,
@@ -158,7 +158,7 @@ class AddVariantsTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _validate_variants(self, client: ShopifyClient, product_id: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _validate_variants(self, client: AsyncShopifyClient, product_id: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Validate variants before creation"""
         
         # Get product info to check existing options
@@ -183,7 +183,7 @@ class AddVariantsTool(BaseMCPTool):
         """
         
         variables = {"id": product_id}
-        result = client.execute_graphql(query, variables)
+        result = await client.execute_graphql(query, variables)
         
         product = result.get('data', {}).get('product')
         if not product:
@@ -232,7 +232,7 @@ class AddVariantsTool(BaseMCPTool):
         
         return {"valid": True}
     
-    async def _create_variants(self, client: ShopifyClient, product_id: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _create_variants(self, client: AsyncShopifyClient, product_id: str, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create the variants using GraphQL mutation"""
         
         mutation = """
@@ -294,7 +294,7 @@ class AddVariantsTool(BaseMCPTool):
             "variants": formatted_variants
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         # Check for errors
         errors = result.get("data", {}).get("productVariantsBulkCreate", {}).get("userErrors")
@@ -326,10 +326,10 @@ class AddVariantsTool(BaseMCPTool):
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
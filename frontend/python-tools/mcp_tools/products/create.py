@@ -9,7 +9,7 @@ import os
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class CreateProductTool(BaseMCPTool):
@@ -98,7 +98,7 @@ class CreateProductTool(BaseMCPTool):
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute product creation natively"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Extract required fields
             title = kwargs.get('title')
@@ -159,7 +159,7 @@ class CreateProductTool(BaseMCPTool):
             '''
             
             variables = {"input": product_input}
-            result = client.execute_graphql(mutation, variables)
+            result = await client.execute_graphql(mutation, variables)
             
             if 'errors' in result:
                 return {"success": False, "error": f"GraphQL errors: {result['errors']}"}
@@ -199,7 +199,7 @@ class CreateProductTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _update_variant_details(self, client: ShopifyClient, product_id: str, variant_id: str,
+    async def _update_variant_details(self, client: AsyncShopifyClient, product_id: str, variant_id: str,
                                       inventory_item_id: str, kwargs: Dict[str, Any]) -> None:
         """Update variant with price, SKU, and other details"""
         mutation = '''
@@ -246,13 +246,13 @@ class CreateProductTool(BaseMCPTool):
             "variants": [variant_input]
         }
         
-        client.execute_graphql(mutation, variables)
+        await client.execute_graphql(mutation, variables)
         
         # Set initial inventory if provided
         if kwargs.get('inventory') is not None:
             await self._set_inventory(client, inventory_item_id, kwargs['inventory'])
     
-    async def _set_inventory(self, client: ShopifyClient, inventory_item_id: str, quantity: int) -> None:
+    async def _set_inventory(self, client: AsyncShopifyClient, inventory_item_id: str, quantity: int) -> None:
         """Set initial inventory quantity"""
         # First get the location
         location_query = '''
@@ -267,7 +267,7 @@ class CreateProductTool(BaseMCPTool):
         }
         '''
         
-        result = client.execute_graphql(location_query)
+        result = await client.execute_graphql(location_query)
         locations = result.get('data', {}).get('locations', {}).get('edges', [])
         
         if not locations:
@@ -298,16 +298,16 @@ class CreateProductTool(BaseMCPTool):
             }
         }
         
-        client.execute_graphql(inventory_mutation, variables)
+        await client.execute_graphql(inventory_mutation, variables)
             
     async def test(self) -> Dict[str, Any]:
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
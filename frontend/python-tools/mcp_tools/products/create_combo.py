@@ -10,7 +10,7 @@ import numpy as np
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class CreateComboTool(BaseMCPTool):
     """Create machine+grinder combo products"""
@@ -90,7 +90,7 @@ class CreateComboTool(BaseMCPTool):
     async def execute(self, product1: str, product2: str, **kwargs) -> Dict[str, Any]:
         """Create a combo product"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Get product details
             product1_data = await self._get_product_details(client, product1)
@@ -131,9 +131,9 @@ class CreateComboTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _get_product_details(self, client: ShopifyClient, identifier: str) -> Optional[Dict[str, Any]]:
+    async def _get_product_details(self, client: AsyncShopifyClient, identifier: str) -> Optional[Dict[str, Any]]:
         """Get product details including variants and images"""
-        product_id = client.resolve_product_id(identifier)
+        product_id = await client.resolve_product_id(identifier)
         if not product_id:
             return None
         
@@ -187,14 +187,14 @@ class CreateComboTool(BaseMCPTool):
         }
         '''
         
-        result = client.execute_graphql(query, {"id": product_id})
+        result = await client.execute_graphql(query, {"id": product_id})
         
         if result and 'data' in result and result['data'].get('product'):
             return result['data']['product']
         
         return None
     
-    async def _create_combo_listing(self, client: ShopifyClient, product1: Dict[str, Any], 
+    async def _create_combo_listing(self, client: AsyncShopifyClient, product1: Dict[str, Any], 
                                    product2: Dict[str, Any], sku_suffix: Optional[str],
                                    discount_amount: Optional[float], discount_percent: Optional[float],
                                    price: Optional[float], publish: bool, prefix: str, serial: str) -> Dict[str, Any]:
@@ -264,7 +264,7 @@ class CreateComboTool(BaseMCPTool):
             "newStatus": "ACTIVE" if publish else "DRAFT"
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         if not result or 'data' not in result or not result['data'].get('productDuplicate'):
             return {
                 "success": False,
@@ -342,7 +342,7 @@ class CreateComboTool(BaseMCPTool):
         }
         '''
         
-        variant_result = client.execute_graphql(variant_query, {"id": new_product['id']})
+        variant_result = await client.execute_graphql(variant_query, {"id": new_product['id']})
         if not variant_result or not variant_result.get('data'):
             return {
                 "success": False,
@@ -374,7 +374,7 @@ class CreateComboTool(BaseMCPTool):
         if total_cost:
             update_input["variants"][0]["inventoryItem"]["cost"] = str(total_cost)
         
-        result = client.execute_graphql(update_mutation, {"product": update_input})
+        result = await client.execute_graphql(update_mutation, {"product": update_input})
         if result and result.get('data', {}).get('productSet', {}).get('userErrors'):
             errors = result['data']['productSet']['userErrors']
             if errors:
@@ -431,7 +431,7 @@ class CreateComboTool(BaseMCPTool):
                 "type": "multi_line_text_field"
             }
             
-            mf_result = client.execute_graphql(metafield_mutation, {"metafields": [mf_input]})
+            mf_result = await client.execute_graphql(metafield_mutation, {"metafields": [mf_input]})
             if mf_result and not mf_result.get('data', {}).get('metafieldsSet', {}).get('userErrors'):
                 metafield_result = {"status": "success", "message": "Buybox content combined"}
         
@@ -538,7 +538,7 @@ class CreateComboTool(BaseMCPTool):
         
         return image.crop((x_min, y_min, x_max, y_max))
     
-    async def _upload_combo_image(self, client: ShopifyClient, product_id: str, image_bytes: bytes) -> bool:
+    async def _upload_combo_image(self, client: AsyncShopifyClient, product_id: str, image_bytes: bytes) -> bool:
         """Upload combo image to product"""
         try:
             # Create staged upload
@@ -572,7 +572,7 @@ class CreateComboTool(BaseMCPTool):
                 }]
             }
             
-            result = client.execute_graphql(mutation, variables)
+            result = await client.execute_graphql(mutation, variables)
             if result.get('data', {}).get('stagedUploadsCreate', {}).get('userErrors'):
                 return False
             
@@ -618,7 +618,7 @@ class CreateComboTool(BaseMCPTool):
                 }]
             }
             
-            result = client.execute_graphql(media_mutation, variables)
+            result = await client.execute_graphql(media_mutation, variables)
             if result and 'data' in result and result['data'].get('productCreateMedia'):
                 return not bool(result['data']['productCreateMedia']['mediaUserErrors'])
             
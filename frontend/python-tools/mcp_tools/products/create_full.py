@@ -2,6 +2,7 @@
 Native MCP implementation for create_full_product
 """
 
+import logging
 import os
 import sys
 import json
@@ -10,8 +11,11 @@ from typing import Dict, Any, List, Optional, Union
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
+from mcp_deadline import record_progress
+
+logger = logging.getLogger(__name__)
 
 class CreateFullProductTool(BaseMCPTool):
     """Create a complete product with all metafields, tags, and proper configuration"""
@@ -168,7 +172,7 @@ class CreateFullProductTool(BaseMCPTool):
                      **kwargs) -> Dict[str, Any]:
         """Execute product creation"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Handle metafields parameter if provided
             if metafields:
@@ -200,7 +204,7 @@ class CreateFullProductTool(BaseMCPTool):
             if handle:
                 product_data["handle"] = handle
             
-            print(f"Creating product: {title}...")
+            logger.info("Creating product: %s", title)
             product_result = await self._create_product(client, product_data)
             
             if not product_result["success"]:
@@ -209,6 +213,9 @@ class CreateFullProductTool(BaseMCPTool):
             product_id = product_result["product_id"]
             variant_id = product_result["variant_id"]
             inventory_item_id = product_result["inventory_item_id"]
+            # Reported if the call times out, so the product isn't created twice
+            completed_steps = ["create"]
+            record_progress(product_id=product_id, completed_steps=completed_steps)
             
             # Step 2: Update variant details
             # If variants provided, use the first one for initial variant
@@ -219,7 +226,7 @@ class CreateFullProductTool(BaseMCPTool):
                 price = first_variant.get('price', price)
                 
             if any([sku, cost, weight, price, compare_at_price]):
-                print("Updating variant details...")
+                logger.info("Updating variant details")
                 variant_result = await self._update_variant_details(
                     client, product_id, variant_id, inventory_item_id,
                     sku=sku, cost=cost, weight=weight, price=price,
@@ -227,7 +234,8 @@ class CreateFullProductTool(BaseMCPTool):
                 )
                 
                 if not variant_result["success"]:
-                    print(f"Warning: Failed to update variant details: {variant_result['error']}")
+                    logger.warning("Failed to update variant details: %s", variant_result['error'])
+                completed_steps.append("variant")
             
             # Step 3: Add metafields
             metafields = self._build_metafields(
@@ -237,10 +245,11 @@ class CreateFullProductTool(BaseMCPTool):
             )
             
             if metafields:
-                print(f"Adding {len(metafields)} metafields...")
+                logger.info("Adding %d metafields", len(metafields))
                 metafield_result = await self._add_metafields(client, product_id, metafields)
                 if not metafield_result["success"]:
-                    print(f"Warning: Failed to add metafields: {metafield_result['error']}")
+                    logger.warning("Failed to add metafields: %s", metafield_result['error'])
+                completed_steps.append("metafields")
             
             # Step 4: Add tags
             if auto_tags or tags:
@@ -257,16 +266,18 @@ class CreateFullProductTool(BaseMCPTool):
                 all_tags = list(dict.fromkeys(all_tags))
                 
                 if all_tags:
-                    print(f"Adding {len(all_tags)} tags...")
+                    logger.info("Adding %d tags", len(all_tags))
                     tag_result = await self._add_tags(client, product_id, all_tags)
                     if not tag_result["success"]:
-                        print(f"Warning: Failed to add tags: {tag_result['error']}")
+                        logger.warning("Failed to add tags: %s", tag_result['error'])
+                    completed_steps.append("tags")
             
             # Step 5: Publish to channels
-            print("Publishing to channels...")
+            logger.info("Publishing to channels")
             publish_result = await self._publish_to_channels(client, product_id)
             if not publish_result["success"]:
-                print(f"Warning: Failed to publish: {publish_result['error']}")
+                logger.warning("Failed to publish: %s", publish_result['error'])
+            completed_steps.append("publish")
             
             # Get shop URL for admin link
             shop_url = os.getenv('SHOPIFY_SHOP_URL', '').replace('https://', '')
@@ -290,7 +301,7 @@ class CreateFullProductTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _create_product(self, client: ShopifyClient, product_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _create_product(self, client: AsyncShopifyClient, product_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create basic product"""
         mutation = """
         mutation createProduct($input: ProductInput!) {
@@ -319,7 +330,7 @@ class CreateFullProductTool(BaseMCPTool):
         """
         
         variables = {"input": product_data}
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return {"success": False, "error": f"GraphQL errors: {result['errors']}"}
@@ -339,7 +350,7 @@ class CreateFullProductTool(BaseMCPTool):
             "handle": product['handle']
         }
     
-    async def _update_variant_details(self, client: ShopifyClient, product_id: str, variant_id: str,
+    async def _update_variant_details(self, client: AsyncShopifyClient, product_id: str, variant_id: str,
                                      inventory_item_id: str, sku: Optional[str] = None,
                                      cost: Optional[str] = None, weight: Optional[float] = None,
                                      price: Optional[str] = None, compare_at_price: Optional[str] = None,
@@ -406,7 +417,7 @@ class CreateFullProductTool(BaseMCPTool):
             "variants": [variant_input]
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
             errors = result['data']['productVariantsBulkUpdate']['userErrors']
@@ -414,7 +425,7 @@ class CreateFullProductTool(BaseMCPTool):
         
         return {"success": True}
     
-    async def _add_metafields(self, client: ShopifyClient, product_id: str, metafields: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _add_metafields(self, client: AsyncShopifyClient, product_id: str, metafields: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Add metafields to product"""
         mutation = """
         mutation updateProduct($input: ProductInput!) {
@@ -437,7 +448,7 @@ class CreateFullProductTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productUpdate', {}).get('userErrors'):
             errors = result['data']['productUpdate']['userErrors']
@@ -445,7 +456,7 @@ class CreateFullProductTool(BaseMCPTool):
         
         return {"success": True}
     
-    async def _add_tags(self, client: ShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
+    async def _add_tags(self, client: AsyncShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
         """Add tags to product"""
         mutation = """
         mutation addTags($id: ID!, $tags: [String!]!) {
@@ -466,7 +477,7 @@ class CreateFullProductTool(BaseMCPTool):
             "tags": tags
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('tagsAdd', {}).get('userErrors'):
             errors = result['data']['tagsAdd']['userErrors']
@@ -474,7 +485,7 @@ class CreateFullProductTool(BaseMCPTool):
         
         return {"success": True}
     
-    async def _publish_to_channels(self, client: ShopifyClient, product_id: str) -> Dict[str, Any]:
+    async def _publish_to_channels(self, client: AsyncShopifyClient, product_id: str) -> Dict[str, Any]:
         """Publish product to all sales channels"""
         channels = [
             "gid://shopify/Channel/46590273",     # Online Store
@@ -511,7 +522,7 @@ class CreateFullProductTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productPublish', {}).get('userErrors'):
             errors = result['data']['productPublish']['userErrors']
@@ -608,10 +619,10 @@ class CreateFullProductTool(BaseMCPTool):
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
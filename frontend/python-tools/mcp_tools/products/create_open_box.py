@@ -2,10 +2,14 @@
 Native MCP implementation for creating open box products
 """
 
+import logging
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from mcp_logging import Payload
+
+logger = logging.getLogger(__name__)
 
 class CreateOpenBoxTool(BaseMCPTool):
     """Create open box listings from existing products"""
@@ -81,10 +85,10 @@ class CreateOpenBoxTool(BaseMCPTool):
     async def execute(self, identifier: str, serial: str, condition: str, **kwargs) -> Dict[str, Any]:
         """Create open box product"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Find original product
-            product_id = client.resolve_product_id(identifier)
+            product_id = await client.resolve_product_id(identifier)
             if not product_id:
                 return {
                     "success": False,
@@ -119,7 +123,7 @@ class CreateOpenBoxTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _get_product_details(self, client: ShopifyClient, product_id: str) -> Optional[Dict[str, Any]]:
+    async def _get_product_details(self, client: AsyncShopifyClient, product_id: str) -> Optional[Dict[str, Any]]:
         """Get full product details"""
         query = """
         query getProduct($id: ID!) {
@@ -194,12 +198,12 @@ class CreateOpenBoxTool(BaseMCPTool):
         }
         """
         
-        result = client.execute_graphql(query, {"id": product_id})
+        result = await client.execute_graphql(query, {"id": product_id})
         if result and 'data' in result and result['data'].get('product'):
             return result['data']['product']
         return None
     
-    def _get_default_location(self, client: ShopifyClient) -> str:
+    async def _get_default_location(self, client: AsyncShopifyClient) -> str:
         """Get the default location ID for inventory."""
         query = '''
         {
@@ -215,7 +219,7 @@ class CreateOpenBoxTool(BaseMCPTool):
         }
         '''
         
-        result = client.execute_graphql(query)
+        result = await client.execute_graphql(query)
         locations = result.get('data', {}).get('locations', {}).get('edges', [])
         
         if not locations:
@@ -223,7 +227,7 @@ class CreateOpenBoxTool(BaseMCPTool):
         
         return locations[0]['node']['id']
     
-    async def _adjust_inventory_quantity(self, client: ShopifyClient, inventory_item_id: str):
+    async def _adjust_inventory_quantity(self, client: AsyncShopifyClient, inventory_item_id: str):
         """Set inventory quantity to 1 for open box items."""
         try:
             # Get current quantity
@@ -247,7 +251,7 @@ class CreateOpenBoxTool(BaseMCPTool):
             }
             """
             
-            result = client.execute_graphql(variant_query, {'id': inventory_item_id})
+            result = await client.execute_graphql(variant_query, {'id': inventory_item_id})
             inventory_levels = result.get('data', {}).get('inventoryItem', {}).get('inventoryLevels', {}).get('edges', [])
             
             if not inventory_levels:
@@ -300,13 +304,13 @@ class CreateOpenBoxTool(BaseMCPTool):
                 }
             }
             
-            client.execute_graphql(mutation, variables)
+            await client.execute_graphql(mutation, variables)
             
         except Exception as e:
             # Don't fail the whole operation if inventory adjustment fails
-            print(f"Warning: Failed to adjust inventory: {e}")
+            logger.warning("Failed to adjust inventory: %s", e)
     
-    async def _update_variant_sku_and_policy(self, client: ShopifyClient, product_id: str, variant_id: str, sku: str, price: float):
+    async def _update_variant_sku_and_policy(self, client: AsyncShopifyClient, product_id: str, variant_id: str, sku: str, price: float):
         """Update variant SKU, price, and inventory policy using productVariantsBulkUpdate."""
         try:
             
@@ -338,29 +342,29 @@ class CreateOpenBoxTool(BaseMCPTool):
                 }]
             }
             
-            print(f"Updating variant with variables: {variables}")
-            result = client.execute_graphql(mutation, variables)
-            print(f"GraphQL response: {result}")
+            logger.debug("Updating variant with variables: %s", Payload(variables))
+            result = await client.execute_graphql(mutation, variables)
+            logger.debug("GraphQL response: %s", Payload(result))
             
             # Check for errors and log them
             if result.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
                 errors = result['data']['productVariantsBulkUpdate']['userErrors']
-                print(f"Error: Failed to update variant: {errors}")
+                logger.error("Failed to update variant: %s", Payload(errors))
                 raise Exception(f"Failed to update variant: {errors}")
             
             # Log success
             updated_variants = result.get('data', {}).get('productVariantsBulkUpdate', {}).get('productVariants', [])
             if updated_variants:
                 variant = updated_variants[0]
-                print(f"Success: Updated variant SKU to {variant.get('sku')}, inventory to {variant.get('inventoryQuantity')}")
+                logger.info("Updated variant SKU to %s, inventory to %s", variant.get('sku'), variant.get('inventoryQuantity'))
             else:
-                print("Warning: No variants returned from productVariantsBulkUpdate")
+                logger.warning("No variants returned from productVariantsBulkUpdate")
                 
         except Exception as e:
-            print(f"Error: Failed to update variant: {e}")
+            logger.error("Failed to update variant: %s", e)
             raise e
     
-    async def _create_open_box_product(self, client: ShopifyClient, original: Dict[str, Any],
+    async def _create_open_box_product(self, client: AsyncShopifyClient, original: Dict[str, Any],
                                       serial: str, condition: str, price: Optional[float],
                                       discount_pct: Optional[float], note: Optional[str],
                                       publish: bool) -> Dict[str, Any]:
@@ -436,7 +440,7 @@ class CreateOpenBoxTool(BaseMCPTool):
             "newStatus": "ACTIVE" if publish else "DRAFT"
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productDuplicate', {}).get('userErrors'):
             errors = result['data']['productDuplicate']['userErrors']
@@ -527,7 +531,7 @@ class CreateOpenBoxTool(BaseMCPTool):
                 "description": original['seo'].get('description', '')
             }
         
-        result = client.execute_graphql(mutation, {"product": update_input})
+        result = await client.execute_graphql(mutation, {"product": update_input})
         
         if result.get('data', {}).get('productSet', {}).get('userErrors'):
             errors = result['data']['productSet']['userErrors']
@@ -576,9 +580,9 @@ class CreateOpenBoxTool(BaseMCPTool):
         """Test open box creation capability"""
         try:
             # Just verify we can access Shopify
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             query = "{ shop { name } }"
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result and 'data' in result:
                 return {
@@ -4,7 +4,7 @@ Native MCP implementation for duplicating products
 
 import json
 from typing import Dict, Any, Optional, List
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class DuplicateListingTool(BaseMCPTool):
     """Duplicate an existing product listing"""
@@ -79,10 +79,10 @@ class DuplicateListingTool(BaseMCPTool):
     async def execute(self, identifier: str, **kwargs) -> Dict[str, Any]:
         """Duplicate product listing"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Find original product
-            product_id = client.resolve_product_id(identifier)
+            product_id = await client.resolve_product_id(identifier)
             if not product_id:
                 return {
                     "success": False,
@@ -121,7 +121,7 @@ class DuplicateListingTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _get_product_details(self, client: ShopifyClient, product_id: str) -> Optional[Dict[str, Any]]:
+    async def _get_product_details(self, client: AsyncShopifyClient, product_id: str) -> Optional[Dict[str, Any]]:
         """Get full product details"""
         query = """
         query getProduct($id: ID!) {
@@ -199,12 +199,12 @@ class DuplicateListingTool(BaseMCPTool):
         }
         """
         
-        result = client.execute_graphql(query, {"id": product_id})
+        result = await client.execute_graphql(query, {"id": product_id})
         if result and 'data' in result and result['data'].get('product'):
             return result['data']['product']
         return None
     
-    async def _duplicate_product(self, client: ShopifyClient, original: Dict[str, Any],
+    async def _duplicate_product(self, client: AsyncShopifyClient, original: Dict[str, Any],
                                 new_title: str, new_sku: Optional[str], new_price: Optional[float],
                                 include_images: bool, status: str, tags_to_add: List[str],
                                 tags_to_remove: List[str]) -> Dict[str, Any]:
@@ -243,7 +243,7 @@ class DuplicateListingTool(BaseMCPTool):
             "includeImages": include_images
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productDuplicate', {}).get('userErrors'):
             errors = result['data']['productDuplicate']['userErrors']
@@ -309,7 +309,7 @@ class DuplicateListingTool(BaseMCPTool):
             }
         }
     
-    async def _update_variant(self, client: ShopifyClient, product_id: str, variant_id: str, 
+    async def _update_variant(self, client: AsyncShopifyClient, product_id: str, variant_id: str, 
                              new_sku: Optional[str], new_price: Optional[float]):
         """Update variant SKU and/or price"""
         mutation = """
@@ -341,13 +341,13 @@ class DuplicateListingTool(BaseMCPTool):
             "variants": [variant_input]
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
             errors = result['data']['productVariantsBulkUpdate']['userErrors']
             raise Exception(f"Failed to update variant: {errors}")
     
-    async def _update_product_tags(self, client: ShopifyClient, product_id: str, tags: List[str]):
+    async def _update_product_tags(self, client: AsyncShopifyClient, product_id: str, tags: List[str]):
         """Update product tags"""
         mutation = """
         mutation updateProduct($input: ProductInput!) {
@@ -371,7 +371,7 @@ class DuplicateListingTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productUpdate', {}).get('userErrors'):
             errors = result['data']['productUpdate']['userErrors']
@@ -381,9 +381,9 @@ class DuplicateListingTool(BaseMCPTool):
         """Test duplicate listing capability"""
         try:
             # Just verify we can access Shopify
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             query = "{ shop { name } }"
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result and 'data' in result:
                 return {
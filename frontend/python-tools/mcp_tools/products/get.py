@@ -9,7 +9,7 @@ import os
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class GetProductTool(BaseMCPTool):
@@ -17,6 +17,7 @@ class GetProductTool(BaseMCPTool):
     
     name = "get_product"
     description = "Get detailed product information by SKU, handle, or ID"
+    read_only = True
     context = """
     This is a native MCP implementation that directly calls the Shopify API.
     No subprocess overhead - faster and more reliable.
@@ -48,10 +49,10 @@ class GetProductTool(BaseMCPTool):
     async def execute(self, identifier: str, include_metafields: bool = False) -> Dict[str, Any]:
         """Execute get_product directly without subprocess"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            product_id = client.resolve_product_id(identifier)
+            product_id = await client.resolve_product_id(identifier)
             if not product_id:
                 raise Exception(f"Product not found with identifier: {identifier}")
             
@@ -155,7 +156,7 @@ class GetProductTool(BaseMCPTool):
             '''
             
             variables = {"id": product_id}
-            result = client.execute_graphql(query, variables)
+            result = await client.execute_graphql(query, variables)
             
             product = result['data']['product']
             if not product:
@@ -240,7 +241,7 @@ class GetProductTool(BaseMCPTool):
         """Test the tool with a simple query"""
         try:
             # Just verify we can create a client
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             return {
                 "status": "passed",
                 "message": "Native tool ready"
@@ -9,7 +9,7 @@ import os
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class ManageTagsTool(BaseMCPTool):
@@ -61,10 +61,10 @@ class ManageTagsTool(BaseMCPTool):
     async def execute(self, product: str, tags: List[str], action: str) -> Dict[str, Any]:
         """Execute tag management natively"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            product_id = client.resolve_product_id(product)
+            product_id = await client.resolve_product_id(product)
             if not product_id:
                 return {
                     "success": False,
@@ -87,7 +87,7 @@ class ManageTagsTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _add_tags(self, client: ShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
+    async def _add_tags(self, client: AsyncShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
         """Add tags to product"""
         mutation = '''
         mutation addTags($id: ID!, $tags: [String!]!) {
@@ -111,7 +111,7 @@ class ManageTagsTool(BaseMCPTool):
             "tags": tags
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('tagsAdd', {}).get('userErrors'):
             errors = result['data']['tagsAdd']['userErrors']
@@ -128,7 +128,7 @@ class ManageTagsTool(BaseMCPTool):
             "message": f"Added {len(tags)} tag(s) to product"
         }
     
-    async def _remove_tags(self, client: ShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
+    async def _remove_tags(self, client: AsyncShopifyClient, product_id: str, tags: List[str]) -> Dict[str, Any]:
         """Remove tags from product"""
         mutation = '''
         mutation removeTags($id: ID!, $tags: [String!]!) {
@@ -152,7 +152,7 @@ class ManageTagsTool(BaseMCPTool):
             "tags": tags
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('tagsRemove', {}).get('userErrors'):
             errors = result['data']['tagsRemove']['userErrors']
@@ -173,10 +173,10 @@ class ManageTagsTool(BaseMCPTool):
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
@@ -4,7 +4,8 @@ Native MCP implementation for managing variant links between products
 
 import json
 from typing import Dict, Any, List, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient, BulkOperationRunner, should_use_bulk
+from mcp_deadline import check_deadline
 
 class ManageVariantLinksTool(BaseMCPTool):
     """Manage variant links between related products"""
@@ -78,7 +79,7 @@ class ManageVariantLinksTool(BaseMCPTool):
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """Execute variant links management action"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             if action == "link":
                 return await self._link_products(client, kwargs)
@@ -103,7 +104,7 @@ class ManageVariantLinksTool(BaseMCPTool):
                 "action": action
             }
     
-    async def _link_products(self, client: ShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    async def _link_products(self, client: AsyncShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Link a group of products together"""
         product_ids = kwargs.get('product_ids', [])
         
@@ -163,7 +164,7 @@ class ManageVariantLinksTool(BaseMCPTool):
                 "failed_products": failed_products
             }
     
-    async def _unlink_products(self, client: ShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    async def _unlink_products(self, client: AsyncShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Remove products from variant linking"""
         product_ids = kwargs.get('product_ids', [])
         
@@ -200,7 +201,7 @@ class ManageVariantLinksTool(BaseMCPTool):
             "failed_products": failed_products
         }
     
-    async def _check_links(self, client: ShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    async def _check_links(self, client: AsyncShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Check variant links for a product"""
         product_id = kwargs.get('product_id')
         
@@ -267,7 +268,7 @@ class ManageVariantLinksTool(BaseMCPTool):
             "link_count": len(linked_ids)
         }
     
-    async def _sync_group(self, client: ShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    async def _sync_group(self, client: AsyncShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Sync all products in a variant group based on one product's links"""
         product_id = kwargs.get('product_id')
         
@@ -297,14 +298,14 @@ class ManageVariantLinksTool(BaseMCPTool):
         # Use link_products to sync the group
         return await self._link_products(client, {"product_ids": linked_ids})
     
-    async def _audit_links(self, client: ShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    async def _audit_links(self, client: AsyncShopifyClient, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Audit variant links for consistency issues"""
         search_query = kwargs.get('search_query', '')
         
         # Search for products with varLinks
         query = """
-        query searchProducts($query: String!) {
-            products(first: 100, query: $query) {
+        query searchProducts($query: String!, $after: String) {
+            products(first: 100, after: $after, query: $query) {
                 edges {
                     node {
                         id
@@ -319,32 +320,56 @@ class ManageVariantLinksTool(BaseMCPTool):
                         }
                     }
                 }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
             }
         }
         """
         
-        result = client.execute_graphql(query, {"query": search_query})
-        
-        if 'errors' in result:
-            return {
-                "success": False,
-                "error": f"GraphQL error: {result['errors']}"
-            }
-        
-        products = result.get('data', {}).get('products', {}).get('edges', [])
+        # Whole-catalog audits are exported with a bulk operation
+        if await should_use_bulk(client, 'products', search_query, page_size=100):
+            products = []
+            runner = BulkOperationRunner(client)
+            async for product in runner.run(self._build_bulk_audit_query(search_query)):
+                metafield = product.pop('metafield', None)
+                product['varlinks_value'] = metafield['value'] if metafield else None
+                products.append(product)
+        else:
+            products = []
+            after = None
+            while True:
+                check_deadline("auditing variant links")
+                result = await client.execute_graphql(query, {"query": search_query, "after": after})
+                
+                if 'errors' in result:
+                    return {
+                        "success": False,
+                        "error": f"GraphQL error: {result['errors']}"
+                    }
+                
+                data = result.get('data', {}).get('products', {})
+                for edge in data.get('edges', []):
+                    product = edge['node']
+                    varlinks_data = product.pop('metafields', {}).get('edges', [])
+                    product['varlinks_value'] = varlinks_data[0]['node']['value'] if varlinks_data else None
+                    products.append(product)
+                
+                page_info = data.get('pageInfo', {})
+                if not page_info.get('hasNextPage') or not data.get('edges'):
+                    break
+                after = page_info.get('endCursor')
         
         # Group products by their varLinks
         link_groups = {}
         unlinked = []
         
-        for edge in products:
-            product = edge['node']
-            varlinks_data = product.get('metafields', {}).get('edges', [])
-            
-            if not varlinks_data:
+        for product in products:
+            if not product['varlinks_value']:
                 unlinked.append(product)
             else:
-                links = tuple(sorted(json.loads(varlinks_data[0]['node']['value'])))
+                links = tuple(sorted(json.loads(product['varlinks_value'])))
                 if links not in link_groups:
                     link_groups[links] = []
                 link_groups[links].append(product)
@@ -384,7 +409,28 @@ class ManageVariantLinksTool(BaseMCPTool):
             "unlinked": unlinked_list
         }
     
-    async def _get_product_info(self, client: ShopifyClient, product_id: str) -> Optional[Dict]:
+    @staticmethod
+    def _build_bulk_audit_query(search_query: str) -> str:
+        """Bulk operation query for auditing varLinks across the catalog"""
+        query_arg = f'(query: {json.dumps(search_query)})' if search_query else ''
+        return f"""
+        {{
+            products{query_arg} {{
+                edges {{
+                    node {{
+                        id
+                        title
+                        handle
+                        metafield(namespace: "new", key: "varLinks") {{
+                            value
+                        }}
+                    }}
+                }}
+            }}
+        }}
+        """
+    
+    async def _get_product_info(self, client: AsyncShopifyClient, product_id: str) -> Optional[Dict]:
         """Get product title and current varLinks"""
         # Convert to GID if needed
         if not product_id.startswith('gid://'):
@@ -392,7 +438,7 @@ class ManageVariantLinksTool(BaseMCPTool):
                 product_id = f"gid://shopify/Product/{product_id}"
             else:
                 # Try to resolve by other identifiers
-                resolved_id = client.resolve_product_id(product_id)
+                resolved_id = await client.resolve_product_id(product_id)
                 if not resolved_id:
                     return None
                 product_id = resolved_id
@@ -412,14 +458,14 @@ class ManageVariantLinksTool(BaseMCPTool):
         }
         """
         
-        result = client.execute_graphql(query, {"id": product_id})
+        result = await client.execute_graphql(query, {"id": product_id})
         
         if 'errors' in result:
             return None
         
         return result.get('data', {}).get('product')
     
-    async def _update_variant_links(self, client: ShopifyClient, product_id: str, 
+    async def _update_variant_links(self, client: AsyncShopifyClient, product_id: str, 
                                    linked_products: List[str]) -> bool:
         """Update the varLinks metafield for a product"""
         mutation = """
@@ -457,7 +503,7 @@ class ManageVariantLinksTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return False
@@ -468,11 +514,11 @@ class ManageVariantLinksTool(BaseMCPTool):
     async def test(self) -> Dict[str, Any]:
         """Test variant links management"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test basic GraphQL connectivity
             query = "{ shop { name } }"
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result and 'data' in result:
                 return {
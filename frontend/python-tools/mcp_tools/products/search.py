@@ -2,7 +2,8 @@
 MCP wrapper for search_products tool
 """
 
-from typing import Dict, Any, Optional, List
+import logging
+from typing import Dict, Any, Optional, List, AsyncIterator
 import sys
 import os
 import json
@@ -10,14 +11,18 @@ import json
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
+from mcp_logging import Payload
+
+logger = logging.getLogger(__name__)
 
 class SearchProductsTool(BaseMCPTool):
     """Search products with advanced filtering"""
     
     name = "search_products"
     description = "Search Shopify products with various filters and options"
+    read_only = True
     context = """
     Powerful product search with multiple filter options:
     - Search by title, SKU, vendor, product type
@@ -62,32 +67,29 @@ class SearchProductsTool(BaseMCPTool):
             },
             "limit": {
                 "type": "integer",
-                "description": "Maximum number of results (default: 50)"
+                "description": "Maximum number of results (default: 50); above 250 results are fetched and returned in pages"
             }
         },
         "required": ["query"]
     }
     
-    async def execute(self, query: str, **kwargs) -> List[Dict[str, Any]]:
-        """Execute product search natively"""
-        import sys
+    async def execute(self, query: str, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Execute product search natively, yielding one page of results per GraphQL query"""
         # Clean up kwargs - remove empty strings and None values
         cleaned_kwargs = {k: v for k, v in kwargs.items() if v and (not isinstance(v, str) or v.strip())}
-        print(f"[SearchProductsTool] Searching for: {query}", file=sys.stderr)
-        print(f"[SearchProductsTool] Raw kwargs: {kwargs}", file=sys.stderr)
-        print(f"[SearchProductsTool] Cleaned kwargs: {cleaned_kwargs}", file=sys.stderr)
+        logger.debug("Searching for %r with %s", query, Payload(cleaned_kwargs))
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Build search query
             search_query = self._build_search_query(query, **cleaned_kwargs)
             limit = cleaned_kwargs.get("limit", kwargs.get("limit", 50))
-            print(f"[SearchProductsTool] Built search query: {search_query}", file=sys.stderr)
+            logger.debug("Built search query: %s", search_query)
             
             # GraphQL query
             graphql_query = f'''
-            query searchProducts($query: String!, $first: Int!) {{
-                products(first: $first, query: $query) {{
+            query searchProducts($query: String!, $first: Int!, $after: String) {{
+                products(first: $first, query: $query, after: $after) {{
                     edges {{
                         node {{
                             id
@@ -125,23 +127,31 @@ class SearchProductsTool(BaseMCPTool):
             }}
             '''
             
-            variables = {
-                "query": search_query,
-                "first": min(limit, 250)  # Shopify API limit
-            }
-            
-            result = client.execute_graphql(graphql_query, variables)
-            
-            print(f"[SearchProductsTool] GraphQL result: {json.dumps(result, indent=2)}", file=sys.stderr)
-            
-            # Format results
-            products = []
-            for edge in result.get('data', {}).get('products', {}).get('edges', []):
-                product = edge['node']
-                products.append(self._format_search_result(product))
+            found = 0
+            cursor = None
+            while found < limit:
+                variables = {
+                    "query": search_query,
+                    "first": min(limit - found, 250),  # Shopify API limit
+                    "after": cursor
+                }
+                
+                result = await client.execute_graphql(graphql_query, variables)
+                logger.debug("GraphQL result: %s", Payload(result))
+                
+                # Format results
+                connection = result.get('data', {}).get('products', {})
+                products = [self._format_search_result(edge['node']) for edge in connection.get('edges', [])]
+                found += len(products)
+                if products:
+                    yield products
+                
+                page_info = connection.get('pageInfo') or {}
+                if not page_info.get('hasNextPage') or not products:
+                    break
+                cursor = page_info.get('endCursor')
             
-            print(f"[SearchProductsTool] Found {len(products)} products", file=sys.stderr)
-            return products
+            logger.info("Found %d products for %r", found, query)
             
         except Exception as e:
             raise Exception(f"Search failed: {str(e)}")
@@ -224,10 +234,10 @@ class SearchProductsTool(BaseMCPTool):
         """Test the search tool"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
@@ -13,6 +13,7 @@ Keeping the metafield parameters here for the moment avoids breaking back-compat
 """
 
 
+import logging
 import os
 import sys
 import json
@@ -23,9 +24,11 @@ from typing import Dict, Any, List, Optional, Union
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
+logger = logging.getLogger(__name__)
+
 class UpdateFullProductTool(BaseMCPTool):
     """Update an existing product with comprehensive content including variants, media, and metafields"""
     
@@ -211,10 +214,10 @@ class UpdateFullProductTool(BaseMCPTool):
                      media: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
         """Execute product update"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            resolved_id = client.resolve_product_id(product_id)
+            resolved_id = await client.resolve_product_id(product_id)
             if not resolved_id:
                 return {
                     "success": False,
@@ -228,7 +231,7 @@ class UpdateFullProductTool(BaseMCPTool):
             )
             
             # Update product using productSet
-            print(f"Updating product: {product_id}...")
+            logger.info("Updating product: %s", product_id)
             update_result = await self._update_product(client, product_input)
             
             if not update_result["success"]:
@@ -237,10 +240,10 @@ class UpdateFullProductTool(BaseMCPTool):
             # Handle media uploads/additions
             media_result = {"success": True, "media_added": 0}
             if media:
-                print(f"Processing {len(media)} media items...")
+                logger.info("Processing %d media items", len(media))
                 media_result = await self._process_media(client, resolved_id, media)
                 if not media_result["success"]:
-                    print(f"Warning: Media processing failed: {media_result['error']}")
+                    logger.warning("Media processing failed: %s", media_result['error'])
             
             return {
                 "success": True,
@@ -345,7 +348,7 @@ class UpdateFullProductTool(BaseMCPTool):
         
         return product_input
     
-    async def _update_product(self, client: ShopifyClient, product_input: Dict[str, Any]) -> Dict[str, Any]:
+    async def _update_product(self, client: AsyncShopifyClient, product_input: Dict[str, Any]) -> Dict[str, Any]:
         """Update product using productSet mutation"""
         mutation = """
         mutation productSet($input: ProductSetInput!, $sync: Boolean!) {
@@ -366,7 +369,7 @@ class UpdateFullProductTool(BaseMCPTool):
         """
         
         variables = {"input": product_input, "sync": True}
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if 'errors' in result:
             return {"success": False, "error": f"GraphQL errors: {result['errors']}"}
@@ -380,7 +383,7 @@ class UpdateFullProductTool(BaseMCPTool):
             "product": product_set.get('product', {})
         }
     
-    async def _process_media(self, client: ShopifyClient, product_id: str, media_items: List[Dict[str, str]]) -> Dict[str, Any]:
+    async def _process_media(self, client: AsyncShopifyClient, product_id: str, media_items: List[Dict[str, str]]) -> Dict[str, Any]:
         """Process media uploads and additions"""
         create_inputs = []
         
@@ -428,7 +431,7 @@ class UpdateFullProductTool(BaseMCPTool):
         """
         
         variables = {"productId": product_id, "media": create_inputs}
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         if result.get('data', {}).get('productCreateMedia', {}).get('mediaUserErrors'):
             errors = result['data']['productCreateMedia']['mediaUserErrors']
@@ -442,7 +445,7 @@ class UpdateFullProductTool(BaseMCPTool):
             "media": created_media
         }
     
-    async def _upload_local_file(self, client: ShopifyClient, file_path: str) -> str:
+    async def _upload_local_file(self, client: AsyncShopifyClient, file_path: str) -> str:
         """Upload local file to Shopify staging"""
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -482,7 +485,7 @@ class UpdateFullProductTool(BaseMCPTool):
             }]
         }
         
-        result = client.execute_graphql(staged_mutation, variables)
+        result = await client.execute_graphql(staged_mutation, variables)
         
         if result.get('data', {}).get('stagedUploadsCreate', {}).get('userErrors'):
             errors = result['data']['stagedUploadsCreate']['userErrors']
@@ -536,10 +539,10 @@ class UpdateFullProductTool(BaseMCPTool):
         """Test the tool with validation"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
@@ -72,7 +72,7 @@ from typing import Any, Dict, List, Optional
 # Make project root importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 # ---------------------------------------------------------------------------
@@ -213,7 +213,7 @@ class UpdateMetafieldsTool(BaseMCPTool):
         return a summary dict.
         """
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             all_inputs: List[Dict[str, Any]] = []
 
             # ----- Validate input parameters (replaces oneOf constraint) -----------------
@@ -232,9 +232,9 @@ class UpdateMetafieldsTool(BaseMCPTool):
             # ----- Build the input list --------------------------------------------------
             if updates:
                 for entry in updates:
-                    all_inputs.extend(self._build_inputs(client, entry["product"], entry["metafields"]))
+                    all_inputs.extend(await self._build_inputs(client, entry["product"], entry["metafields"]))
             else:
-                all_inputs.extend(self._build_inputs(client, product, metafields))
+                all_inputs.extend(await self._build_inputs(client, product, metafields))
 
             if not all_inputs:
                 return {"success": False, "error": "No metafields to update."}
@@ -245,7 +245,7 @@ class UpdateMetafieldsTool(BaseMCPTool):
 
             updated_count = 0
             for chunk in chunks:
-                result = self._metafields_set(client, chunk)
+                result = await self._metafields_set(client, chunk)
                 if not result["success"]:
                     return result  # Bubble-up the error immediately
                 updated_count += len(result.get("metafields", []))
@@ -257,14 +257,14 @@ class UpdateMetafieldsTool(BaseMCPTool):
     # --------------------------------------------------------------------
     # Internal helpers
     # --------------------------------------------------------------------
-    def _build_inputs(
+    async def _build_inputs(
         self,
-        client: ShopifyClient,
+        client: AsyncShopifyClient,
         product_identifier: str,
         metafields: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
         """Transform the user-supplied metafields into MetafieldsSetInput objects."""
-        gid = client.resolve_product_id(product_identifier)
+        gid = await client.resolve_product_id(product_identifier)
         if not gid:
             raise ValueError(f"Product not found: {product_identifier}")
 
@@ -300,7 +300,7 @@ class UpdateMetafieldsTool(BaseMCPTool):
             )
         return inputs
 
-    def _metafields_set(self, client: ShopifyClient, inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _metafields_set(self, client: AsyncShopifyClient, inputs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute the metafieldsSet mutation and return result dict."""
         mutation = """
         mutation metafieldsSet($metafields: [MetafieldsSetInput!]!) {
@@ -310,7 +310,7 @@ class UpdateMetafieldsTool(BaseMCPTool):
           }
         }
         """
-        response = client.execute_graphql(mutation, {"metafields": inputs})
+        response = await client.execute_graphql(mutation, {"metafields": inputs})
 
         result_data = response.get("data", {}).get("metafieldsSet", {})
         user_errors = result_data.get("userErrors")
@@ -324,8 +324,8 @@ class UpdateMetafieldsTool(BaseMCPTool):
     # --------------------------------------------------------------------
     async def test(self):  # type: ignore[override]
         try:
-            client = ShopifyClient()
-            _ = client.execute_graphql("{ shop { name } }")
+            client = AsyncShopifyClient()
+            _ = await client.execute_graphql("{ shop { name } }")
             return {"status": "passed"}
         except Exception as exc:
             return {"status": "failed", "error": str(exc)}
@@ -9,7 +9,7 @@ import os
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class UpdateStatusTool(BaseMCPTool):
@@ -51,10 +51,10 @@ class UpdateStatusTool(BaseMCPTool):
     async def execute(self, product: str, status: str) -> Dict[str, Any]:
         """Update product status natively"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Resolve product ID
-            product_id = client.resolve_product_id(product)
+            product_id = await client.resolve_product_id(product)
             if not product_id:
                 return {
                     "success": False,
@@ -73,7 +73,7 @@ class UpdateStatusTool(BaseMCPTool):
             }
             '''
             
-            result = client.execute_graphql(query, {'id': product_id})
+            result = await client.execute_graphql(query, {'id': product_id})
             product_data = result.get('data', {}).get('product')
             
             if not product_data:
@@ -117,7 +117,7 @@ class UpdateStatusTool(BaseMCPTool):
                 }
             }
             
-            result = client.execute_graphql(mutation, variables)
+            result = await client.execute_graphql(mutation, variables)
             
             # Check for errors
             user_errors = result.get('data', {}).get('productUpdate', {}).get('userErrors', [])
@@ -157,10 +157,10 @@ class UpdateStatusTool(BaseMCPTool):
         """Test the tool"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
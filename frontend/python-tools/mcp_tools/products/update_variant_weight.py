@@ -9,7 +9,7 @@ import os
 # Add parent directory to path so we can import the original tools
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from base import ShopifyClient
+from base import AsyncShopifyClient
 from ..base import BaseMCPTool
 
 class UpdateVariantWeightTool(BaseMCPTool):
@@ -77,7 +77,7 @@ class UpdateVariantWeightTool(BaseMCPTool):
             
             weight_unit = weight_unit.upper()
             
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # First, find the variant by SKU
             search_query = """
@@ -106,7 +106,7 @@ class UpdateVariantWeightTool(BaseMCPTool):
             }
             """
             
-            search_result = client.execute_graphql(search_query, {"sku": f"sku:{sku}"})
+            search_result = await client.execute_graphql(search_query, {"sku": f"sku:{sku}"})
             
             if "errors" in search_result:
                 return {"success": False, "error": f"GraphQL error: {search_result['errors']}"}
@@ -167,7 +167,7 @@ class UpdateVariantWeightTool(BaseMCPTool):
                 }]
             }
             
-            result = client.execute_graphql(update_mutation, variables)
+            result = await client.execute_graphql(update_mutation, variables)
             
             if "errors" in result:
                 return {"success": False, "error": f"GraphQL error: {result['errors']}"}
@@ -212,10 +212,10 @@ class UpdateVariantWeightTool(BaseMCPTool):
         """Test the tool"""
         try:
             self.validate_env()
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             # Test with a simple query to verify connection
-            result = client.execute_graphql('{ shop { name } }')
+            result = await client.execute_graphql('{ shop { name } }')
             
             return {
                 "status": "passed",
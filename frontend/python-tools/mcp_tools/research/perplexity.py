@@ -12,6 +12,7 @@ class PerplexityResearchTool(BaseMCPTool):
     
     name = "perplexity_research"
     description = "Research products, competitors, and industry information using Perplexity AI"
+    read_only = True
     context = """
     Uses Perplexity AI to research real-time information about:
     - Product specifications and reviews
@@ -8,7 +8,7 @@ manage_map_sales.py`` and adapted to the MCP modular style.
 Highlights:
 1.  Uses BaseMCPTool so it can be invoked by the MCP orchestrator.
 2.  Talks to Shopify Admin GraphQL API 2025-07 only through
-    ``ShopifyClient``.
+    ``AsyncShopifyClient``.
 3.  Only employs the ``productVariantsBulkUpdate`` mutation – no REST.
 4.  Works off the 2025 Breville promo calendar markdown file shipped in
     this directory, parses the same tables as the legacy script and
@@ -23,6 +23,7 @@ is safe for serverless loading.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import re
 import sys
 import os
@@ -30,7 +31,9 @@ from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from price_diff import plan_price_changes
+from sale_calendar import SaleCalendar, SaleWindow, cached_calendar
 
 # ---------------------------------------------------------------------------
 # Utility helpers
@@ -57,30 +60,42 @@ CalendarData = Dict[str, List[Dict[str, str]]]
 # Core logic – extracted from legacy tool and made class-friendly
 # ---------------------------------------------------------------------------
 class BrevilleMapCalendar:
-    """Parse the enhanced Breville sales calendar markdown file."""
+    """Parse the enhanced Breville sales calendar markdown file.
+
+    The parsed ranges are compiled into a ``SaleCalendar`` (date and SKU
+    index) and cached on disk until the markdown file changes.
+    """
 
     def __init__(self, calendar_file: Path) -> None:
         self.calendar_file: Path = calendar_file
-        self.sales_data: CalendarData = {}
-        self._load()
+        if not self.calendar_file.exists():
+            raise FileNotFoundError(f"Calendar file not found: {self.calendar_file}")
+        self.index: SaleCalendar = cached_calendar(self.calendar_file, self._compile, yearless=True)
+        self.sales_data: CalendarData = {w.label: w.items for w in self.index.windows}
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _load(self) -> None:
-        if not self.calendar_file.exists():
-            raise FileNotFoundError(f"Calendar file not found: {self.calendar_file}")
+    def _compile(self, calendar_file: Path) -> SaleCalendar:
+        windows = []
+        for dr, products in self._parse(calendar_file).items():
+            start, end = self._parse_date_range(dr)
+            windows.append(SaleWindow(dr, start, end, products))
+        return SaleCalendar(windows)
 
+    @staticmethod
+    def _parse(calendar_file: Path) -> CalendarData:
+        sales_data: CalendarData = {}
         date_header_re = re.compile(r"^## (.+ - .+)$")
         current_range: Optional[str] = None
 
-        with self.calendar_file.open() as fh:
+        with calendar_file.open() as fh:
             for line in fh:
                 line = line.rstrip("\n")
                 header_match = date_header_re.match(line)
                 if header_match:
                     current_range = header_match.group(1)
-                    self.sales_data[current_range] = []
+                    sales_data[current_range] = []
                     continue
 
                 if (
@@ -105,7 +120,7 @@ class BrevilleMapCalendar:
                         variant_id,
                     ) = cells[:8]
 
-                    self.sales_data[current_range].append(
+                    sales_data[current_range].append(
                         {
                             "product_title": product_title,
                             "color": colour,
@@ -117,6 +132,7 @@ class BrevilleMapCalendar:
                             "variant_id": variant_id,
                         }
                     )
+        return sales_data
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -142,18 +158,17 @@ class BrevilleMapCalendar:
         )
 
     def active_sales_for(self, on: date) -> Tuple[List[Dict[str, str]], Optional[str]]:
-        active: List[Dict[str, str]] = []
-        active_range: Optional[str] = None
-        for dr, products in self.sales_data.items():
-            start, end = self._parse_date_range(dr)
-            if start <= on <= end:
-                active.extend(products)
-                active_range = dr
-        return active, active_range
+        windows = self.index.windows_on(on)
+        active: List[Dict[str, str]] = [product for w in windows for product in w.items]
+        return active, (windows[-1].label if windows else None)
+
+    def sales_for_sku(self, sku: str, on: date) -> List[Dict[str, str]]:
+        """Calendar rows for ``sku`` in the ranges active on ``on``."""
+        return self.index.items_for_sku(sku, on)
 
     def sale_end_iso(self, dr: str) -> str:
         """Return ISO8601 Z time for 23:59:59 on the range's end date."""
-        _, end_d = self._parse_date_range(dr)
+        end_d = self.index.by_label[dr].end
         end_dt = datetime.combine(end_d, datetime.max.time()).replace(tzinfo=timezone.utc)
         return end_dt.isoformat().replace("+00:00", "Z")
 
@@ -190,7 +205,7 @@ class ManageMapSalesTool(BaseMCPTool):
         self.calendar = BrevilleMapCalendar(
             Path(__file__).with_suffix("").parent / "breville_espresso_sales_2025_enhanced.md"
         )
-        self.client = ShopifyClient()  # Already points to 2025-07
+        self.client = AsyncShopifyClient()  # Already points to 2025-07
 
     # ------------------------------------------------------------------
     # Base entry point – async for compatibility with orchestrator
@@ -205,34 +220,22 @@ class ManageMapSalesTool(BaseMCPTool):
         if action not in action_map:
             return {"success": False, "error": f"Unsupported action: {action}"}
         try:
-            return action_map[action](**kwargs)
+            return await action_map[action](**kwargs)
         except Exception as exc:  # pylint: disable=broad-except
             return {"success": False, "error": str(exc), "action": action}
 
     # ------------------------------------------------------------------
     # Shopify helpers (mutations / queries)
     # ------------------------------------------------------------------
-    PRODUCT_SEARCH_Q = """
-    query searchBySku($query: String!) {
-        products(first: 5, query: $query) {
-            edges {
-                node {
-                    id
-                    tags
-                    variants(first: 10) {
-                        edges {
-                            node {
-                                id
-                                sku
-                                price
-                                compareAtPrice
-                            }
-                        }
-                    }
-                }
-            }
+    VARIANT_SELECTION = """
+        price
+        compareAtPrice
+        product {
+            id
+            tags
+            status
+            saleEnd: metafield(namespace: "inventory", key: "ShappifySaleEndDate") { value }
         }
-    }
     """
 
     PRODUCT_VARIANT_BULK_MUTATION = """
@@ -254,9 +257,9 @@ class ManageMapSalesTool(BaseMCPTool):
     """
 
     # ------------------------------------------------------------------
-    # Action implementations (sync for simplicity)
+    # Action implementations
     # ------------------------------------------------------------------
-    def _check_action(self, **kwargs):
+    async def _check_action(self, **kwargs):
         check_date: date = (
             datetime.strptime(kwargs.get("date"), "%Y-%m-%d").date() if kwargs.get("date") else date.today()
         )
@@ -269,7 +272,7 @@ class ManageMapSalesTool(BaseMCPTool):
             "sales": sales,
         }
 
-    def _apply_action(self, **kwargs):
+    async def _apply_action(self, **kwargs):
         dry_run: bool = kwargs.get("dry_run", False)
         target_date: date = (
             datetime.strptime(kwargs.get("date"), "%Y-%m-%d").date() if kwargs.get("date") else date.today()
@@ -280,12 +283,14 @@ class ManageMapSalesTool(BaseMCPTool):
 
         sale_end_iso = self.calendar.sale_end_iso(active_range)  # type: ignore[arg-type]
         stats = {"updated": 0, "already_on_sale": 0, "not_found": 0, "not_map": 0}
-        product_ids_needing_end_date = set()
+        sale_ends: Dict[str, Optional[str]] = {}
 
+        # One batched read of current prices; only real changes are written
+        variants = await self._lookup_skus(active_sales)
+        requested = []
+        current = {}
         for product in active_sales:
-            sku = product["sku"]
-            search_res = self.client.execute_graphql(self.PRODUCT_SEARCH_Q, {"query": f"sku:{sku} status:active"})
-            product_info = self._extract_product_info(search_res, sku)
+            product_info = variants.get(product["sku"])
             if not product_info:
                 stats["not_found"] += 1
                 continue
@@ -294,43 +299,37 @@ class ManageMapSalesTool(BaseMCPTool):
                 stats["not_map"] += 1
                 continue
 
-            product_ids_needing_end_date.add(product_info["product_id"])
-
-            # Already on sale?
-            if (
-                product_info["compare_at"]
-                and abs(product_info["current_price"] - product["sale_price"]) < 0.01
-            ):
-                stats["already_on_sale"] += 1
-                continue
-
-            if dry_run:
-                stats["updated"] += 1
-                continue
-
-            variables = {
-                "productId": product_info["product_id"],
-                "variants": [
-                    {
-                        "id": product_info["variant_id"],
-                        "price": str(product["sale_price"]),
-                        "compareAtPrice": str(product["regular_price"]),
-                    }
-                ],
-            }
-            mutation_res = self.client.execute_graphql(self.PRODUCT_VARIANT_BULK_MUTATION, variables)
+            sale_ends[product_info["product_id"]] = product_info["sale_end"]
+            current[product_info["variant_id"]] = product_info["variant"]
+            requested.append({
+                "variant_id": product_info["variant_id"],
+                "price": product["sale_price"],
+                "compare_at_price": product["regular_price"],
+            })
+
+        price_plan = plan_price_changes(requested, current)
+        stats["already_on_sale"] = len(price_plan.unchanged)
+        # Set sale end metafield on parent products that don't have it yet
+        end_date_updates = sorted(pid for pid, end in sale_ends.items() if end != sale_end_iso)
+        plan = {**price_plan.counts(), "sale_end_updates": len(end_date_updates)}
+
+        if dry_run:
+            stats["updated"] = price_plan.variants_to_change
+            return {"success": True, "details": stats, "plan": plan, "sale_end": sale_end_iso, "dry_run": dry_run}
+
+        for product_id, variants_input in price_plan.changes.items():
+            variables = {"productId": product_id, "variants": variants_input}
+            mutation_res = await self.client.execute_graphql(self.PRODUCT_VARIANT_BULK_MUTATION, variables)
             if not self.client.check_user_errors(mutation_res, "productVariantsBulkUpdate"):
                 continue
-            stats["updated"] += 1
+            stats["updated"] += len(variants_input)
 
-        # Set sale end metafield on parent products
-        if not dry_run and product_ids_needing_end_date:
-            for pid in product_ids_needing_end_date:
-                self._update_sale_end_metafield(pid, sale_end_iso)
+        for pid in end_date_updates:
+            await self._update_sale_end_metafield(pid, sale_end_iso)
 
-        return {"success": True, "details": stats, "sale_end": sale_end_iso, "dry_run": dry_run}
+        return {"success": True, "details": stats, "plan": plan, "sale_end": sale_end_iso, "dry_run": dry_run}
 
-    def _revert_action(self, **kwargs):
+    async def _revert_action(self, **kwargs):
         date_range: str = kwargs.get("date_range") or ""
         dry_run: bool = kwargs.get("dry_run", False)
         if date_range not in self.calendar.sales_data:
@@ -343,10 +342,9 @@ class ManageMapSalesTool(BaseMCPTool):
         products = self.calendar.sales_data[date_range]
         stats = {"reverted": 0, "not_on_sale": 0, "not_found": 0}
         product_ids: set[str] = set()
+        variants = await self._lookup_skus(products)
         for product in products:
-            sku = product["sku"]
-            res = self.client.execute_graphql(self.PRODUCT_SEARCH_Q, {"query": f"sku:{sku} status:active"})
-            info = self._extract_product_info(res, sku)
+            info = variants.get(product["sku"])
             if not info:
                 stats["not_found"] += 1
                 continue
@@ -363,26 +361,25 @@ class ManageMapSalesTool(BaseMCPTool):
                     {"id": info["variant_id"], "price": str(product["regular_price"]), "compareAtPrice": None}
                 ],
             }
-            mutation_res = self.client.execute_graphql(self.PRODUCT_VARIANT_BULK_MUTATION, variables)
+            mutation_res = await self.client.execute_graphql(self.PRODUCT_VARIANT_BULK_MUTATION, variables)
             if not self.client.check_user_errors(mutation_res, "productVariantsBulkUpdate"):
                 continue
             stats["reverted"] += 1
         # Clear metafield
         if not dry_run:
             for pid in product_ids:
-                self._update_sale_end_metafield(pid, "")
+                await self._update_sale_end_metafield(pid, "")
         return {"success": True, "details": stats, "dry_run": dry_run}
 
-    def _summary_action(self, **_kw):
+    async def _summary_action(self, **_kw):
         today = date.today()
         summary = []
-        for dr in sorted(self.calendar.sales_data.keys(), key=lambda r: self.calendar._parse_date_range(r)[0]):
-            start, end = self.calendar._parse_date_range(dr)
+        for window in sorted(self.calendar.index.windows, key=lambda w: w.start):
             summary.append(
                 {
-                    "date_range": dr,
-                    "products": len(self.calendar.sales_data[dr]),
-                    "active": start <= today <= end,
+                    "date_range": window.label,
+                    "products": len(window.items),
+                    "active": window.start <= today <= window.end,
                 }
             )
         return {"success": True, "summary": summary}
@@ -390,24 +387,28 @@ class ManageMapSalesTool(BaseMCPTool):
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
+    async def _lookup_skus(self, products: List[Dict[str, str]]) -> Dict[str, Optional[Dict]]:
+        """Active variant info for every calendar SKU, resolved in batched queries"""
+        variants = await self.client.resolve_variants(
+            [p["sku"] for p in products], self.VARIANT_SELECTION, search="product_status:active", skus_only=True
+        )
+        return {sku: self._variant_info(variant) for sku, variant in variants.items()}
+
     @staticmethod
-    def _extract_product_info(resp: Dict, sku: str):  # type: ignore[override]
-        edges = resp.get("data", {}).get("products", {}).get("edges", [])
-        for e in edges:
-            node = e["node"]
-            for v in node["variants"]["edges"]:
-                variant = v["node"]
-                if variant["sku"] == sku:
-                    return {
-                        "product_id": node["id"],
-                        "variant_id": variant["id"],
-                        "current_price": float(variant["price"]),
-                        "compare_at": float(variant["compareAtPrice"]) if variant["compareAtPrice"] else None,
-                        "tags": node["tags"],
-                    }
-        return None
+    def _variant_info(variant: Optional[Dict]):
+        if not variant or variant["product"].get("status") != "ACTIVE":
+            return None
+        return {
+            "product_id": variant["product"]["id"],
+            "variant_id": variant["id"],
+            "current_price": float(variant["price"]),
+            "compare_at": float(variant["compareAtPrice"]) if variant["compareAtPrice"] else None,
+            "tags": variant["product"]["tags"],
+            "sale_end": (variant["product"].get("saleEnd") or {}).get("value"),
+            "variant": variant,
+        }
 
-    def _update_sale_end_metafield(self, product_id: str, sale_end: str) -> None:
+    async def _update_sale_end_metafield(self, product_id: str, sale_end: str) -> None:
         variables = {
             "input": {
                 "id": product_id,
@@ -421,7 +422,7 @@ class ManageMapSalesTool(BaseMCPTool):
                 ],
             }
         }
-        res = self.client.execute_graphql(self.PRODUCT_UPDATE_METAFIELD_MUTATION, variables)
+        res = await self.client.execute_graphql(self.PRODUCT_UPDATE_METAFIELD_MUTATION, variables)
         self.client.check_user_errors(res, "productUpdate")
 
 
@@ -446,12 +447,13 @@ def _cli() -> None:  # pragma: no cover – invoked manually
     if args.calendar:
         tool.calendar = BrevilleMapCalendar(Path(args.calendar))
 
-    result = {
+    action = {
         "check": lambda: tool._check_action(date=args.date),
         "apply": lambda: tool._apply_action(date=args.date, dry_run=args.dry_run),
         "revert": lambda: tool._revert_action(date_range=args.date_range, dry_run=args.dry_run),
         "summary": lambda: tool._summary_action(),
-    }[args.command]()
+    }[args.command]
+    result = asyncio.run(action())
 
     # Pretty-print result to stdout for human use.
     import json as _json
@@ -4,7 +4,9 @@ Native MCP implementation for managing Miele MAP sales
 
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, List, Optional, Tuple
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from price_diff import plan_price_changes, prefetch_prices
+from sale_calendar import SaleCalendar, SaleWindow
 
 class ManageMieleSalesTool(BaseMCPTool):
     """Manage Miele MAP sales based on 2025 calendar"""
@@ -59,7 +61,7 @@ class ManageMieleSalesTool(BaseMCPTool):
             },
             "force": {
                 "type": "boolean",
-                "description": "Force apply even if already on sale",
+                "description": "Write prices and tags even where they are already set",
                 "default": False
             }
         },
@@ -136,6 +138,23 @@ class ManageMieleSalesTool(BaseMCPTool):
             }),
             # Add more sale windows as needed...
         ]
+        self.calendar = self._compile_calendar()
+
+    def _compile_calendar(self) -> SaleCalendar:
+        """Index the sale windows by date and SKU, expanding CM6360 to both colors"""
+        windows = []
+        for start_str, end_str, sale_prices in self.sale_windows:
+            items = []
+            for product_key, sale_price in sale_prices.items():
+                keys = [f"CM6360_{color}" for color in ["CleanSteel", "LotusWhite"]] \
+                    if product_key == "CM6360" else [product_key]
+                for key in keys:
+                    if key in self.products:
+                        items.append({"product": key, "sku": self.products[key]["variants"][0]["sku"],
+                                      "sale_price": sale_price})
+            windows.append(SaleWindow(f"{start_str} - {end_str}", date.fromisoformat(start_str),
+                                      date.fromisoformat(end_str), items))
+        return SaleCalendar(windows)
     
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """Execute Miele sales management action"""
@@ -174,41 +193,21 @@ class ManageMieleSalesTool(BaseMCPTool):
         """Check what sales should be active on a date"""
         active_sales = []
         
-        for start_str, end_str, sale_prices in self.sale_windows:
-            start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
-            
-            if start_date <= check_date <= end_date:
-                # Process each product in the sale
-                for product_key, sale_price in sale_prices.items():
-                    # Handle CM6360 which has two color variants
-                    if product_key == "CM6360":
-                        for color in ["CleanSteel", "LotusWhite"]:
-                            key = f"CM6360_{color}"
-                            if key in self.products:
-                                product = self.products[key]
-                                active_sales.append({
-                                    "product": key,
-                                    "product_id": product["product_id"],
-                                    "regular_price": float(product["regular_price"]),
-                                    "sale_price": float(sale_price),
-                                    "savings": float(product["regular_price"]) - float(sale_price),
-                                    "discount_percent": round((float(product["regular_price"]) - float(sale_price)) / float(product["regular_price"]) * 100, 1),
-                                    "start_date": start_str,
-                                    "end_date": end_str
-                                })
-                    elif product_key in self.products:
-                        product = self.products[product_key]
-                        active_sales.append({
-                            "product": product_key,
-                            "product_id": product["product_id"],
-                            "regular_price": float(product["regular_price"]),
-                            "sale_price": float(sale_price),
-                            "savings": float(product["regular_price"]) - float(sale_price),
-                            "discount_percent": round((float(product["regular_price"]) - float(sale_price)) / float(product["regular_price"]) * 100, 1),
-                            "start_date": start_str,
-                            "end_date": end_str
-                        })
+        for window in self.calendar.windows_on(check_date):
+            for item in window.items:
+                product = self.products[item["product"]]
+                regular = float(product["regular_price"])
+                sale = float(item["sale_price"])
+                active_sales.append({
+                    "product": item["product"],
+                    "product_id": product["product_id"],
+                    "regular_price": regular,
+                    "sale_price": sale,
+                    "savings": regular - sale,
+                    "discount_percent": round((regular - sale) / regular * 100, 1),
+                    "start_date": window.start.isoformat(),
+                    "end_date": window.end.isoformat()
+                })
         
         return {
             "success": True,
@@ -231,35 +230,59 @@ class ManageMieleSalesTool(BaseMCPTool):
                 "date": str(target_date)
             }
         
-        client = ShopifyClient()
+        client = AsyncShopifyClient()
         results = []
         sale_tag = f"sale-{target_date.strftime('%Y-%m')}"
         
+        # Read current prices and tags in one query; unless forced, only write what differs
+        requested = [
+            {"variant_id": variant['id'], "price": sale['sale_price'], "compare_at_price": sale['regular_price']}
+            for sale in active_sales
+            for variant in self.products[sale['product']]['variants']
+        ]
+        current = await prefetch_prices(client, [row['variant_id'] for row in requested], "product { tags }")
+        price_plan = plan_price_changes(requested, current, force=force)
+        untagged = {
+            node['product']['id'] for node in current.values()
+            if node and (force or not {"miele-sale", sale_tag} <= set(node['product']['tags']))
+        }
+        plan = {**price_plan.counts(), "products_to_tag": len(untagged)}
+        
         for sale in active_sales:
             product_key = sale['product']
             product_info = self.products[product_key]
+            variants_input = price_plan.changes.get(product_info['product_id'], [])
+            needs_tags = product_info['product_id'] in untagged
+            
+            if all(v['id'] in price_plan.not_found for v in product_info['variants']):
+                results.append({"product": product_key, "status": "error", "errors": ["Variant not found"]})
+                continue
+            invalid = [row['error'] for row in price_plan.invalid
+                       if row['variant_id'] in {v['id'] for v in product_info['variants']}]
+            if invalid:
+                results.append({"product": product_key, "status": "error", "errors": invalid})
+                continue
+            
+            if not variants_input and not needs_tags:
+                results.append({"product": product_key, "status": "unchanged"})
+                continue
             
             if dry_run:
+                actions = []
+                if variants_input:
+                    actions += [
+                        f"Would set price to ${sale['sale_price']}",
+                        f"Would set compare-at to ${sale['regular_price']}"
+                    ]
+                if needs_tags:
+                    actions.append(f"Would add tags: miele-sale, {sale_tag}")
                 results.append({
                     "product": product_key,
                     "status": "dry_run",
-                    "actions": [
-                        f"Would set price to ${sale['sale_price']}",
-                        f"Would set compare-at to ${sale['regular_price']}",
-                        f"Would add tags: miele-sale, {sale_tag}"
-                    ]
+                    "actions": actions
                 })
                 continue
             
-            # Update variants
-            variants_input = []
-            for variant in product_info['variants']:
-                variants_input.append({
-                    "id": variant['id'],
-                    "price": str(sale['sale_price']),
-                    "compareAtPrice": str(sale['regular_price'])
-                })
-            
             # Update using bulk mutation
             mutation = '''
             mutation updateVariantPrices($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
@@ -282,16 +305,17 @@ class ManageMieleSalesTool(BaseMCPTool):
                 "variants": variants_input
             }
             
-            response = client.execute_graphql(mutation, variables)
-            
-            if response.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
-                errors = response['data']['productVariantsBulkUpdate']['userErrors']
-                results.append({
-                    "product": product_key,
-                    "status": "error",
-                    "errors": errors
-                })
-                continue
+            if variants_input:
+                response = await client.execute_graphql(mutation, variables)
+                
+                if response.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
+                    errors = response['data']['productVariantsBulkUpdate']['userErrors']
+                    results.append({
+                        "product": product_key,
+                        "status": "error",
+                        "errors": errors
+                    })
+                    continue
             
             # Add tags
             tag_mutation = '''
@@ -310,10 +334,11 @@ class ManageMieleSalesTool(BaseMCPTool):
             }
             '''
             
-            tag_response = client.execute_graphql(tag_mutation, {
-                "id": product_info['product_id'],
-                "tags": ["miele-sale", sale_tag]
-            })
+            if needs_tags:
+                tag_response = await client.execute_graphql(tag_mutation, {
+                    "id": product_info['product_id'],
+                    "tags": ["miele-sale", sale_tag]
+                })
             
             results.append({
                 "product": product_key,
@@ -327,14 +352,16 @@ class ManageMieleSalesTool(BaseMCPTool):
             "success": True,
             "date": str(target_date),
             "dry_run": dry_run,
+            "plan": plan,
             "applied_sales": len([r for r in results if r.get('status') == 'success']),
+            "unchanged": len([r for r in results if r.get('status') == 'unchanged']),
             "errors": len([r for r in results if r.get('status') == 'error']),
             "results": results
         }
     
     async def _revert_sales(self, target_date: date, dry_run: bool) -> Dict[str, Any]:
         """Revert all Miele products to regular prices"""
-        client = ShopifyClient()
+        client = AsyncShopifyClient()
         results = []
         sale_tag = f"sale-{target_date.strftime('%Y-%m')}"
         
@@ -382,7 +409,7 @@ class ManageMieleSalesTool(BaseMCPTool):
                 "variants": variants_input
             }
             
-            response = client.execute_graphql(mutation, variables)
+            response = await client.execute_graphql(mutation, variables)
             
             if response.get('data', {}).get('productVariantsBulkUpdate', {}).get('userErrors'):
                 errors = response['data']['productVariantsBulkUpdate']['userErrors']
@@ -410,7 +437,7 @@ class ManageMieleSalesTool(BaseMCPTool):
             }
             '''
             
-            tag_response = client.execute_graphql(tag_mutation, {
+            tag_response = await client.execute_graphql(tag_mutation, {
                 "id": product_info['product_id'],
                 "tags": ["miele-sale", sale_tag]
             })
@@ -435,40 +462,27 @@ class ManageMieleSalesTool(BaseMCPTool):
         today = date.today()
         upcoming = []
         
-        for start_str, end_str, sale_prices in self.sale_windows:
-            start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
+        for window in self.calendar.windows:
+            start_date, end_date = window.start, window.end
             
             # Include past 30 days and future sales
             if end_date >= today - timedelta(days=30):
                 status = "active" if start_date <= today <= end_date else ("upcoming" if start_date > today else "past")
                 
                 products_in_sale = []
-                for product_key, sale_price in sale_prices.items():
-                    if product_key == "CM6360":
-                        # Handle both color variants
-                        for color in ["CleanSteel", "LotusWhite"]:
-                            key = f"CM6360_{color}"
-                            if key in self.products:
-                                product = self.products[key]
-                                products_in_sale.append({
-                                    "product": key,
-                                    "regular_price": float(product["regular_price"]),
-                                    "sale_price": float(sale_price),
-                                    "discount_percent": round((float(product["regular_price"]) - float(sale_price)) / float(product["regular_price"]) * 100, 1)
-                                })
-                    elif product_key in self.products:
-                        product = self.products[product_key]
-                        products_in_sale.append({
-                            "product": product_key,
-                            "regular_price": float(product["regular_price"]),
-                            "sale_price": float(sale_price),
-                            "discount_percent": round((float(product["regular_price"]) - float(sale_price)) / float(product["regular_price"]) * 100, 1)
-                        })
+                for item in window.items:
+                    regular = float(self.products[item["product"]]["regular_price"])
+                    sale = float(item["sale_price"])
+                    products_in_sale.append({
+                        "product": item["product"],
+                        "regular_price": regular,
+                        "sale_price": sale,
+                        "discount_percent": round((regular - sale) / regular * 100, 1)
+                    })
                 
                 upcoming.append({
-                    "start_date": start_str,
-                    "end_date": end_str,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
                     "status": status,
                     "days_until": (start_date - today).days if start_date > today else 0,
                     "products": products_in_sale
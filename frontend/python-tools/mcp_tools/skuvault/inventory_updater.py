@@ -260,81 +260,90 @@ class InventoryUpdater:
             location_code=m.location_code,
         )
 
-def process_single(self, shopify_sku: str, quantity: int, dry_run: bool = False):
-    """Update a single SKU in SkuVault."""
-    item = self._translate(shopify_sku, quantity)
-    if not item:
-        return
-    if dry_run:
-        logger.info("Dry-run: would update %s", item)
-        return
-    try:
-        resp = self.client.update_quantities([item])
-    except SkuVaultError as exc:
-        logger.error("Single update failed for %s: %s", item.sku, exc)
-        return
-    else:
-        self._known_quantities[item.sku] = item.quantity
-        logger.info("Update response: %s", resp)
-        self._record_metric(1)
-
-def process_batch(self, updates: Dict[str, int], dry_run: bool = False):
-    """Bulk quantity update with best-effort rollback on failure."""
-    payload: List[UpsertPayloadItem] = []
-    for shopify_sku, qty in updates.items():
-        item = self._translate(shopify_sku, qty)
-        if item:
-            payload.append(item)
-    if not payload:
-        logger.info("Nothing to update in batch.")
-        return
-    if dry_run:
-        logger.info("Dry-run payload: %s", [p.to_dict() for p in payload])
-        return
-    try:
-        resp = self.client.update_quantities(payload)
-    except SkuVaultError as exc:
-        logger.error("Batch update failed: %s. Attempting rollback ..", exc)
-        self._attempt_rollback(payload)
-        raise
-    else:
-        logger.info("Batch update response: %s", resp)
-        for item in payload:
-            self._known_quantities[item.sku] = item.quantity
-        self._record_metric(len(payload))
-
-
-    """Bulk quantity update with best-effort rollback on failure."""
-    payload: List[UpsertPayloadItem] = []
-    for shopify_sku, qty in updates.items():
-        item = self._translate(shopify_sku, qty)
-        if item:
-            payload.append(item)
-    if not payload:
-        logger.info("Nothing to update in batch.")
-        return
-    if dry_run:
-        logger.info(f"Dry-run payload: {[p.to_dict() for p in payload]}")
-        return
-    try:
-        resp = self.client.update_quantities(payload)
-    except SkuVaultError as exc:
-        logger.error(f"Batch update failed: {exc}. Attempting rollback ..")
-        self._attempt_rollback(payload)
-        raise
-    else:
-        logger.info(f"Batch update response: {resp}")
-        for item in payload:
+    def process_single(self, shopify_sku: str, quantity: int, dry_run: bool = False):
+        """Update a single SKU in SkuVault."""
+        item = self._translate(shopify_sku, quantity)
+        if not item:
+            return
+        if dry_run:
+            logger.info("Dry-run: would update %s", item)
+            return
+        try:
+            resp = self.client.update_quantities([item])
+        except SkuVaultError as exc:
+            logger.error("Single update failed for %s: %s", item.sku, exc)
+            return
+        else:
             self._known_quantities[item.sku] = item.quantity
-        self._record_metric(len(payload))
-    # Monitoring stub (StatsD)
+            logger.info("Update response: %s", resp)
+            self._record_metric(1)
+
+    def process_batch(self, updates: Dict[str, int], dry_run: bool = False):
+        """Bulk quantity update with best-effort rollback on failure."""
+        payload: List[UpsertPayloadItem] = []
+        for shopify_sku, qty in updates.items():
+            item = self._translate(shopify_sku, qty)
+            if item:
+                payload.append(item)
+        if not payload:
+            logger.info("Nothing to update in batch.")
+            return
+        if dry_run:
+            logger.info("Dry-run payload: %s", [p.to_dict() for p in payload])
+            return
+        try:
+            resp = self.client.update_quantities(payload)
+        except SkuVaultError as exc:
+            logger.error("Batch update failed: %s. Attempting rollback ..", exc)
+            self._attempt_rollback(payload)
+            raise
+        else:
+            logger.info("Batch update response: %s", resp)
+            for item in payload:
+                self._known_quantities[item.sku] = item.quantity
+            self._record_metric(len(payload))
+
+    def _attempt_rollback(self, payload: List[UpsertPayloadItem]):
+        """Re-push the last quantities we know SkuVault accepted for a failed batch."""
+        previous = [
+            UpsertPayloadItem(item.sku, self._known_quantities[item.sku], item.warehouse_id, item.location_code)
+            for item in payload
+            if item.sku in self._known_quantities
+        ]
+        if not previous:
+            logger.warning("No previously pushed quantities to roll back to")
+            return
+        try:
+            self.client.update_quantities(previous)
+        except SkuVaultError as exc:
+            logger.error("Rollback failed: %s", exc)
+
+    # Monitoring (StatsD), one client per process
     def _record_metric(self, count: int):
+        client = _get_statsd_client()
+        if client is not None:
+            client.incr("inventory_updates", count)
+
+
+_statsd_client = None
+_statsd_checked = False
+
+
+def _get_statsd_client():
+    """Shared StatsD client, or None when statsd is not installed or configured."""
+    global _statsd_client, _statsd_checked
+    if not _statsd_checked:
+        _statsd_checked = True
         try:
             import statsd  # type: ignore
-            c = statsd.StatsClient(prefix="idc.skvt")
-            c.incr("inventory_updates", count)
+            _statsd_client = statsd.StatsClient(
+                host=os.environ.get("STATSD_HOST", "localhost"),
+                port=int(os.environ.get("STATSD_PORT", "8125")),
+                prefix="idc.skvt",
+            )
         except Exception as e:  # pylint: disable=broad-except
             logger.debug(f"StatsD not configured: {e}")
+    return _statsd_client
 
 
 # ---------------------------------------------------------------------------
@@ -7,6 +7,7 @@ import json
 import requests
 from typing import Dict, Any, List, Optional, Tuple
 from ..base import BaseMCPTool
+from mcp_deadline import http_timeout
 
 class ManageSkuVaultKitsTool(BaseMCPTool):
     """Manage SkuVault kits (bundles/combos)"""
@@ -391,7 +392,7 @@ class ManageSkuVaultKitsTool(BaseMCPTool):
         }
         
         try:
-            response = requests.post(url, json=request_body, headers=self.headers, timeout=30)
+            response = requests.post(url, json=request_body, headers=self.headers, timeout=http_timeout(30))
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -6,7 +6,8 @@ import os
 import json
 import requests
 from typing import Dict, Any, List, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
+from mcp_deadline import check_deadline, http_timeout, record_progress
 
 class UploadToSkuVaultTool(BaseMCPTool):
     """Upload products from Shopify to SkuVault inventory system"""
@@ -24,7 +25,7 @@ class UploadToSkuVaultTool(BaseMCPTool):
     - Dry run preview mode
     
     Process:
-    1. Fetch product from Shopify by SKU
+    1. Fetch products from Shopify by SKU (batched)
     2. Extract title, vendor, price, cost, images
     3. Format for SkuVault requirements
     4. Upload via SkuVault API
@@ -68,6 +69,33 @@ class UploadToSkuVaultTool(BaseMCPTool):
         }
     }
     
+    timeout = 600
+    
+    VARIANT_SELECTION = """
+        price
+        inventoryItem {
+            id
+            unitCost {
+                amount
+            }
+        }
+        product {
+            id
+            title
+            vendor
+            productType
+            descriptionHtml
+            images(first: 5) {
+                edges {
+                    node {
+                        url
+                        altText
+                    }
+                }
+            }
+        }
+    """
+    
     def __init__(self):
         super().__init__()
         self.skuvault_tenant_token = os.environ.get('SKUVAULT_TENANT_TOKEN')
@@ -95,13 +123,16 @@ class UploadToSkuVaultTool(BaseMCPTool):
         
         dry_run = kwargs.get('dry_run', False)
         
-        # Process each SKU
+        # Fetch every SKU from Shopify in batched queries, then process each
         results = []
-        client = ShopifyClient()
+        client = AsyncShopifyClient()
+        variants = await client.resolve_variants(skus, self.VARIANT_SELECTION, skus_only=True)
         
         for sku in skus:
-            result = await self._process_sku(client, sku, dry_run)
+            check_deadline(f"uploading {sku}")
+            result = await self._process_sku(sku, variants.get(sku), dry_run)
             results.append(result)
+            record_progress(processed=len(results), total=len(skus), results=results)
         
         # Summary
         success_count = sum(1 for r in results if r.get('success'))
@@ -118,11 +149,9 @@ class UploadToSkuVaultTool(BaseMCPTool):
             "dry_run": dry_run
         }
     
-    async def _process_sku(self, client: ShopifyClient, sku: str, dry_run: bool) -> Dict[str, Any]:
-        """Process a single SKU"""
+    async def _process_sku(self, sku: str, shopify_data: Optional[Dict[str, Any]], dry_run: bool) -> Dict[str, Any]:
+        """Process a single SKU from its Shopify variant"""
         try:
-            # Fetch from Shopify
-            shopify_data = await self._fetch_product_by_sku(client, sku)
             if not shopify_data:
                 return {
                     "sku": sku,
@@ -161,55 +190,6 @@ class UploadToSkuVaultTool(BaseMCPTool):
                 "error": str(e)
             }
     
-    async def _fetch_product_by_sku(self, client: ShopifyClient, sku: str) -> Optional[Dict[str, Any]]:
-        """Fetch product data from Shopify by SKU"""
-        query = """
-        query getProductBySku($sku: String!) {
-            productVariants(first: 1, query: $sku) {
-                edges {
-                    node {
-                        id
-                        sku
-                        price
-                        inventoryItem {
-                            id
-                            unitCost {
-                                amount
-                            }
-                        }
-                        product {
-                            id
-                            title
-                            vendor
-                            productType
-                            descriptionHtml
-                            images(first: 5) {
-                                edges {
-                                    node {
-                                        url
-                                        altText
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        """
-        
-        variables = {"sku": f"sku:{sku}"}
-        result = client.execute_graphql(query, variables)
-        
-        if 'errors' in result:
-            return None
-        
-        edges = result.get('data', {}).get('productVariants', {}).get('edges', [])
-        if not edges:
-            return None
-        
-        return edges[0]['node']
-    
     def _prepare_skuvault_data(self, shopify_data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Shopify product data to SkuVault format"""
         variant = shopify_data
@@ -271,7 +251,7 @@ class UploadToSkuVaultTool(BaseMCPTool):
                 'https://app.skuvault.com/api/products/createProduct',
                 headers=headers,
                 json=product_data,
-                timeout=30
+                timeout=http_timeout(30)
             )
             
             if response.status_code == 200:
@@ -3,7 +3,7 @@ Native MCP implementation for managing URL redirects
 """
 
 from typing import Dict, Any, List, Optional
-from ..base import BaseMCPTool, ShopifyClient
+from ..base import BaseMCPTool, AsyncShopifyClient
 
 class ManageRedirectsTool(BaseMCPTool):
     """Manage URL redirects in Shopify store"""
@@ -70,7 +70,7 @@ class ManageRedirectsTool(BaseMCPTool):
     async def execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """Execute redirect management action"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             
             if action == "create":
                 from_path = kwargs.get('from_path')
@@ -112,7 +112,7 @@ class ManageRedirectsTool(BaseMCPTool):
                 "action": action
             }
     
-    async def _create_redirect(self, client: ShopifyClient, from_path: str, to_path: str) -> Dict[str, Any]:
+    async def _create_redirect(self, client: AsyncShopifyClient, from_path: str, to_path: str) -> Dict[str, Any]:
         """Create a URL redirect"""
         mutation = """
         mutation createUrlRedirect($redirect: UrlRedirectInput!) {
@@ -137,7 +137,7 @@ class ManageRedirectsTool(BaseMCPTool):
             }
         }
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         # Check for errors
         if result.get('data', {}).get('urlRedirectCreate', {}).get('userErrors'):
@@ -164,7 +164,7 @@ class ManageRedirectsTool(BaseMCPTool):
             "error": "Failed to create redirect"
         }
     
-    async def _list_redirects(self, client: ShopifyClient, limit: int) -> Dict[str, Any]:
+    async def _list_redirects(self, client: AsyncShopifyClient, limit: int) -> Dict[str, Any]:
         """List URL redirects"""
         query = """
         query listRedirects($first: Int!) {
@@ -185,7 +185,7 @@ class ManageRedirectsTool(BaseMCPTool):
         
         variables = {"first": limit}
         
-        result = client.execute_graphql(query, variables)
+        result = await client.execute_graphql(query, variables)
         
         if result and 'data' in result and result['data'].get('urlRedirects'):
             redirects = []
@@ -204,7 +204,7 @@ class ManageRedirectsTool(BaseMCPTool):
             "error": "Failed to list redirects"
         }
     
-    async def _delete_redirect(self, client: ShopifyClient, redirect_id: str) -> Dict[str, Any]:
+    async def _delete_redirect(self, client: AsyncShopifyClient, redirect_id: str) -> Dict[str, Any]:
         """Delete a URL redirect"""
         # Ensure proper GID format
         if not redirect_id.startswith("gid://"):
@@ -224,7 +224,7 @@ class ManageRedirectsTool(BaseMCPTool):
         
         variables = {"id": redirect_id}
         
-        result = client.execute_graphql(mutation, variables)
+        result = await client.execute_graphql(mutation, variables)
         
         # Check for errors
         if result.get('data', {}).get('urlRedirectDelete', {}).get('userErrors'):
@@ -249,7 +249,7 @@ class ManageRedirectsTool(BaseMCPTool):
     async def test(self) -> Dict[str, Any]:
         """Test redirect management capability"""
         try:
-            client = ShopifyClient()
+            client = AsyncShopifyClient()
             # Test with a simple query
             query = """
             {
@@ -262,7 +262,7 @@ class ManageRedirectsTool(BaseMCPTool):
                 }
             }
             """
-            result = client.execute_graphql(query)
+            result = await client.execute_graphql(query)
             
             if result and 'data' in result:
                 return {
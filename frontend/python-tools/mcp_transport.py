@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Stdio transport and JSON codec for the MCP servers
+
+``StdioTransport`` wraps fds 0/1 in an asyncio ``StreamReader`` /
+``StreamWriter`` pair, so reading a request is an event-loop wakeup rather
+than a hop through a thread pool, and writes are buffered with ``drain()``
+backpressure when the client stops reading. When a descriptor cannot be
+registered with the event loop (a regular file, or Windows) it falls back to
+a private reader thread and blocking writes.
+
+The JSON codec is pluggable: orjson when installed, the standard library
+otherwise, or whatever ``MCP_JSON_CODEC`` names. All message decoding and
+encoding, including the ``json.dumps(result)`` text of tool results, goes
+through ``get_codec()``.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Longest single JSON-RPC line accepted from the client
+MAX_MESSAGE_BYTES = int(os.environ.get('MCP_MAX_MESSAGE_BYTES', str(64 * 1024 * 1024)))
+
+# 'stream' (default) or 'thread' to force the fallback transport
+STDIO_MODE = os.environ.get('MCP_STDIO_MODE', 'stream')
+
+
+# ---------------------------------------------------------------------------
+# JSON codecs
+# ---------------------------------------------------------------------------
+
+class StdlibCodec:
+    """The standard library ``json`` module"""
+    name = 'json'
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+
+class OrjsonCodec(StdlibCodec):
+    """orjson, falling back to ``json`` for values it refuses to encode"""
+    name = 'orjson'
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. Decimal or integers past 64 bits, which json handles
+            return super().dumps_bytes(obj)
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode('utf-8')
+
+
+CODECS = {'json': StdlibCodec}
+if orjson is not None:
+    CODECS['orjson'] = OrjsonCodec
+
+_codec = CODECS.get(os.environ.get('MCP_JSON_CODEC', ''), CODECS.get('orjson', StdlibCodec))()
+
+
+def get_codec():
+    """Codec used for every MCP message in this process"""
+    return _codec
+
+
+def set_codec(codec) -> None:
+    """Replace the process codec (anything with loads/dumps/dumps_bytes)"""
+    global _codec
+    _codec = codec
+
+
+# ---------------------------------------------------------------------------
+# Transport
+# ---------------------------------------------------------------------------
+
+class StreamTransport:
+    """Newline-delimited JSON-RPC over an asyncio stream pair, e.g. a socket connection"""
+
+    def __init__(self, reader: Optional[asyncio.StreamReader] = None,
+                 writer: Optional[asyncio.StreamWriter] = None):
+        self.reader = reader
+        self.writer = writer
+
+    async def read_message(self) -> Optional[bytes]:
+        """Next request line, or None at EOF"""
+        try:
+            line = await self.reader.readline()
+        except ValueError:
+            # Longer than MAX_MESSAGE_BYTES; the reader has discarded it
+            return b''
+        return line or None
+
+    async def write_message(self, message: Any) -> None:
+        """Encode and send one message line"""
+        await self.write_line(get_codec().dumps_bytes(message) + b'\n')
+
+    async def write_line(self, data: bytes) -> None:
+        """Send an already encoded, newline-terminated message"""
+        self.writer.write(data)
+        await self.writer.drain()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+class StdioTransport(StreamTransport):
+    """Newline-delimited JSON-RPC over stdin/stdout"""
+
+    def __init__(self, stdin=None, stdout=None, mode: str = STDIO_MODE):
+        super().__init__()
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.mode = mode
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def open(self) -> 'StdioTransport':
+        """Attach to the event loop, per fd falling back to a reader thread or blocking writes"""
+        if self.mode == 'stream':
+            loop = asyncio.get_running_loop()
+            try:
+                reader = asyncio.StreamReader(limit=MAX_MESSAGE_BYTES)
+                await loop.connect_read_pipe(
+                    lambda: asyncio.StreamReaderProtocol(reader),
+                    os.fdopen(self.stdin.fileno(), 'rb', buffering=0, closefd=False),
+                )
+                self.reader = reader
+            except (ValueError, OSError, NotImplementedError):
+                pass
+            try:
+                self.stdout.flush()
+                transport, protocol = await loop.connect_write_pipe(
+                    asyncio.streams.FlowControlMixin,
+                    os.fdopen(self.stdout.fileno(), 'wb', buffering=0, closefd=False),
+                )
+                self.writer = asyncio.StreamWriter(transport, protocol, self.reader, loop)
+            except (ValueError, OSError, NotImplementedError):
+                pass
+        if self.reader is None:
+            # Own thread, so tools keep the default executor to themselves
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mcp-stdin')
+        return self
+
+    async def read_message(self) -> Optional[bytes]:
+        """Next request line, or None at EOF"""
+        if self.reader is not None:
+            return await super().read_message()
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(self._executor, self.stdin.buffer.readline)
+        return line or None
+
+    async def write_line(self, data: bytes) -> None:
+        """Send an already encoded, newline-terminated message"""
+        if self.writer is not None:
+            await super().write_line(data)
+        else:
+            self.stdout.buffer.write(data)
+            self.stdout.flush()
+
+    def close(self) -> None:
+        super().close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -11,6 +11,9 @@ import sys
 import sqlite3
 from pathlib import Path
 
+import memory_search
+import memory_vectors
+
 # Database path
 DB_PATH = Path(__file__).parent.parent / 'server' / 'memory' / 'data' / 'espressobot_memory.db'
 
@@ -30,36 +33,41 @@ def get_user_id():
     # Default fallback
     return "user_2"
 
-def search_memories(query, limit=10):
+def search_memories(query, limit=10, mode='auto'):
     """Search memories for the current user"""
     user_id = get_user_id()
     
     try:
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
         
-        # Get all memories for the user
-        cursor.execute("""
-            SELECT id, content, metadata, created_at 
-            FROM memories 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (user_id, limit))
+        rows = None
+        if mode != 'text':
+            try:
+                # Cosine similarity against the process-wide vector index
+                rows = memory_vectors.semantic_search(conn, DB_PATH, query, user_id, limit)
+            except Exception as e:
+                if mode == 'semantic':
+                    raise
+                print(f"Semantic search failed, using full-text search: {e}", file=sys.stderr)
+        if rows is None:
+            # BM25-ranked FTS5 search, index kept in sync by triggers
+            rows = memory_search.search(conn, str(DB_PATH), query, user_id, limit)
+            mode = 'text'
+        else:
+            mode = 'semantic'
         
         memories = []
-        for row in cursor.fetchall():
+        for row in rows:
             memory = {
                 'id': row['id'],
                 'memory': row['content'],
                 'metadata': json.loads(row['metadata']) if row['metadata'] else {},
                 'created_at': row['created_at']
             }
-            
-            # Simple keyword matching for now (since embeddings require OpenAI)
-            if query.lower() in memory['memory'].lower():
-                memories.append(memory)
+            if row['score'] is not None:
+                memory['score'] = row['score']
+            memories.append(memory)
         
         conn.close()
         
@@ -67,7 +75,8 @@ def search_memories(query, limit=10):
             'success': True,
             'user_id': user_id,
             'memories': memories[:limit],
-            'count': len(memories)
+            'count': len(memories),
+            'mode': mode
         }
         
     except Exception as e:
@@ -120,12 +129,32 @@ def get_all_memories(limit=100):
         }
 
 def add_memory(content, metadata=None):
-    """Add a memory for the current user (requires JS backend for embeddings)"""
-    return {
-        'success': False,
-        'error': 'Adding memories requires the JavaScript backend for embedding generation. Use the memory tool through the orchestrator instead.',
-        'user_id': get_user_id()
-    }
+    """Add a memory for the current user (needs an embedding function)"""
+    user_id = get_user_id()
+    if memory_vectors.get_embedding_function() is None:
+        return {
+            'success': False,
+            'error': 'Adding memories needs an embedding function: set OPENAI_API_KEY or MEMORY_EMBEDDER=module:function, or use the memory tool through the orchestrator instead.',
+            'user_id': user_id
+        }
+    
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        memory = memory_vectors.add_memory(conn, user_id, content, metadata)
+        conn.close()
+        
+        return {
+            'success': True,
+            'user_id': user_id,
+            'memory_id': memory['id']
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'user_id': user_id
+        }
 
 def main():
     parser = argparse.ArgumentParser(description='Memory operations for EspressoBot')
@@ -136,6 +165,8 @@ def main():
     search_parser = subparsers.add_parser('search', help='Search memories')
     search_parser.add_argument('query', help='Search query')
     search_parser.add_argument('--limit', type=int, default=10, help='Maximum results')
+    search_parser.add_argument('--mode', choices=['auto', 'semantic', 'text'], default='auto',
+                               help='Semantic search when available, or full-text only')
     
     # Get all operation
     getall_parser = subparsers.add_parser('get_all', help='Get all memories')
@@ -154,7 +185,7 @@ def main():
     
     # Execute the operation
     if args.operation == 'search':
-        result = search_memories(args.query, args.limit)
+        result = search_memories(args.query, args.limit, args.mode)
     elif args.operation == 'get_all':
         result = get_all_memories(args.limit)
     elif args.operation == 'add':
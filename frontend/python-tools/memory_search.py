@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the local memory database
+
+Keeps an FTS5 index (``memories_fts``) next to the ``memories`` table of
+``espressobot_memory.db``. The index is external-content, so it stores no
+second copy of the text, and triggers keep it in step with every insert,
+update and delete, whichever process (Python tools or the Node server)
+makes them.
+
+Queries are tokenized and every term is matched as a prefix ("espr" finds
+"espresso"). All terms must match; if nothing does, any term may match.
+Results are ranked by BM25 and filtered to one user inside the MATCH
+itself, so other users' memories are never scored (an exact ``user_id``
+check backs it up, since the tokenizer splits ids like ``user_2``).
+"""
+
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Set
+
+FTS_TABLE = 'memories_fts'
+
+SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    content, user_id, content='memories', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+    INSERT INTO {FTS_TABLE}(rowid, content, user_id) VALUES (new.rowid, new.content, new.user_id);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, user_id) VALUES ('delete', old.rowid, old.content, old.user_id);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content, user_id ON memories BEGIN
+    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, user_id) VALUES ('delete', old.rowid, old.content, old.user_id);
+    INSERT INTO {FTS_TABLE}(rowid, content, user_id) VALUES (new.rowid, new.content, new.user_id);
+END;
+"""
+
+# Only the content column counts towards the BM25 score
+SEARCH_SQL = f"""
+    SELECT m.id, m.content, m.metadata, m.created_at, bm25({FTS_TABLE}, 1.0, 0.0) AS score
+    FROM {FTS_TABLE} JOIN memories m ON m.rowid = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH ? AND m.user_id = ?
+    ORDER BY score
+    LIMIT ?
+"""
+
+LIKE_SQL = """
+    SELECT id, content, metadata, created_at, NULL AS score
+    FROM memories
+    WHERE user_id = ? AND content LIKE ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_ready: Set[str] = set()
+
+
+def ensure_index(conn: sqlite3.Connection, db_path: str) -> None:
+    """Create the FTS table and triggers once per database, backfilling existing rows"""
+    if db_path in _ready:
+        return
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    with conn:
+        conn.executescript(SCHEMA)
+        if not exists:
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _ready.add(db_path)
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_match(query: str, user_id: str, any_term: bool = False) -> Optional[str]:
+    """FTS5 MATCH expression: prefix terms scoped to ``user_id``"""
+    terms = re.findall(r'\w+', query.lower())
+    if not terms:
+        return None
+    joiner = ' OR ' if any_term else ' AND '
+    return f"user_id : {_quote(user_id)} AND ({joiner.join(_quote(t) + '*' for t in terms)})"
+
+
+def search(conn: sqlite3.Connection, db_path: str, query: str, user_id: str,
+           limit: int = 10) -> List[Dict[str, Any]]:
+    """Ranked memories of ``user_id`` matching ``query`` (best first)"""
+    try:
+        ensure_index(conn, db_path)
+        rows = []
+        for any_term in (False, True):
+            match = build_match(query, user_id, any_term)
+            if match is None:
+                return []
+            rows = conn.execute(SEARCH_SQL, (match, user_id, limit)).fetchall()
+            if rows:
+                break
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5, or a read-only database: substring match
+        rows = conn.execute(LIKE_SQL, (user_id, f'%{query}%', limit)).fetchall()
+    return [
+        {
+            'id': row[0],
+            'content': row[1],
+            'metadata': row[2],
+            'created_at': row[3],
+            'score': round(-row[4], 4) if row[4] is not None else None,  # bm25() is lower-is-better
+        }
+        for row in rows
+    ]
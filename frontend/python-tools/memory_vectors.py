@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Local vector index for semantic memory search
+
+Embeddings already stored in ``memories.embedding`` (JSON arrays or
+comma-separated floats, as text or bytes) are parsed once into a
+unit-normalized float32 matrix in rowid order, with each user's row
+positions kept alongside. The matrix is cached next to the database as
+``.npy`` and memory-mapped, so a process pays the parse cost only once.
+
+A trigger bumps ``memory_index_state.version`` on every change to
+``memories``; a search compares it with the cached version before using the
+matrix. New memories only append: the rows past the highest rowid already
+indexed are parsed and added. Deletes and embedding/user updates also bump
+``vectors_rewrites`` and force a full rebuild. Cosine top-k is then a
+matrix-vector product over the user's rows plus ``argpartition``. This is
+exact search; at the size of a per-user memory store it is faster than
+maintaining an ANN graph.
+
+Query embeddings come from a pluggable function ``text -> list[float]``:
+``set_embedding_function`` or ``MEMORY_EMBEDDER=module:function`` for a
+local model, else OpenAI's ``text-embedding-3-small`` (the model the Node
+server stores) when ``OPENAI_API_KEY`` is set. ``hashing_embedding`` is an
+offline stand-in for tests. A memory whose embedding fails (network error,
+bad key) is still stored, without a vector, and full-text search finds it.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import string
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import requests
+
+logger = logging.getLogger('memory-vectors')
+
+EmbeddingFunction = Callable[[str], Sequence[float]]
+
+OPENAI_EMBEDDING_MODEL = 'text-embedding-3-small'
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_index_state (key TEXT PRIMARY KEY, version INTEGER NOT NULL);
+INSERT OR IGNORE INTO memory_index_state (key, version) VALUES ('vectors', 0);
+INSERT OR IGNORE INTO memory_index_state (key, version) VALUES ('vectors_rewrites', 0);
+CREATE TRIGGER IF NOT EXISTS memory_vectors_insert AFTER INSERT ON memories BEGIN
+    UPDATE memory_index_state SET version = version + 1 WHERE key = 'vectors';
+END;
+CREATE TRIGGER IF NOT EXISTS memory_vectors_delete AFTER DELETE ON memories BEGIN
+    UPDATE memory_index_state SET version = version + 1 WHERE key = 'vectors';
+END;
+CREATE TRIGGER IF NOT EXISTS memory_vectors_update AFTER UPDATE OF embedding, user_id ON memories BEGIN
+    UPDATE memory_index_state SET version = version + 1 WHERE key = 'vectors';
+END;
+CREATE TRIGGER IF NOT EXISTS memory_vectors_rewrite_delete AFTER DELETE ON memories BEGIN
+    UPDATE memory_index_state SET version = version + 1 WHERE key = 'vectors_rewrites';
+END;
+CREATE TRIGGER IF NOT EXISTS memory_vectors_rewrite_update AFTER UPDATE OF embedding, user_id ON memories BEGIN
+    UPDATE memory_index_state SET version = version + 1 WHERE key = 'vectors_rewrites';
+END;
+"""
+
+
+def parse_embedding(raw: Any) -> Optional[List[float]]:
+    """Decode an embedding in any format the Node server has stored"""
+    if raw is None:
+        return None
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode('utf-8', errors='ignore')
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        if raw.startswith('['):
+            values = json.loads(raw)
+        else:
+            values = [float(v) for v in raw.split(',')]
+    except ValueError:
+        return None
+    return values if values and all(isinstance(v, (int, float)) for v in values) else None
+
+
+# ---------------------------------------------------------------------------
+# Embedding functions
+# ---------------------------------------------------------------------------
+
+_embedding_function: Optional[EmbeddingFunction] = None
+
+
+def set_embedding_function(fn: Optional[EmbeddingFunction]) -> None:
+    """Use ``fn`` for query and new-memory embeddings in this process"""
+    global _embedding_function
+    _embedding_function = fn
+
+
+def openai_embedding(text: str) -> List[float]:
+    """Embedding from the OpenAI API, matching what the Node server stores"""
+    response = requests.post(
+        'https://api.openai.com/v1/embeddings',
+        headers={'Authorization': f"Bearer {os.environ['OPENAI_API_KEY']}"},
+        json={'model': OPENAI_EMBEDDING_MODEL, 'input': text[:8000]},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json()['data'][0]['embedding']
+
+
+def hashing_embedding(text: str, dim: int = 256) -> List[float]:
+    """Deterministic bag-of-words embedding; offline stand-in for a real model"""
+    vector = [0.0] * dim
+    for token in re.findall(r'\w+', text.lower()):
+        digest = int(hashlib.md5(token.encode()).hexdigest(), 16)
+        vector[digest % dim] += 1.0 if (digest >> 64) & 1 else -1.0
+    return vector
+
+
+def get_embedding_function() -> Optional[EmbeddingFunction]:
+    """Configured embedding function, or None when none is available"""
+    if _embedding_function is not None:
+        return _embedding_function
+    spec = os.environ.get('MEMORY_EMBEDDER')
+    if spec:
+        module_name, _, attr = spec.partition(':')
+        return getattr(importlib.import_module(module_name), attr)
+    if os.environ.get('OPENAI_API_KEY'):
+        return openai_embedding
+    return None
+
+
+def semantic_available() -> bool:
+    """Whether semantic search can run here (numpy and an embedding function)"""
+    return np is not None and get_embedding_function() is not None
+
+
+def try_embed(text: str) -> Optional[List[float]]:
+    """Embedding of ``text``, or None when there is no embedder or it fails"""
+    embed = get_embedding_function()
+    if embed is None:
+        return None
+    try:
+        return list(embed(text))
+    except Exception as e:
+        logger.warning("Embedding failed, storing the memory without a vector: %s", e)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class VectorIndex:
+    """Memory-mapped matrix of one database's memory embeddings"""
+
+    def __init__(self, db_path: Path, cache_dir: Optional[Path] = None):
+        if np is None:
+            raise RuntimeError("numpy is required for semantic memory search")
+        self.db_path = Path(db_path)
+        cache_dir = Path(cache_dir) if cache_dir else self.db_path.parent
+        self.matrix_path = cache_dir / f"{self.db_path.stem}.vectors.npy"
+        self.meta_path = cache_dir / f"{self.db_path.stem}.vectors.json"
+        self.version: Optional[int] = None
+        self.rewrites: Optional[int] = None
+        self.max_rowid = 0
+        self.matrix = None
+        self.ids: List[Any] = []
+        self.users: Dict[str, List[int]] = {}  # Row positions of each user's memories
+        self._lock = threading.Lock()
+
+    def _current_versions(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """(any change, deletes/updates) counters from ``memory_index_state``"""
+        query = "SELECT key, version FROM memory_index_state WHERE key IN ('vectors', 'vectors_rewrites')"
+        try:
+            rows = dict(conn.execute(query).fetchall())
+        except sqlite3.OperationalError:
+            rows = {}
+        if len(rows) < 2:
+            with conn:
+                conn.executescript(STATE_SCHEMA)
+            rows = dict(conn.execute(query).fetchall())
+        return rows['vectors'], rows['vectors_rewrites']
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Bring the matrix up to date: append new memories, rebuild after deletes/updates"""
+        version, rewrites = self._current_versions(conn)
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            if self.matrix is not None and rewrites == self.rewrites:
+                self._append(conn, version)
+            elif not self._load_cache(conn, version, rewrites):
+                self._rebuild(conn, version, rewrites)
+
+    def _load_cache(self, conn: sqlite3.Connection, version: int, rewrites: int) -> bool:
+        try:
+            meta = json.loads(self.meta_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return False
+        if meta.get('rewrites') != rewrites or 'max_rowid' not in meta or meta.get('version', 0) > version:
+            return False
+        self.matrix = np.load(self.matrix_path, mmap_mode='r')
+        self.ids = meta['ids']
+        self.users = meta['users']
+        self.max_rowid = meta['max_rowid']
+        self.version = meta['version']
+        self.rewrites = rewrites
+        if self.version != version:
+            self._append(conn, version)  # Only inserts since the cache was written
+        return True
+
+    @staticmethod
+    def _parse_rows(rows, dim: Optional[int]):
+        """(rowid, memory id, user, unit vector) of the rows with a usable embedding"""
+        parsed = []
+        for rowid, memory_id, user_id, raw in rows:
+            vector = parse_embedding(raw)
+            if vector is None:
+                continue
+            dim = dim or len(vector)
+            if len(vector) != dim:
+                continue  # Different model; keep the first row's dimension
+            parsed.append((rowid, memory_id, user_id, vector))
+        return parsed, dim
+
+    def _store(self, matrix, ids: List[Any], users: Dict[str, List[int]], max_rowid: int,
+               version: int, rewrites: int) -> None:
+        self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.matrix_path.with_suffix('.tmp.npy')
+        np.save(tmp, matrix)
+        os.replace(tmp, self.matrix_path)
+        tmp_meta = self.meta_path.with_suffix('.tmp')
+        tmp_meta.write_text(json.dumps({'version': version, 'rewrites': rewrites, 'max_rowid': max_rowid,
+                                        'ids': ids, 'users': users}))
+        os.replace(tmp_meta, self.meta_path)
+
+        self.matrix = np.load(self.matrix_path, mmap_mode='r')
+        self.ids = ids
+        self.users = users
+        self.max_rowid = max_rowid
+        self.version = version
+        self.rewrites = rewrites
+
+    @staticmethod
+    def _unit_rows(vectors: List[List[float]], dim: int):
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _rebuild(self, conn: sqlite3.Connection, version: int, rewrites: int) -> None:
+        rows = conn.execute(
+            "SELECT rowid, id, user_id, embedding FROM memories WHERE embedding IS NOT NULL ORDER BY rowid"
+        )
+        parsed, dim = self._parse_rows(rows, None)
+        ids, users = [], {}
+        for rowid, memory_id, user_id, _ in parsed:
+            users.setdefault(user_id, []).append(len(ids))
+            ids.append(memory_id)
+        max_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM memories").fetchone()[0]
+        self._store(self._unit_rows([p[3] for p in parsed], dim or 0), ids, users, max_rowid, version, rewrites)
+
+    def _append(self, conn: sqlite3.Connection, version: int) -> None:
+        """Add memories inserted since the last refresh without re-parsing the rest"""
+        rows = conn.execute(
+            "SELECT rowid, id, user_id, embedding FROM memories "
+            "WHERE rowid > ? AND embedding IS NOT NULL ORDER BY rowid",
+            (self.max_rowid,),
+        )
+        dim = self.matrix.shape[1] if len(self.ids) else None
+        parsed, dim = self._parse_rows(rows, dim)
+        max_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM memories").fetchone()[0]
+        ids = list(self.ids)
+        users = {user: list(positions) for user, positions in self.users.items()}
+        for rowid, memory_id, user_id, _ in parsed:
+            users.setdefault(user_id, []).append(len(ids))
+            ids.append(memory_id)
+        matrix = self.matrix
+        if parsed:
+            added = self._unit_rows([p[3] for p in parsed], dim)
+            matrix = np.concatenate([matrix, added]) if len(self.ids) else added
+        self._store(matrix, ids, users, max_rowid, version, self.rewrites)
+
+    def search(self, conn: sqlite3.Connection, embedding: Sequence[float], user_id: str,
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """Top-``limit`` memories of ``user_id`` by cosine similarity"""
+        self.refresh(conn)
+        positions = self.users.get(user_id)
+        if positions is None or self.matrix is None or not len(embedding):
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape[0] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Query embedding has {query.shape[0]} dimensions, stored memories have {self.matrix.shape[1]}"
+            )
+        query /= np.linalg.norm(query) or 1.0
+
+        rows = np.asarray(positions)
+        scores = self.matrix[rows] @ query
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{'id': self.ids[rows[i]], 'similarity': round(float(scores[i]), 4)} for i in top]
+
+
+_indexes: Dict[str, VectorIndex] = {}
+
+
+def get_vector_index(db_path: Path) -> VectorIndex:
+    """Process-wide index for a memory database"""
+    key = str(Path(db_path).resolve())
+    if key not in _indexes:
+        _indexes[key] = VectorIndex(Path(db_path))
+    return _indexes[key]
+
+
+def semantic_search(conn: sqlite3.Connection, db_path: Path, query: str, user_id: str,
+                    limit: int = 10, embedding: Optional[Sequence[float]] = None) -> Optional[List[Dict[str, Any]]]:
+    """Memories ranked by embedding similarity, or None if semantic search is unavailable
+
+    ``embedding`` is the query's, when the caller has already computed it.
+    Embedder and index errors propagate; callers in ``auto`` mode fall back
+    to full-text search.
+    """
+    if not semantic_available():
+        return None
+    if embedding is None:
+        embedding = get_embedding_function()(query)
+    hits = get_vector_index(db_path).search(conn, embedding, user_id, limit)
+    if not hits:
+        return []
+    by_id = {
+        row[0]: row
+        for row in conn.execute(
+            f"SELECT id, content, metadata, created_at FROM memories WHERE id IN ({','.join('?' * len(hits))})",
+            [hit['id'] for hit in hits],
+        )
+    }
+    return [
+        {
+            'id': hit['id'],
+            'content': by_id[hit['id']][1],
+            'metadata': by_id[hit['id']][2],
+            'created_at': by_id[hit['id']][3],
+            'score': hit['similarity'],
+        }
+        for hit in hits
+        if hit['id'] in by_id
+    ]
+
+
+_EMBED = object()
+
+
+def add_memory(conn: sqlite3.Connection, user_id: str, content: str,
+               metadata: Optional[Dict[str, Any]] = None, embedding: Any = _EMBED) -> Dict[str, Any]:
+    """Insert a memory the way the Node server does, embedding it when possible
+
+    Pass ``embedding`` (a vector, or None for none) when it was computed
+    elsewhere, e.g. off the event loop.
+    """
+    if embedding is _EMBED:
+        embedding = try_embed(content)
+    embedding = json.dumps(list(embedding)) if embedding is not None else None
+    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=9))
+    memory_id = f"mem_{int(time.time() * 1000)}_{suffix}"
+    with conn:
+        conn.execute(
+            "INSERT INTO memories (id, user_id, content, embedding, metadata, created_at) "
+            "VALUES (?, ?, ?, ?, ?, datetime('now'))",
+            (memory_id, user_id, content, embedding, json.dumps(metadata or {})),
+        )
+    return {'id': memory_id, 'embedded': embedding is not None}
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Price-change planning with no-op suppression.
+
+Repricing tools used to write every requested price, including the ones a
+variant already had: each such write costs API points and adds an entry to
+the product's history for nothing. The tools now go through a diff stage
+first:
+
+1. ``prefetch_prices`` reads the current ``price``/``compareAtPrice`` of
+   every variant in the batch (``nodes(ids:)``, one query per cost-sized
+   chunk - one query for any ordinary batch).
+2. ``plan_price_changes`` compares them with the requested prices, to the
+   cent, and drops rows that wouldn't change anything.
+3. The resulting ``PricePlan`` groups the real changes by product, ready for
+   one ``productVariantsBulkUpdate`` each, and reports counts for the caller
+   to show before anything is written. Rows whose price can't be parsed are
+   listed in ``invalid`` and skipped; the rest of the batch still goes out.
+
+Re-running a sale that is already applied costs the one read and no writes.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+from base import AsyncShopifyClient
+
+PRICE_SELECTION = """
+    price
+    compareAtPrice
+    product { id }
+"""
+
+
+def money(value: Any) -> Optional[Decimal]:
+    """``value`` rounded to cents, or None for an empty/unset price"""
+    if value is None or value == '':
+        return None
+    try:
+        return Decimal(str(value)).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"Invalid price: {value!r}")
+
+
+@dataclass
+class PricePlan:
+    """Requested price rows split into real changes and no-ops"""
+
+    changes: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    unchanged: List[str] = field(default_factory=list)
+    not_found: List[str] = field(default_factory=list)
+    invalid: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def variants_to_change(self) -> int:
+        return sum(len(variants) for variants in self.changes.values())
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "requested": self.variants_to_change + len(self.unchanged) + len(self.not_found)
+                         + len(self.invalid),
+            "to_change": self.variants_to_change,
+            "unchanged": len(self.unchanged),
+            "not_found": len(self.not_found),
+            "invalid": len(self.invalid),
+            "products_to_update": len(self.changes),
+        }
+
+
+async def prefetch_prices(client: AsyncShopifyClient, variant_ids: List[str],
+                          selection: str = '') -> Dict[str, Optional[Dict[str, Any]]]:
+    """Current price, compare-at price and product of each variant GID (plus ``selection``)"""
+    return await client.fetch_nodes(variant_ids, PRICE_SELECTION + selection)
+
+
+def plan_price_changes(requested: List[Dict[str, Any]], current: Dict[str, Optional[Dict[str, Any]]],
+                       force: bool = False) -> PricePlan:
+    """Diff requested prices against ``current`` variant nodes
+
+    Each requested row has ``variant_id`` (a GID), ``price`` and
+    ``compare_at_price`` (None clears it). With ``force`` every found row is
+    kept, as before the diff stage existed. A row with a malformed price goes
+    to ``invalid`` with its error instead of failing the whole batch.
+    """
+    plan = PricePlan()
+    for row in requested:
+        variant_id = row['variant_id']
+        variant = current.get(variant_id)
+        if not variant:
+            plan.not_found.append(variant_id)
+            continue
+        try:
+            price = money(row['price'])
+            compare_at = money(row.get('compare_at_price'))
+            same = money(variant.get('price')) == price and money(variant.get('compareAtPrice')) == compare_at
+        except ValueError as e:
+            plan.invalid.append({"variant_id": variant_id, "error": str(e)})
+            continue
+        if not force and same:
+            plan.unchanged.append(variant_id)
+            continue
+        plan.changes.setdefault(variant['product']['id'], []).append({
+            "id": variant_id,
+            "price": str(price),
+            "compareAtPrice": None if compare_at is None else str(compare_at),
+        })
+    return plan
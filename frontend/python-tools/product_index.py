@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Local identifier index for ``resolve_product_id``
+
+Resolving a handle, SKU or title used to cost up to two sequential API
+calls (``productByHandle``, then a ``sku: OR title:`` search) every time a
+tool was handed one. This index keeps a SQLite copy of every product's
+identifiers - handle, normalized title, and each variant's SKU and barcode -
+mapped to the product, variant and inventory-item GIDs, and holds it in
+dictionaries so a resolve is a lookup.
+
+Sync model (the same as the order warehouse):
+- Warm: ``warm()`` exports the whole catalog once, as a bulk operation for
+  large shops. Until then the index is cold and the clients resolve as
+  before. Run ``python product_index.py warm``.
+- Delta: afterwards the async client fetches products with ``updated_at``
+  past the stored cursor at most every ``PRODUCT_INDEX_MIN_SYNC_SECONDS``
+  before a lookup, so renamed handles and new SKUs are picked up.
+- Miss: an identifier the index doesn't know is resolved with a single
+  query (handle and search together) and the answer is stored.
+
+Deleted products aren't seen by ``updated_at`` deltas; their identifiers
+stay until the next ``warm``, and a stale GID fails where it is used the
+same way a mistyped one does.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / 'server' / 'data' / 'product_index.db'
+
+# Don't hit the API for deltas more often than this (seconds)
+MIN_SYNC_INTERVAL = float(os.environ.get('PRODUCT_INDEX_MIN_SYNC_SECONDS', '300'))
+
+# Page sizes keep the requested query cost under Shopify's 1000 point ceiling
+PAGE_SIZE = 10
+VARIANTS_PER_PRODUCT = 40
+# Follow-up pages for products with more variants than the first page holds
+VARIANTS_PAGE_SIZE = 250
+
+SCHEMA_VERSION = '1'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    handle TEXT,
+    title TEXT,
+    title_key TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS variants (
+    id TEXT PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    sku TEXT,
+    barcode TEXT,
+    inventory_item_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_variants_product ON variants (product_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+PRODUCT_FIELDS = """
+    id
+    handle
+    title
+    updatedAt
+"""
+
+VARIANT_FIELDS = """
+    id
+    sku
+    barcode
+    inventoryItem { id }
+"""
+
+PAGED_PRODUCTS_QUERY = f"""
+query indexProducts($first: Int!, $after: String, $query: String!) {{
+    products(first: $first, after: $after, query: $query, sortKey: UPDATED_AT) {{
+        edges {{
+            node {{
+                {PRODUCT_FIELDS}
+                variants(first: {VARIANTS_PER_PRODUCT}) {{
+                    edges {{ node {{ {VARIANT_FIELDS} }} }}
+                    pageInfo {{ hasNextPage endCursor }}
+                }}
+            }}
+        }}
+        pageInfo {{
+            hasNextPage
+            endCursor
+        }}
+    }}
+}}
+"""
+
+BULK_PRODUCTS_QUERY = f"""
+{{
+    products {{
+        edges {{
+            node {{
+                {PRODUCT_FIELDS}
+                variants {{
+                    edges {{ node {{ {VARIANT_FIELDS} }} }}
+                }}
+            }}
+        }}
+    }}
+}}
+"""
+
+PRODUCT_VARIANTS_QUERY = f"""
+query indexProductVariants($id: ID!, $after: String) {{
+    product(id: $id) {{
+        variants(first: {VARIANTS_PAGE_SIZE}, after: $after) {{
+            edges {{ node {{ {VARIANT_FIELDS} }} }}
+            pageInfo {{ hasNextPage endCursor }}
+        }}
+    }}
+}}
+"""
+
+# Fallback for a miss: the old handle lookup and search, in one request
+RESOLVE_QUERY = f"""
+query resolveIdentifier($handle: String!, $query: String!) {{
+    productByHandle(handle: $handle) {{
+        {PRODUCT_FIELDS}
+        variants(first: {VARIANTS_PER_PRODUCT}) {{
+            edges {{ node {{ {VARIANT_FIELDS} }} }}
+            pageInfo {{ hasNextPage endCursor }}
+        }}
+    }}
+    products(first: 1, query: $query) {{
+        edges {{
+            node {{
+                {PRODUCT_FIELDS}
+                variants(first: {VARIANTS_PER_PRODUCT}) {{
+                    edges {{ node {{ {VARIANT_FIELDS} }} }}
+                    pageInfo {{ hasNextPage endCursor }}
+                }}
+            }}
+        }}
+    }}
+}}
+"""
+
+
+def title_key(title: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a product title"""
+    return re.sub(r'\s+', ' ', (title or '').strip()).casefold()
+
+
+def search_query(identifier: str) -> str:
+    """Product search matching ``identifier`` as a SKU, barcode or title"""
+    quoted = json.dumps(identifier)
+    return f'sku:{quoted} OR barcode:{quoted} OR title:{quoted}'
+
+
+def _variants(product: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Variants from either a paginated (edges) or bulk (list) product"""
+    variants = product.get('variants') or []
+    if isinstance(variants, dict):
+        return [edge.get('node', {}) for edge in variants.get('edges', [])]
+    return variants
+
+
+def _partial_variants(product: Dict[str, Any]) -> bool:
+    """Whether a paginated product's variants stop short of the full list"""
+    variants = product.get('variants')
+    return isinstance(variants, dict) and bool((variants.get('pageInfo') or {}).get('hasNextPage'))
+
+
+class ProductIndex:
+    """SQLite identifier store, loaded into dictionaries for lookups"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or os.environ.get('PRODUCT_INDEX_PATH') or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        # Sync and async clients in one process may store concurrently
+        self._lock = threading.RLock()
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self.last_sync_stats: Dict[str, Any] = {}
+        self._load()
+
+    def _init_schema(self):
+        if self._get_meta('schema_version') not in (None, SCHEMA_VERSION):
+            # Column set changed - cold until warmed again
+            self.conn.executescript("DROP TABLE IF EXISTS products; DROP TABLE IF EXISTS variants; DROP TABLE IF EXISTS meta;")
+        self.conn.executescript(SCHEMA)
+        self._set_meta('schema_version', SCHEMA_VERSION)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+    def _get_meta(self, key: str) -> Optional[str]:
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def shop(self) -> Optional[str]:
+        return self._get_meta('shop')
+
+    @property
+    def is_warm(self) -> bool:
+        return self._get_meta('cursor') is not None
+
+    def serves(self, shop_url: str) -> bool:
+        """Whether this index is warm and was built from ``shop_url``"""
+        return self.is_warm and self.shop == shop_url
+
+    def sync_due(self) -> bool:
+        return time.time() - float(self._get_meta('last_delta_at') or 0) >= MIN_SYNC_INTERVAL
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _load(self):
+        self._handles: Dict[str, str] = {}
+        self._titles: Dict[str, set] = {}
+        self._skus: Dict[str, Dict[str, Any]] = {}
+        self._barcodes: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, List[Tuple[str, str]]] = {}
+        products = self.conn.execute("SELECT id, handle, title_key FROM products").fetchall()
+        variants: Dict[str, List[sqlite3.Row]] = {}
+        for row in self.conn.execute("SELECT * FROM variants"):
+            variants.setdefault(row['product_id'], []).append(row)
+        for product in products:
+            self._index(product['id'], product['handle'], product['title_key'],
+                        [dict(v) for v in variants.get(product['id'], [])])
+
+    def _index(self, product_id: str, handle: Optional[str], key: str, variants: Iterable[Dict[str, Any]]):
+        keys = []
+        if handle:
+            self._handles[handle] = product_id
+            keys.append(('handle', handle))
+        if key:
+            self._titles.setdefault(key, set()).add(product_id)
+            keys.append(('title', key))
+        for variant in variants:
+            entry = {
+                'product_id': product_id,
+                'variant_id': variant['id'],
+                'inventory_item_id': variant.get('inventory_item_id'),
+            }
+            if variant.get('sku'):
+                self._skus[variant['sku'].upper()] = entry
+                keys.append(('sku', variant['sku'].upper()))
+            if variant.get('barcode'):
+                self._barcodes[variant['barcode']] = entry
+                keys.append(('barcode', variant['barcode']))
+        self._keys[product_id] = keys
+
+    def _unindex(self, product_id: str):
+        for kind, key in self._keys.pop(product_id, []):
+            if kind == 'handle' and self._handles.get(key) == product_id:
+                del self._handles[key]
+            elif kind == 'title':
+                owners = self._titles.get(key)
+                if owners:
+                    owners.discard(product_id)
+                    if not owners:
+                        del self._titles[key]
+            else:
+                table = self._skus if kind == 'sku' else self._barcodes
+                if table.get(key, {}).get('product_id') == product_id:
+                    del table[key]
+
+    def lookup(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """GIDs for a handle, SKU, barcode or unambiguous title, or None
+
+        Returns ``product_id`` plus, for a SKU or barcode, the matching
+        ``variant_id`` and ``inventory_item_id``; ``matched`` names the key.
+        """
+        identifier = identifier.strip()
+        if not identifier:
+            return None
+        product_id = self._handles.get(identifier) or self._handles.get(identifier.lower())
+        if product_id:
+            return {'product_id': product_id, 'matched': 'handle'}
+        entry = self._skus.get(identifier.upper())
+        if entry:
+            return dict(entry, matched='sku')
+        entry = self._barcodes.get(identifier)
+        if entry:
+            return dict(entry, matched='barcode')
+        owners = self._titles.get(title_key(identifier))
+        if owners and len(owners) == 1:
+            return {'product_id': next(iter(owners)), 'matched': 'title'}
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'products': len(self._keys),
+            'skus': len(self._skus),
+            'barcodes': len(self._barcodes),
+            'shop': self.shop,
+            'cursor': self._get_meta('cursor'),
+        }
+
+    # ------------------------------------------------------------------
+    # Storing
+    # ------------------------------------------------------------------
+    def store_products(self, products: Iterable[Dict[str, Any]], advance_cursor: bool = False) -> int:
+        """Upsert products; delta pages also move the ``updated_at`` cursor forward
+
+        A product whose variant list is only a first page keeps its stored
+        variants; the page is upserted on top of them.
+        """
+        product_rows = []
+        variant_rows = []
+        complete = []
+        indexed = []
+        cursor = self._get_meta('cursor')
+
+        for product in products:
+            if not product or not product.get('id'):
+                continue
+            variants = [{
+                'id': v['id'],
+                'sku': v.get('sku') or None,
+                'barcode': v.get('barcode') or None,
+                'inventory_item_id': (v.get('inventoryItem') or {}).get('id'),
+            } for v in _variants(product) if v.get('id')]
+            key = title_key(product.get('title'))
+            product_rows.append((product['id'], product.get('handle'), product.get('title'),
+                                 key, product.get('updatedAt')))
+            variant_rows.extend((v['id'], product['id'], v['sku'], v['barcode'], v['inventory_item_id'])
+                                for v in variants)
+            partial = _partial_variants(product)
+            if not partial:
+                complete.append((product['id'],))
+            indexed.append((product['id'], product.get('handle'), key, None if partial else variants))
+            updated = product.get('updatedAt')
+            if advance_cursor and updated and (cursor is None or updated > cursor):
+                cursor = updated
+
+        if not product_rows:
+            return 0
+        with self._lock:
+            with self.conn:
+                self.conn.executemany("DELETE FROM variants WHERE product_id = ?", complete)
+                self.conn.executemany("INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)", product_rows)
+                self.conn.executemany("INSERT OR REPLACE INTO variants VALUES (?, ?, ?, ?, ?)", variant_rows)
+                if advance_cursor:
+                    self._set_meta('cursor', cursor)
+            for product_id, handle, key, variants in indexed:
+                if variants is None:
+                    variants = [dict(row) for row in self.conn.execute(
+                        "SELECT * FROM variants WHERE product_id = ?", (product_id,))]
+                self._unindex(product_id)
+                self._index(product_id, handle, key, variants)
+        return len(product_rows)
+
+    # ------------------------------------------------------------------
+    # Single-query fallback
+    # ------------------------------------------------------------------
+    def resolve_request(self, identifier: str) -> Tuple[str, Dict[str, Any]]:
+        """Query and variables that resolve ``identifier`` in one request"""
+        return RESOLVE_QUERY, {'handle': identifier, 'query': search_query(identifier)}
+
+    def store_resolved(self, identifier: str, result: Dict[str, Any]) -> Optional[str]:
+        """Store the products a ``resolve_request`` found; the product ID it resolved to"""
+        data = result.get('data') or {}
+        by_handle = data.get('productByHandle')
+        edges = (data.get('products') or {}).get('edges') or []
+        found = edges[0]['node'] if edges else None
+        self.store_products([p for p in (by_handle, found) if p])
+        if by_handle:
+            return by_handle['id']
+        return found['id'] if found else None
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def _async_lock(self) -> asyncio.Lock:
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        return self._sync_lock
+
+    async def warm(self, client) -> Dict[str, Any]:
+        """Load the whole catalog of ``client``'s shop and start the delta cursor"""
+        from shopify_bulk import BulkOperationRunner, should_use_bulk  # shopify_bulk imports base
+
+        async with self._async_lock():
+            stats = {'products': 0, 'api_calls': 1, 'strategy': None}
+            # Delta cursor starts from before the export so nothing is missed
+            started = datetime.now(timezone.utc) - timedelta(minutes=5)
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM variants")
+                self.conn.execute("DELETE FROM products")
+                self._set_meta('cursor', None)
+                self._set_meta('shop', client.shop_url)
+            self._load()
+
+            if await should_use_bulk(client, 'products', '', page_size=PAGE_SIZE):
+                stats['strategy'] = 'bulk_operation'
+                runner = BulkOperationRunner(client)
+                batch = []
+                async for product in runner.run(BULK_PRODUCTS_QUERY, {'ProductVariant': 'variants'}):
+                    batch.append(product)
+                    if len(batch) >= 500:
+                        stats['products'] += self.store_products(batch)
+                        batch = []
+                stats['products'] += self.store_products(batch)
+            else:
+                stats['strategy'] = 'paginated'
+                stats['products'] += await self._fetch_paged(client, '', stats)
+
+            with self._lock, self.conn:
+                self._set_meta('cursor', started.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                self._set_meta('last_delta_at', str(time.time()))
+            self.last_sync_stats = stats
+            return stats
+
+    async def sync(self, client, force: bool = False) -> Dict[str, Any]:
+        """Fetch products changed since the cursor, if a delta is due"""
+        async with self._async_lock():
+            stats = {'delta_products': 0, 'api_calls': 0}
+            if not self.is_warm or not (force or self.sync_due()):
+                return stats
+            cursor = self._get_meta('cursor')
+            stats['delta_products'] = await self._fetch_paged(
+                client, f"updated_at:>='{cursor}'", stats, advance_cursor=True
+            )
+            with self._lock, self.conn:
+                self._set_meta('last_delta_at', str(time.time()))
+            self.last_sync_stats = stats
+            return stats
+
+    async def _fetch_paged(self, client, search: str, stats: Dict[str, Any],
+                           advance_cursor: bool = False) -> int:
+        fetched = 0
+        after = None
+        while True:
+            result = await client.execute_graphql(
+                PAGED_PRODUCTS_QUERY, {'first': PAGE_SIZE, 'after': after, 'query': search}
+            )
+            stats['api_calls'] += 1
+            data = result.get('data', {}).get('products', {})
+            products = [edge['node'] for edge in data.get('edges', [])]
+            for product in products:
+                await self._complete_variants(client, product, stats)
+            fetched += self.store_products(products, advance_cursor)
+
+            page_info = data.get('pageInfo', {})
+            if not page_info.get('hasNextPage') or not products:
+                return fetched
+            after = page_info.get('endCursor')
+
+    async def _complete_variants(self, client, product: Dict[str, Any], stats: Dict[str, Any]):
+        """Fetch the rest of a product's variants when the first page was not all of them"""
+        variants = product.get('variants') or {}
+        page_info = variants.get('pageInfo') or {}
+        edges = list(variants.get('edges', []))
+        while page_info.get('hasNextPage'):
+            result = await client.execute_graphql(
+                PRODUCT_VARIANTS_QUERY, {'id': product['id'], 'after': page_info.get('endCursor')}
+            )
+            stats['api_calls'] += 1
+            page = ((result.get('data') or {}).get('product') or {}).get('variants') or {}
+            edges.extend(page.get('edges', []))
+            page_info = page.get('pageInfo') or {}
+        product['variants'] = {'edges': edges}
+
+
+_indexes: Dict[Path, ProductIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_product_index(shop_url: str, create: bool = False) -> Optional[ProductIndex]:
+    """The process-wide index for ``shop_url``, or None while it is cold
+
+    Without ``create`` a missing database file is left alone, so resolving
+    never leaves an empty index behind.
+    """
+    path = Path(os.environ.get('PRODUCT_INDEX_PATH') or DEFAULT_DB_PATH)
+    index = _indexes.get(path)
+    if index is None:
+        if not create and not path.exists():
+            return None
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                index = _indexes[path] = ProductIndex(path)
+    if create or index.serves(shop_url):
+        return index
+    return None
+
+
+async def _main(command: str):
+    from base import AsyncShopifyClient
+
+    client = AsyncShopifyClient()
+    index = get_product_index(client.shop_url, create=True)
+    if command == 'warm':
+        print(json.dumps(await index.warm(client), indent=2))
+    elif command == 'sync':
+        print(json.dumps(await index.sync(client, force=True), indent=2))
+    print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command not in ('warm', 'sync', 'stats'):
+        print("Usage: product_index.py [warm|sync|stats]", file=sys.stderr)
+        sys.exit(2)
+    asyncio.run(_main(command))
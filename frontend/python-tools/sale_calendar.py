@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compiled sale calendars
+
+The sales tools used to keep their calendars as raw date-range strings and
+answer "what is on sale on this date" by parsing and testing every range in
+turn. ``SaleCalendar`` compiles a list of ``SaleWindow`` objects once:
+
+- Interval index: the start and end+1 dates of every window split the year
+  into elementary intervals. Each interval holds the windows that cover it,
+  so a date lookup is one ``bisect`` over the boundaries.
+- SKU map: each SKU maps to the windows it appears in, so "is this SKU on
+  sale on this date" is the date lookup plus a set test.
+
+Calendars read from a file (the Breville MAP markdown) are compiled through
+``cached_calendar``, which stores the compiled form as JSON under
+``server/data/sale_calendars`` keyed by the source's mtime and size, and by
+the current year for calendars whose ranges carry no year. Later processes
+load the JSON instead of re-parsing the markdown; the same process reuses
+the object it already has.
+"""
+
+import json
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'server' / 'data' / 'sale_calendars'
+
+CACHE_VERSION = 1
+
+# source path -> (cache key, compiled calendar)
+_loaded: Dict[str, Tuple[Dict[str, Any], 'SaleCalendar']] = {}
+
+
+@dataclass
+class SaleWindow:
+    """One sale period and the items on sale during it (end date inclusive)"""
+
+    label: str
+    start: date
+    end: date
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"label": self.label, "start": self.start.isoformat(), "end": self.end.isoformat(),
+                "items": self.items}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SaleWindow':
+        return cls(data['label'], date.fromisoformat(data['start']), date.fromisoformat(data['end']),
+                   data['items'])
+
+
+class SaleCalendar:
+    """Sale windows indexed by date and by SKU
+
+    ``windows`` keeps the source order, and lookups return windows in that
+    order, so callers that used to scan the source see the same results.
+    """
+
+    def __init__(self, windows: List[SaleWindow]):
+        self.windows = list(windows)
+        self.by_label: Dict[str, SaleWindow] = {w.label: w for w in self.windows}
+
+        self._bounds: List[date] = sorted({w.start for w in self.windows}
+                                          | {w.end + timedelta(days=1) for w in self.windows})
+        self._covering: List[Tuple[int, ...]] = [
+            tuple(i for i, w in enumerate(self.windows) if w.start <= bound <= w.end)
+            for bound in self._bounds
+        ]
+
+        self._skus: Dict[str, Set[int]] = {}
+        for i, window in enumerate(self.windows):
+            for item in window.items:
+                if item.get('sku'):
+                    self._skus.setdefault(item['sku'], set()).add(i)
+
+    def windows_on(self, on: date) -> List[SaleWindow]:
+        """Windows running on ``on``"""
+        return [self.windows[i] for i in self._covering_indexes(on)]
+
+    def windows_for_sku(self, sku: str, on: Optional[date] = None) -> List[SaleWindow]:
+        """Windows that include ``sku``, optionally only those running on ``on``"""
+        indexes = self._skus.get(sku, set())
+        if on is not None:
+            return [self.windows[i] for i in self._covering_indexes(on) if i in indexes]
+        return [self.windows[i] for i in sorted(indexes)]
+
+    def items_for_sku(self, sku: str, on: date) -> List[Dict[str, Any]]:
+        """Calendar rows for ``sku`` in the windows running on ``on``"""
+        return [item for window in self.windows_for_sku(sku, on)
+                for item in window.items if item.get('sku') == sku]
+
+    def _covering_indexes(self, on: date) -> Tuple[int, ...]:
+        position = bisect_right(self._bounds, on) - 1
+        return self._covering[position] if position >= 0 else ()
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {"windows": [w.to_dict() for w in self.windows]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SaleCalendar':
+        return cls([SaleWindow.from_dict(w) for w in data['windows']])
+
+
+def cached_calendar(source: Path, compile_calendar: Callable[[Path], SaleCalendar],
+                    cache_dir: Optional[Path] = None, yearless: bool = False) -> SaleCalendar:
+    """Compiled calendar for ``source``, rebuilt only when the file changes
+
+    ``yearless`` calendars resolve their ranges against the current year,
+    so the cached form is also dropped when the year turns. A cache
+    directory that can't be written just means compiling every time.
+    """
+    source = Path(source).resolve()
+    stat = source.stat()
+    key = {
+        "version": CACHE_VERSION,
+        "source": str(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "year": date.today().year if yearless else None,
+    }
+
+    loaded = _loaded.get(str(source))
+    if loaded and loaded[0] == key:
+        return loaded[1]
+
+    cache_dir = Path(cache_dir or os.environ.get('SALE_CALENDAR_CACHE_DIR') or DEFAULT_CACHE_DIR)
+    cache_file = cache_dir / f"{source.stem}.json"
+    calendar = None
+    try:
+        cached = json.loads(cache_file.read_text())
+        if cached.get('key') == key:
+            calendar = SaleCalendar.from_dict(cached)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    if calendar is None:
+        calendar = compile_calendar(source)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix('.tmp')
+            tmp.write_text(json.dumps({"key": key, **calendar.to_dict()}))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+
+    _loaded[str(source)] = (key, calendar)
+    return calendar
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Shopify Bulk Operations support.
+
+Large exports (full catalog, months of orders) are cheaper and faster through
+``bulkOperationRunQuery`` than through hundreds of ``first: 250`` pages.
+Shopify runs the query server-side and publishes the result as a JSONL file
+where nested connections are flattened into their own lines carrying a
+``__parentId``.
+
+``BulkOperationRunner`` submits the query, waits for completion (polling, or
+woken early by a webhook stand-in via ``notify``), downloads the file to
+disk in chunks and yields reassembled top-level records one at a time, so
+memory use is bounded by the largest single record rather than the export.
+
+Shopify runs one bulk query per shop at a time. Before submitting, the
+runner adopts a running operation for the same query or waits for a
+different one to finish; an operation it submitted is cancelled with
+``bulkOperationCancel`` if the caller is cancelled or runs out of time.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from base import AsyncShopifyClient, get_io_executor
+from mcp_deadline import DeadlineExceeded, cleanup_scope, http_timeout
+
+logger = logging.getLogger('shopify-bulk')
+
+# Page size used by the regular paginated queries this replaces.
+PAGE_SIZE = 250
+
+# Tools switch to a bulk operation above this many pages of results.
+BULK_THRESHOLD_PAGES = int(os.environ.get('SHOPIFY_BULK_THRESHOLD_PAGES', '4'))
+
+TERMINAL_STATUSES = {'COMPLETED', 'FAILED', 'CANCELED', 'EXPIRED'}
+
+# Read timeout for the result download, capped by the call's deadline.
+DOWNLOAD_TIMEOUT = float(os.environ.get('SHOPIFY_BULK_DOWNLOAD_TIMEOUT', '60'))
+
+# Time allowed for bulkOperationCancel once the caller's deadline has passed.
+CANCEL_TIMEOUT = 10.0
+
+
+class BulkOperationError(Exception):
+    """Raised when a bulk operation cannot be started or does not complete."""
+
+
+class BulkOperationTimeout(BulkOperationError):
+    """Raised when a bulk operation is still running after the runner's timeout."""
+
+
+RUN_QUERY_MUTATION = '''
+mutation bulkOperationRunQuery($query: String!) {
+    bulkOperationRunQuery(query: $query) {
+        bulkOperation {
+            id
+            status
+        }
+        userErrors {
+            field
+            message
+        }
+    }
+}
+'''
+
+CANCEL_MUTATION = '''
+mutation bulkOperationCancel($id: ID!) {
+    bulkOperationCancel(id: $id) {
+        bulkOperation {
+            id
+            status
+        }
+        userErrors {
+            field
+            message
+        }
+    }
+}
+'''
+
+CURRENT_QUERY = '''
+query currentBulkOperation {
+    currentBulkOperation(type: QUERY) {
+        id
+        status
+        query
+    }
+}
+'''
+
+STATUS_QUERY = '''
+query bulkOperationStatus($id: ID!) {
+    node(id: $id) {
+        ... on BulkOperation {
+            id
+            status
+            errorCode
+            objectCount
+            fileSize
+            url
+            partialDataUrl
+        }
+    }
+}
+'''
+
+COUNT_QUERIES = {
+    'orders': 'query count($query: String) { ordersCount(query: $query, limit: null) { count } }',
+    'products': 'query count($query: String) { productsCount(query: $query, limit: null) { count } }',
+}
+
+
+def child_key_for(gid: str) -> str:
+    """Default list key for a child line, e.g. ``gid://shopify/LineItem/1`` -> ``lineItems``."""
+    type_name = gid.split('/')[-2] if gid.startswith('gid://') else 'children'
+    return type_name[:1].lower() + type_name[1:] + 's'
+
+
+def iter_jsonl_records(path: Path, child_keys: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream reassembled top-level records from a bulk operation JSONL file.
+
+    Children are attached to their parent as plain lists (not edges/node)
+    under ``child_keys[TypeName]`` or the default from ``child_key_for``.
+    Shopify writes every child after its parent, so a top-level record is
+    complete once the next top-level line appears.
+    """
+    child_keys = child_keys or {}
+    current: Optional[Dict[str, Any]] = None
+    index: Dict[str, Dict[str, Any]] = {}
+
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            parent_id = obj.pop('__parentId', None)
+
+            if parent_id is None:
+                if current is not None:
+                    yield current
+                current = obj
+                index = {}
+            else:
+                parent = index.get(parent_id)
+                if parent is None:
+                    logger.warning("Orphan bulk result line for parent %s", parent_id)
+                    continue
+                child_id = obj.get('id', '')
+                type_name = child_id.split('/')[-2] if child_id.startswith('gid://') else ''
+                key = child_keys.get(type_name) or child_key_for(child_id)
+                parent.setdefault(key, []).append(obj)
+
+            if obj.get('id'):
+                index[obj['id']] = obj
+
+    if current is not None:
+        yield current
+
+
+class BulkOperationRunner:
+    """Run a bulk query and stream its results."""
+
+    def __init__(self, client: Optional[AsyncShopifyClient] = None,
+                 poll_interval: float = 2.0, max_poll_interval: float = 15.0,
+                 timeout: float = 3600.0):
+        self.client = client or AsyncShopifyClient()
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self._wakeups: Dict[str, asyncio.Event] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def submit(self, query: str) -> str:
+        """Start a bulk query and return the operation GID."""
+        result = await self.client.execute_graphql(RUN_QUERY_MUTATION, {'query': query})
+        payload = result.get('data', {}).get('bulkOperationRunQuery', {})
+        errors = payload.get('userErrors') or []
+        if errors:
+            raise BulkOperationError(f"bulkOperationRunQuery failed: {errors}")
+        operation = payload.get('bulkOperation') or {}
+        if not operation.get('id'):
+            raise BulkOperationError("bulkOperationRunQuery returned no operation")
+        return operation['id']
+
+    async def cancel(self, operation_id: str) -> None:
+        """Ask Shopify to stop an operation; failures are logged, not raised."""
+        try:
+            with cleanup_scope(CANCEL_TIMEOUT):
+                result = await self.client.execute_graphql(CANCEL_MUTATION, {'id': operation_id})
+        except Exception as e:
+            logger.warning("Could not cancel bulk operation %s: %s", operation_id, e)
+            return
+        errors = (result.get('data', {}).get('bulkOperationCancel') or {}).get('userErrors') or []
+        if errors:
+            logger.warning("bulkOperationCancel %s failed: %s", operation_id, errors)
+
+    async def current(self) -> Optional[Dict[str, Any]]:
+        """The shop's bulk query operation if one is still running, else None."""
+        result = await self.client.execute_graphql(CURRENT_QUERY)
+        operation = result.get('data', {}).get('currentBulkOperation')
+        if operation and operation.get('status') not in TERMINAL_STATUSES:
+            return operation
+        return None
+
+    async def _running_operation(self, query: str) -> Optional[str]:
+        """Id of a running operation for ``query``; waits out one for another query."""
+        operation = await self.current()
+        if operation is None:
+            return None
+        if ' '.join((operation.get('query') or '').split()) == ' '.join(query.split()):
+            return operation['id']
+        logger.info("Waiting for bulk operation %s to finish before submitting", operation['id'])
+        try:
+            await self.wait(operation['id'])
+        except BulkOperationTimeout:
+            raise
+        except BulkOperationError:
+            pass  # It failed or was cancelled; either way the slot is free
+        return None
+
+    def notify(self, operation_id: str) -> None:
+        """Webhook stand-in: wake a waiter when ``bulk_operations/finish`` arrives."""
+        event = self._wakeups.get(operation_id)
+        if event is not None:
+            event.set()
+
+    async def status(self, operation_id: str) -> Dict[str, Any]:
+        result = await self.client.execute_graphql(STATUS_QUERY, {'id': operation_id})
+        return result.get('data', {}).get('node') or {}
+
+    async def wait(self, operation_id: str) -> Dict[str, Any]:
+        """Wait for the operation to finish and return its final status."""
+        event = self._wakeups.setdefault(operation_id, asyncio.Event())
+        deadline = time.monotonic() + self.timeout
+        interval = self.poll_interval
+        try:
+            while True:
+                operation = await self.status(operation_id)
+                if operation.get('status') in TERMINAL_STATUSES:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BulkOperationTimeout(f"Bulk operation {operation_id} timed out")
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(interval, remaining))
+                    event.clear()
+                except asyncio.TimeoutError:
+                    interval = min(interval * 1.5, self.max_poll_interval)
+        finally:
+            self._wakeups.pop(operation_id, None)
+
+        if operation.get('status') != 'COMPLETED':
+            raise BulkOperationError(
+                f"Bulk operation {operation_id} ended {operation.get('status')}: {operation.get('errorCode')}"
+            )
+        return operation
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+    def _download(self, url: str, timeout: Any = DOWNLOAD_TIMEOUT) -> Path:
+        """Stream the result file to a temporary path (blocking)."""
+        fd, name = tempfile.mkstemp(prefix='shopify-bulk-', suffix='.jsonl')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                with self.client.session.get(url, stream=True, timeout=timeout) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        fh.write(chunk)
+        except BaseException:
+            Path(name).unlink(missing_ok=True)
+            raise
+        return Path(name)
+
+    async def iter_results(self, operation: Dict[str, Any],
+                           child_keys: Optional[Dict[str, str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield reassembled records of a completed operation."""
+        url = operation.get('url')
+        if not url:
+            return  # No objects matched the query
+        loop = asyncio.get_running_loop()
+        path = await loop.run_in_executor(get_io_executor(), self._download, url,
+                                          http_timeout(DOWNLOAD_TIMEOUT))
+        try:
+            for i, record in enumerate(iter_jsonl_records(path, child_keys), 1):
+                yield record
+                if i % 500 == 0:
+                    await asyncio.sleep(0)  # Let other tasks run during long parses
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def run(self, query: str,
+                  child_keys: Optional[Dict[str, str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Submit ``query`` (or adopt a running copy), wait for it, and yield records."""
+        operation_id = await self._running_operation(query)
+        submitted = operation_id is None
+        if submitted:
+            operation_id = await self.submit(query)
+        try:
+            operation = await self.wait(operation_id)
+        except (asyncio.CancelledError, DeadlineExceeded, BulkOperationTimeout):
+            if submitted:
+                await self.cancel(operation_id)
+            raise
+        async for record in self.iter_results(operation, child_keys):
+            yield record
+
+
+async def expected_count(client: AsyncShopifyClient, resource: str, search_query: str) -> int:
+    """Cheap count of matching ``orders`` or ``products`` for choosing a strategy."""
+    result = await client.execute_graphql(COUNT_QUERIES[resource], {'query': search_query})
+    return int((result.get('data', {}).get(f'{resource}Count') or {}).get('count') or 0)
+
+
+async def should_use_bulk(client: AsyncShopifyClient, resource: str, search_query: str,
+                          page_size: int = PAGE_SIZE) -> bool:
+    """Whether a result set is large enough to be worth a bulk operation.
+
+    ``page_size`` is the caller's own page size when its paged query asks
+    for fewer than 250 nodes per page.
+    """
+    return await expected_count(client, resource, search_query) > BULK_THRESHOLD_PAGES * page_size
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Concurrent, cost-budgeted mutation fan-out.
+
+Tools that change many products (bulk repricing, sales) send one mutation
+per product. ``MutationExecutor`` runs those concurrently instead of one
+after another: as many at a time as the throttle bucket can pay for, capped
+by ``SHOPIFY_MUTATION_CONCURRENCY``. Every request still goes through the
+shared ``CostThrottle``, so the fan-out slows down to Shopify's restore rate
+rather than running into THROTTLED errors.
+
+A mutation that is throttled anyway or answered with a 5xx is retried with
+full-jitter exponential back-off. Results are yielded as each mutation
+completes, and ``plan()`` estimates up front how long the whole batch will
+take from the bucket level and restore rate.
+
+Writes are never abandoned half-way: closing ``run()`` early (the caller was
+cancelled or hit its deadline) cancels only the mutations that haven't been
+sent yet, lets the ones already sent finish, and logs the keys that were
+never attempted.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from base import AsyncShopifyClient, ShopifyServerError
+from mcp_deadline import DeadlineExceeded, check_deadline, remaining
+from shopify_throttle import ShopifyThrottledError
+
+logger = logging.getLogger('shopify-mutations')
+
+MUTATION_CONCURRENCY = int(os.environ.get('SHOPIFY_MUTATION_CONCURRENCY', '8'))
+MUTATION_RETRIES = int(os.environ.get('SHOPIFY_MUTATION_RETRIES', '4'))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 8.0
+# Round trip assumed for one mutation when estimating a batch's duration
+ASSUMED_LATENCY_SECONDS = float(os.environ.get('SHOPIFY_MUTATION_LATENCY_SECONDS', '0.6'))
+
+RETRYABLE_ERRORS = (ShopifyThrottledError, ShopifyServerError)
+
+Job = Tuple[str, Dict[str, Any]]
+
+
+class MutationExecutor:
+    """Run one mutation per job concurrently within the throttle budget."""
+
+    def __init__(self, client: AsyncShopifyClient, concurrency: int = MUTATION_CONCURRENCY,
+                 retries: int = MUTATION_RETRIES, rng: Optional[random.Random] = None):
+        self.client = client
+        self.max_concurrency = max(1, concurrency)
+        self.retries = retries
+        self.rng = rng or random.Random()
+
+    def concurrency_for(self, cost: float) -> int:
+        """Mutations of ``cost`` points the bucket can hold in flight at once."""
+        budget = self.client.throttle.maximum_available
+        return max(1, min(self.max_concurrency, int(budget // max(cost, 1))))
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt + 1``."""
+        return self.rng.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def plan(self, mutation: str, jobs: List[Job]) -> Dict[str, Any]:
+        """Cost, concurrency and expected duration of running ``jobs``."""
+        throttle = self.client.throttle
+        cost = throttle.estimate_cost(mutation, jobs[0][1] if jobs else None)
+        concurrency = self.concurrency_for(cost)
+        total = cost * len(jobs)
+        level = max(throttle.snapshot()['currentlyAvailable'], 0)
+        # Whichever is slower: refilling the bucket, or the round trips themselves
+        refill = max(total - level, 0) / throttle.restore_rate
+        round_trips = math.ceil(len(jobs) / concurrency) * ASSUMED_LATENCY_SECONDS
+        plan = {
+            "mutations": len(jobs),
+            "concurrency": concurrency,
+            "estimated_cost": total,
+            "estimated_seconds": round(max(refill, round_trips), 1),
+        }
+        left = remaining()
+        if left is not None:
+            plan["deadline_seconds"] = round(left, 1)
+            plan["fits_deadline"] = plan["estimated_seconds"] < left
+        return plan
+
+    async def _run_one(self, key: str, mutation: str, variables: Dict[str, Any],
+                       slots: asyncio.Semaphore, started: Set[str]) -> Dict[str, Any]:
+        async with slots:
+            started.add(key)
+            for attempt in range(self.retries + 1):
+                check_deadline(f"mutation for {key}")
+                try:
+                    result = await self.client.execute_graphql(mutation, variables)
+                    return {"key": key, "result": result, "error": None, "attempts": attempt + 1}
+                except DeadlineExceeded:
+                    raise
+                except RETRYABLE_ERRORS as e:
+                    if attempt == self.retries:
+                        return {"key": key, "result": None, "error": str(e), "attempts": attempt + 1}
+                    await asyncio.sleep(self.backoff(attempt))
+                except Exception as e:
+                    return {"key": key, "result": None, "error": str(e), "attempts": attempt + 1}
+
+    async def run(self, mutation: str, jobs: List[Job]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``{"key", "result", "error", "attempts"}`` per job, in completion order.
+
+        Closing the iterator early cancels the mutations not yet sent; the
+        ones in flight are waited for, so no write is cut off mid-request.
+        """
+        if not jobs:
+            return
+        cost = self.client.throttle.estimate_cost(mutation, jobs[0][1])
+        slots = asyncio.Semaphore(self.concurrency_for(cost))
+        started: Set[str] = set()
+        tasks = {key: asyncio.ensure_future(self._run_one(key, mutation, variables, slots, started))
+                 for key, variables in jobs}
+        try:
+            for next_done in asyncio.as_completed(list(tasks.values())):
+                yield await next_done
+        finally:
+            never_sent = [key for key, task in tasks.items() if not task.done() and key not in started]
+            for key in never_sent:
+                tasks[key].cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            if never_sent:
+                logger.warning("%d of %d mutations never attempted: %s",
+                               len(never_sent), len(jobs), ", ".join(never_sent))
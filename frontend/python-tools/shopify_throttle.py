@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Cost-aware scheduler for Shopify Admin GraphQL requests.
+
+Shopify meters GraphQL calls with a leaky bucket: every query costs points,
+the bucket holds ``maximumAvailable`` points and refills at ``restoreRate``
+points per second.  Each response reports the live bucket state under
+``extensions.cost.throttleStatus``.
+
+``CostThrottle`` mirrors that bucket locally.  Before a request is sent its
+cost is estimated and a slot is reserved; if the bucket cannot cover it the
+caller waits just long enough for the points to restore.  Reservations are
+handed out in order, so concurrent callers queue fairly instead of racing
+each other into a THROTTLED error.  Every response re-synchronises the local
+bucket with what Shopify reports.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# Shopify defaults for a standard plan; corrected by the first response.
+DEFAULT_MAXIMUM_AVAILABLE = 1000.0
+DEFAULT_RESTORE_RATE = 50.0
+
+# Cost assumed for a connection whose page size comes from an unknown variable.
+DEFAULT_PAGE_SIZE = 50
+
+MUTATION_BASE_COST = 10
+
+_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|\$?[A-Za-z_][A-Za-z0-9_]*|-?\d+|[{}():,]|\.\.\.|#[^\n]*')
+_PASS_THROUGH_FIELDS = {'edges', 'node', 'pageInfo'}
+
+
+class ShopifyThrottledError(Exception):
+    """Raised when Shopify rejects a request with a THROTTLED error."""
+
+
+def _tokenize(query: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(query) if not t.startswith('#')]
+
+
+def estimate_query_cost(query: str, variables: Optional[Dict[str, Any]] = None) -> int:
+    """Estimate the requested cost of a GraphQL document.
+
+    Follows Shopify's published rules closely enough for scheduling: objects
+    cost 1, connections cost 2 plus their page size times the cost of each
+    node, scalars are free and mutations cost 10.
+    """
+    variables = variables or {}
+    tokens = _tokenize(query)
+    is_mutation = bool(tokens) and tokens[0] == 'mutation'
+
+    def page_size(args: Dict[str, str]) -> Optional[int]:
+        for key in ('first', 'last'):
+            value = args.get(key)
+            if value is None:
+                continue
+            if value.startswith('$'):
+                resolved = variables.get(value[1:])
+                return int(resolved) if isinstance(resolved, int) else DEFAULT_PAGE_SIZE
+            if value.lstrip('-').isdigit():
+                return int(value)
+        return None
+
+    def parse_args(pos: int) -> Tuple[Dict[str, str], int]:
+        args: Dict[str, str] = {}
+        depth = 0
+        key = None
+        while pos < len(tokens):
+            tok = tokens[pos]
+            if tok == '(':
+                depth += 1
+            elif tok == ')':
+                depth -= 1
+                if depth == 0:
+                    return args, pos + 1
+            elif depth == 1 and tok == ':' and key is None and pos > 0:
+                key = tokens[pos - 1]
+            elif depth == 1 and key is not None:
+                args[key] = tok
+                key = None
+            pos += 1
+        return args, pos
+
+    def selection(pos: int) -> Tuple[int, int]:
+        """Cost a selection set starting after ``{``; returns (cost, next pos)."""
+        cost = 0
+        while pos < len(tokens) and tokens[pos] != '}':
+            tok = tokens[pos]
+            pos += 1
+            if tok in ('...', 'on', ':', ','):
+                continue
+            args: Dict[str, str] = {}
+            if pos < len(tokens) and tokens[pos] == '(':
+                args, pos = parse_args(pos)
+            if pos < len(tokens) and tokens[pos] == '{':
+                child_cost, pos = selection(pos + 1)
+                size = page_size(args)
+                if size is not None:
+                    cost += 2 + size * max(child_cost, 1)
+                elif tok in _PASS_THROUGH_FIELDS:
+                    cost += child_cost
+                else:
+                    cost += 1 + child_cost
+        return cost, pos + 1
+
+    # Skip the operation header (name and variable definitions).
+    pos = 0
+    while pos < len(tokens) and tokens[pos] != '{':
+        if tokens[pos] == '(':
+            _, pos = parse_args(pos)
+            continue
+        pos += 1
+    if pos >= len(tokens):
+        return 1
+
+    cost, _ = selection(pos + 1)
+    if is_mutation:
+        return MUTATION_BASE_COST + max(cost - 1, 0)
+    return max(cost, 1)
+
+
+class CostThrottle:
+    """Process-wide leaky bucket paced by Shopify's ``throttleStatus``."""
+
+    def __init__(self, maximum_available: float = DEFAULT_MAXIMUM_AVAILABLE,
+                 restore_rate: float = DEFAULT_RESTORE_RATE, cache_size: int = 512):
+        self.maximum_available = maximum_available
+        self.restore_rate = restore_rate
+        self._available = maximum_available
+        self._updated_at = time.monotonic()
+        self._in_flight = 0.0
+        self._lock = threading.Lock()
+        self._known_costs: 'OrderedDict[str, int]' = OrderedDict()
+        self._cache_size = cache_size
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'actual_cost_total': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Cost estimation
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _query_key(query: str, variables: Optional[Dict[str, Any]]) -> str:
+        sizes = sorted((k, v) for k, v in (variables or {}).items() if isinstance(v, int))
+        return hashlib.sha1(f"{query}|{sizes}".encode()).hexdigest()
+
+    def estimate_cost(self, query: str, variables: Optional[Dict[str, Any]] = None) -> int:
+        """Return Shopify's last reported cost for this query, else a static estimate."""
+        key = self._query_key(query, variables)
+        with self._lock:
+            if key in self._known_costs:
+                self._known_costs.move_to_end(key)
+                return self._known_costs[key]
+        return estimate_query_cost(query, variables)
+
+    # ------------------------------------------------------------------
+    # Bucket bookkeeping
+    # ------------------------------------------------------------------
+    def _level(self, now: float) -> float:
+        restored = (now - self._updated_at) * self.restore_rate
+        return min(self.maximum_available, self._available + restored)
+
+    def reserve(self, cost: float) -> float:
+        """Reserve ``cost`` points and return how long to wait before sending."""
+        cost = min(cost, self.maximum_available)
+        with self._lock:
+            now = time.monotonic()
+            level = self._level(now)
+            wait = 0.0 if level >= cost else (cost - level) / self.restore_rate
+            # The level may go negative: later callers queue behind this one.
+            self._available = level - cost
+            self._updated_at = now
+            self._in_flight += cost
+            self.stats['requests'] += 1
+            if wait > 0:
+                self.stats['waits'] += 1
+                self.stats['wait_seconds'] += wait
+        return wait
+
+    def release(self, cost: float) -> None:
+        """Give back a reservation whose request was never sent."""
+        cost = min(cost, self.maximum_available)
+        with self._lock:
+            now = time.monotonic()
+            self._available = self._level(now) + cost
+            self._updated_at = now
+            self._in_flight = max(self._in_flight - cost, 0.0)
+
+    def acquire(self, cost: float) -> float:
+        """Blocking wait until ``cost`` points are available; returns the reservation."""
+        wait = self.reserve(cost)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            except BaseException:
+                self.release(cost)
+                raise
+        return cost
+
+    async def acquire_async(self, cost: float) -> float:
+        """Async wait until ``cost`` points are available; returns the reservation.
+
+        A waiter cancelled during the wait (tool cancel, deadline) releases
+        its reservation, so it doesn't stay counted as in flight.
+        """
+        wait = self.reserve(cost)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                self.release(cost)
+                raise
+        return cost
+
+    def record(self, query: str, variables: Optional[Dict[str, Any]],
+               cost_info: Optional[Dict[str, Any]], reserved: float) -> None:
+        """Release a reservation and sync the bucket with ``extensions.cost``.
+
+        Shopify's ``currentlyAvailable`` already accounts for this request, but
+        not for other reservations still in flight, so those are deducted.
+        """
+        status = (cost_info or {}).get('throttleStatus') or {}
+        with self._lock:
+            self._in_flight = max(self._in_flight - min(reserved, self.maximum_available), 0.0)
+            if not cost_info:
+                return
+            requested = cost_info.get('requestedQueryCost')
+            if requested is not None:
+                key = self._query_key(query, variables)
+                self._known_costs[key] = int(requested)
+                self._known_costs.move_to_end(key)
+                while len(self._known_costs) > self._cache_size:
+                    self._known_costs.popitem(last=False)
+            actual = cost_info.get('actualQueryCost')
+            if actual is not None:
+                self.stats['actual_cost_total'] += actual
+            if status:
+                self.maximum_available = float(status.get('maximumAvailable', self.maximum_available))
+                self.restore_rate = float(status.get('restoreRate', self.restore_rate)) or DEFAULT_RESTORE_RATE
+                now = time.monotonic()
+                reported = float(status.get('currentlyAvailable', self._level(now)))
+                self._available = reported - self._in_flight
+                self._updated_at = now
+
+    def note_throttled(self) -> None:
+        with self._lock:
+            self.stats['throttled'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current bucket level and counters, suitable for a metrics endpoint."""
+        with self._lock:
+            level = self._level(time.monotonic())
+            return {
+                'currentlyAvailable': round(level, 2),
+                'maximumAvailable': self.maximum_available,
+                'restoreRate': self.restore_rate,
+                'utilization': round(1 - max(level, 0) / self.maximum_available, 4),
+                'inFlight': round(self._in_flight, 2),
+                **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in self.stats.items()},
+            }
+
+
+_throttle: Optional[CostThrottle] = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle() -> CostThrottle:
+    """Return the process-wide throttle shared by all Shopify clients."""
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = CostThrottle()
+    return _throttle
+
+
+def is_throttled(result: Dict[str, Any]) -> bool:
+    """Whether a GraphQL response carries a THROTTLED error."""
+    for error in result.get('errors') or []:
+        if isinstance(error, dict) and (error.get('extensions') or {}).get('code') == 'THROTTLED':
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Per-call cost attribution
+# ---------------------------------------------------------------------------
+
+# Cost accumulator of the MCP tool call running in this context, if any.
+# Tasks the call spawns copy the context and so share the same accumulator.
+_call_cost: ContextVar[Optional[Dict[str, float]]] = ContextVar('shopify_call_cost', default=None)
+
+
+@contextmanager
+def track_query_cost():
+    """Collect the cost of every query made inside the block."""
+    cost = {'queries': 0, 'requested': 0.0, 'actual': 0.0}
+    token = _call_cost.set(cost)
+    try:
+        yield cost
+    finally:
+        _call_cost.reset(token)
+
+
+def charge_query_cost(result: Dict[str, Any]) -> None:
+    """Add a response's ``extensions.cost`` to the current accumulator."""
+    cost = _call_cost.get()
+    if cost is None:
+        return
+    cost_info = (result.get('extensions') or {}).get('cost') or {}
+    cost['queries'] += 1
+    cost['requested'] += cost_info.get('requestedQueryCost') or 0
+    cost['actual'] += cost_info.get('actualQueryCost') or 0
@@ -0,0 +1,84 @@
+import sys, pathlib, asyncio, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+from mcp_base_server import EnhancedMCPServer, RequestDispatcher
+from mcp_deadline import TIMEOUT_ERROR_CODE, http_timeout, record_progress, remaining
+
+
+class StepsTool:
+    name = "steps"
+    description = ""
+    input_schema = {}
+    timeout = 0.2
+
+    def __init__(self):
+        self.finished = False
+        self.seen_remaining = None
+
+    async def execute(self, steps=3, delay=0.0):
+        self.seen_remaining = remaining()
+        done = []
+        for step in range(steps):
+            await asyncio.sleep(delay)
+            done.append(step)
+            record_progress(done=done)
+        self.finished = True
+        return {"success": True, "done": done}
+
+
+def call(server, **params):
+    return asyncio.run(server.handle_request({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "steps", **params}}))
+
+
+def make_server():
+    server = EnhancedMCPServer("espressobot-test")
+    tool = StepsTool()
+    server.add_tool(tool)
+    return server, tool
+
+
+def test_timeout_returns_partial_progress():
+    server, tool = make_server()
+    started = time.perf_counter()
+    response = call(server, arguments={"steps": 10, "delay": 0.05})
+    assert time.perf_counter() - started < 0.5
+    assert response["error"]["code"] == TIMEOUT_ERROR_CODE
+    assert "steps timed out after 0.2s" in response["error"]["message"]
+    assert 1 <= len(response["error"]["data"]["partial"]["done"]) < 10
+    assert not tool.finished
+    assert server.metrics.snapshot()["tools"]["steps"]["errors"] == 1
+
+
+def test_client_timeout_shortens_tool_default():
+    server, tool = make_server()
+    response = call(server, arguments={}, _meta={"timeoutMs": 50})
+    assert "result" in response
+    assert 0 < tool.seen_remaining <= 0.05
+
+    response = call(server, arguments={}, _meta={"timeoutMs": 60_000})
+    assert 0.15 < tool.seen_remaining <= 0.2
+
+
+def test_cancelled_call_sends_nothing():
+    server, tool = make_server()
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def scenario():
+        dispatcher = RequestDispatcher(server.handle_request, send=send)
+        dispatcher.dispatch({"jsonrpc": "2.0", "id": 7, "method": "tools/call",
+                             "params": {"name": "steps", "arguments": {"steps": 5, "delay": 0.02}}})
+        await asyncio.sleep(0.03)
+        dispatcher.dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 7}})
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert sent == [] and not tool.finished
+
+
+def test_http_timeout_without_deadline_uses_default():
+    assert http_timeout(30) == (10.0, 30)
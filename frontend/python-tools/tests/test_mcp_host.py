@@ -0,0 +1,133 @@
+import sys, pathlib, asyncio, json, os
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import mcp_tool_manifest
+from mcp_base_server import EnhancedMCPServer
+from mcp_host import MCPHost, load_servers, server_files
+
+
+class NamedTool:
+    description = "Return the server it lives in"
+    input_schema = {}
+
+    def __init__(self, name):
+        self.name = name
+
+    async def execute(self, **kwargs):
+        await asyncio.sleep(kwargs.get("delay", 0))
+        return {"success": True, "tool": self.name}
+
+
+def make_server(name, *tools):
+    server = EnhancedMCPServer(name)
+    for tool in tools:
+        server.add_tool(NamedTool(tool))
+    return server
+
+
+async def call(path, *requests):
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    writer.write_eof()
+    lines = [json.loads(line) for line in (await reader.read()).splitlines()]
+    writer.close()
+    return lines
+
+
+def test_namespaces_keep_their_own_tools(tmp_path):
+    host = MCPHost({
+        "products": make_server("espressobot-products", "get_product"),
+        "pricing": make_server("espressobot-pricing", "update_pricing", "bulk_price_update"),
+    }, socket_dir=tmp_path, idle_seconds=0)
+
+    async def scenario():
+        await host.start()
+        listing = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        products, pricing = await asyncio.gather(
+            call(host.socket_path("products"), listing),
+            call(host.socket_path("pricing"), listing),
+        )
+        await host.close()
+        return products, pricing
+
+    products, pricing = asyncio.run(scenario())
+    assert products[0] == {"jsonrpc": "2.0", "method": "ready"}
+    assert [t["name"] for t in products[1]["result"]["tools"]] == ["get_product"]
+    assert [t["name"] for t in pricing[1]["result"]["tools"]] == ["update_pricing", "bulk_price_update"]
+    assert not list(tmp_path.glob("*.sock"))
+
+
+def test_connections_are_served_concurrently(tmp_path):
+    host = MCPHost({"products": make_server("espressobot-products", "get_product")},
+                   socket_dir=tmp_path, idle_seconds=0)
+
+    def request(delay):
+        return {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                "params": {"name": "get_product", "arguments": {"delay": delay}}}
+
+    async def scenario():
+        await host.start()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*(call(host.socket_path("products"), request(0.2)) for _ in range(3)))
+        elapsed = loop.time() - start
+        await host.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+    assert all(json.loads(r[1]["result"]["content"][0]["text"])["success"] for r in results)
+    assert elapsed < 0.5
+
+
+def test_second_host_refuses_the_same_directory(tmp_path):
+    async def scenario():
+        first = MCPHost({}, socket_dir=tmp_path)
+        await first.start()
+        try:
+            await MCPHost({}, socket_dir=tmp_path).start()
+        except RuntimeError:
+            return True
+        finally:
+            await first.close()
+        return False
+
+    assert asyncio.run(scenario())
+
+
+def test_loads_specialized_server_scripts(tmp_path, monkeypatch):
+    monkeypatch.setattr(mcp_tool_manifest, "_manifest", mcp_tool_manifest.ToolManifest(path=tmp_path / "manifest.json"))
+    assert {"products", "pricing", "utility"} <= set(server_files())
+
+    servers = load_servers(["utility"])
+    tool = servers["utility"].tools["memory_operations"]
+    assert servers["utility"].server_info["name"] == "espressobot-utility"
+    assert not tool.loaded
+
+
+def test_socket_dir_is_private_to_its_user(tmp_path, monkeypatch):
+    import mcp_host
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+    assert mcp_host.default_socket_dir() == tmp_path / "run" / "espressobot-mcp"
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert str(os.getuid()) in mcp_host.default_socket_dir().name
+
+    async def start(directory):
+        host = MCPHost({}, socket_dir=directory)
+        await host.start()
+        await host.close()
+
+    created = tmp_path / "fresh" / "mcp"
+    asyncio.run(start(created))
+    assert created.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    with pytest.raises(RuntimeError, match="mode 755"):
+        asyncio.run(start(shared))
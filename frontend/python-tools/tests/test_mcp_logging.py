@@ -0,0 +1,74 @@
+import sys, pathlib, io, json, logging, logging.handlers, queue, random, threading
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+from mcp_logging import (DeferredQueueHandler, JsonFormatter, Payload, SamplingFilter,
+                         parse_sample_rates, truncate)
+
+
+class CountingList(list):
+    visited = 0
+
+    def __iter__(self):
+        for item in super().__iter__():
+            CountingList.visited += 1
+            yield item
+
+
+def test_truncate_stops_at_the_budget():
+    big = {"data": {"products": {"edges": CountingList({"node": {"id": i, "title": "x" * 50}} for i in range(100_000))}}}
+    text = truncate(big, limit=300)
+    assert len(text) < 400
+    assert text.startswith('{"data": {"products": {"edges": [{"node": {"id": 0')
+    assert text.endswith("[truncated: dict, 1 keys]")
+    assert CountingList.visited < 10
+
+    assert truncate("y" * 10_000_000, limit=20).endswith("[truncated: str, 10000000 chars]")
+    assert truncate({"a": [1, None, True], "b": b"\x00" * 64}) == '{"a": [1, null, true], "b": <64 bytes>}'
+
+
+def test_sampling_filter_uses_most_specific_logger():
+    sampler = SamplingFilter(parse_sample_rates("mcp_tools=0.5, mcp_tools.products.search=0,bad=x"),
+                             rng=random.Random(1))
+    assert sampler.rates == {"mcp_tools": 0.5, "mcp_tools.products.search": 0.0}
+
+    def kept(name, level=logging.INFO, n=1000):
+        return sum(sampler.filter(logging.LogRecord(name, level, "", 0, "m", (), None)) for _ in range(n))
+
+    assert kept("mcp_tools.products.search") == 0
+    assert kept("mcp_tools.products.search", logging.WARNING) == 1000
+    assert 400 < kept("mcp_tools.pricing.bulk_price_update") < 600
+    assert kept("mcp-server") == 1000
+
+
+def test_queue_handler_defers_formatting_and_freezes_args():
+    log_queue = queue.SimpleQueue()
+    stream = io.StringIO()
+    threads = []
+
+    class RecordingFormatter(JsonFormatter):
+        def format(self, record):
+            threads.append(threading.current_thread())
+            return super().format(record)
+
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(RecordingFormatter())
+    listener = logging.handlers.QueueListener(log_queue, sink)
+    logger = logging.getLogger("test-mcp-logging")
+    logger.propagate = False
+    handler = DeferredQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        params = {"sku": "ABC-1"}
+        logger.warning("tools/call %s", Payload(params), extra={"tool": "get_product"})
+        params["sku"] = "changed"
+        assert stream.getvalue() == ""  # Nothing formatted on the calling thread
+        listener.start()
+        listener.stop()
+    finally:
+        logger.removeHandler(handler)
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == 'tools/call {"sku": "ABC-1"}'
+    assert entry["tool"] == "get_product" and entry["level"] == "WARNING"
+    assert threads and threads[0] is not threading.current_thread()
@@ -0,0 +1,112 @@
+import sys, pathlib, asyncio, json, random, socket, types, urllib.request
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import mcp_metrics
+from mcp_base_server import EnhancedMCPServer
+from mcp_metrics import LatencyHistogram, ensure_metrics_endpoint, prometheus
+from shopify_throttle import charge_query_cost
+
+
+class ShopifyTool:
+    name = "shopify_tool"
+    description = ""
+    input_schema = {}
+
+    async def execute(self, **kwargs):
+        if kwargs.get("raise"):
+            raise RuntimeError("boom")
+        for _ in range(2):
+            charge_query_cost({"data": {}, "extensions": {"cost": {"requestedQueryCost": 12, "actualQueryCost": 7}}})
+        return {"success": not kwargs.get("fail"), "items": ["x" * 100]}
+
+
+def call(server, request_id, **arguments):
+    return asyncio.run(server.handle_request({
+        "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+        "params": {"name": "shopify_tool", "arguments": arguments},
+    }))
+
+
+def test_histogram_percentiles_within_one_percent():
+    histogram = LatencyHistogram()
+    rng = random.Random(7)
+    values = sorted(rng.randint(1, 5_000_000) for _ in range(20_000))
+    for value in values:
+        histogram.record(value)
+    for quantile in (0.5, 0.9, 0.99):
+        exact = values[int(quantile * len(values)) - 1]
+        assert abs(histogram.percentile(quantile) - exact) / exact < 0.01
+    assert histogram.max == values[-1] and histogram.count == len(values)
+    assert len(histogram.counts) < 2000
+
+
+def test_tool_calls_are_recorded_and_exposed():
+    server = EnhancedMCPServer("espressobot-test")
+    server.add_tool(ShopifyTool())
+
+    responses = [call(server, 1), call(server, 2, fail=True)]
+    error = call(server, 3, **{"raise": True})
+    assert "error" in error
+
+    metrics = server.metrics.snapshot()["tools"]["shopify_tool"]
+    assert metrics["calls"] == 3 and metrics["errors"] == 1 and metrics["failures"] == 1
+    assert metrics["response_bytes"]["total"] == sum(len(r["result"]["content"][0]["text"]) for r in responses)
+    assert metrics["shopify"] == {"queries": 4, "requested_cost": 48, "actual_cost": 28}
+    assert metrics["wall_time_share"] == 1.0
+
+    resource = asyncio.run(server.handle_request(
+        {"jsonrpc": "2.0", "id": 4, "method": "resources/read", "params": {"uri": "metrics://tools"}}))
+    assert json.loads(resource["result"]["contents"][0]["text"])["tools"]["shopify_tool"]["calls"] == 3
+
+    text = prometheus([server.metrics])
+    assert 'mcp_tool_calls_total{server="espressobot-test",tool="shopify_tool"} 3' in text
+    assert 'mcp_tool_shopify_cost_total{server="espressobot-test",tool="shopify_tool"} 28' in text
+    assert "# TYPE mcp_tool_latency_seconds summary" in text
+
+
+def test_prometheus_endpoint(monkeypatch):
+    server = EnhancedMCPServer("espressobot-endpoint")
+    server.add_tool(ShopifyTool())
+    call(server, 1)
+    monkeypatch.setattr(mcp_metrics, "_endpoint", None)
+
+    async def scenario():
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        endpoint = await ensure_metrics_endpoint(port=port)
+        loop = asyncio.get_running_loop()
+        body = await loop.run_in_executor(
+            None, lambda: urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode())
+        endpoint.close()
+        await endpoint.wait_closed()
+        return body
+
+    body = asyncio.run(scenario())
+    assert 'tool="shopify_tool"' in body and 'server="espressobot-endpoint"' in body
+
+
+def test_inventory_updater_reuses_statsd_client(monkeypatch):
+    from mcp_tools.skuvault import inventory_updater
+
+    created = []
+
+    class StatsClient:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            self.counts = {}
+
+        def incr(self, name, count):
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    monkeypatch.setitem(sys.modules, "statsd", types.SimpleNamespace(StatsClient=StatsClient))
+    monkeypatch.setattr(inventory_updater, "_statsd_client", None)
+    monkeypatch.setattr(inventory_updater, "_statsd_checked", False)
+
+    updater = inventory_updater.InventoryUpdater({}, client=None)
+    for _ in range(3):
+        updater._record_metric(2)
+
+    assert len(created) == 1
+    assert inventory_updater._statsd_client.counts == {"inventory_updates": 6}
@@ -0,0 +1,132 @@
+import sys, pathlib, asyncio, json
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+from mcp_base_server import EnhancedMCPServer, RequestDispatcher
+from mcp_streaming import ResultStore
+
+
+class OrdersTool:
+    name = "export_orders"
+    description = ""
+    input_schema = {}
+
+    def __init__(self):
+        self.pages_fetched = 0
+
+    async def execute(self, pages=5, per_page=100):
+        for page in range(pages):
+            self.pages_fetched += 1
+            await asyncio.sleep(0)
+            yield [{"id": page * per_page + i, "name": f"#{page * per_page + i}"} for i in range(per_page)]
+
+
+class ReportTool:
+    name = "report"
+    description = ""
+    input_schema = {}
+
+    async def execute(self, size=10):
+        return {"success": True, "note": "é" * size}
+
+
+def make_server(max_inline):
+    server = EnhancedMCPServer("espressobot-test")
+    server.results = ResultStore(max_inline_bytes=max_inline)
+    orders = OrdersTool()
+    server.add_tool(orders)
+    server.add_tool(ReportTool())
+    return server, orders
+
+
+def request(request_id, method, **params):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+async def read_all(server, response):
+    texts = [response["result"]["content"][0]["text"]]
+    cursor = response["result"].get("_meta", {}).get("nextCursor")
+    reads = 0
+    while cursor:
+        page = await server.handle_request(request(100 + reads, "resources/read", uri=cursor))
+        texts.append(page["result"]["contents"][0]["text"])
+        cursor = page["result"].get("nextCursor")
+        reads += 1
+    return texts, reads
+
+
+def test_small_results_stay_inline():
+    server, _ = make_server(max_inline=4096)
+    response = asyncio.run(server.handle_request(
+        request(1, "tools/call", name="export_orders", arguments={"pages": 2, "per_page": 3})))
+    content = response["result"]["content"]
+    assert len(content) == 1 and [o["id"] for o in json.loads(content[0]["text"])] == list(range(6))
+    assert "_meta" not in response["result"]
+
+
+def test_generator_results_are_paged_lazily():
+    server, orders = make_server(max_inline=4096)
+
+    async def scenario():
+        response = await server.handle_request(request(1, "tools/call", name="export_orders", arguments={}))
+        fetched_first = orders.pages_fetched
+        texts, reads = await read_all(server, response)
+        return response, fetched_first, texts, reads
+
+    response, fetched_first, texts, reads = asyncio.run(scenario())
+    link = response["result"]["content"][1]
+    assert link["type"] == "resource_link" and link["uri"].startswith("result://")
+    assert fetched_first < 5
+    assert all(len(text.encode()) <= 4096 for text in texts)
+    items = [item for text in texts for item in json.loads(text)]
+    assert [item["id"] for item in items] == list(range(500))
+    assert reads == len(texts) - 1 and all(s.done for s in server.results.streams.values())
+    assert server.metrics.snapshot()["tools"]["export_orders"]["response_bytes"]["total"] == len(texts[0].encode())
+
+
+def test_cursor_reads_are_repeatable_and_ordered():
+    server, _ = make_server(max_inline=2048)
+
+    async def scenario():
+        response = await server.handle_request(request(1, "tools/call", name="export_orders", arguments={}))
+        cursor = response["result"]["_meta"]["nextCursor"]
+        first = await server.handle_request(request(2, "resources/read", uri=cursor))
+        again = await server.handle_request(request(3, "resources/read", uri=cursor))
+        skipped = await server.handle_request(request(4, "resources/read", uri=cursor[:-1] + "9"))
+        return first, again, skipped
+
+    first, again, skipped = asyncio.run(scenario())
+    assert first["result"] == again["result"]
+    assert "error" in skipped
+
+
+def test_large_plain_results_are_sliced():
+    server, _ = make_server(max_inline=1000)
+
+    async def scenario():
+        response = await server.handle_request(
+            request(1, "tools/call", name="report", arguments={"size": 2000}))
+        return await read_all(server, response)
+
+    texts, reads = asyncio.run(scenario())
+    assert reads >= 3
+    assert json.loads("".join(texts)) == {"success": True, "note": "é" * 2000}
+
+
+def test_progress_notifications_follow_pages():
+    server, _ = make_server(max_inline=1 << 20)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def scenario():
+        dispatcher = RequestDispatcher(server.handle_request, send=send)
+        dispatcher.dispatch(request(1, "tools/call", name="export_orders", arguments={"pages": 3},
+                                    _meta={"progressToken": "tok"}))
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    progress = [m["params"]["progress"] for m in sent if m.get("method") == "notifications/progress"]
+    assert progress == [100, 200, 300]
+    assert len(json.loads(sent[-1]["result"]["content"][0]["text"])) == 300
@@ -0,0 +1,66 @@
+import sys, pathlib, os, io, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import mcp_transport
+from mcp_transport import StdioTransport, StdlibCodec
+
+
+@pytest.fixture(params=sorted(mcp_transport.CODECS))
+def codec(request, monkeypatch):
+    codec = mcp_transport.CODECS[request.param]()
+    monkeypatch.setattr(mcp_transport, "_codec", codec)
+    return codec
+
+
+def test_codecs_round_trip(codec):
+    message = {"jsonrpc": "2.0", "id": 1, "result": {"text": "café", "n": [1, 2.5, None]}}
+    assert codec.loads(codec.dumps_bytes(message)) == message
+    assert codec.loads(codec.dumps(message)) == message
+
+
+def test_orjson_codec_falls_back_for_unsupported_values():
+    if "orjson" not in mcp_transport.CODECS:
+        pytest.skip("orjson not installed")
+    assert mcp_transport.OrjsonCodec().dumps({"big": 2 ** 70}) == StdlibCodec().dumps({"big": 2 ** 70})
+
+
+def test_stream_transport_over_pipes(codec):
+    in_read, in_write = os.pipe()
+    out_read, out_write = os.pipe()
+    stdin = os.fdopen(in_read, "r")
+    stdout = os.fdopen(out_write, "w")
+
+    async def scenario():
+        transport = await StdioTransport(stdin, stdout, mode="stream").open()
+        assert transport.reader is not None and transport.writer is not None
+        os.write(in_write, b'{"jsonrpc": "2.0", "id": 7, "method": "ping"}\n')
+        os.close(in_write)
+        line = await transport.read_message()
+        await transport.write_message({"jsonrpc": "2.0", "id": codec.loads(line)["id"], "result": {}})
+        assert await transport.read_message() is None
+        transport.close()
+
+    asyncio.run(scenario())
+    stdout.close()
+    with os.fdopen(out_read, "rb") as f:
+        assert codec.loads(f.readline()) == {"jsonrpc": "2.0", "id": 7, "result": {}}
+    stdin.close()
+
+
+def test_regular_file_falls_back_to_thread(tmp_path):
+    requests_file = tmp_path / "requests.jsonl"
+    requests_file.write_bytes(b'{"id": 1}\n{"id": 2}\n')
+
+    async def scenario():
+        with open(requests_file, "r") as stdin:
+            transport = await StdioTransport(stdin, io.TextIOWrapper(io.BytesIO()), mode="stream").open()
+            lines = [await transport.read_message() for _ in range(3)]
+            transport.close()
+            return transport, lines
+
+    transport, lines = asyncio.run(scenario())
+    assert transport.reader is None
+    assert lines == [b'{"id": 1}\n', b'{"id": 2}\n', None]
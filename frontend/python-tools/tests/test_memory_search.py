@@ -0,0 +1,64 @@
+import sys, pathlib, sqlite3
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import memory_search
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "memory.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE memories (
+            id TEXT PRIMARY KEY, user_id TEXT, content TEXT,
+            embedding TEXT, metadata TEXT, created_at TEXT
+        )
+    """)
+    rows = [
+        ("a", "user_2", "Espresso machines ship free over $500", "2025-01-01"),
+        ("b", "user_2", "Customer prefers espresso grinders with flat burrs", "2025-01-02"),
+        ("c", "user_2", "Breville MAP pricing starts in March", "2025-01-03"),
+        ("d", "user_22", "Espresso notes for someone else", "2025-01-04"),
+    ]
+    conn.executemany(
+        "INSERT INTO memories (id, user_id, content, created_at) VALUES (?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    return conn, str(path)
+
+
+def test_existing_rows_are_indexed_and_ranked(db):
+    conn, path = db
+    results = memory_search.search(conn, path, "espresso grinder", "user_2")
+
+    assert [r["id"] for r in results] == ["b"]
+    assert results[0]["score"] > 0
+
+
+def test_prefix_match_and_user_isolation(db):
+    conn, path = db
+    ids = {r["id"] for r in memory_search.search(conn, path, "espr", "user_2")}
+    assert ids == {"a", "b"}
+
+
+def test_falls_back_to_any_term(db):
+    conn, path = db
+    results = memory_search.search(conn, path, "breville unicorn", "user_2")
+    assert [r["id"] for r in results] == ["c"]
+
+
+def test_triggers_keep_index_in_sync(db):
+    conn, path = db
+    memory_search.ensure_index(conn, path)
+
+    with conn:
+        conn.execute("INSERT INTO memories (id, user_id, content) VALUES ('e', 'user_2', 'Miele sale ends Friday')")
+        conn.execute("UPDATE memories SET content = 'Shipping is free over $750' WHERE id = 'a'")
+        conn.execute("DELETE FROM memories WHERE id = 'c'")
+
+    assert [r["id"] for r in memory_search.search(conn, path, "miele", "user_2")] == ["e"]
+    assert [r["id"] for r in memory_search.search(conn, path, "750", "user_2")] == ["a"]
+    assert memory_search.search(conn, path, "breville", "user_2") == []
@@ -0,0 +1,132 @@
+import sys, pathlib, json, sqlite3
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import memory_vectors
+from memory_vectors import VectorIndex, hashing_embedding
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "memory.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE memories (
+            id TEXT PRIMARY KEY, user_id TEXT, content TEXT,
+            embedding TEXT, metadata TEXT, created_at TEXT
+        )
+    """)
+    memories = [
+        ("a", "user_2", "espresso machine descaling schedule"),
+        ("b", "user_2", "grinder burr replacement"),
+        ("c", "user_3", "espresso machine descaling schedule"),
+    ]
+    for memory_id, user_id, content in memories:
+        conn.execute(
+            "INSERT INTO memories (id, user_id, content, embedding) VALUES (?, ?, ?, ?)",
+            (memory_id, user_id, content, json.dumps(hashing_embedding(content))),
+        )
+    # Comma-separated format written by older Node code
+    conn.execute(
+        "INSERT INTO memories (id, user_id, content, embedding) VALUES (?, ?, ?, ?)",
+        ("d", "user_2", "descaling reminder", ",".join(map(str, hashing_embedding("descaling reminder")))),
+    )
+    conn.commit()
+    memory_vectors.set_embedding_function(hashing_embedding)
+    yield conn, path
+    memory_vectors.set_embedding_function(None)
+
+
+def test_top_k_is_per_user_and_ranked(db):
+    conn, path = db
+    index = VectorIndex(path)
+    hits = index.search(conn, hashing_embedding("espresso descaling"), "user_2", limit=2)
+
+    assert [h["id"] for h in hits] == ["a", "d"]
+    assert hits[0]["similarity"] >= hits[1]["similarity"]
+
+
+def test_matrix_is_cached_and_memory_mapped(db):
+    conn, path = db
+    VectorIndex(path).refresh(conn)
+
+    fresh = VectorIndex(path)
+    fresh._rebuild = lambda *a: pytest.fail("cache should be reused")
+    fresh.refresh(conn)
+    assert isinstance(fresh.matrix, np.memmap)
+    assert fresh.matrix.shape == (4, 256)
+
+
+def test_changes_invalidate_index(db):
+    conn, path = db
+    index = VectorIndex(path)
+    index.refresh(conn)
+
+    added = memory_vectors.add_memory(conn, "user_2", "tamper pressure notes")
+    hits = index.search(conn, hashing_embedding("tamper pressure notes"), "user_2", limit=1)
+    assert hits[0]["id"] == added["id"]
+    assert hits[0]["similarity"] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_semantic_search_returns_rows(db):
+    conn, path = db
+    rows = memory_vectors.semantic_search(conn, path, "burr grinder", "user_2", limit=1)
+    assert rows[0]["content"] == "grinder burr replacement"
+
+
+def test_tool_falls_back_to_full_text_when_embedding_fails(db):
+    import asyncio
+    from mcp_tools.memory.operations import MemoryOperationsTool
+
+    conn, path = db
+    conn.close()
+    tool = MemoryOperationsTool()
+    tool.db_path = path
+
+    def offline(text):
+        raise ConnectionError("embeddings endpoint unreachable")
+
+    for embedder in (offline, lambda text: hashing_embedding(text, dim=8)):  # Network error, wrong dimensions
+        memory_vectors.set_embedding_function(embedder)
+        found = asyncio.run(tool.execute("search", query="grinder", mode="auto"))
+        assert found["success"] and found["mode"] == "text" and found["fallback_reason"]
+        assert [m["content"] for m in found["memories"]] == ["grinder burr replacement"]
+        assert not asyncio.run(tool.execute("search", query="grinder", mode="semantic"))["success"]
+
+    memory_vectors.set_embedding_function(offline)
+    added = asyncio.run(tool.execute("add", content="tamper size is 58mm"))
+    assert added["success"] and added["embedded"] is False
+
+
+def test_new_memories_are_appended_without_a_rebuild(db):
+    conn, path = db
+    index = VectorIndex(path)
+    index.refresh(conn)
+    parsed = []
+    original = VectorIndex._parse_rows
+
+    def counting(rows, dim):
+        result = original(rows, dim)
+        parsed.append(len(result[0]))
+        return result
+
+    index._parse_rows = counting
+    index._rebuild = lambda *a: pytest.fail("an insert should not rebuild the index")
+    added = memory_vectors.add_memory(conn, "user_3", "milk jug sizes")
+    hits = index.search(conn, hashing_embedding("milk jug sizes"), "user_3", limit=1)
+    assert hits[0]["id"] == added["id"] and parsed == [1]
+
+    # Another process picks the appended matrix up from the cache
+    fresh = VectorIndex(path)
+    fresh._rebuild = lambda *a: pytest.fail("cache should be reused")
+    assert fresh.search(conn, hashing_embedding("milk jug sizes"), "user_3", limit=1)[0]["id"] == added["id"]
+
+    # A delete still rebuilds
+    del index._rebuild
+    with conn:
+        conn.execute("DELETE FROM memories WHERE id = ?", (added["id"],))
+    assert [h["id"] for h in index.search(conn, hashing_embedding("milk jug"), "user_3")] == ["c"]
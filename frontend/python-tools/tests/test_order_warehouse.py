@@ -0,0 +1,225 @@
+import sys, pathlib, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+from mcp_tools.analytics import order_warehouse
+from mcp_tools.analytics.order_warehouse import OrderWarehouse
+
+
+def make_order(num, created_at, updated_at=None, total="100.00", status="PAID", items=()):
+    return {
+        "id": f"gid://shopify/Order/{num}",
+        "name": f"#{num}",
+        "createdAt": created_at,
+        "updatedAt": updated_at or created_at,
+        "displayFinancialStatus": status,
+        "cancelledAt": None,
+        "currencyCode": "CAD",
+        "sourceIdentifier": "web",
+        "sourceName": "web",
+        "discountCodes": [],
+        "totalPriceSet": {"shopMoney": {"amount": total}},
+        "totalDiscountsSet": {"shopMoney": {"amount": "0.00"}},
+        "refunds": [],
+        "lineItems": {"edges": [
+            {"node": {"title": title, "sku": sku, "quantity": qty,
+                      "originalUnitPriceSet": {"shopMoney": {"amount": price}}}}
+            for title, sku, qty, price in items
+        ]},
+    }
+
+
+class FakeClient:
+    """Answers warehouse queries from a list of orders."""
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.searches = []
+
+    async def execute_graphql(self, query, variables=None):
+        if "ianaTimezone" in query:
+            return {"data": {"shop": {"ianaTimezone": "America/Toronto"}}}
+        if "ordersCount" in query:
+            return {"data": {"ordersCount": {"count": len(self.orders)}}}
+        self.searches.append(variables["query"])
+        if variables["query"].startswith("updated_at"):
+            cursor = variables["query"].split("'")[1]
+            matched = [o for o in self.orders if o["updatedAt"] >= cursor]
+        else:
+            matched = self.orders
+        return {"data": {"orders": {
+            "edges": [{"node": o} for o in matched],
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+        }}}
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return OrderWarehouse(tmp_path / "orders.db")
+
+
+def test_backfill_then_answer_locally(warehouse, monkeypatch):
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    client = FakeClient([
+        # 02:30 UTC is still the previous evening in Toronto
+        make_order(1, "2025-07-02T02:30:00Z", items=[("Grinder", "G-1", 2, "50.00")]),
+        make_order(2, "2025-07-02T15:00:00Z", total="40.00"),
+        make_order(3, "2025-07-02T16:00:00Z", status="PENDING"),
+    ])
+
+    asyncio.run(warehouse.sync(client, "2025-07-01"))
+    assert client.searches[0] == "created_at:>=2025-07-01"
+
+    assert warehouse.summary("2025-07-01", "2025-07-01") == {"order_count": 1, "gross_revenue": 100.0}
+    assert warehouse.summary("2025-07-02", "2025-07-02") == {"order_count": 1, "gross_revenue": 40.0}
+    assert warehouse.top_products("2025-07-01", "2025-07-02")[0]["quantity_sold"] == 2
+
+    # Covered range within the sync interval costs no API calls
+    calls = len(client.searches)
+    stats = asyncio.run(warehouse.sync(client, "2025-07-01"))
+    assert len(client.searches) == calls
+    assert stats["api_calls"] == 0
+
+
+def test_earlier_range_only_fetches_missing_days(warehouse, monkeypatch):
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    client = FakeClient([make_order(1, "2025-07-10T15:00:00Z")])
+
+    asyncio.run(warehouse.sync(client, "2025-07-10"))
+    asyncio.run(warehouse.sync(client, "2025-07-01"))
+
+    assert client.searches[-1] == "created_at:>=2025-07-01 created_at:<=2025-07-09"
+
+
+def test_delta_picks_up_updated_orders(warehouse, monkeypatch):
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 0)
+    order = make_order(1, "2025-07-10T15:00:00Z")
+    client = FakeClient([order])
+    asyncio.run(warehouse.sync(client, "2025-07-10"))
+
+    # Order later refunded in full
+    client.orders = [dict(order, updatedAt="2099-01-01T00:00:00Z", displayFinancialStatus="REFUNDED")]
+    stats = asyncio.run(warehouse.sync(client, "2025-07-10"))
+
+    assert client.searches[-1].startswith("updated_at:>='")
+    assert stats["delta_orders"] == 1
+    assert warehouse.summary("2025-07-10", "2025-07-10")["order_count"] == 0
+    assert warehouse.summary("2025-07-10", "2025-07-10", financial_status="REFUNDED")["order_count"] == 1
+
+
+def test_daily_sales_histograms_from_one_scan(warehouse, monkeypatch):
+    from datetime import datetime
+    from mcp_tools.analytics.daily_sales import DailySalesTool
+
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    client = FakeClient([
+        make_order(1, "2025-07-02T13:10:00Z"),  # 09:10 Toronto
+        make_order(2, "2025-07-02T13:40:00Z", total="60.00"),  # 09:40
+        dict(make_order(3, "2025-07-02T18:05:00Z"), sourceIdentifier="pos", sourceName="1234"),  # 14:05
+    ])
+    asyncio.run(warehouse.sync(client, "2025-07-01"))
+
+    now = datetime(2025, 7, 2, 14, 20, tzinfo=warehouse.timezone)
+    day = DailySalesTool()._scan_day(warehouse.orders("2025-07-02", "2025-07-02"), now)
+
+    assert day["summary"] == {"order_count": 3, "total_revenue": 260.0, "average_order_value": 86.67}
+    assert day["hourly"]["09:00"] == 2
+    assert list(day["hourly"])[-1] == "14:00"
+    assert day["half_hourly"]["09:00"] == 1 and day["half_hourly"]["09:30"] == 1
+    assert "14:30" not in day["half_hourly"]
+    assert day["channels"]["web"] == {"orders": 2, "revenue": 160.0}
+    assert day["channels"]["pos"]["orders"] == 1
+    assert day["channel_hourly"]["web"]["09:00"] == 2 and day["channel_hourly"]["web"]["14:00"] == 0
+    assert day["channel_hourly"]["pos"]["14:00"] == 1 and sum(day["channel_hourly"]["pos"].values()) == 1
+
+
+def test_revenue_report_sections_share_one_stream(warehouse, monkeypatch):
+    from mcp_tools.analytics import revenue_reports
+
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    client = FakeClient([
+        dict(make_order(1, "2025-07-02T15:00:00Z"), discountCodes=["SUMMER"],
+             totalDiscountsSet={"shopMoney": {"amount": "15.00"}}),
+        dict(make_order(2, "2025-07-03T15:00:00Z", total="50.00"), sourceIdentifier="pos", sourceName="1234"),
+        dict(make_order(3, "2025-07-03T16:00:00Z", status="REFUNDED"),
+             refunds=[{"totalRefundedSet": {"shopMoney": {"amount": "100.00"}}}]),
+    ])
+    monkeypatch.setattr(revenue_reports, "AsyncShopifyClient", lambda: client)
+    monkeypatch.setattr(revenue_reports, "get_order_warehouse", lambda: warehouse)
+
+    result = asyncio.run(revenue_reports.RevenueReportsTool().execute("weekly", "2025-07-01", "2025-07-07"))
+    report = result["data"]
+
+    assert result["success"]
+    assert report["summary"]["gross_revenue"] == 150.0
+    assert report["refunds"] == {"total_refunded": 100.0, "refund_count": 1}
+    assert report["discounts"]["top_discount_codes"] == {"SUMMER": 1}
+    assert report["channels"]["pos"] == {"order_count": 1, "revenue": 50.0}
+    assert report["weekly_breakdown"][0]["week"] == "2025-W27"
+    # No per-section order queries beyond the warehouse backfill and delta
+    assert client.searches[0] == "created_at:>=2025-06-24"
+    assert all(q.startswith("updated_at") for q in client.searches[1:])
+
+
+def test_orders_with_many_line_items_are_paged_not_truncated(warehouse, monkeypatch):
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    items = [(f"Part {i}", f"P-{i}", 1, "2.00") for i in range(30)]
+    order = make_order(1, "2025-07-10T15:00:00Z", items=items)
+    first, rest = order["lineItems"]["edges"][:25], order["lineItems"]["edges"][25:]
+    order["lineItems"] = {"edges": first, "pageInfo": {"hasNextPage": True, "endCursor": "c25"}}
+
+    class LineItemClient(FakeClient):
+        async def execute_graphql(self, query, variables=None):
+            if "warehouseOrderLineItems" in query:
+                assert variables == {"id": order["id"], "after": "c25"}
+                return {"data": {"order": {"lineItems": {
+                    "edges": rest, "pageInfo": {"hasNextPage": False, "endCursor": None},
+                }}}}
+            return await super().execute_graphql(query, variables)
+
+    stats = asyncio.run(warehouse.sync(LineItemClient([order]), "2025-07-10"))
+
+    assert stats["strategy"] == "paginated"
+    count, = warehouse.conn.execute("SELECT COUNT(*) FROM line_items").fetchone()
+    assert count == 30
+    assert len(warehouse.top_products("2025-07-10", "2025-07-10", limit=50)) == 30
+
+
+def test_bulk_threshold_uses_the_warehouse_page_size(warehouse, monkeypatch):
+    monkeypatch.setattr(order_warehouse, "MIN_SYNC_INTERVAL", 3600)
+    exported = []
+
+    class FakeRunner:
+        def __init__(self, client):
+            pass
+
+        async def run(self, query):
+            exported.append(query)
+            for order in client.orders:
+                yield order
+
+    class CountingClient(FakeClient):
+        async def execute_graphql(self, query, variables=None):
+            if "ordersCount" in query:
+                # Five warehouse pages, well under four 250-order pages
+                return {"data": {"ordersCount": {"count": 5 * order_warehouse.PAGE_SIZE}}}
+            return await super().execute_graphql(query, variables)
+
+    monkeypatch.setattr(order_warehouse, "BulkOperationRunner", FakeRunner)
+    client = CountingClient([make_order(1, "2025-07-10T15:00:00Z")])
+    stats = asyncio.run(warehouse.sync(client, "2025-07-10"))
+
+    assert stats["strategy"] == "bulk_operation" and len(exported) == 1
+    assert warehouse.summary("2025-07-10", "2025-07-10")["order_count"] == 1
+
+
+def test_today_is_the_shop_day(warehouse, monkeypatch):
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+    from mcp_tools.analytics.order_analytics import OrderAnalyticsTool
+
+    asyncio.run(warehouse.ensure_timezone(FakeClient([])))
+    tool = OrderAnalyticsTool.__new__(OrderAnalyticsTool)
+    assert tool._parse_date("today", warehouse.timezone) == datetime.now(ZoneInfo("America/Toronto")).strftime("%Y-%m-%d")
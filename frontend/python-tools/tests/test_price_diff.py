@@ -0,0 +1,125 @@
+import sys, pathlib, asyncio, json
+from datetime import date
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import sale_calendar
+from price_diff import money, plan_price_changes
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SALE_CALENDAR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(sale_calendar, "_loaded", {})
+
+
+def variant(num, price, compare_at=None, product=1):
+    return {"id": f"gid://shopify/ProductVariant/{num}", "price": price, "compareAtPrice": compare_at,
+            "product": {"id": f"gid://shopify/Product/{product}"}}
+
+
+def test_plan_drops_no_ops_and_groups_by_product():
+    current = {v["id"]: v for v in [variant(1, "10.00"), variant(2, "20.00", "25.00"),
+                                    variant(3, "30.00", product=2), variant(4, "40.00", "50.00", product=2)]}
+    requested = [
+        {"variant_id": "gid://shopify/ProductVariant/1", "price": 10, "compare_at_price": None},
+        {"variant_id": "gid://shopify/ProductVariant/2", "price": "20", "compare_at_price": 25.0},
+        {"variant_id": "gid://shopify/ProductVariant/3", "price": 29.99, "compare_at_price": None},
+        {"variant_id": "gid://shopify/ProductVariant/4", "price": 40, "compare_at_price": None},
+        {"variant_id": "gid://shopify/ProductVariant/9", "price": 1, "compare_at_price": None},
+    ]
+
+    plan = plan_price_changes(requested, current)
+
+    assert plan.counts() == {"requested": 5, "to_change": 2, "unchanged": 2, "not_found": 1,
+                             "invalid": 0, "products_to_update": 1}
+    assert plan.changes == {"gid://shopify/Product/2": [
+        {"id": "gid://shopify/ProductVariant/3", "price": "29.99", "compareAtPrice": None},
+        {"id": "gid://shopify/ProductVariant/4", "price": "40.00", "compareAtPrice": None},
+    ]}
+    assert plan_price_changes(requested, current, force=True).variants_to_change == 4
+
+
+def test_money_rejects_garbage():
+    assert money("19.999") == money(20) and money("") is None
+    with pytest.raises(ValueError):
+        money("abc")
+
+
+def test_malformed_prices_are_listed_and_the_rest_planned():
+    current = {v["id"]: v for v in [variant(1, "10.00"), variant(2, "20.00"), variant(3, "oops")]}
+    requested = [
+        {"variant_id": "gid://shopify/ProductVariant/1", "price": "12,50", "compare_at_price": None},
+        {"variant_id": "gid://shopify/ProductVariant/2", "price": 21, "compare_at_price": "n/a"},
+        {"variant_id": "gid://shopify/ProductVariant/3", "price": 5, "compare_at_price": None},
+        {"variant_id": "gid://shopify/ProductVariant/1", "price": 11, "compare_at_price": None},
+    ]
+
+    plan = plan_price_changes(requested, current)
+
+    assert [row["variant_id"][-1] for row in plan.invalid] == ["1", "2", "3"]
+    assert "'12,50'" in plan.invalid[0]["error"]
+    assert plan.counts()["invalid"] == 3 and plan.counts()["requested"] == 4
+    assert plan.changes == {"gid://shopify/Product/1": [
+        {"id": "gid://shopify/ProductVariant/1", "price": "11.00", "compareAtPrice": None},
+    ]}
+
+
+class FakeShop:
+    """Answers batched SKU searches from live variant state and applies price mutations."""
+
+    def __init__(self, skus):
+        self.variants = {sku: {"id": f"gid://shopify/ProductVariant/{i}", "sku": sku, "price": "999.99",
+                               "compareAtPrice": None,
+                               "product": {"id": f"gid://shopify/Product/{i}", "tags": ["BREMAP"],
+                                           "status": "ACTIVE", "saleEnd": None}}
+                         for i, sku in enumerate(skus)}
+        self.reads = 0
+        self.writes = 0
+
+    async def execute_graphql(self, query, variables=None):
+        if query.lstrip().startswith("mutation"):
+            self.writes += 1
+            if "productUpdate" in query:
+                product_id = variables["input"]["id"]
+                value = variables["input"]["metafields"][0]["value"]
+                for v in self.variants.values():
+                    if v["product"]["id"] == product_id:
+                        v["product"]["saleEnd"] = {"value": value}
+                return {"data": {"productUpdate": {"userErrors": []}}}
+            for change in variables["variants"]:
+                v = next(v for v in self.variants.values() if v["id"] == change["id"])
+                v["price"], v["compareAtPrice"] = change["price"], change["compareAtPrice"]
+            return {"data": {"productVariantsBulkUpdate": {"userErrors": []}}}
+        self.reads += 1
+        data = {}
+        for alias, search in variables.items():
+            sku = json.loads(search.split(" ")[0].split(":", 1)[1])
+            found = self.variants.get(sku)
+            data["v" + alias[1:]] = {"edges": [{"node": json.loads(json.dumps(found))}] if found else []}
+        return {"data": data}
+
+
+def test_reapplying_a_breville_sale_costs_one_read_and_no_writes(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("PRODUCT_INDEX_PATH", "/nonexistent/product_index.db")
+    from mcp_tools.sales.manage_map_sales import ManageMapSalesTool
+
+    tool = ManageMapSalesTool()
+    on = date(date.today().year, 6, 8)
+    sales, _ = tool.calendar.active_sales_for(on)
+    shop = FakeShop({s["sku"] for s in sales})
+    monkeypatch.setattr(tool.client, "execute_graphql", shop.execute_graphql)
+
+    first = asyncio.run(tool.execute("apply", date=on.isoformat()))
+    assert first["success"] and first["details"]["updated"] == len(sales)
+    assert first["plan"]["to_change"] == len(sales) and first["plan"]["sale_end_updates"] == len(sales)
+
+    shop.reads = shop.writes = 0
+    again = asyncio.run(tool.execute("apply", date=on.isoformat()))
+    assert again["details"]["already_on_sale"] == len(sales) and again["details"]["updated"] == 0
+    assert again["plan"]["to_change"] == 0 and again["plan"]["sale_end_updates"] == 0
+    assert (shop.reads, shop.writes) == (1, 0)
@@ -0,0 +1,155 @@
+import sys, pathlib, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import product_index
+from base import AsyncShopifyClient
+from product_index import ProductIndex, get_product_index
+
+
+def make_product(num, handle, title, variants=(), updated_at="2026-01-01T00:00:00Z"):
+    return {
+        "id": f"gid://shopify/Product/{num}",
+        "handle": handle,
+        "title": title,
+        "updatedAt": updated_at,
+        "variants": {"edges": [
+            {"node": {"id": f"gid://shopify/ProductVariant/{num}{i}", "sku": sku, "barcode": barcode,
+                      "inventoryItem": {"id": f"gid://shopify/InventoryItem/{num}{i}"}}}
+            for i, (sku, barcode) in enumerate(variants)
+        ]},
+    }
+
+
+class FakeClient:
+    """Answers index queries from a list of products."""
+
+    shop_url = "https://test-shop.myshopify.com"
+
+    def __init__(self, products):
+        self.products = products
+        self.queries = []
+
+    async def execute_graphql(self, query, variables=None):
+        self.queries.append(variables)
+        if "productsCount" in query:
+            return {"data": {"productsCount": {"count": len(self.products)}}}
+        if "resolveIdentifier" in query:
+            by_handle = next((p for p in self.products if p["handle"] == variables["handle"]), None)
+            return {"data": {"productByHandle": by_handle, "products": {"edges": []}}}
+        if variables["query"].startswith("updated_at"):
+            cursor = variables["query"].split("'")[1]
+            matched = [p for p in self.products if p["updatedAt"] >= cursor]
+        else:
+            matched = self.products
+        return {"data": {"products": {
+            "edges": [{"node": p} for p in matched],
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+        }}}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ProductIndex(tmp_path / "index.db")
+
+
+CATALOG = [
+    make_product(1, "breville-barista-express", "Breville  Barista Express", [("BES870XL", "9310"), ("BES870BSXL", None)]),
+    make_product(2, "grinder-1", "Grinder", [("GR-1", None)]),
+    make_product(3, "grinder-2", "grinder", [("GR-2", None)]),
+]
+
+
+def test_warm_indexes_every_identifier(index):
+    client = FakeClient(CATALOG)
+    stats = asyncio.run(index.warm(client))
+    assert stats["strategy"] == "paginated" and stats["products"] == 3
+    assert index.serves(client.shop_url) and not index.serves("https://other.myshopify.com")
+
+    assert index.lookup("breville-barista-express")["matched"] == "handle"
+    assert index.lookup("bes870bsxl") == {
+        "product_id": "gid://shopify/Product/1",
+        "variant_id": "gid://shopify/ProductVariant/11",
+        "inventory_item_id": "gid://shopify/InventoryItem/11",
+        "matched": "sku",
+    }
+    assert index.lookup("9310")["variant_id"] == "gid://shopify/ProductVariant/10"
+    assert index.lookup("breville barista EXPRESS")["product_id"] == "gid://shopify/Product/1"
+    assert index.lookup("Grinder") is None  # Two products share the title
+
+    # Survives a restart
+    reopened = ProductIndex(index.db_path)
+    assert reopened.lookup("GR-2")["product_id"] == "gid://shopify/Product/3"
+
+
+def test_delta_replaces_changed_identifiers(index):
+    client = FakeClient(list(CATALOG))
+    asyncio.run(index.warm(client))
+    client.products[1] = make_product(2, "grinder-pro", "Grinder Pro", [("GR-1P", None)],
+                                      updated_at="2999-01-01T00:00:00Z")
+
+    assert asyncio.run(index.sync(client))["api_calls"] == 0  # Not due yet
+    stats = asyncio.run(index.sync(client, force=True))
+    assert stats["delta_products"] == 1
+    assert index.lookup("GR-1") is None
+    assert index.lookup("grinder-pro")["product_id"] == "gid://shopify/Product/2"
+    # The old handle is gone and the title is no longer shared
+    assert index.lookup("grinder") == {"product_id": "gid://shopify/Product/3", "matched": "title"}
+    assert index.stats()["cursor"] == "2999-01-01T00:00:00Z"
+
+
+def test_products_with_many_variants_keep_them_all(index):
+    big = make_product(4, "cups", "Cups", [(f"CUP-{i}", None) for i in range(45)])
+    edges = big["variants"]["edges"]
+    big["variants"] = {"edges": edges[:40], "pageInfo": {"hasNextPage": True, "endCursor": "v40"}}
+
+    class VariantClient(FakeClient):
+        async def execute_graphql(self, query, variables=None):
+            if "indexProductVariants" in query:
+                assert variables == {"id": big["id"], "after": "v40"}
+                return {"data": {"product": {"variants": {
+                    "edges": edges[40:], "pageInfo": {"hasNextPage": False, "endCursor": None},
+                }}}}
+            return await super().execute_graphql(query, variables)
+
+    asyncio.run(index.warm(VariantClient([big])))
+    assert index.lookup("CUP-44")["product_id"] == big["id"]
+
+    # A lone first page (e.g. from the resolve fallback) keeps the rest
+    index.store_products([dict(big, title="Mugs", variants={
+        "edges": edges[:40], "pageInfo": {"hasNextPage": True, "endCursor": "v40"}})])
+    assert index.lookup("CUP-44")["product_id"] == big["id"]
+    assert index.lookup("mugs")["product_id"] == big["id"]
+    count, = index.conn.execute("SELECT COUNT(*) FROM variants").fetchone()
+    assert count == 45
+
+
+def test_client_resolves_from_index_then_one_query(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("PRODUCT_INDEX_PATH", str(tmp_path / "index.db"))
+    monkeypatch.setattr(product_index, "MIN_SYNC_INTERVAL", 3600)
+    shop = AsyncShopifyClient()
+    fake = FakeClient(CATALOG)
+    fake.shop_url = shop.shop_url
+    assert get_product_index(shop.shop_url) is None
+
+    index = get_product_index(shop.shop_url, create=True)
+    asyncio.run(index.warm(fake))
+    fake.products = fake.products + [make_product(4, "tamper", "Tamper", [("TMP-58", None)])]
+
+    posts = []
+
+    async def execute_graphql(query, variables=None):
+        posts.append(variables)
+        return await fake.execute_graphql(query, variables)
+
+    monkeypatch.setattr(shop, "execute_graphql", execute_graphql)
+    assert asyncio.run(shop.resolve_product_id("BES870XL")) == "gid://shopify/Product/1"
+    assert posts == []
+    assert asyncio.run(shop.resolve_product_id("tamper")) == "gid://shopify/Product/4"
+    assert len(posts) == 1 and posts[0]["query"].startswith('sku:"tamper"')
+    assert asyncio.run(shop.resolve_product_id("TMP-58")) == "gid://shopify/Product/4"
+    assert len(posts) == 1
@@ -0,0 +1,164 @@
+import sys, pathlib, json, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+from mcp_base_server import EnhancedMCPServer, RequestDispatcher, handle_batch
+
+
+def make_handler(delays, started):
+    async def handler(request):
+        started.append(request["id"])
+        await asyncio.sleep(delays[request["id"]])
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {}}
+    return handler
+
+
+def written_ids(capsys):
+    return [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()]
+
+
+def test_slow_request_does_not_block_others(capsys):
+    started = []
+    dispatcher = RequestDispatcher(make_handler({1: 0.2, 2: 0.0, 3: 0.01}, started), max_concurrency=4)
+
+    async def scenario():
+        for request_id in (1, 2, 3):
+            dispatcher.dispatch({"jsonrpc": "2.0", "id": request_id, "method": "tools/call"})
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert written_ids(capsys) == [2, 3, 1]
+
+
+def test_concurrency_limit(capsys):
+    running = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {}}
+
+    dispatcher = RequestDispatcher(handler, max_concurrency=2)
+
+    async def scenario():
+        for request_id in range(6):
+            dispatcher.dispatch({"jsonrpc": "2.0", "id": request_id, "method": "tools/call"})
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert running["peak"] == 2
+    assert sorted(written_ids(capsys)) == list(range(6))
+
+
+def test_cancel_notification_stops_task(capsys):
+    started = []
+    dispatcher = RequestDispatcher(make_handler({1: 5.0, 2: 0.0}, started))
+
+    async def scenario():
+        dispatcher.dispatch({"jsonrpc": "2.0", "id": 1, "method": "tools/call"})
+        dispatcher.dispatch({"jsonrpc": "2.0", "id": 2, "method": "tools/call"})
+        await asyncio.sleep(0.01)
+        dispatcher.dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                             "params": {"requestId": 1, "reason": "user aborted"}})
+        await asyncio.wait_for(dispatcher.drain(), timeout=1)
+
+    asyncio.run(scenario())
+    assert started == [1, 2]
+    assert written_ids(capsys) == [2]
+    assert dispatcher.in_flight == {}
+
+
+class CountingTool:
+    description = ""
+    input_schema = {}
+
+    def __init__(self, name, read_only):
+        self.name = name
+        self.read_only = read_only
+        self.calls = 0
+
+    async def execute(self, sku):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return {"success": True, "sku": sku}
+
+
+def tool_call(request_id, name, sku, **meta):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": {"sku": sku}, "_meta": meta}}
+
+
+def test_batch_runs_concurrently_and_shares_identical_reads(capsys):
+    server = EnhancedMCPServer("espressobot-test")
+    get_product = CountingTool("get_product", read_only=True)
+    adjust = CountingTool("adjust_inventory", read_only=False)
+    server.add_tool(get_product)
+    server.add_tool(adjust)
+    capsys.readouterr()
+
+    batch = [
+        *(tool_call(i, "get_product", f"SKU-{i}") for i in range(5)),
+        tool_call(5, "get_product", "SKU-0", progressToken="p"),
+        tool_call(6, "adjust_inventory", "SKU-9"),
+        tool_call(7, "adjust_inventory", "SKU-9"),
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        "not a request",
+    ]
+    dispatcher = RequestDispatcher(server.handle_request)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        dispatcher.dispatch(batch)
+        await dispatcher.drain()
+        return loop.time() - start
+
+    elapsed = asyncio.run(scenario())
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    responses = json.loads(lines[0])
+    assert [r["id"] for r in responses] == [0, 1, 2, 3, 4, 5, 6, 7, None]
+    assert responses[-1]["error"]["code"] == -32600
+    assert json.loads(responses[5]["result"]["content"][0]["text"])["sku"] == "SKU-0"
+    assert get_product.calls == 5 and adjust.calls == 2
+    assert elapsed < 0.3
+
+
+def test_empty_batch_is_invalid():
+    server = EnhancedMCPServer("espressobot-test")
+    response = asyncio.run(server.handle_request([]))
+    assert response["error"]["code"] == -32600 and response["id"] is None
+
+
+def test_batch_members_share_the_limit_and_cancel_alone(capsys):
+    running = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        if isinstance(request, list):
+            return await handle_batch(handler, request, lambda r: False, max_concurrency=8)
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await asyncio.sleep(5.0 if request["id"] == 1 else 0.02)
+        finally:
+            running["now"] -= 1
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {}}
+
+    dispatcher = RequestDispatcher(handler, max_concurrency=2)
+
+    async def scenario():
+        dispatcher.dispatch([{"jsonrpc": "2.0", "id": i, "method": "tools/call"} for i in range(1, 6)])
+        dispatcher.dispatch({"jsonrpc": "2.0", "id": 6, "method": "tools/call"})
+        await asyncio.sleep(0.01)
+        dispatcher.dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1}})
+        await asyncio.wait_for(dispatcher.drain(), timeout=1)
+
+    asyncio.run(scenario())
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    batch = next(line for line in lines if isinstance(line, list))
+    assert [r["id"] for r in batch] == [2, 3, 4, 5]  # Only the cancelled member is missing
+    assert {"jsonrpc": "2.0", "id": 6, "result": {}} in lines
+    assert running["peak"] == 2
+    assert dispatcher.in_flight == {}
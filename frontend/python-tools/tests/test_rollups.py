@@ -0,0 +1,67 @@
+import sys, pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+from mcp_tools.analytics import rollups
+from mcp_tools.analytics.rollups import rollup_orders
+
+
+def row(day, total=100.0, status="PAID", discounts=0.0, refunded=0.0, refunds=0, source="web"):
+    return {
+        "created_day": day,
+        "financial_status": status,
+        "total_price": total,
+        "total_discounts": discounts,
+        "total_refunded": refunded,
+        "refund_count": refunds,
+        "source_identifier": source,
+    }
+
+
+ROWS = [
+    row("2025-06-29", 50.0),  # Sunday, ISO week 26
+    row("2025-06-30", 100.0, discounts=10.0),  # Monday, week 27
+    row("2025-07-01", 200.0, source="pos"),
+    row("2025-07-01", 80.0, status="REFUNDED", refunded=80.0, refunds=1),
+    row("2025-07-15", 30.0),
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(rollups, "np", None)
+    elif rollups.np is None:
+        pytest.skip("numpy not installed")
+
+
+def test_daily_buckets_cover_range(backend):
+    daily = rollup_orders(ROWS, "2025-06-29", "2025-07-02")["daily"]
+
+    assert [d["date"] for d in daily] == ["2025-06-29", "2025-06-30", "2025-07-01", "2025-07-02"]
+    assert daily[2]["orders"] == 1 and daily[2]["revenue"] == 200.0
+    assert daily[2]["refunds"] == 80.0 and daily[2]["net_revenue"] == 120.0
+    assert daily[3]["orders"] == 0 and daily[3]["channels"] == {}
+
+
+def test_weeks_and_months_share_buckets(backend):
+    result = rollup_orders(ROWS, "2025-06-29", "2025-07-20")
+
+    weekly = result["weekly"]
+    assert [w["week"] for w in weekly] == ["2025-W26", "2025-W27", "2025-W28", "2025-W29"]
+    assert weekly[0]["start"] == weekly[0]["end"] == "2025-06-29"
+    assert weekly[1]["revenue"] == 300.0
+    assert weekly[1]["discounts"] == 10.0 and weekly[1]["orders_with_discount"] == 1
+    assert weekly[1]["channels"] == {"web": {"order_count": 1, "revenue": 100.0},
+                                     "pos": {"order_count": 1, "revenue": 200.0}}
+
+    monthly = result["monthly"]
+    assert [(m["month"], m["start"], m["end"]) for m in monthly] == [
+        ("2025-06", "2025-06-29", "2025-06-30"),
+        ("2025-07", "2025-07-01", "2025-07-20"),
+    ]
+    assert monthly[1]["revenue"] == 230.0
+    assert monthly[1]["refund_count"] == 1
+    assert sum(m["orders"] for m in monthly) == sum(w["orders"] for w in weekly) == 4
@@ -0,0 +1,85 @@
+import sys, pathlib, os
+from datetime import date, timedelta
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import sale_calendar
+from sale_calendar import SaleCalendar, SaleWindow, cached_calendar
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SALE_CALENDAR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(sale_calendar, "_loaded", {})
+
+
+def test_date_and_sku_lookups_match_a_linear_scan():
+    windows = [
+        SaleWindow("a", date(2025, 1, 1), date(2025, 1, 10), [{"sku": "X", "price": 1}]),
+        SaleWindow("b", date(2025, 1, 5), date(2025, 1, 6), [{"sku": "Y", "price": 2}]),
+        SaleWindow("c", date(2025, 1, 10), date(2025, 1, 20), [{"sku": "X", "price": 3}]),
+        SaleWindow("d", date(2025, 12, 26), date(2026, 1, 1), [{"sku": "Y", "price": 4}]),
+    ]
+    calendar = SaleCalendar(windows)
+
+    day = date(2024, 12, 25)
+    while day <= date(2026, 1, 3):
+        expected = [w for w in windows if w.start <= day <= w.end]
+        assert calendar.windows_on(day) == expected, day
+        assert calendar.windows_for_sku("X", day) == [w for w in expected if w.label in ("a", "c")]
+        day += timedelta(days=1)
+
+    assert [i["price"] for i in calendar.items_for_sku("X", date(2025, 1, 10))] == [1, 3]
+    assert [w.label for w in calendar.windows_for_sku("Y")] == ["b", "d"]
+    assert calendar.windows_for_sku("Z", date(2025, 1, 5)) == []
+
+
+def test_compiled_calendar_is_cached_until_the_source_changes(tmp_path, monkeypatch):
+    source = tmp_path / "calendar.txt"
+    source.write_text("2025-03-01 2025-03-07 SKU-1")
+    compiled = []
+
+    def compile_calendar(path):
+        compiled.append(path)
+        start, end, sku = path.read_text().split()
+        return SaleCalendar([SaleWindow(start, date.fromisoformat(start), date.fromisoformat(end),
+                                        [{"sku": sku}])])
+
+    first = cached_calendar(source, compile_calendar)
+    assert cached_calendar(source, compile_calendar) is first
+    # A fresh process loads the JSON instead of compiling again
+    monkeypatch.setattr(sale_calendar, "_loaded", {})
+    reloaded = cached_calendar(source, compile_calendar)
+    assert len(compiled) == 1 and reloaded.windows == first.windows
+
+    source.write_text("2025-04-01 2025-04-07 SKU-2")
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10**9))
+    changed = cached_calendar(source, compile_calendar)
+    assert len(compiled) == 2 and changed.windows_for_sku("SKU-2", date(2025, 4, 3))
+
+
+def test_breville_and_miele_calendars_share_the_index(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    from mcp_tools.sales.manage_map_sales import BrevilleMapCalendar, ManageMapSalesTool
+    from mcp_tools.sales.manage_miele_sales import ManageMieleSalesTool
+
+    breville = ManageMapSalesTool().calendar
+    assert isinstance(breville.index, SaleCalendar)
+    on = date(date.today().year, 6, 8)
+    sales, active_range = breville.active_sales_for(on)
+    assert active_range == "06 Jun - 12 Jun" and sales == breville.sales_data[active_range]
+    assert breville.sales_for_sku(sales[0]["sku"], on)[0]["sku"] == sales[0]["sku"]
+    assert breville.sale_end_iso(active_range) == f"{on.year}-06-12T23:59:59.999999Z"
+    # Year-spanning range still ends in the following January
+    new_year, _ = breville._parse_date_range("26 Dec - 01 Jan")
+    assert breville.active_sales_for(date(new_year.year + 1, 1, 1))[1] == "26 Dec - 01 Jan"
+    # Reloaded from the on-disk cache
+    monkeypatch.setattr(sale_calendar, "_loaded", {})
+    assert BrevilleMapCalendar(breville.calendar_file).sales_data == breville.sales_data
+
+    miele = ManageMieleSalesTool()
+    windows = miele.calendar.windows_for_sku("MIL-CM6360-W", date(2025, 2, 10))
+    assert [(w.start, w.end) for w in windows] == [(date(2025, 2, 7), date(2025, 2, 13))]
@@ -0,0 +1,103 @@
+import sys, pathlib, json, asyncio, multiprocessing
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import mcp_scratchpad_tool as scratchpad
+
+
+def use_paths(data_dir):
+    scratchpad.SCRATCHPAD_FILE = data_dir / "scratchpad.json"
+    scratchpad.SCRATCHPAD_LOG = data_dir / "scratchpad.log"
+    scratchpad.SCRATCHPAD_LOCK = data_dir / "scratchpad.lock"
+    scratchpad._log_state.update(fh=None, dirty=False)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    for name in ("SCRATCHPAD_FILE", "SCRATCHPAD_LOG", "SCRATCHPAD_LOCK"):
+        monkeypatch.setattr(scratchpad, name, getattr(scratchpad, name))
+    monkeypatch.setattr(scratchpad, "_log_state", {"fh": None, "last_fsync": 0.0, "dirty": False})
+    use_paths(tmp_path)
+    return tmp_path
+
+
+def add_entries(data_dir, author, count):
+    use_paths(data_dir)
+    for i in range(count):
+        asyncio.run(scratchpad.scratchpad_add_entry(f"{author}-{i}", author))
+
+
+def test_writes_go_to_log_and_read_back(data_dir):
+    asyncio.run(scratchpad.scratchpad_write("plan"))
+    asyncio.run(scratchpad.scratchpad_append("step 1"))
+    result = asyncio.run(scratchpad.scratchpad_add_entry("done", "agent"))
+
+    assert not (data_dir / "scratchpad.json").exists()
+    assert len((data_dir / "scratchpad.log").read_text().splitlines()) == 3
+    assert result["entry"]["id"] == 3
+
+    data = asyncio.run(scratchpad.scratchpad_read())["data"]
+    assert data["content"] == "plan\nstep 1"
+    assert [e["content"] for e in data["entries"]] == ["done"]
+
+
+def test_concurrent_processes_do_not_lose_entries(data_dir, monkeypatch):
+    monkeypatch.setattr(scratchpad, "MAX_ENTRIES", 1000)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=add_entries, args=(data_dir, f"w{n}", 20)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    entries = scratchpad.load_scratchpad()["entries"]
+    assert len(entries) == 80
+    assert [e["id"] for e in entries] == list(range(1, 81))
+
+
+def test_compaction_folds_log_into_snapshot(data_dir, monkeypatch):
+    monkeypatch.setattr(scratchpad, "COMPACT_BYTES", 200)
+    for i in range(60):
+        asyncio.run(scratchpad.scratchpad_add_entry(f"note {i}"))
+
+    snapshot = json.loads((data_dir / "scratchpad.json").read_text())
+    assert snapshot["log_seq"] > 0
+    assert (data_dir / "scratchpad.log").stat().st_size <= 200
+
+    data = scratchpad.load_scratchpad(limit=5)
+    assert [e["content"] for e in data["entries"]] == [f"note {i}" for i in range(55, 60)]
+    assert len(scratchpad.load_scratchpad()["entries"]) == scratchpad.MAX_ENTRIES
+
+
+def test_clear_compacts_and_keeps_sequence(data_dir):
+    asyncio.run(scratchpad.scratchpad_add_entry("old"))
+    asyncio.run(scratchpad.scratchpad_clear())
+
+    assert (data_dir / "scratchpad.log").read_text() == ""
+    entry = asyncio.run(scratchpad.scratchpad_add_entry("new"))["entry"]
+    assert entry["id"] == 3
+    assert [e["content"] for e in scratchpad.load_scratchpad()["entries"]] == ["new"]
+
+
+def test_torn_line_is_skipped(data_dir):
+    asyncio.run(scratchpad.scratchpad_write("first"))
+    with open(data_dir / "scratchpad.log", "a") as f:
+        f.write('{"seq": 2, "op": "wri')  # crash mid-write
+    asyncio.run(scratchpad.scratchpad_append("second"))
+
+    assert scratchpad.load_scratchpad()["content"] == "first\nsecond"
+
+
+def test_command_line_writes_through_the_log(data_dir, monkeypatch, capsys):
+    import io
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"content": "from node", "author": "orchestrator"})))
+    scratchpad.main(["add_entry"])
+    result = json.loads(capsys.readouterr().out)
+
+    assert result["success"] and result["entry"]["author"] == "orchestrator"
+    assert json.loads((data_dir / "scratchpad.log").read_text())["op"] == "add_entry"
+    with pytest.raises(SystemExit):
+        scratchpad.main(["rewrite"])
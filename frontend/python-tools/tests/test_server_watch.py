@@ -0,0 +1,128 @@
+import sys, pathlib, asyncio, json, importlib.util
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+spec = importlib.util.spec_from_file_location(
+    "mcp_server_watch", pathlib.Path(__file__).resolve().parents[1] / "mcp-server-watch.py")
+watch = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(watch)
+
+# Answers every request with its pid; exits on the "crash" method
+WORKER = """
+import json, os, sys
+print(json.dumps({"jsonrpc": "2.0", "method": "ready"}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["method"] == "crash":
+        sys.exit(3)
+    result = {"pid": os.getpid()}
+    if request["method"] == "tools/call" and request.get("params", {}).get("paged"):
+        result["_meta"] = {"nextCursor": f"result://s{os.getpid()}?cursor=1"}
+    elif request["method"] == "resources/read":
+        cursor = int(request["params"]["uri"].rsplit("=", 1)[1])
+        if cursor < 2:
+            result["nextCursor"] = request["params"]["uri"].replace(f"={cursor}", f"={cursor + 1}")
+    print(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}), flush=True)
+"""
+
+
+class FakeTransport:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def read_message(self):
+        return await self.incoming.get()
+
+    async def write_line(self, data):
+        self.sent.append(json.loads(data))
+
+    def request(self, request_id, method="tools/call", params=None):
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        self.incoming.put_nowait(json.dumps(message).encode() + b"\n")
+
+    async def response(self, request_id):
+        for _ in range(500):
+            for message in self.sent:
+                if message.get("id") == request_id:
+                    return message
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"no response for {request_id}")
+
+
+def run_manager(scenario, **kwargs):
+    async def main():
+        transport = FakeTransport()
+        manager = watch.MCPServerManager([sys.executable, "-c", WORKER], transport=transport, **kwargs)
+        runner = asyncio.create_task(manager.run())
+        try:
+            return await scenario(manager, transport)
+        finally:
+            transport.incoming.put_nowait(None)
+            await runner
+    return asyncio.run(main())
+
+
+def test_fails_over_to_warm_standby():
+    async def scenario(manager, transport):
+        transport.request(1)
+        first = (await transport.response(1))["result"]["pid"]
+        while manager.snapshot()["standby"] < 1:
+            await asyncio.sleep(0.01)
+
+        transport.request(2, method="crash")
+        error = await transport.response(2)
+        transport.request(3)
+        second = (await transport.response(3))["result"]["pid"]
+        return first, second, error, manager.snapshot()
+
+    first, second, error, metrics = run_manager(scenario, pool_size=2, max_requests=0)
+    assert first != second
+    assert "exited with code 3" in error["error"]["message"]
+    assert metrics["crashes"] == 1 and metrics["failed_in_flight"] == 1
+    assert metrics["failover"]["count"] == 1 and metrics["failover"]["last_ms"] < 100
+
+
+def test_recycles_after_request_limit():
+    async def scenario(manager, transport):
+        pids = []
+        for request_id in range(1, 5):
+            transport.request(request_id)
+            pids.append((await transport.response(request_id))["result"]["pid"])
+        transport.request(99, method="supervisor/metrics")
+        return pids, (await transport.response(99))["result"]
+
+    pids, metrics = run_manager(scenario, pool_size=2, max_requests=2)
+    assert pids[0] == pids[1] and pids[2] == pids[3] and pids[0] != pids[2]
+    assert metrics["recycles"] == 2 and metrics["crashes"] == 0
+    assert metrics["requests"] == 4
+
+
+def test_result_stream_reads_follow_a_recycled_worker():
+    async def scenario(manager, transport):
+        transport.request(1, params={"paged": True})
+        first = await transport.response(1)
+        owner, link = first["result"]["pid"], first["result"]["_meta"]["nextCursor"]
+        assert manager.snapshot()["recycles"] == 1  # Retired after one request
+
+        pids = []
+        for request_id in (2, 3):
+            transport.request(request_id, method="resources/read", params={"uri": link})
+            page = (await transport.response(request_id))["result"]
+            pids.append(page["pid"])
+            link = page.get("nextCursor")
+        assert link is None
+
+        for _ in range(500):  # Drained, so the retired worker exits
+            if owner not in [w.pid for w in manager.workers]:
+                break
+            await asyncio.sleep(0.01)
+        assert owner not in [w.pid for w in manager.workers]
+        transport.request(4)
+        return owner, pids, (await transport.response(4))["result"]["pid"], manager.snapshot()
+
+    owner, pids, later, metrics = run_manager(scenario, pool_size=2, max_requests=1)
+    assert pids == [owner, owner] and later != owner
+    assert metrics["open_streams"] == 0 and metrics["crashes"] == 0
@@ -0,0 +1,173 @@
+import sys, pathlib, json, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+from shopify_bulk import BulkOperationError, BulkOperationRunner, iter_jsonl_records
+
+
+JSONL_LINES = [
+    {"id": "gid://shopify/Order/1", "name": "#1001"},
+    {"id": "gid://shopify/LineItem/11", "sku": "A", "__parentId": "gid://shopify/Order/1"},
+    {"id": "gid://shopify/LineItem/12", "sku": "B", "__parentId": "gid://shopify/Order/1"},
+    {"id": "gid://shopify/Order/2", "name": "#1002"},
+    {"id": "gid://shopify/Order/3", "name": "#1003"},
+    {"id": "gid://shopify/LineItem/31", "sku": "C", "__parentId": "gid://shopify/Order/3"},
+]
+
+
+def write_jsonl(path):
+    path.write_text("\n".join(json.dumps(line) for line in JSONL_LINES) + "\n")
+    return path
+
+
+def test_iter_jsonl_records_reassembles_children(tmp_path):
+    records = list(iter_jsonl_records(write_jsonl(tmp_path / "result.jsonl")))
+
+    assert [r["name"] for r in records] == ["#1001", "#1002", "#1003"]
+    assert [li["sku"] for li in records[0]["lineItems"]] == ["A", "B"]
+    assert "lineItems" not in records[1]
+    assert "__parentId" not in records[2]["lineItems"][0]
+
+
+def test_iter_jsonl_records_custom_child_key(tmp_path):
+    records = iter_jsonl_records(write_jsonl(tmp_path / "result.jsonl"), {"LineItem": "items"})
+    assert len(next(records)["items"]) == 2
+
+
+class FakeClient:
+    def __init__(self, statuses, current=None):
+        self.statuses = iter(statuses)
+        self.current = current
+        self.calls = []
+        self.cancelled = []
+
+    async def execute_graphql(self, query, variables=None):
+        self.calls.append(variables)
+        if "currentBulkOperation" in query:
+            return {"data": {"currentBulkOperation": self.current}}
+        if "bulkOperationCancel" in query:
+            self.cancelled.append(variables["id"])
+            return {"data": {"bulkOperationCancel": {"userErrors": []}}}
+        if "bulkOperationRunQuery" in query:
+            return {"data": {"bulkOperationRunQuery": {
+                "bulkOperation": {"id": "gid://shopify/BulkOperation/9", "status": "CREATED"},
+                "userErrors": [],
+            }}}
+        return {"data": {"node": next(self.statuses)}}
+
+
+def test_runner_polls_until_complete_and_streams(tmp_path):
+    path = write_jsonl(tmp_path / "result.jsonl")
+    client = FakeClient([
+        {"status": "RUNNING"},
+        {"status": "COMPLETED", "url": "https://storage.example/result.jsonl"},
+    ])
+    runner = BulkOperationRunner(client, poll_interval=0.01)
+    runner._download = lambda url, timeout: path
+
+    async def collect():
+        return [record async for record in runner.run("{ orders { edges { node { id } } } }")]
+
+    records = asyncio.run(collect())
+    assert len(records) == 3
+    assert not path.exists()  # downloaded file is cleaned up
+
+
+def test_runner_notify_wakes_waiter():
+    client = FakeClient([{"status": "RUNNING"}, {"status": "COMPLETED", "url": None}])
+    runner = BulkOperationRunner(client, poll_interval=30)
+
+    async def scenario():
+        waiter = asyncio.create_task(runner.wait("gid://shopify/BulkOperation/9"))
+        await asyncio.sleep(0.01)
+        runner.notify("gid://shopify/BulkOperation/9")
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(scenario())["status"] == "COMPLETED"
+
+
+def test_runner_raises_on_failure():
+    client = FakeClient([{"status": "FAILED", "errorCode": "ACCESS_DENIED"}])
+    runner = BulkOperationRunner(client, poll_interval=0.01)
+
+    with pytest.raises(BulkOperationError, match="ACCESS_DENIED"):
+        asyncio.run(runner.wait("gid://shopify/BulkOperation/9"))
+
+
+def test_runner_cancels_its_operation_when_the_caller_gives_up():
+    client = FakeClient(iter(lambda: {"status": "RUNNING"}, None))
+    runner = BulkOperationRunner(client, poll_interval=0.01)
+
+    async def scenario():
+        task = asyncio.create_task(anext(runner.run("{ orders { edges { node { id } } } }")))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert client.cancelled == ["gid://shopify/BulkOperation/9"]
+
+
+def test_runner_adopts_a_running_copy_of_its_query(tmp_path):
+    path = write_jsonl(tmp_path / "result.jsonl")
+    query = "{ orders { edges { node { id } } } }"
+    client = FakeClient([{"status": "COMPLETED", "url": "https://storage.example/result.jsonl"}],
+                        current={"id": "gid://shopify/BulkOperation/7", "status": "RUNNING",
+                                 "query": "{\n  orders { edges { node { id } } }\n}"})
+    runner = BulkOperationRunner(client, poll_interval=0.01)
+    runner._download = lambda url, timeout: path
+
+    async def collect():
+        return [record async for record in runner.run(query)]
+
+    assert len(asyncio.run(collect())) == 3
+    assert {"id": "gid://shopify/BulkOperation/7"} in client.calls
+    assert not any(call and "query" in call for call in client.calls)  # nothing submitted
+
+
+def test_runner_waits_for_another_query_before_submitting():
+    client = FakeClient([{"status": "RUNNING"}, {"status": "CANCELED"}, {"status": "COMPLETED", "url": None}],
+                        current={"id": "gid://shopify/BulkOperation/7", "status": "RUNNING",
+                                 "query": "{ products { edges { node { id } } } }"})
+    runner = BulkOperationRunner(client, poll_interval=0.01)
+
+    async def collect():
+        return [record async for record in runner.run("{ orders { edges { node { id } } } }")]
+
+    assert asyncio.run(collect()) == []
+    waited = client.calls.index({"id": "gid://shopify/BulkOperation/7"})
+    submitted = client.calls.index({"query": "{ orders { edges { node { id } } } }"})
+    assert waited < submitted and client.cancelled == []
+
+
+def test_variant_link_audit_pages_below_the_bulk_threshold(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    from mcp_tools.products.manage_variant_links import ManageVariantLinksTool
+
+    catalog = [{"id": f"gid://shopify/Product/{n}", "title": f"P{n}", "handle": f"p{n}",
+                "metafields": {"edges": [{"node": {"value": json.dumps(["a", "b"])}}] if n % 2 else []}}
+               for n in range(230)]
+    pages = []
+
+    async def execute_graphql(query, variables=None):
+        if "productsCount" in query:
+            return {"data": {"productsCount": {"count": len(catalog)}}}
+        start = int(variables["after"] or 0)
+        pages.append(start)
+        page = catalog[start:start + 100]
+        return {"data": {"products": {
+            "edges": [{"node": json.loads(json.dumps(p))} for p in page],
+            "pageInfo": {"hasNextPage": start + 100 < len(catalog), "endCursor": str(start + 100)},
+        }}}
+
+    from mcp_tools.base import AsyncShopifyClient
+    monkeypatch.setattr(AsyncShopifyClient, "execute_graphql", lambda self, q, v=None: execute_graphql(q, v))
+    result = asyncio.run(ManageVariantLinksTool().execute("audit"))
+
+    assert pages == [0, 100, 200]
+    assert result["success"], result
+    assert sum(g["product_count"] for g in result["groups"]) == 115
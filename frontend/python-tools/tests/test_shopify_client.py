@@ -0,0 +1,173 @@
+import sys, pathlib, json, time, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import base
+from base import AsyncShopifyClient, ShopifyClient
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = json.dumps(self._payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def shopify_env(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+
+
+def test_clients_share_one_session():
+    assert AsyncShopifyClient().session is ShopifyClient().session
+    assert ShopifyClient().session is base.get_shared_session()
+
+
+def test_sync_facade_sends_token_header(monkeypatch):
+    captured = {}
+
+    def fake_post(self, url, json=None, headers=None, **_kw):  # noqa: A002
+        captured["url"] = url
+        captured["headers"] = headers
+        return DummyResponse(200, {"data": {"shop": {"name": "Demo"}}})
+
+    monkeypatch.setattr("requests.Session.post", fake_post, raising=True)
+
+    result = ShopifyClient().execute_graphql("{ shop { name } }")
+    assert result["data"]["shop"]["name"] == "Demo"
+    assert captured["url"] == "https://example.myshopify.com/admin/api/2025-07/graphql.json"
+    assert captured["headers"]["X-Shopify-Access-Token"] == "token"
+
+
+def test_async_calls_overlap(monkeypatch):
+    def slow_post(self, url, json=None, headers=None, **_kw):  # noqa: A002
+        time.sleep(0.2)
+        return DummyResponse(200, {"data": {}})
+
+    monkeypatch.setattr("requests.Session.post", slow_post, raising=True)
+
+    async def run():
+        client = AsyncShopifyClient()
+        return await asyncio.gather(*(client.execute_graphql("{ shop { name } }") for _ in range(5)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 5
+    assert elapsed < 0.6  # sequential would take ~1s
+
+
+def test_graphql_errors_raise(monkeypatch):
+    def error_post(self, url, json=None, headers=None, **_kw):  # noqa: A002
+        return DummyResponse(200, {"errors": [{"message": "Boom"}]})
+
+    monkeypatch.setattr("requests.Session.post", error_post, raising=True)
+
+    with pytest.raises(Exception, match="Boom"):
+        asyncio.run(AsyncShopifyClient().execute_graphql("{ shop { name } }"))
+
+
+def test_resolve_product_id_prefers_sku_match(monkeypatch):
+    responses = iter([
+        DummyResponse(200, {"data": {"productByHandle": None}}),
+        DummyResponse(200, {"data": {"products": {"edges": [{"node": {
+            "id": "gid://shopify/Product/1",
+            "title": "Machine",
+            "variants": {"edges": [{"node": {"sku": "ABC-1"}}]},
+        }}]}}}),
+    ])
+
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: next(responses), raising=True)
+
+    gid = asyncio.run(AsyncShopifyClient().resolve_product_id("ABC-1"))
+    assert gid == "gid://shopify/Product/1"
+
+
+def test_requests_carry_the_call_deadline(monkeypatch):
+    from mcp_deadline import DeadlineExceeded, deadline_scope
+
+    timeouts = []
+
+    def fake_post(self, url, json=None, headers=None, timeout=None, **_kw):  # noqa: A002
+        timeouts.append(timeout)
+        return DummyResponse(200, {"data": {}})
+
+    monkeypatch.setattr("requests.Session.post", fake_post, raising=True)
+
+    async def run():
+        client = AsyncShopifyClient()
+        await client.execute_graphql("{ shop { name } }")
+        with deadline_scope(2):
+            await client.execute_graphql("{ shop { name } }")
+        with deadline_scope(-1):
+            await client.execute_graphql("{ shop { name } }")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert timeouts[0] == (10.0, base.SHOPIFY_HTTP_TIMEOUT)
+    assert 1.9 < timeouts[1][1] <= 2 and len(timeouts) == 2
+
+
+def test_resolve_variants_batches_ids_and_skus(monkeypatch):
+    monkeypatch.setattr(base, "BATCH_QUERY_COST", 6)
+    monkeypatch.setenv("PRODUCT_INDEX_PATH", "/nonexistent/product_index.db")
+    catalog = {f"gid://shopify/ProductVariant/{n}": {"id": f"gid://shopify/ProductVariant/{n}", "sku": f"SKU-{n}",
+                                                     "product": {"id": f"gid://shopify/Product/{n}"}}
+               for n in range(1, 6)}
+    queries = []
+
+    async def execute_graphql(query, variables=None):
+        queries.append(variables)
+        if "nodes(ids:" in query:
+            return {"data": {"nodes": [catalog.get(gid) for gid in variables["ids"]]}}
+        data = {}
+        for alias, search in variables.items():
+            sku = json.loads(search.split(":", 1)[1])
+            near = [v for v in catalog.values() if v["sku"].upper().startswith(sku.upper())]  # Search is fuzzy
+            data["v" + alias[1:]] = {"edges": [{"node": v} for v in near]}
+        return {"data": data}
+
+    client = AsyncShopifyClient()
+    monkeypatch.setattr(client, "execute_graphql", execute_graphql)
+    found = asyncio.run(client.resolve_variants(
+        ["1", "gid://shopify/ProductVariant/2", "3", "99", "sku-4", "SKU-5", "SKU-"], "product { id }"))
+
+    assert found["1"]["product"]["id"] == "gid://shopify/Product/1"
+    assert found["sku-4"]["id"] == "gid://shopify/ProductVariant/4"
+    assert found["SKU-5"]["sku"] == "SKU-5"
+    assert found["99"] is None and found["SKU-"] is None  # No exact match
+    id_batches = [q["ids"] for q in queries if "ids" in q]
+    sku_batches = [q for q in queries if "ids" not in q]
+    assert sorted(len(b) for b in id_batches) == [1, 3] and len(sku_batches) == 3  # Sized to the cost budget
+
+
+def test_resolve_variants_treats_numeric_skus_as_skus(monkeypatch):
+    monkeypatch.setenv("PRODUCT_INDEX_PATH", "/nonexistent/product_index.db")
+    by_id = {"id": "gid://shopify/ProductVariant/12345", "sku": "OTHER"}
+    by_sku = {"id": "gid://shopify/ProductVariant/7", "sku": "12345"}
+    queries = []
+
+    async def execute_graphql(query, variables=None):
+        queries.append(query)
+        if "nodes(ids:" in query:
+            return {"data": {"nodes": [by_id]}}
+        return {"data": {"v0": {"edges": [{"node": by_sku}]}}}
+
+    client = AsyncShopifyClient()
+    monkeypatch.setattr(client, "execute_graphql", execute_graphql)
+
+    found = asyncio.run(client.resolve_variants(["12345"], "product { id }", skus_only=True))
+    assert found["12345"]["id"] == "gid://shopify/ProductVariant/7"
+    assert not any("nodes(ids:" in q for q in queries)
+    # Without the flag an all-digit identifier is still a variant ID
+    assert asyncio.run(client.resolve_variants(["12345"], "product { id }"))["12345"] is by_id
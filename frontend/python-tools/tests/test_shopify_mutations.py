@@ -0,0 +1,136 @@
+import sys, pathlib, asyncio, json, random
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import shopify_mutations
+from base import AsyncShopifyClient, ShopifyServerError
+from mcp_base_server import EnhancedMCPServer
+from shopify_mutations import MutationExecutor
+from shopify_throttle import CostThrottle
+
+MUTATION = "mutation m($productId: ID!) { productVariantsBulkUpdate(productId: $productId) { userErrors { message } } }"
+
+
+class FakeClient:
+    """Counts concurrent mutations; fails chosen products once with a 5xx."""
+
+    def __init__(self, flaky=(), slow=()):
+        self.throttle = CostThrottle()
+        self.flaky = set(flaky)
+        self.slow = set(slow)
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+        self.completed = []
+
+    async def execute_graphql(self, query, variables=None):
+        key = variables["productId"]
+        self.calls.append(key)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.05 if key in self.slow else 0.001)
+            self.completed.append(key)
+            if key in self.flaky:
+                self.flaky.discard(key)
+                raise ShopifyServerError("API Request Error: 502 Server Error")
+            return {"data": {"productVariantsBulkUpdate": {"userErrors": []}}}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(shopify_mutations, "BACKOFF_BASE_SECONDS", 0.001)
+
+
+def run(executor, jobs):
+    async def collect():
+        return [outcome async for outcome in executor.run(MUTATION, jobs)]
+    return asyncio.run(collect())
+
+
+def test_fan_out_is_concurrent_and_retries_server_errors():
+    client = FakeClient(flaky={"p3"}, slow={"p0"})
+    executor = MutationExecutor(client, concurrency=4, rng=random.Random(0))
+    jobs = [(f"p{i}", {"productId": f"p{i}"}) for i in range(20)]
+
+    outcomes = run(executor, jobs)
+
+    assert 1 < client.peak <= 4
+    assert sorted(o["key"] for o in outcomes) == sorted(key for key, _ in jobs)
+    assert all(o["error"] is None for o in outcomes)
+    assert next(o for o in outcomes if o["key"] == "p3")["attempts"] == 2
+    assert outcomes[-1]["key"] == "p0"  # Results arrive in completion order
+
+
+def test_retries_are_bounded_and_concurrency_follows_budget():
+    client = FakeClient()
+    client.throttle.maximum_available = 20
+
+    async def always_failing(query, variables=None):
+        raise ShopifyServerError("API Request Error: 503")
+
+    client.execute_graphql = always_failing
+    executor = MutationExecutor(client, concurrency=8, retries=2)
+    assert executor.concurrency_for(10) == 2
+
+    (outcome,) = run(executor, [("p1", {"productId": "p1"})])
+    assert outcome["attempts"] == 3 and "503" in outcome["error"]
+
+    plan = executor.plan(MUTATION, [(f"p{i}", {"productId": f"p{i}"}) for i in range(100)])
+    assert plan["mutations"] == 100 and plan["estimated_seconds"] > 0
+
+
+def test_bulk_price_update_returns_summary_with_plan_and_products(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("PRODUCT_INDEX_PATH", "/nonexistent/product_index.db")
+    from mcp_tools.pricing.bulk_update import BulkPriceUpdateTool
+
+    async def execute_graphql(self, query, variables=None):
+        if "nodes(ids:" in query:
+            return {"data": {"nodes": [
+                {"id": gid, "sku": None, "price": "10.00" if gid.endswith("/31") else "12.00", "compareAtPrice": None,
+                 "product": {"id": f"gid://shopify/Product/{int(gid.rsplit('/', 1)[1]) // 10}"}}
+                for gid in variables["ids"]
+            ]}}
+        return {"data": {"productVariantsBulkUpdate": {
+            "productVariants": [{"id": v["id"]} for v in variables["variants"]], "userErrors": []}}}
+
+    monkeypatch.setattr(AsyncShopifyClient, "execute_graphql", execute_graphql)
+    server = EnhancedMCPServer("pricing-test")
+    server.add_tool(BulkPriceUpdateTool())
+    updates = [{"variant_id": str(n), "price": 10} for n in (11, 12, 21, 31)]
+
+    response = asyncio.run(server.handle_request({"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {
+        "name": "bulk_price_update", "arguments": {"updates": updates}}}))
+    result = json.loads(response["result"]["content"][0]["text"])
+    plan, products = result.pop("plan"), result.pop("products")
+
+    assert result == {"success": True, "total_variants_processed": 4,
+                      "variants_updated": 3, "variants_unchanged": 1, "errors": []}
+    assert plan["mutations"] == 2 and "estimated_seconds" in plan
+    assert plan["unchanged"] == 1  # Variant 31 already has the price
+    assert sorted(p["product_id"] for p in products) == [f"gid://shopify/Product/{n}" for n in (1, 2)]
+    assert all(p["success"] for p in products)
+
+
+def test_closing_early_lets_sent_writes_finish(caplog):
+    client = FakeClient(slow={f"p{i}" for i in range(10)})
+    executor = MutationExecutor(client, concurrency=2)
+    jobs = [(f"p{i}", {"productId": f"p{i}"}) for i in range(10)]
+
+    async def take_one_then_close():
+        outcomes = executor.run(MUTATION, jobs)
+        first = await outcomes.__anext__()
+        await outcomes.aclose()
+        return first
+
+    first = asyncio.run(take_one_then_close())
+    # Both mutations in flight when the caller stopped were completed, not cut off
+    assert first["error"] is None and 2 < len(client.calls) < 10
+    assert client.completed == client.calls
+    assert f"{10 - len(client.calls)} of 10 mutations never attempted" in caplog.text
@@ -0,0 +1,137 @@
+import sys, pathlib, json, asyncio
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+import pytest
+
+import base
+from shopify_throttle import CostThrottle, ShopifyThrottledError, estimate_query_cost
+
+
+ORDERS_QUERY = """
+query orders($first: Int!, $query: String) {
+    orders(first: $first, query: $query) {
+        edges { node { id name totalPriceSet { shopMoney { amount } } } }
+        pageInfo { hasNextPage endCursor }
+    }
+}
+"""
+
+
+class DummyResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def cost_block(requested, available, actual=None):
+    return {
+        "requestedQueryCost": requested,
+        "actualQueryCost": actual,
+        "throttleStatus": {"maximumAvailable": 2000.0, "currentlyAvailable": available, "restoreRate": 100.0},
+    }
+
+
+def test_estimate_scales_with_page_size():
+    small = estimate_query_cost(ORDERS_QUERY, {"first": 10})
+    large = estimate_query_cost(ORDERS_QUERY, {"first": 250})
+    assert small < large
+    assert estimate_query_cost("{ shop { name } }") == 1
+    assert estimate_query_cost("mutation { productUpdate(input: {}) { product { id } } }") >= 10
+
+
+def test_reserve_waits_for_restore():
+    throttle = CostThrottle(maximum_available=100, restore_rate=50)
+    assert throttle.reserve(80) == 0
+    wait = throttle.reserve(80)
+    # 20 points left, 60 more needed at 50/s
+    assert wait == pytest.approx(1.2, abs=0.05)
+    assert throttle.snapshot()["waits"] == 1
+
+
+def test_cancelled_waiter_gives_its_reservation_back():
+    throttle = CostThrottle(maximum_available=100, restore_rate=10)
+    throttle.record(ORDERS_QUERY, None, None, throttle.acquire(100))  # Drain the bucket
+    before = throttle.snapshot()
+
+    async def cancel_waiter():
+        waiter = asyncio.ensure_future(throttle.acquire_async(50))
+        await asyncio.sleep(0.01)
+        assert throttle.snapshot()["inFlight"] == 50
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(cancel_waiter())
+    after = throttle.snapshot()
+    assert after["inFlight"] == before["inFlight"] == 0
+    assert after["currentlyAvailable"] == pytest.approx(before["currentlyAvailable"], abs=1)
+
+
+def test_record_syncs_bucket_and_learns_cost():
+    throttle = CostThrottle(maximum_available=1000, restore_rate=50)
+    reserved = throttle.acquire(10)
+    throttle.record(ORDERS_QUERY, {"first": 50}, cost_block(252, 1500.0, 40), reserved)
+
+    snap = throttle.snapshot()
+    assert snap["maximumAvailable"] == 2000.0
+    assert snap["restoreRate"] == 100.0
+    assert 1500.0 <= snap["currentlyAvailable"] <= 1501.0
+    assert throttle.estimate_cost(ORDERS_QUERY, {"first": 50}) == 252
+
+
+def test_client_retries_throttled(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    throttle = CostThrottle(maximum_available=2000, restore_rate=1000)
+    monkeypatch.setattr(base, "get_throttle", lambda: throttle)
+
+    responses = iter([
+        DummyResponse({"errors": [{"message": "Throttled", "extensions": {"code": "THROTTLED"}}],
+                       "extensions": {"cost": cost_block(1, 0.0)}}),
+        DummyResponse({"data": {"shop": {"name": "Demo"}}, "extensions": {"cost": cost_block(1, 1999.0, 1)}}),
+    ])
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: next(responses), raising=True)
+
+    result = base.ShopifyClient().execute_graphql("{ shop { name } }")
+    assert result["data"]["shop"]["name"] == "Demo"
+    assert throttle.snapshot()["throttled"] == 1
+    assert throttle.snapshot()["inFlight"] == 0
+
+
+def test_client_gives_up_after_retries(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(base, "get_throttle", lambda: CostThrottle(restore_rate=100000))
+    monkeypatch.setattr(base, "THROTTLE_RETRIES", 2)
+
+    throttled = DummyResponse({"errors": [{"message": "Throttled", "extensions": {"code": "THROTTLED"}}]})
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: throttled, raising=True)
+
+    with pytest.raises(ShopifyThrottledError):
+        base.ShopifyClient().execute_graphql("{ shop { name } }")
+
+
+def test_client_always_sends_the_request_once(monkeypatch):
+    monkeypatch.setenv("SHOPIFY_SHOP_URL", "example.myshopify.com")
+    monkeypatch.setenv("SHOPIFY_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(base, "get_throttle", lambda: CostThrottle(restore_rate=100000))
+    monkeypatch.setattr(base, "THROTTLE_RETRIES", 0)
+
+    ok = DummyResponse({"data": {"shop": {"name": "Demo"}}})
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: ok, raising=True)
+
+    assert base.ShopifyClient().execute_graphql("{ shop { name } }")["data"]["shop"]["name"] == "Demo"
+    result = asyncio.run(base.AsyncShopifyClient().execute_graphql("{ shop { name } }"))
+    assert result["data"]["shop"]["name"] == "Demo"
+
+    throttled = DummyResponse({"errors": [{"message": "Throttled", "extensions": {"code": "THROTTLED"}}]})
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: throttled, raising=True)
+    with pytest.raises(ShopifyThrottledError):
+        base.ShopifyClient().execute_graphql("{ shop { name } }")
@@ -0,0 +1,118 @@
+import sys, pathlib, asyncio, os
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "python-tools"))
+
+from mcp_tool_manifest import LazyTool, ToolManifest, profile_startup
+
+TOOL_SOURCE = '''
+LOADS = []
+
+class EchoTool:
+    name = "echo"
+    description = "{description}"
+    context = "Say it back"
+    input_schema = {{"type": "object"}}
+
+    def __init__(self):
+        LOADS.append(self)
+
+    async def execute(self, **kwargs):
+        return {{"success": True, "echo": kwargs}}
+
+class Helper:
+    name = "not a tool, no execute"
+'''
+
+
+def make_tools(tmp_path, monkeypatch, description="Return the arguments"):
+    package = tmp_path / "manifest_tools"
+    (package / "misc").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "misc" / "__init__.py").write_text("")
+    (package / "misc" / "echo.py").write_text(TOOL_SOURCE.format(description=description))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return package
+
+
+def forget(prefix="manifest_tools"):
+    for name in [m for m in sys.modules if m.startswith(prefix)]:
+        del sys.modules[name]
+
+
+def test_manifest_is_reused_without_imports(tmp_path, monkeypatch):
+    tools_dir = make_tools(tmp_path, monkeypatch)
+    path = tmp_path / "manifest.json"
+
+    entries = ToolManifest(tools_dir, path).all_tools()
+    assert entries == [{
+        "module": "manifest_tools.misc.echo",
+        "class": "EchoTool",
+        "name": "echo",
+        "description": "Return the arguments",
+        "input_schema": {"type": "object"},
+        "context": "Say it back",
+    }]
+    assert path.exists()
+
+    forget()
+    assert ToolManifest(tools_dir, path).all_tools() == entries
+    assert "manifest_tools.misc.echo" not in sys.modules
+    forget()
+
+
+def test_lazy_tool_imports_on_first_call(tmp_path, monkeypatch):
+    tools_dir = make_tools(tmp_path, monkeypatch)
+    path = tmp_path / "manifest.json"
+    ToolManifest(tools_dir, path).all_tools()
+    forget()
+
+    tool = LazyTool(ToolManifest(tools_dir, path).entry("manifest_tools.misc.echo", "EchoTool"))
+    assert tool.name == "echo" and tool.context == "Say it back"
+    assert not tool.loaded and "manifest_tools.misc.echo" not in sys.modules
+
+    assert asyncio.run(tool.execute(q="x")) == {"success": True, "echo": {"q": "x"}}
+    asyncio.run(tool.execute(q="y"))
+    assert tool.loaded
+    assert len(sys.modules["manifest_tools.misc.echo"].LOADS) == 1
+    forget()
+
+
+def test_changed_module_is_described_again(tmp_path, monkeypatch):
+    tools_dir = make_tools(tmp_path, monkeypatch)
+    path = tmp_path / "manifest.json"
+    ToolManifest(tools_dir, path).all_tools()
+    forget()
+
+    tool_file = tools_dir / "misc" / "echo.py"
+    tool_file.write_text(TOOL_SOURCE.format(description="Repeat the arguments back"))
+    stat = tool_file.stat()
+    os.utime(tool_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    entries = ToolManifest(tools_dir, path).all_tools()
+    assert entries[0]["description"] == "Repeat the arguments back"
+    forget()
+
+
+def test_profile_startup_reports_each_module(tmp_path, monkeypatch):
+    tools_dir = make_tools(tmp_path, monkeypatch)
+    report = profile_startup(tools_dir, budget_ms=10_000, manifest_path=tmp_path / "manifest.json")
+    assert [m["module"] for m in report["modules"]] == ["manifest_tools.misc.echo"]
+    assert report["within_budget"] and not report["manifest_cached"]
+    forget()
+
+
+def test_lazy_start_is_timed_without_the_eager_imports(tmp_path, monkeypatch):
+    tools_dir = make_tools(tmp_path, monkeypatch)
+    echo = tools_dir / "misc" / "echo.py"
+    echo.write_text("import time\ntime.sleep(0.3)\n" + echo.read_text())
+    manifest_path = tmp_path / "manifest.json"
+
+    # Building the manifest pays for the import, even though this process has it
+    first = profile_startup(tools_dir, budget_ms=10_000, manifest_path=manifest_path)
+    assert not first["manifest_cached"] and first["lazy_ms"] >= 300
+    forget()
+
+    cached = profile_startup(tools_dir, budget_ms=10_000, manifest_path=manifest_path)
+    assert cached["manifest_cached"]
+    assert cached["eager_ms"] >= 300 and cached["lazy_ms"] < 300
+    forget()
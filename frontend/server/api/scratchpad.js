@@ -2,11 +2,14 @@ import { Router } from 'express';
 import { authenticateToken } from '../auth.js';
 import fs from 'fs/promises';
 import path from 'path';
+import { runScratchpadAction } from '../tools/scratchpad-tool.js';
 
 const router = Router();
 
 // Path to the scratchpad file
 const SCRATCHPAD_FILE = path.join(process.cwd(), 'server', 'data', 'scratchpad.json');
+// Writes from the Python MCP servers land here until they compact them into SCRATCHPAD_FILE
+const SCRATCHPAD_LOG = path.join(process.cwd(), 'server', 'data', 'scratchpad.log');
 
 // Ensure data directory exists
 async function ensureDataDirectory() {
@@ -23,23 +26,46 @@ async function loadScratchpad() {
   try {
     await ensureDataDirectory();
     const data = await fs.readFile(SCRATCHPAD_FILE, 'utf8');
-    return JSON.parse(data);
+    return await replayLog(JSON.parse(data));
   } catch (error) {
     // Return empty scratchpad if file doesn't exist
-    return {
+    return await replayLog({
       content: '',
       entries: [],
       last_updated: null,
       created_at: new Date().toISOString()
-    };
+    });
   }
 }
 
-// Save scratchpad data
-async function saveScratchpad(data) {
-  await ensureDataDirectory();
-  data.last_updated = new Date().toISOString();
-  await fs.writeFile(SCRATCHPAD_FILE, JSON.stringify(data, null, 2));
+// Apply logged writes newer than the snapshot (see python-tools/mcp_scratchpad_tool.py)
+async function replayLog(scratchpad) {
+  let log;
+  try {
+    log = await fs.readFile(SCRATCHPAD_LOG, 'utf8');
+  } catch {
+    return scratchpad;
+  }
+  scratchpad.entries = scratchpad.entries || [];
+  for (const line of log.split('\n')) {
+    let op;
+    try {
+      op = JSON.parse(line);
+    } catch {
+      continue;
+    }
+    if (op.seq <= (scratchpad.log_seq || 0)) continue;
+    if (op.op === 'write') scratchpad.content = op.content;
+    if (op.op === 'append') scratchpad.content = ((scratchpad.content || '') + '\n' + op.content).trim();
+    if (op.op === 'add_entry') scratchpad.entries = [...scratchpad.entries, op.entry].slice(-50);
+    if (op.op === 'clear') {
+      scratchpad.content = '';
+      scratchpad.entries = [];
+    }
+    scratchpad.log_seq = op.seq;
+    scratchpad.last_updated = op.timestamp;
+  }
+  return scratchpad;
 }
 
 /**
@@ -57,10 +83,9 @@ router.post('/', authenticateToken, async (req, res) => {
       });
     }
 
-    const scratchpad = await loadScratchpad();
-    
     switch (action) {
-      case 'read':
+      case 'read': {
+        const scratchpad = await loadScratchpad();
         if (!scratchpad.content && scratchpad.entries.length === 0) {
           return res.json({ 
             success: true, 
@@ -73,36 +98,18 @@ router.post('/', authenticateToken, async (req, res) => {
           message: 'Scratchpad content retrieved', 
           data: scratchpad
         });
+      }
         
+      // Writes go through the Python tool so they share its lock and append log
       case 'write':
-        if (!content) {
-          return res.status(400).json({ 
-            success: false, 
-            message: 'Content is required for write action' 
-          });
-        }
-        scratchpad.content = content;
-        await saveScratchpad(scratchpad);
-        return res.json({ 
-          success: true, 
-          message: 'Scratchpad content updated', 
-          data: scratchpad 
-        });
-        
       case 'append':
         if (!content) {
           return res.status(400).json({ 
             success: false, 
-            message: 'Content is required for append action' 
+            message: `Content is required for ${action} action` 
           });
         }
-        scratchpad.content = (scratchpad.content || '') + '\n' + content;
-        await saveScratchpad(scratchpad);
-        return res.json({ 
-          success: true, 
-          message: 'Content appended to scratchpad', 
-          data: scratchpad 
-        });
+        return res.json(await runScratchpadAction(action, { content }));
         
       case 'add_entry':
         if (!content) {
@@ -111,43 +118,10 @@ router.post('/', authenticateToken, async (req, res) => {
             message: 'Content is required for add_entry action' 
           });
         }
-        if (!scratchpad.entries) scratchpad.entries = [];
-        
-        const entry = {
-          content,
-          author: author || 'User',
-          timestamp: new Date().toISOString(),
-          id: scratchpad.entries.length + 1
-        };
-        
-        scratchpad.entries.push(entry);
-        
-        // Keep only last 50 entries to prevent unlimited growth
-        if (scratchpad.entries.length > 50) {
-          scratchpad.entries = scratchpad.entries.slice(-50);
-        }
-        
-        await saveScratchpad(scratchpad);
-        return res.json({ 
-          success: true, 
-          message: 'Entry added to scratchpad', 
-          data: scratchpad, 
-          entry 
-        });
+        return res.json(await runScratchpadAction('add_entry', { content, author: author || 'User' }));
         
       case 'clear':
-        const clearedScratchpad = {
-          content: '',
-          entries: [],
-          last_updated: new Date().toISOString(),
-          created_at: scratchpad.created_at || new Date().toISOString()
-        };
-        await saveScratchpad(clearedScratchpad);
-        return res.json({ 
-          success: true, 
-          message: 'Scratchpad cleared', 
-          data: clearedScratchpad 
-        });
+        return res.json(await runScratchpadAction('clear'));
         
       default:
         return res.status(400).json({ 
@@ -88,12 +88,18 @@ export async function initializeMCPTools() {
     // Initialize all specialized servers
     console.log('[MCP Client] Initializing specialized MCP servers...');
     
+    // MCP_HOST=true serves every namespace from one shared Python process
+    const useHost = process.env.MCP_HOST === 'true';
+    const pythonTools = path.join(__dirname, '../../python-tools');
+    
     for (const serverConfig of specializedServers) {
       try {
         const server = new MCPServerStdio({
           name: `EspressoBot ${serverConfig.name} Server`,
           command: 'python3',
-          args: [path.join(__dirname, '../../python-tools', serverConfig.file)],
+          args: useHost
+            ? [path.join(pythonTools, 'mcp-host-connect.py'), serverConfig.name]
+            : [path.join(pythonTools, serverConfig.file)],
           env: {
             ...process.env,
             PYTHONUNBUFFERED: '1'
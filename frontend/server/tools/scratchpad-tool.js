@@ -2,8 +2,13 @@ import { tool } from '@openai/agents';
 import { z } from 'zod';
 import fs from 'fs/promises';
 import path from 'path';
+import { spawn } from 'child_process';
 
 const SCRATCHPAD_FILE = path.join(process.cwd(), 'server', 'data', 'scratchpad.json');
+// Writes from the Python MCP servers land here until they compact them into SCRATCHPAD_FILE
+const SCRATCHPAD_LOG = path.join(process.cwd(), 'server', 'data', 'scratchpad.log');
+// Writes go through the Python tool so they take the same lock and append log
+const SCRATCHPAD_SCRIPT = path.join(process.cwd(), 'python-tools', 'mcp_scratchpad_tool.py');
 
 // Ensure data directory exists
 async function ensureDataDirectory() {
@@ -20,23 +25,73 @@ async function loadScratchpad() {
   try {
     await ensureDataDirectory();
     const data = await fs.readFile(SCRATCHPAD_FILE, 'utf8');
-    return JSON.parse(data);
+    return await replayLog(JSON.parse(data));
   } catch (error) {
     // Return empty scratchpad if file doesn't exist
-    return {
+    return await replayLog({
       content: '',
       entries: [],
       last_updated: null,
       created_at: new Date().toISOString()
-    };
+    });
+  }
+}
+
+// Apply logged writes newer than the snapshot (see python-tools/mcp_scratchpad_tool.py)
+async function replayLog(scratchpad) {
+  let log;
+  try {
+    log = await fs.readFile(SCRATCHPAD_LOG, 'utf8');
+  } catch {
+    return scratchpad;
   }
+  scratchpad.entries = scratchpad.entries || [];
+  for (const line of log.split('\n')) {
+    let op;
+    try {
+      op = JSON.parse(line);
+    } catch {
+      continue;
+    }
+    if (op.seq <= (scratchpad.log_seq || 0)) continue;
+    if (op.op === 'write') scratchpad.content = op.content;
+    if (op.op === 'append') scratchpad.content = ((scratchpad.content || '') + '\n' + op.content).trim();
+    if (op.op === 'add_entry') scratchpad.entries = [...scratchpad.entries, op.entry].slice(-50);
+    if (op.op === 'clear') {
+      scratchpad.content = '';
+      scratchpad.entries = [];
+    }
+    scratchpad.log_seq = op.seq;
+    scratchpad.last_updated = op.timestamp;
+  }
+  return scratchpad;
 }
 
-// Save scratchpad data
-async function saveScratchpad(data) {
-  await ensureDataDirectory();
-  data.last_updated = new Date().toISOString();
-  await fs.writeFile(SCRATCHPAD_FILE, JSON.stringify(data, null, 2));
+// Run one scratchpad action through python-tools/mcp_scratchpad_tool.py
+function runScratchpadAction(action, args = {}) {
+  return new Promise((resolve, reject) => {
+    const proc = spawn('python3', [SCRATCHPAD_SCRIPT, action], {
+      cwd: path.dirname(SCRATCHPAD_SCRIPT),
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    let stdout = '';
+    let stderr = '';
+    proc.stdout.on('data', (chunk) => { stdout += chunk; });
+    proc.stderr.on('data', (chunk) => { stderr += chunk; });
+    proc.on('error', reject);
+    proc.on('close', (code) => {
+      if (code !== 0) {
+        reject(new Error(stderr.trim() || `scratchpad ${action} exited with code ${code}`));
+        return;
+      }
+      try {
+        resolve(JSON.parse(stdout));
+      } catch (error) {
+        reject(new Error(`Invalid scratchpad ${action} output: ${error.message}`));
+      }
+    });
+    proc.stdin.end(JSON.stringify(args));
+  });
 }
 
 // Helper function to format scratchpad content for display
@@ -62,7 +117,7 @@ function formatScratchpadContent(scratchpad) {
 }
 
 // Export helper functions for orchestrator use
-export { loadScratchpad, formatScratchpadContent };
+export { loadScratchpad, formatScratchpadContent, runScratchpadAction };
 
 export const scratchpadTool = tool({
   name: 'scratchpad',
@@ -74,10 +129,9 @@ export const scratchpadTool = tool({
   }),
   execute: async ({ action, content, author }) => {
     try {
-      const scratchpad = await loadScratchpad();
-      
       switch (action) {
-        case 'read':
+        case 'read': {
+          const scratchpad = await loadScratchpad();
           if (!scratchpad.content && scratchpad.entries.length === 0) {
             return { success: true, message: 'Scratchpad is empty', data: scratchpad };
           }
@@ -87,55 +141,23 @@ export const scratchpadTool = tool({
             data: scratchpad,
             formatted: formatScratchpadContent(scratchpad)
           };
+        }
           
         case 'write':
-          if (!content) {
-            return { success: false, message: 'Content is required for write action' };
-          }
-          scratchpad.content = content;
-          await saveScratchpad(scratchpad);
-          return { success: true, message: 'Scratchpad content updated', data: scratchpad };
-          
         case 'append':
           if (!content) {
-            return { success: false, message: 'Content is required for append action' };
+            return { success: false, message: `Content is required for ${action} action` };
           }
-          scratchpad.content = (scratchpad.content || '') + '\n' + content;
-          await saveScratchpad(scratchpad);
-          return { success: true, message: 'Content appended to scratchpad', data: scratchpad };
+          return await runScratchpadAction(action, { content });
           
         case 'add_entry':
           if (!content) {
             return { success: false, message: 'Content is required for add_entry action' };
           }
-          if (!scratchpad.entries) scratchpad.entries = [];
-          
-          const entry = {
-            content,
-            author: author || 'unknown',
-            timestamp: new Date().toISOString(),
-            id: scratchpad.entries.length + 1
-          };
-          
-          scratchpad.entries.push(entry);
-          
-          // Keep only last 50 entries to prevent unlimited growth
-          if (scratchpad.entries.length > 50) {
-            scratchpad.entries = scratchpad.entries.slice(-50);
-          }
-          
-          await saveScratchpad(scratchpad);
-          return { success: true, message: 'Entry added to scratchpad', data: scratchpad, entry };
+          return await runScratchpadAction('add_entry', { content, author: author || 'unknown' });
           
         case 'clear':
-          const clearedScratchpad = {
-            content: '',
-            entries: [],
-            last_updated: new Date().toISOString(),
-            created_at: scratchpad.created_at || new Date().toISOString()
-          };
-          await saveScratchpad(clearedScratchpad);
-          return { success: true, message: 'Scratchpad cleared', data: clearedScratchpad };
+          return await runScratchpadAction('clear');
           
         default:
           return { success: false, message: `Unknown action: ${action}` };